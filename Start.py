@@ -368,6 +368,8 @@ app.add_middleware(
 app.state.services = None
 app.state.agent_manager = None
 app.state.taskmaster_scheduler_task = None
+app.state.taskmaster_worker_pool = None
+app.state.workflow_webhook_dispatcher = None
 app.state.metrics = {"requests_total": 0, "per_path": {}, "per_method": {}}
 app.state.router_load_report = []
 app.state.startup_report = {}
@@ -527,7 +529,12 @@ except Exception as e:
 async def _taskmaster_scheduler_loop() -> None:
     from app.bootstrap.lifecycle import taskmaster_scheduler_loop  # noqa: E402
 
-    await taskmaster_scheduler_loop(logger=logger)
+    def _wake_workers(jobs: int) -> None:
+        pool = getattr(app.state, "taskmaster_worker_pool", None)
+        if pool is not None:
+            pool.notify(jobs)
+
+    await taskmaster_scheduler_loop(logger=logger, on_enqueued=_wake_workers)
 
 
 def _module_available(module_name: str) -> bool:
@@ -591,8 +598,15 @@ def _config_digest() -> str:
         "RATE_LIMIT_REQUESTS_PER_MINUTE",
         "TASKMASTER_SCHEDULER_INTERVAL_SECONDS",
         "TASKMASTER_SCHEDULER_MAX_DUE_PER_TICK",
+        "TASKMASTER_WORKERS",
+        "TASKMASTER_LEASE_SECONDS",
+        "WORKFLOW_STEP_WORKERS",
+        "WORKFLOW_WEBHOOK_DISPATCHER",
+        "WORKFLOW_WEBHOOK_PER_ENDPOINT_CONCURRENCY",
         "ORGANIZER_LLM_PROVIDER",
         "ORGANIZER_LLM_MODEL",
+        "ORGANIZER_LLM_CONCURRENCY",
+        "ORGANIZER_LLM_BATCH_SIZE",
         "LLM_PROVIDER",
         "LLM_MODEL",
         "ENV",
@@ -768,6 +782,30 @@ async def _startup_services():
         app.state.taskmaster_scheduler_task = asyncio.create_task(_taskmaster_scheduler_loop())
         logger.info("TaskMaster scheduler loop started")
 
+        # Start TaskMaster queue workers
+        from app.bootstrap.lifecycle import start_taskmaster_worker_pool  # noqa: E402
+
+        app.state.taskmaster_worker_pool = start_taskmaster_worker_pool(logger=logger)
+
+        # Steps queued or running when the last process stopped will never finish
+        from app.bootstrap.lifecycle import (  # noqa: E402
+            recover_interrupted_workflow_steps,
+        )
+
+        try:
+            recover_interrupted_workflow_steps(logger=logger)
+        except Exception as e:
+            logger.warning(f"Workflow step recovery failed: {e}")
+
+        # Deliver queued workflow webhooks
+        from app.bootstrap.lifecycle import (  # noqa: E402
+            start_workflow_webhook_dispatcher,
+        )
+
+        app.state.workflow_webhook_dispatcher = start_workflow_webhook_dispatcher(
+            logger=logger
+        )
+
         app.state.startup_report = _build_startup_report()
         logger.info("Startup compliance report: %s", json.dumps(app.state.startup_report))
         _record_awareness(
@@ -801,12 +839,59 @@ async def _shutdown_services():
             pass
         app.state.taskmaster_scheduler_task = None
 
+    pool = getattr(app.state, "taskmaster_worker_pool", None)
+    if pool is not None:
+        try:
+            # Lets in-flight jobs finish; their leases expire if this times out
+            await asyncio.to_thread(pool.stop, 30)
+        except Exception as e:
+            logger.warning(f"TaskMaster worker pool shutdown failed: {e}")
+        app.state.taskmaster_worker_pool = None
+
+    try:
+        from services.workflow import shutdown_step_executor  # noqa: E402
+
+        # Queued workflow steps are dropped and marked interrupted; running ones
+        # finish in the background
+        shutdown_step_executor(wait=False)
+    except Exception as e:
+        logger.warning(f"Workflow step executor shutdown failed: {e}")
+
+    try:
+        from utils.pdf_pages import shutdown_pdf_page_pool  # noqa: E402
+
+        shutdown_pdf_page_pool(wait=False)
+    except Exception as e:
+        logger.warning(f"PDF page pool shutdown failed: {e}")
+
+    try:
+        from utils.ocr_pages import shutdown_ocr_pool  # noqa: E402
+
+        shutdown_ocr_pool(wait=False)
+    except Exception as e:
+        logger.warning(f"OCR pool shutdown failed: {e}")
+
+    dispatcher = getattr(app.state, "workflow_webhook_dispatcher", None)
+    if dispatcher is not None:
+        try:
+            await dispatcher.stop(10)
+        except Exception as e:
+            logger.warning(f"Workflow webhook dispatcher shutdown failed: {e}")
+        app.state.workflow_webhook_dispatcher = None
+
     services = getattr(app.state, "services", None)
     if services and hasattr(services, "shutdown"):
         try:
             await services.shutdown()
         except Exception as e:
             logger.warning(f"Service container shutdown failed: {e}")
+
+    try:
+        from mem_db.knowledge import close_knowledge_manager  # noqa: E402
+
+        await close_knowledge_manager()
+    except Exception as e:
+        logger.warning(f"Knowledge manager shutdown failed: {e}")
     app.state.agent_manager = None
 
 
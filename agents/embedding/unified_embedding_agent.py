@@ -24,7 +24,7 @@ from dataclasses import dataclass, field  # noqa: E402
 from datetime import datetime, timezone  # noqa: E402
 from enum import Enum  # noqa: E402
 from pathlib import Path  # noqa: E402
-from typing import Any, Dict, List, Optional  # noqa: E402
+from typing import Any, Dict, List, Optional, Tuple  # noqa: E402
 
 # Core imports
 from config.core.service_container import ServiceContainer  # noqa: E402
@@ -39,6 +39,13 @@ except ImportError:
     NUMPY_AVAILABLE = False
     np = None
 
+try:
+    from mem_db.embedding_cache import EmbeddingCacheStore  # noqa: E402
+
+    EMBEDDING_CACHE_AVAILABLE = True
+except ImportError:
+    EMBEDDING_CACHE_AVAILABLE = False
+
 try:
     from sentence_transformers import SentenceTransformer  # noqa: E402
 
@@ -194,10 +201,11 @@ class UnifiedEmbeddingAgent(BaseAgent):
         self._cache_hits = 0
         self._cache_misses = 0
 
-        # Cache setup
-        if self.config.enable_caching:
+        # Cache setup: vectors keyed by text+model hash in a memory-mapped store
+        self._embedding_cache: Optional[EmbeddingCacheStore] = None
+        if self.config.enable_caching and EMBEDDING_CACHE_AVAILABLE:
             self.config.cache_dir.mkdir(parents=True, exist_ok=True)
-            self._embedding_cache: Dict[str, EmbeddingResult] = {}
+            self._embedding_cache = EmbeddingCacheStore(self.config.cache_dir / "vectors")
 
         self.logger.info(
             f"Initialized {self.agent_name} with model {self.config.model.value}"
@@ -327,56 +335,31 @@ class UnifiedEmbeddingAgent(BaseAgent):
             raise RuntimeError(f"Failed to connect to Memgraph: {e}") from e
 
     async def _load_cache(self):
-        """Load embedding cache from disk."""
+        """Migrate a legacy JSON embedding cache into the vector cache store."""
         cache_file = self.config.cache_dir / "embedding_cache.json"
-        if cache_file.exists():
+        if self._embedding_cache is not None and cache_file.exists():
             try:
                 with open(cache_file, "r") as f:
                     cache_data = json.load(f)
 
-                for key, data in cache_data.items():
-                    # Reconstruct numpy array
-                    if NUMPY_AVAILABLE and data.get("embedding"):
-                        data["embedding"] = np.array(data["embedding"])
-
-                    self._embedding_cache[key] = EmbeddingResult(**data)
-
-                self.logger.info(
-                    f"Loaded {len(self._embedding_cache)} cached embeddings"
+                self._embedding_cache.put_many(
+                    (key, np.asarray(data["embedding"], dtype=np.float32))
+                    for key, data in cache_data.items()
+                    if data.get("embedding")
                 )
+                cache_file.rename(cache_file.with_suffix(".json.migrated"))
+                self.logger.info(f"Migrated {len(cache_data)} cached embeddings")
 
             except Exception as e:
                 self.logger.warning(f"Failed to load embedding cache: {e}")
 
     async def _save_cache(self):
-        """Save embedding cache to disk."""
-        if not self.config.enable_caching:
+        """Flush buffered cache index updates to disk."""
+        if self._embedding_cache is None:
             return
 
         try:
-            cache_file = self.config.cache_dir / "embedding_cache.json"
-            cache_data = {}
-
-            for key, result in self._embedding_cache.items():
-                data = {
-                    "text": result.text,
-                    "embedding": result.embedding.tolist() if NUMPY_AVAILABLE else None,
-                    "model_used": result.model_used,
-                    "dimension": result.dimension,
-                    "processing_time": result.processing_time,
-                    "confidence_score": result.confidence_score,
-                    "entity_id": result.entity_id,
-                    "graph_node_id": result.graph_node_id,
-                    "relationships": result.relationships,
-                    "metadata": result.metadata,
-                }
-                cache_data[key] = data
-
-            with open(cache_file, "w") as f:
-                json.dump(cache_data, f)
-
-            self.logger.debug(f"Saved {len(cache_data)} embeddings to cache")
-
+            self._embedding_cache.flush()
         except Exception as e:
             self.logger.warning(f"Failed to save embedding cache: {e}")
 
@@ -384,16 +367,54 @@ class UnifiedEmbeddingAgent(BaseAgent):
         self, text: str, entity_id: Optional[str] = None
     ) -> EmbeddingResult:
         """Generate embedding for text with optional entity tracking."""
+        result, generated = await self._embed_one(text, entity_id)
+
+        # Store in vector store if available
+        if generated and self._vector_store:
+            await self._store_in_vector_store(result)
+        return result
+
+    async def embed_texts(
+        self, texts: List[str], entity_ids: Optional[List[Optional[str]]] = None
+    ) -> List[EmbeddingResult]:
+        """Embed several texts and store the new embeddings in one batch."""
+        entity_ids = entity_ids or [None] * len(texts)
+        results: List[EmbeddingResult] = []
+        generated: List[EmbeddingResult] = []
+        for text, entity_id in zip(texts, entity_ids):
+            result, is_new = await self._embed_one(text, entity_id)
+            results.append(result)
+            if is_new:
+                generated.append(result)
+
+        if generated and self._vector_store:
+            await self._store_batch_in_vector_store(generated)
+        return results
+
+    async def _embed_one(
+        self, text: str, entity_id: Optional[str] = None
+    ) -> Tuple[EmbeddingResult, bool]:
+        """Return the embedding for ``text`` and whether it was newly generated."""
         start_time = time.time()
 
         # Check cache first
         cache_key = self._generate_cache_key(text, self.config.model.value)
-        if self.config.enable_caching and cache_key in self._embedding_cache:
+        cached = (
+            self._embedding_cache.get(cache_key)
+            if self._embedding_cache is not None
+            else None
+        )
+        if cached is not None:
             self._cache_hits += 1
-            result = self._embedding_cache[cache_key]
-            if entity_id:
-                result.entity_id = entity_id
-            return result
+            result = EmbeddingResult(
+                text=text,
+                embedding=cached,
+                model_used=self.config.model.value,
+                dimension=len(cached),
+                processing_time=0.0,
+                entity_id=entity_id,
+            )
+            return result, False
 
         self._cache_misses += 1
 
@@ -421,17 +442,13 @@ class UnifiedEmbeddingAgent(BaseAgent):
             )
 
             # Cache result
-            if self.config.enable_caching:
-                self._embedding_cache[cache_key] = result
-
-            # Store in vector store if available
-            if self._vector_store:
-                await self._store_in_vector_store(result)
+            if self._embedding_cache is not None and embedding is not None:
+                self._embedding_cache.put(cache_key, embedding)
 
             self.logger.debug(
                 f"Generated embedding for text (dim={result.dimension}, time={processing_time:.3f}s)"
             )
-            return result
+            return result, True
 
         except Exception as e:
             self.logger.error(f"Failed to generate embedding: {e}")
@@ -490,34 +507,57 @@ class UnifiedEmbeddingAgent(BaseAgent):
 
     async def _store_in_vector_store(self, result: EmbeddingResult):
         """Store embedding in vector store."""
+        await self._store_batch_in_vector_store([result])
+
+    async def _store_batch_in_vector_store(self, results: List[EmbeddingResult]):
+        """Store embeddings in the vector store with one batched write."""
         try:
-            if hasattr(self._vector_store, "add_document"):
-                # Unified vector store
-                await self._vector_store.add_document(
-                    content=result.text,
-                    embedding=result.embedding,
-                    metadata={
-                        "entity_id": result.entity_id,
-                        "model_used": result.model_used,
-                        "processing_time": result.processing_time,
-                        **result.metadata,
-                    },
+            metadatas = [
+                {
+                    "entity_id": result.entity_id,
+                    "model_used": result.model_used,
+                    "processing_time": result.processing_time,
+                    **result.metadata,
+                }
+                for result in results
+            ]
+            if hasattr(self._vector_store, "add_documents"):
+                # Unified vector store: one FAISS add and one SQLite transaction
+                await self._vector_store.add_documents(
+                    contents=[result.text for result in results],
+                    embeddings=np.vstack(
+                        [np.asarray(r.embedding, dtype=np.float32).ravel() for r in results]
+                    ),
+                    metadatas=metadatas,
                     document_type="embedding",
-                    importance_score=result.confidence_score,
+                    importance_score=[result.confidence_score for result in results],
                 )
+            elif hasattr(self._vector_store, "add_document"):
+                for result, metadata in zip(results, metadatas):
+                    await self._vector_store.add_document(
+                        content=result.text,
+                        embedding=result.embedding,
+                        metadata=metadata,
+                        document_type="embedding",
+                        importance_score=result.confidence_score,
+                    )
             elif hasattr(self._vector_store, "upsert"):
                 # ChromaDB
                 self._vector_store.upsert(
-                    documents=[result.text],
-                    embeddings=[result.embedding.tolist()],
+                    documents=[result.text for result in results],
+                    embeddings=[result.embedding.tolist() for result in results],
                     metadatas=[
                         {
                             "entity_id": result.entity_id,
                             "model_used": result.model_used,
                             **result.metadata,
                         }
+                        for result in results
+                    ],
+                    ids=[
+                        result.entity_id or f"emb_{hash(result.text)}"
+                        for result in results
                     ],
-                    ids=[result.entity_id or f"emb_{hash(result.text)}"],
                 )
 
         except Exception as e:
@@ -741,7 +781,7 @@ class UnifiedEmbeddingAgent(BaseAgent):
             "cache_hit_rate": self._cache_hits
             / max(1, self._cache_hits + self._cache_misses),
             "cached_embeddings": (
-                len(self._embedding_cache) if self.config.enable_caching else 0
+                len(self._embedding_cache) if self._embedding_cache is not None else 0
             ),
             # Timing stats
             "total_embeddings": len(self._embedding_times),
@@ -767,7 +807,7 @@ class UnifiedEmbeddingAgent(BaseAgent):
             "embedding_models_loaded": len(self._embedding_models) > 0,
             "vector_store_available": self._vector_store is not None,
             "memgraph_connected": self._memgraph_connection is not None,
-            "cache_operational": self.config.enable_caching,
+            "cache_operational": self._embedding_cache is not None,
         }
 
         try:
@@ -823,6 +863,24 @@ class UnifiedEmbeddingAgent(BaseAgent):
                 "metadata": metadata,
             }
 
+        elif task_type == "embed_texts":
+            results = await self.embed_texts(
+                task_data.get("texts", []), task_data.get("entity_ids")
+            )
+
+            return {
+                "success": True,
+                "result": {
+                    "embeddings": [
+                        r.embedding.tolist() if NUMPY_AVAILABLE else [] for r in results
+                    ],
+                    "dimension": results[0].dimension if results else 0,
+                    "model_used": self.config.model.value,
+                    "entity_ids": [r.entity_id for r in results],
+                },
+                "metadata": metadata,
+            }
+
         elif task_type == "embed_entities_to_graph":
             entities = task_data.get("entities", [])
             graph_node_ids = await self.embed_entities_to_graph(entities)
@@ -861,8 +919,10 @@ class UnifiedEmbeddingAgent(BaseAgent):
     async def cleanup(self):
         """Cleanup resources."""
         # Save cache
-        if self.config.enable_caching:
+        if self._embedding_cache is not None:
             await self._save_cache()
+            self._embedding_cache.close()
+            self._embedding_cache = None
 
         # Close Memgraph connection
         if self._memgraph_connection:
@@ -25,11 +25,13 @@ Consolidates functionality from:
 - document_processor_full.py (comprehensive format support)
 """
 
+import asyncio
 import hashlib
 import logging  # noqa: E402
 import mimetypes  # noqa: E402
 import os  # noqa: E402
 import tempfile  # noqa: E402
+from concurrent.futures import BrokenExecutor  # noqa: E402
 from dataclasses import dataclass, field  # noqa: E402
 from datetime import datetime  # noqa: E402
 from pathlib import Path  # noqa: E402
@@ -41,6 +43,14 @@ from core.container.service_container_impl import ProductionServiceContainer  #
 # These are placeholder imports for the example. Replace with your actual project structure.
 from agents.base import BaseAgent  # noqa: E402
 from agents.base.agent_mixins import DocumentProcessingMixin, LegalMemoryMixin  # noqa: E402
+from mem_db.page_text_cache import get_page_text_cache  # noqa: E402
+from utils.pdf_pages import (  # noqa: E402
+    PDF_PAGE_WORKERS,
+    extract_page_range,
+    get_pdf_page_pool,
+    page_shards,
+    shutdown_pdf_page_pool,
+)
 
 if TYPE_CHECKING:
     from mem_db.memory.memory_interfaces import MemoryType
@@ -137,6 +147,38 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Page cache namespace for pypdf text; bump when extraction output changes
+PDF_TEXT_EXTRACTOR = "pypdf-text-v1"
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_pdf_metadata(file_path: Path) -> Dict[str, Any]:
+    from pypdf import PdfReader  # type: ignore
+
+    reader = PdfReader(str(file_path))
+    return {
+        "title": getattr(reader.metadata, "title", None) if reader.metadata else None,
+        "author": getattr(reader.metadata, "author", None) if reader.metadata else None,
+        "producer": getattr(reader.metadata, "producer", None)
+        if reader.metadata
+        else None,
+        "creator": getattr(reader.metadata, "creator", None)
+        if reader.metadata
+        else None,
+        "subject": getattr(reader.metadata, "subject", None)
+        if reader.metadata
+        else None,
+        "page_count": len(reader.pages),
+        "encrypted": bool(getattr(reader, "is_encrypted", False)),
+    }
+
 
 class ProcessingStrategy:
     """Document processing strategy enumeration"""
@@ -228,6 +270,10 @@ class DocumentProcessingConfig:
     )
     ocr_language: str = "eng"
     extract_images_from_pdf: bool = False  # Feature flag for image extraction
+    pdf_page_workers: int = PDF_PAGE_WORKERS  # Processes extracting PDF page shards
+    pdf_pages_per_shard: int = 25  # Minimum shard size
+    pdf_parallel_min_pages: int = 32  # Fewer uncached pages are extracted in one thread
+    pdf_page_cache_path: Optional[Path] = Path("storage/page_text_cache/pages.db")
     enable_multimodal: bool = True
     enable_structured_data: bool = True
     whisper_model: str = "base"  # Whisper model for audio transcription
@@ -682,29 +728,104 @@ class DocumentProcessor(BaseAgent, DocumentProcessingMixin, LegalMemoryMixin):
     # --- File Type Handlers ---
 
     async def _process_pdf(self, file_path: Path) -> tuple:
-        """Process PDF using pypdf."""
+        """Process PDF using pypdf, page shards in parallel, reusing cached pages."""
         if not PYPDF_AVAILABLE:
             raise RuntimeError("pypdf is required for PDF processing.")
-        from pypdf import PdfReader  # type: ignore
 
-        reader = PdfReader(str(file_path))
-        metadata = {
-            "title": getattr(reader.metadata, "title", None) if reader.metadata else None,
-            "author": getattr(reader.metadata, "author", None) if reader.metadata else None,
-            "producer": getattr(reader.metadata, "producer", None) if reader.metadata else None,
-            "creator": getattr(reader.metadata, "creator", None) if reader.metadata else None,
-            "subject": getattr(reader.metadata, "subject", None) if reader.metadata else None,
-            "page_count": len(reader.pages),
-            "encrypted": bool(getattr(reader, "is_encrypted", False)),
-        }
+        metadata = await asyncio.to_thread(_read_pdf_metadata, file_path)
+        page_texts = await self._extract_pdf_pages(
+            file_path, metadata["page_count"], metadata
+        )
         parts = []
-        for i, page in enumerate(reader.pages):
-            txt = (page.extract_text() or "").strip()
+        for page_no in sorted(page_texts):
+            txt = page_texts[page_no]
             if txt:
-                parts.append(f"\n--- Page {i + 1} ---\n{txt}")
+                parts.append(f"\n--- Page {page_no} ---\n{txt}")
         content = "\n".join(parts).strip()
         return content, metadata, None, None, "pypdf"
 
+    async def _extract_pdf_pages(
+        self, file_path: Path, page_count: int, metadata: Dict[str, Any]
+    ) -> Dict[int, str]:
+        """Text of every page, from the page cache where possible.
+
+        Uncached pages are split into a few page ranges per worker (at least
+        ``pdf_pages_per_shard`` pages each) and extracted on the process pool;
+        each shard is cached as soon as it finishes, so an interrupted run
+        keeps its progress.
+        """
+        sha256 = await asyncio.to_thread(_file_sha256, file_path)
+        cache = (
+            get_page_text_cache(self.config.pdf_page_cache_path)
+            if self.config.pdf_page_cache_path
+            else None
+        )
+        pages = list(range(1, page_count + 1))
+        texts: Dict[int, str] = {}
+        if cache is not None:
+            texts.update(
+                await asyncio.to_thread(
+                    cache.get_pages, sha256, pages, extractor=PDF_TEXT_EXTRACTOR
+                )
+            )
+        missing = [p for p in pages if p not in texts]
+        workers = max(1, int(self.config.pdf_page_workers))
+        # Every shard re-parses the file, so use a few shards per worker, not many
+        shards = page_shards(
+            missing,
+            max(self.config.pdf_pages_per_shard, -(-len(missing) // (workers * 2))),
+        )
+        metadata.update(
+            {
+                "sha256": sha256,
+                "page_cache_hits": len(texts),
+                "pages_extracted": len(missing),
+            }
+        )
+
+        async def _store(rows: List[Any]) -> None:
+            texts.update(rows)
+            if cache is not None:
+                await asyncio.to_thread(
+                    cache.put_pages, sha256, rows, extractor=PDF_TEXT_EXTRACTOR
+                )
+
+        if not missing:
+            return texts
+        if len(missing) < self.config.pdf_parallel_min_pages or workers <= 1:
+            await _store(
+                await asyncio.to_thread(extract_page_range, str(file_path), missing)
+            )
+            return texts
+
+        loop = asyncio.get_running_loop()
+        try:
+            pool = get_pdf_page_pool(workers)
+            futures = [
+                loop.run_in_executor(pool, extract_page_range, str(file_path), shard)
+                for shard in shards
+            ]
+            try:
+                for next_done in asyncio.as_completed(futures):
+                    await _store(await next_done)
+            finally:
+                # After a failure, drop queued shards and collect the rest's outcome
+                for fut in futures:
+                    fut.cancel()
+                await asyncio.gather(*futures, return_exceptions=True)
+            metadata["extraction_shards"] = len(shards)
+        except (BrokenExecutor, OSError) as e:
+            logger.warning(
+                f"PDF page pool unavailable ({e}); "
+                f"extracting {file_path.name} in-process"
+            )
+            shutdown_pdf_page_pool(wait=False)
+            remaining = [p for p in missing if p not in texts]
+            await _store(
+                await asyncio.to_thread(extract_page_range, str(file_path), remaining)
+            )
+        return texts
+
     async def _process_docx(self, file_path: Path) -> tuple:
         if file_path.suffix.lower() == ".doc":
             logger.warning(
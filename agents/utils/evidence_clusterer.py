@@ -1,27 +1,149 @@
 import sys
 import os
 import json
+import tempfile
+import threading
 from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import numpy as np
-from sklearn.cluster import KMeans
-import torch
-from transformers import AutoTokenizer, AutoModel
-import torch.nn.functional as F
-import nltk
-from nltk.tokenize import sent_tokenize
-
-# Ensure NLTK data is present for sentence splitting
+from sklearn.cluster import KMeans, MiniBatchKMeans
+
+try:
+    import torch
+    from transformers import AutoTokenizer, AutoModel
+    import torch.nn.functional as F
+    TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    TRANSFORMERS_AVAILABLE = False
+
 try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+    import nltk
+    from nltk.tokenize import sent_tokenize
+
+    # Ensure NLTK data is present for sentence splitting
+    try:
+        nltk.data.find('tokenizers/punkt')
+    except LookupError:
+        nltk.download('punkt', quiet=True)
+    NLTK_AVAILABLE = True
+except ImportError:
+    NLTK_AVAILABLE = False
 
 # Add project root to path
 root = Path(__file__).resolve().parents[2]
 sys.path.append(str(root))
 
+# Sentences per forward pass; peak memory is batch_size x longest sentence in the batch
+DEFAULT_BATCH_SIZE = int(os.getenv("EVIDENCE_CLUSTER_BATCH_SIZE", "64"))
+# torch intra-op threads for encoding (0 keeps the torch default)
+DEFAULT_NUM_THREADS = int(os.getenv("EVIDENCE_CLUSTER_THREADS", "0"))
+DEFAULT_MAX_LENGTH = int(os.getenv("EVIDENCE_CLUSTER_MAX_LENGTH", "256"))
+# "reservoir": KMeans on a uniform sample, then assign everything.
+# "minibatch": MiniBatchKMeans.partial_fit on every encoded batch.
+DEFAULT_CLUSTER_METHOD = os.getenv("EVIDENCE_CLUSTER_METHOD", "reservoir")
+DEFAULT_SAMPLE_SIZE = int(os.getenv("EVIDENCE_CLUSTER_SAMPLE_SIZE", "50000"))
+
+ProgressCallback = Callable[[int, int], None]
+EmbeddingBatch = Tuple[np.ndarray, np.ndarray]
+
+
+def cluster_embedding_batches(
+    batches: Iterable[EmbeddingBatch],
+    total: int,
+    num_clusters: int,
+    method: str = DEFAULT_CLUSTER_METHOD,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    random_state: int = 42,
+    assign_chunk: int = 8192,
+) -> np.ndarray:
+    """Cluster a stream of ``(row_indices, embeddings)`` batches.
+
+    Embeddings are spilled to a temporary on-disk array as they arrive, so RAM
+    holds one batch plus either the reservoir sample or the MiniBatchKMeans
+    centroids. Labels for all ``total`` rows are assigned in chunks afterwards.
+    """
+    if method not in ("reservoir", "minibatch"):
+        raise ValueError(f"Unknown clustering method: {method}")
+    rng = np.random.default_rng(random_state)
+    labels = np.zeros(total, dtype=np.int32)
+    if total == 0:
+        return labels
+
+    with tempfile.TemporaryDirectory(prefix="evidence_clusters_") as tmp:
+        spill = None
+        reservoir = None
+        seen = 0
+        model = None
+        pending: List[np.ndarray] = []
+        pending_rows = 0
+        if method == "minibatch":
+            model = MiniBatchKMeans(
+                n_clusters=num_clusters, random_state=random_state, n_init=3
+            )
+
+        for indices, embeddings in batches:
+            if spill is None:
+                spill = np.lib.format.open_memmap(
+                    os.path.join(tmp, "embeddings.npy"),
+                    mode="w+",
+                    dtype=np.float32,
+                    shape=(total, embeddings.shape[1]),
+                )
+            spill[indices] = embeddings
+
+            if model is not None:
+                # partial_fit needs at least num_clusters rows per call
+                pending.append(embeddings)
+                pending_rows += len(embeddings)
+                if pending_rows >= num_clusters:
+                    model.partial_fit(np.vstack(pending))
+                    pending, pending_rows = [], 0
+                continue
+
+            # Algorithm R over the stream, vectorised per batch
+            if reservoir is None:
+                reservoir = np.empty((min(sample_size, total), embeddings.shape[1]), dtype=np.float32)
+            positions = np.arange(seen, seen + len(embeddings))
+            fill = positions < len(reservoir)
+            reservoir[positions[fill]] = embeddings[fill]
+            slots = rng.integers(0, positions[~fill] + 1) if (~fill).any() else np.empty(0, dtype=np.int64)
+            keep = slots < len(reservoir)
+            reservoir[slots[keep]] = embeddings[~fill][keep]
+            seen += len(embeddings)
+
+        if model is not None:
+            if pending:
+                model.partial_fit(np.vstack(pending))
+        else:
+            model = KMeans(n_clusters=num_clusters, random_state=random_state, n_init='auto')
+            model.fit(reservoir[:min(seen, len(reservoir))])
+
+        for start in range(0, total, assign_chunk):
+            stop = min(start + assign_chunk, total)
+            labels[start:stop] = model.predict(np.asarray(spill[start:stop]))
+        del spill
+    return labels
+
+
 class EvidenceClusterer:
-    def __init__(self, model_name="all-minilm-L6-v2"):
+    def __init__(
+        self,
+        model_name="all-minilm-L6-v2",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        num_threads: int = DEFAULT_NUM_THREADS,
+        max_length: int = DEFAULT_MAX_LENGTH,
+    ):
+        if not TRANSFORMERS_AVAILABLE:
+            raise ImportError("EvidenceClusterer requires torch and transformers")
+        self.batch_size = max(1, batch_size)
+        self.max_length = max_length
+        # Shared instances are called from several worker threads at once; the
+        # fast tokenizer is not thread-safe ("Already borrowed"), so a batch is
+        # tokenized and run through the model under one lock.
+        self._encode_lock = threading.Lock()
+        if num_threads > 0:
+            torch.set_num_threads(num_threads)
+
         # Resolve local path
         self.model_path = root / "models" / model_name
         if not self.model_path.exists():
@@ -33,51 +155,118 @@ class EvidenceClusterer:
             # Load locally from your files
             self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_path))
             self.model = AutoModel.from_pretrained(str(self.model_path))
-        
+
         self.model.eval()
 
     def _mean_pooling(self, model_output, attention_mask):
-        token_embeddings = model_output[0] 
+        token_embeddings = model_output[0]
         input_mask_expanded = attention_mask.unsqueeze(-1).expand(token_embeddings.size()).float()
         return torch.sum(token_embeddings * input_mask_expanded, 1) / torch.clamp(input_mask_expanded.sum(1), min=1e-9)
 
-    def get_embeddings(self, sentences):
-        """Generate high-fidelity embeddings using manual pooling."""
-        encoded_input = self.tokenizer(sentences, padding=True, truncation=True, return_tensors='pt')
-        with torch.no_grad():
-            model_output = self.model(**encoded_input)
-        
+    def _encode(self, sentences: List[str]) -> np.ndarray:
+        with self._encode_lock:
+            encoded_input = self.tokenizer(
+                sentences, padding=True, truncation=True, max_length=self.max_length, return_tensors='pt'
+            )
+            with torch.no_grad():
+                model_output = self.model(**encoded_input)
+
         sentence_embeddings = self._mean_pooling(model_output, encoded_input['attention_mask'])
         sentence_embeddings = F.normalize(sentence_embeddings, p=2, dim=1)
         return sentence_embeddings.numpy()
 
-    def cluster_document(self, text, num_clusters=3):
+    def iter_embeddings(
+        self,
+        sentences: List[str],
+        batch_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Iterator[EmbeddingBatch]:
+        """Yield ``(row_indices, embeddings)`` in length-bucketed mini-batches.
+
+        Sorting by length keeps similarly sized sentences together, so each
+        batch pads to a short maximum instead of the corpus-wide longest one.
+        """
+        batch_size = batch_size or self.batch_size
+        order = np.argsort(np.fromiter((len(s) for s in sentences), dtype=np.int64, count=len(sentences)), kind="stable")
+        done = 0
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            yield indices, self._encode([sentences[i] for i in indices])
+            done += len(indices)
+            if progress:
+                progress(done, len(order))
+
+    def get_embeddings(self, sentences, batch_size: Optional[int] = None, progress: Optional[ProgressCallback] = None):
+        """Generate high-fidelity embeddings using manual pooling, in input order."""
+        embeddings = None
+        for indices, batch in self.iter_embeddings(sentences, batch_size, progress):
+            if embeddings is None:
+                embeddings = np.empty((len(sentences), batch.shape[1]), dtype=np.float32)
+            embeddings[indices] = batch
+        if embeddings is None:
+            return np.empty((0, self.model.config.hidden_size), dtype=np.float32)
+        return embeddings
+
+    @staticmethod
+    def split_sentences(text: str) -> List[str]:
+        raw_sentences = sent_tokenize(text) if NLTK_AVAILABLE else text.splitlines()
+        return [s.strip() for s in raw_sentences if len(s.strip()) > 25]
+
+    def cluster_sentences(
+        self,
+        sentences: List[str],
+        num_clusters: int = 3,
+        method: str = DEFAULT_CLUSTER_METHOD,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        batch_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> np.ndarray:
+        """Encode and cluster sentences with bounded memory; returns one label per sentence."""
+        num_clusters = max(1, min(num_clusters, len(sentences)))
+        return cluster_embedding_batches(
+            self.iter_embeddings(sentences, batch_size, progress),
+            total=len(sentences),
+            num_clusters=num_clusters,
+            method=method,
+            sample_size=sample_size,
+        )
+
+    @staticmethod
+    def group_by_label(sentences: List[str], labels: np.ndarray) -> Dict[int, List[str]]:
+        clusters: Dict[int, List[str]] = {}
+        for sentence, label in zip(sentences, labels):
+            clusters.setdefault(int(label), []).append(sentence)
+        return clusters
+
+    def cluster_document(self, text, num_clusters=3, progress: Optional[ProgressCallback] = None):
         """Split text into sentences and group them by semantic similarity."""
         # 1. Tokenize into sentences
-        raw_sentences = sent_tokenize(text)
-        sentences = [s.strip() for s in raw_sentences if len(s.strip()) > 25] 
-        
+        sentences = self.split_sentences(text)
+
         if len(sentences) < num_clusters:
             num_clusters = max(1, len(sentences))
 
         print(f"Processing {len(sentences)} sentences into {num_clusters} semantic clusters...")
+        if not sentences:
+            return {}
 
-        # 2. Generate Embeddings
-        embeddings = self.get_embeddings(sentences)
+        # 2. Embed in mini-batches and cluster
+        labels = self.cluster_sentences(sentences, num_clusters=num_clusters, progress=progress)
 
-        # 3. Perform KMeans Clustering
-        kmeans = KMeans(n_clusters=num_clusters, random_state=42, n_init='auto')
-        kmeans.fit(embeddings)
-        labels = kmeans.labels_
+        # 3. Group results
+        return self.group_by_label(sentences, labels)
 
-        # 4. Group results
-        clusters = {}
-        for i, label in enumerate(labels):
-            if label not in clusters:
-                clusters[label] = []
-            clusters[label].append(sentences[i])
+_shared_clusterers: Dict[str, EvidenceClusterer] = {}
+_shared_lock = threading.Lock()
 
-        return clusters
+
+def get_shared_clusterer(model_name: str = "all-minilm-L6-v2") -> EvidenceClusterer:
+    """Process-wide warm clusterer; transformer weights load once per model."""
+    with _shared_lock:
+        clusterer = _shared_clusterers.get(model_name)
+        if clusterer is None:
+            clusterer = _shared_clusterers[model_name] = EvidenceClusterer(model_name)
+        return clusterer
 
 def main():
     # High-Resolution Test Case: Mixed Legal Scenarios
@@ -2,23 +2,88 @@ from __future__ import annotations
 
 import asyncio
 import os
-from typing import Any
+from typing import Any, Callable, Optional
 
 
-async def taskmaster_scheduler_loop(*, logger: Any) -> None:
-    """Run due TaskMaster schedules periodically with bounded per-tick throughput."""
+async def taskmaster_scheduler_loop(
+    *, logger: Any, on_enqueued: Optional[Callable[[int], None]] = None
+) -> None:
+    """Enqueue due TaskMaster schedules periodically; workers run the jobs.
+
+    The database work runs in the default executor, so request handling on
+    the event loop never waits on a scheduler tick.
+    """
     from mem_db.database import get_database_manager
     from services.taskmaster_service import TaskMasterService
 
     interval = int(os.getenv("TASKMASTER_SCHEDULER_INTERVAL_SECONDS", "60"))
-    max_due = int(os.getenv("TASKMASTER_SCHEDULER_MAX_DUE_PER_TICK", "2"))
+    max_due = int(os.getenv("TASKMASTER_SCHEDULER_MAX_DUE_PER_TICK", "100"))
     while True:
         try:
-            db = get_database_manager()
-            svc = TaskMasterService(db)
-            svc.run_due_schedules(max_due=max_due)
+            svc = await asyncio.to_thread(
+                lambda: TaskMasterService(get_database_manager())
+            )
+            while True:
+                out = await asyncio.to_thread(
+                    svc.enqueue_due_schedules, max_due=max_due
+                )
+                if out["due"] and on_enqueued is not None:
+                    on_enqueued(out["due"])
+                # A full batch means more may be due; drain without waiting an interval
+                if out["due"] < out["max_due"]:
+                    break
         except asyncio.CancelledError:
             raise
         except Exception as e:
             logger.warning("TaskMaster scheduler tick failed: %s", e)
         await asyncio.sleep(max(10, interval))
+
+
+def start_taskmaster_worker_pool(*, logger: Any):
+    """Start the TaskMaster queue worker pool; ``TASKMASTER_WORKERS=0`` disables it."""
+    from mem_db.database import get_database_manager
+    from services.taskmaster_worker_pool import TaskMasterWorkerPool
+
+    workers = int(os.getenv("TASKMASTER_WORKERS", "2"))
+    if workers <= 0:
+        logger.info("TaskMaster worker pool disabled (TASKMASTER_WORKERS=%s)", workers)
+        return None
+    pool = TaskMasterWorkerPool(get_database_manager(), workers=workers)
+    pool.start()
+    return pool
+
+
+def recover_interrupted_workflow_steps(*, logger: Any) -> int:
+    """Mark workflow steps a previous process left queued or running as interrupted."""
+    from mem_db.database import get_database_manager
+    from services.workflow import recover_interrupted_steps
+
+    recovered = recover_interrupted_steps(get_database_manager())
+    if recovered:
+        logger.warning("Marked %s orphaned workflow step(s) as interrupted", recovered)
+    return recovered
+
+
+def start_workflow_webhook_dispatcher(*, logger: Any):
+    """Start draining the workflow webhook outbox.
+
+    ``WORKFLOW_WEBHOOK_DISPATCHER=0`` disables it.
+    """
+    from mem_db.database import get_database_manager
+    from services.workflow import record_webhook_delivery
+    from services.workflow_webhook_dispatcher import WorkflowWebhookDispatcher
+
+    if str(os.getenv("WORKFLOW_WEBHOOK_DISPATCHER", "1")).strip().lower() in {
+        "0",
+        "false",
+        "no",
+        "off",
+    }:
+        logger.info("Workflow webhook dispatcher disabled")
+        return None
+    db = get_database_manager()
+    dispatcher = WorkflowWebhookDispatcher(
+        db, on_result=lambda outcome: record_webhook_delivery(db, outcome)
+    )
+    dispatcher.start()
+    return dispatcher
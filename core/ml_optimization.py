@@ -22,6 +22,8 @@ from pathlib import Path
 from datetime import datetime
 import numpy as np
 
+from mem_db.embedding_cache import EmbeddingCacheStore
+
 try:
     import faiss
     FAISS_AVAILABLE = True
@@ -53,23 +55,36 @@ class EmbeddingCache:
     """
     Persistent cache for text embeddings to avoid re-computation.
     
-    Uses SHA-256 hashing of text for lookup and pickle for storage.
+    Uses SHA-256 hashing of text for lookup. Vectors live in an append-only,
+    memory-mapped EmbeddingCacheStore, so a put appends one vector instead of
+    re-pickling the whole cache and startup does not load it into RAM.
     """
     
-    def __init__(self, cache_dir: str = "./cache/embeddings"):
+    def __init__(
+        self,
+        cache_dir: str = "./cache/embeddings",
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
         """
         Initialize embedding cache.
         
         Args:
             cache_dir: Directory to store cache files
+            max_entries: Evict least-recently-used entries beyond this count
+            max_bytes: Evict least-recently-used entries beyond this many vector bytes
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.cache_file = self.cache_dir / "embedding_cache.pkl"
         self.metadata_file = self.cache_dir / "cache_metadata.json"
         
-        # Load existing cache
-        self.cache: Dict[str, np.ndarray] = {}
+        limits = {}
+        if max_entries is not None:
+            limits["max_entries"] = max_entries
+        if max_bytes is not None:
+            limits["max_bytes"] = max_bytes
+        self.store = EmbeddingCacheStore(self.cache_dir / "vectors", **limits)
         self.metadata: Dict = {
             "hits": 0,
             "misses": 0,
@@ -81,14 +96,15 @@ class EmbeddingCache:
         self._load_cache()
         
     def _load_cache(self):
-        """Load cache from disk."""
+        """Load cache metadata and migrate a legacy pickle cache if present."""
         if self.cache_file.exists():
             try:
                 with open(self.cache_file, 'rb') as f:
-                    self.cache = pickle.load(f)
+                    legacy = pickle.load(f)
+                self.store.put_many(legacy.items())
+                self.cache_file.rename(self.cache_file.with_suffix(".pkl.migrated"))
             except Exception as e:
-                print(f"Warning: Failed to load cache: {e}")
-                self.cache = {}
+                print(f"Warning: Failed to migrate legacy cache: {e}")
         
         if self.metadata_file.exists():
             try:
@@ -97,16 +113,15 @@ class EmbeddingCache:
             except Exception as e:
                 print(f"Warning: Failed to load metadata: {e}")
         
-        self.metadata["total_entries"] = len(self.cache)
+        self.metadata["total_entries"] = len(self.store)
         
     def _save_cache(self):
-        """Save cache to disk."""
+        """Flush pending index updates and write metadata."""
         try:
-            with open(self.cache_file, 'wb') as f:
-                pickle.dump(self.cache, f)
+            self.store.flush()
             
             self.metadata["last_updated"] = datetime.now().isoformat()
-            self.metadata["total_entries"] = len(self.cache)
+            self.metadata["total_entries"] = len(self.store)
             
             with open(self.metadata_file, 'w') as f:
                 json.dump(self.metadata, f, indent=2)
@@ -127,14 +142,23 @@ class EmbeddingCache:
         Returns:
             Cached embedding or None if not found
         """
-        text_hash = self._get_hash(text)
+        return self.get_many([text])[0]
         
-        if text_hash in self.cache:
-            self.metadata["hits"] += 1
-            return self.cache[text_hash]
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Get embeddings for several texts with one index lookup.
         
-        self.metadata["misses"] += 1
-        return None
+        Args:
+            texts: Input texts
+            
+        Returns:
+            Cached embeddings, None where not found
+        """
+        results = self.store.get_many([self._get_hash(text) for text in texts])
+        hits = sum(1 for result in results if result is not None)
+        self.metadata["hits"] += hits
+        self.metadata["misses"] += len(results) - hits
+        return results
         
     def put(self, text: str, embedding: np.ndarray):
         """
@@ -144,27 +168,39 @@ class EmbeddingCache:
             text: Input text
             embedding: Text embedding vector
         """
-        text_hash = self._get_hash(text)
-        self.cache[text_hash] = embedding
+        self.put_many([text], [embedding])
+        
+    def put_many(self, texts: List[str], embeddings: Union[np.ndarray, List[np.ndarray]]):
+        """
+        Store several embeddings in one append and index transaction.
         
-        # Periodically save cache (every 10 new entries)
-        if len(self.cache) % 10 == 0:
-            self._save_cache()
+        Args:
+            texts: Input texts
+            embeddings: Embedding vectors aligned with texts
+        """
+        self.store.put_many(
+            (self._get_hash(text), embedding) for text, embedding in zip(texts, embeddings)
+        )
             
     def get_stats(self) -> Dict:
         """Get cache statistics."""
         total_requests = self.metadata["hits"] + self.metadata["misses"]
         hit_rate = self.metadata["hits"] / total_requests if total_requests > 0 else 0.0
+        store_stats = self.store.stats()
         
         return {
             **self.metadata,
+            "total_entries": store_stats["entries"],
             "hit_rate": hit_rate,
-            "total_requests": total_requests
+            "total_requests": total_requests,
+            "cache_bytes": store_stats["file_bytes"],
+            "evictions": store_stats["evictions"],
+            "compactions": store_stats["compactions"],
         }
         
     def clear(self):
         """Clear the cache."""
-        self.cache = {}
+        self.store.clear()
         self.metadata["hits"] = 0
         self.metadata["misses"] = 0
         self.metadata["total_entries"] = 0
@@ -174,6 +210,11 @@ class EmbeddingCache:
         """Explicitly save cache to disk."""
         self._save_cache()
 
+    def close(self):
+        """Save metadata and release the underlying store."""
+        self._save_cache()
+        self.store.close()
+
 
 class FAISSSearchEngine:
     """
@@ -536,18 +577,9 @@ class BatchProcessor:
         """
         if use_cache:
             # Check cache first
-            embeddings = []
-            uncached_texts = []
-            uncached_indices = []
-            
-            for i, text in enumerate(texts):
-                cached_emb = self.cache.get(text)
-                if cached_emb is not None:
-                    embeddings.append(cached_emb)
-                else:
-                    embeddings.append(None)
-                    uncached_texts.append(text)
-                    uncached_indices.append(i)
+            embeddings = self.cache.get_many(texts)
+            uncached_indices = [i for i, emb in enumerate(embeddings) if emb is None]
+            uncached_texts = [texts[i] for i in uncached_indices]
             
             # Encode uncached texts
             if uncached_texts:
@@ -559,14 +591,13 @@ class BatchProcessor:
                 )
                 
                 # Store in cache
-                for text, emb in zip(uncached_texts, new_embeddings):
-                    self.cache.put(text, emb)
+                self.cache.put_many(uncached_texts, new_embeddings)
                 
                 # Insert into results
                 for idx, emb in zip(uncached_indices, new_embeddings):
                     embeddings[idx] = emb
             
-            # Save cache periodically
+            # Persist recency updates and hit counters
             self.cache.save()
             
             return np.array(embeddings)
@@ -11,7 +11,7 @@ import json
 import re
 import hashlib
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 try:
     import requests  # noqa: E402
@@ -482,6 +482,21 @@ class ApiClient:
         """Get knowledge entities."""
         return self._make_request("GET", "/knowledge/entities", timeout=10.0)
 
+    def get_knowledge_layout(
+        self,
+        viewport: Tuple[float, float, float, float] = (0.0, 0.0, 1.0, 1.0),
+        max_nodes: int = 2000,
+        since_version: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Fetch the server-side graph layout for a viewport (delta if since_version)."""
+        x0, y0, x1, y1 = viewport
+        params: Dict[str, Any] = {
+            "x0": x0, "y0": y0, "x1": x1, "y1": y1, "max_nodes": int(max_nodes),
+        }
+        if since_version is not None:
+            params["since_version"] = int(since_version)
+        return self._make_request("GET", "/knowledge/layout", timeout=60.0, params=params)
+
     def add_knowledge_entity(self, name: str, entity_type: str) -> Dict[str, Any]:
         """Add a knowledge entity."""
         data = {"name": name, "entity_type": entity_type}
@@ -507,8 +507,26 @@ class KnowledgeGraphTab(BaseTab):
             QMessageBox.critical(self, "Error", f"Reject failed: {e}")
 
     def visualize_graph(self):
-        """Visualize knowledge graph."""
-        QMessageBox.information(self, "Info", "Graph visualization coming soon.")
+        """Visualize knowledge graph from the server-side layout.
+
+        Only the visible viewport is fetched; zooming out shows community
+        super-nodes instead of shipping the whole graph to the client.
+        """
+        try:
+            from PySide6.QtWidgets import QDialog
+            from ..ui.ontology_graph_widget import OntologyGraphWidget
+
+            dialog = QDialog(self)
+            dialog.setWindowTitle("Knowledge Graph")
+            dialog.resize(1200, 800)
+            layout = QVBoxLayout(dialog)
+            widget = OntologyGraphWidget(dialog)
+            layout.addWidget(widget)
+            if hasattr(widget, "mode_combo"):
+                widget.set_layout_source(api_client.get_knowledge_layout)
+            dialog.show()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Visualization failed: {e}")
 
     def clear_graph_results(self):
         """Clear graph results."""
@@ -23,6 +23,7 @@ from ..services import api_client
 from ..core.path_config import resolve_local_model_path
 from ..utils import (
     collect_folder_content,
+    collect_folder_documents,
     extract_content_from_response,
     read_text_file_if_supported,
 )
@@ -303,9 +304,20 @@ class SemanticAnalysisWorker(QThread):
                 resp = api_client.process_document(self.file_path)
                 content = extract_content_from_response(resp)
             
+            folder_documents = None
             if not content and self.folder_path:
                 logger.info(f"[SemanticInfoWorker] Collecting content from folder: {self.folder_path}...")
-                content = _collect_folder_content_utility(self.folder_path, self.isInterruptionRequested)
+                if self.analysis_type == "Strategic Clustering":
+                    # Keep files separate so the corpus is clustered in one embedding pass
+                    folder_documents = collect_folder_documents(
+                        self.folder_path,
+                        process_document_fn=api_client.process_document,
+                        extract_fn=extract_content_from_response,
+                        is_interruption_requested_fn=self.isInterruptionRequested,
+                    )
+                    content = "\n\n".join(folder_documents.values())
+                else:
+                    content = _collect_folder_content_utility(self.folder_path, self.isInterruptionRequested)
             
             if not content:
                 raise RuntimeError("No content to analyze.")
@@ -339,13 +351,16 @@ class SemanticAnalysisWorker(QThread):
                     service = ThematicDiscoveryService(manager)
                     
                     # Run end-to-end audit via the asyncio loop
-                    doc_id = os.path.basename(self.file_path) if self.file_path else "manual_input"
+                    if folder_documents:
+                        coro = service.discover_corpus_themes(
+                            folder_documents, os.path.basename(os.path.normpath(self.folder_path))
+                        )
+                    else:
+                        doc_id = os.path.basename(self.file_path) if self.file_path else "manual_input"
+                        coro = service.discover_strategic_themes(content, doc_id)
                     
                     # Bridge synchronous thread to async coroutine
-                    future = asyncio.run_coroutine_threadsafe(
-                        service.discover_strategic_themes(content, doc_id), 
-                        loop
-                    )
+                    future = asyncio.run_coroutine_threadsafe(coro, loop)
                     results = future.result(timeout=300) # 5 minute timeout for large files
                     
                     self.result_ready.emit({"type": "strategic_discovery", "data": results})
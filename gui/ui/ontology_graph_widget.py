@@ -10,12 +10,14 @@ Features:
 - Interactive: zoom, pan, click nodes for details
 - Filter by entity type, relationship type
 - 3D and 2D visualization modes
+- Server layout mode: positions come from the backend, only the visible
+  viewport is fetched (community super-nodes when zoomed out, deltas on refresh)
 - Export graph data (JSON, GraphML)
 - Search and highlight specific entities
 """
 
 import json
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
 try:
@@ -98,6 +100,15 @@ class OntologyGraphWidget(QWidget):
         self.current_mode = "3D"  # "3D" or "2D"
         self.filtered_types: set = set()  # Types to show (empty = all)
         
+        # Server layout mode state (see set_layout_source)
+        self.layout_source: Optional[Callable[..., Dict[str, Any]]] = None
+        self.max_server_nodes = 2000
+        self.viewport: Tuple[float, float, float, float] = (0.0, 0.0, 1.0, 1.0)
+        self._server_version: Optional[int] = None
+        self._server_level = "nodes"
+        self._server_nodes: Dict[str, Dict] = {}
+        self._server_edges: Dict[str, Dict] = {}
+        
         self._init_ui()
         
     def _show_dependency_error(self, lib_name: str):
@@ -169,6 +180,24 @@ class OntologyGraphWidget(QWidget):
         
         layout.addWidget(self._create_separator())
         
+        # Viewport navigation (server layout mode only)
+        self.nav_buttons = []
+        for text, handler in (
+            ("➕", lambda: self.zoom(0.5)),
+            ("➖", lambda: self.zoom(2.0)),
+            ("◀", lambda: self.pan(-0.25, 0.0)),
+            ("▶", lambda: self.pan(0.25, 0.0)),
+            ("▲", lambda: self.pan(0.0, 0.25)),
+            ("▼", lambda: self.pan(0.0, -0.25)),
+            ("⟲", self.reset_view),
+        ):
+            button = QPushButton(text)
+            button.setMaximumWidth(32)
+            button.clicked.connect(handler)
+            button.setVisible(False)
+            layout.addWidget(button)
+            self.nav_buttons.append(button)
+        
         # Search
         search_label = QLabel("Search:")
         search_label.setStyleSheet("color: white; font-weight: bold;")
@@ -313,8 +342,89 @@ class OntologyGraphWidget(QWidget):
         # Emit signal
         self.graph_updated.emit()
         
+    def set_layout_source(self, fetch: Callable[..., Dict[str, Any]], max_nodes: int = 2000):
+        """
+        Render from a server-side layout instead of laying out locally.
+        
+        Args:
+            fetch: Callable(viewport, max_nodes=..., since_version=...) returning the
+                /knowledge/layout response (e.g. api_client.get_knowledge_layout)
+            max_nodes: Node budget per viewport; the server clusters beyond it
+        """
+        self.layout_source = fetch
+        self.max_server_nodes = max_nodes
+        self._server_version = None
+        if self.mode_combo.findText("Server Layout") < 0:
+            self.mode_combo.addItem("Server Layout")
+        for button in self.nav_buttons:
+            button.setVisible(True)
+        self.mode_combo.setCurrentText("Server Layout")
+        
+    def apply_layout_response(self, response: Dict[str, Any]):
+        """Merge a full or delta layout response into the visible node/edge store."""
+        if not response.get("delta"):
+            self._server_nodes.clear()
+            self._server_edges.clear()
+        for node_id in response.get("removed_nodes", []):
+            self._server_nodes.pop(node_id, None)
+        for key in response.get("removed_edges", []):
+            self._server_edges.pop(key, None)
+        self._server_nodes.update({n["id"]: n for n in response.get("nodes", [])})
+        self._server_edges.update({e["key"]: e for e in response.get("edges", [])})
+        self._server_version = response.get("version")
+        self._server_level = response.get("level", "nodes")
+        
+        # Mirror the visible slice into self.graph for search, details and stats
+        self.graph.clear()
+        for node_id, node in self._server_nodes.items():
+            self.graph.add_node(
+                node_id,
+                label=node.get("label", node_id),
+                entity_type=node.get("type") or "UNKNOWN",
+                metadata={"size": node.get("size"), "community": node.get("community")},
+            )
+        for edge in self._server_edges.values():
+            self.graph.add_edge(edge["source"], edge["target"], weight=edge.get("weight", 1))
+        self._update_statistics()
+        self.graph_updated.emit()
+        
+    def zoom(self, factor: float):
+        """Scale the viewport around its centre (factor < 1 zooms in)."""
+        x0, y0, x1, y1 = self.viewport
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        half = min(max((x1 - x0) * factor / 2, 1e-4), 0.5)
+        self._set_viewport((cx - half, cy - half, cx + half, cy + half))
+        
+    def pan(self, dx: float, dy: float):
+        """Shift the viewport by a fraction of its width/height."""
+        x0, y0, x1, y1 = self.viewport
+        w, h = x1 - x0, y1 - y0
+        self._set_viewport((x0 + dx * w, y0 + dy * h, x1 + dx * w, y1 + dy * h))
+        
+    def reset_view(self):
+        """Show the whole layout again."""
+        self._set_viewport((0.0, 0.0, 1.0, 1.0))
+        
+    def _set_viewport(self, viewport: Tuple[float, float, float, float]):
+        # A new viewport needs a full slice; deltas only apply to the same one.
+        self.viewport = viewport
+        self._server_version = None
+        self.refresh_graph()
+        
+    def _fetch_server_layout(self):
+        """Fetch the visible slice, as a delta when one is already loaded."""
+        response = self.layout_source(
+            self.viewport,
+            max_nodes=self.max_server_nodes,
+            since_version=self._server_version,
+        )
+        self.apply_layout_response(response)
+        
     def refresh_graph(self):
         """Refresh the graph visualization."""
+        if self.current_mode == "Server" and self.layout_source is not None:
+            self._refresh_server_graph()
+            return
         if self.graph.number_of_nodes() == 0:
             self._set_status("No data to display", error=True)
             return
@@ -338,6 +448,94 @@ class OntologyGraphWidget(QWidget):
         except Exception as e:
             self._set_status(f"Error: {str(e)}", error=True)
             
+    def _refresh_server_graph(self):
+        """Fetch and render the current viewport of the server-side layout."""
+        self._set_status("Loading layout...")
+        try:
+            self._fetch_server_layout()
+            html_content = self._generate_server_graph()
+            if WEBENGINE_AVAILABLE:
+                self.graph_view.setHtml(html_content)
+            else:
+                self.graph_view.setHtml(f"<pre>{html_content[:1000]}...</pre>")
+            level = "communities" if self._server_level == "clusters" else "nodes"
+            self._set_status(f"Displaying {len(self._server_nodes)} {level}, "
+                           f"{len(self._server_edges)} edges (layout v{self._server_version})")
+        except Exception as e:
+            self._set_status(f"Error: {str(e)}", error=True)
+            
+    def _generate_server_graph(self) -> str:
+        """Render the visible slice at its server-computed coordinates."""
+        nodes = [
+            n for n in self._server_nodes.values()
+            if not self.filtered_types or n.get("type") in self.filtered_types
+            or n.get("cluster")
+        ]
+        if not nodes:
+            return "<h3>No nodes in this view</h3>"
+        positions = {n["id"]: (n["x"], n["y"]) for n in nodes}
+        
+        edge_x = []
+        edge_y = []
+        for edge in self._server_edges.values():
+            if edge["source"] in positions and edge["target"] in positions:
+                x0, y0 = positions[edge["source"]]
+                x1, y1 = positions[edge["target"]]
+                edge_x.extend([x0, x1, None])
+                edge_y.extend([y0, y1, None])
+        edge_trace = go.Scatter(
+            x=edge_x,
+            y=edge_y,
+            mode='lines',
+            line=dict(color='#95a5a6', width=1),
+            hoverinfo='none',
+            showlegend=False
+        )
+        
+        clustered = self._server_level == "clusters"
+        largest = max(n.get("size") or 0 for n in nodes) or 1
+        node_trace = go.Scatter(
+            x=[n["x"] for n in nodes],
+            y=[n["y"] for n in nodes],
+            mode='markers' if len(nodes) > 300 else 'markers+text',
+            marker=dict(
+                size=[8 + 22 * ((n.get("size") or 0) / largest) ** 0.5 for n in nodes],
+                color=[
+                    self.ENTITY_COLORS.get(n.get("type") or "DEFAULT", self.ENTITY_COLORS["DEFAULT"])
+                    for n in nodes
+                ],
+                line=dict(color='white', width=1)
+            ),
+            text=[str(n.get("label", n["id"]))[:20] for n in nodes],
+            hovertext=[
+                f"{n.get('label', n['id'])}<br>"
+                + (f"Members: {n.get('size')}" if clustered else f"Type: {n.get('type')}")
+                for n in nodes
+            ],
+            hoverinfo='text',
+            textposition='top center',
+            showlegend=False
+        )
+        
+        x0, y0, x1, y1 = self.viewport
+        fig = go.Figure(data=[edge_trace, node_trace])
+        fig.update_layout(
+            title=dict(
+                text=f"Entity Relationship Graph - {len(nodes)} "
+                     f"{'Communities' if clustered else 'Nodes'}",
+                x=0.5,
+                xanchor='center'
+            ),
+            showlegend=False,
+            hovermode='closest',
+            margin=dict(l=20, r=20, b=20, t=60),
+            xaxis=dict(range=[x0, x1], showgrid=False, zeroline=False, showticklabels=False),
+            yaxis=dict(range=[y0, y1], showgrid=False, zeroline=False, showticklabels=False),
+            paper_bgcolor='white',
+            plot_bgcolor='white'
+        )
+        return fig.to_html(include_plotlyjs='cdn', div_id="graph_server")
+        
     def _generate_3d_graph(self) -> str:
         """Generate 3D graph visualization using Plotly."""
         # Apply filters
@@ -535,7 +733,7 @@ class OntologyGraphWidget(QWidget):
         
     def _on_mode_changed(self, mode_text: str):
         """Handle visualization mode change."""
-        self.current_mode = "3D" if mode_text == "3D Graph" else "2D"
+        self.current_mode = {"3D Graph": "3D", "Server Layout": "Server"}.get(mode_text, "2D")
         self.refresh_graph()
         
     def _on_filter_changed(self, filter_text: str):
@@ -46,16 +46,16 @@ def read_text_file_if_supported(file_path: str) -> str:
         return ""
 
 
-def collect_folder_content(
+def collect_folder_documents(
     folder_path: str,
     *,
     process_document_fn: Callable[[str], Dict[str, Any]],
     extract_fn: Callable[[Dict[str, Any]], str] = extract_content_from_response,
     is_interruption_requested_fn: Callable[[], bool] | None = None,
-) -> str:
-    """Collect and concatenate content from supported files in a folder."""
+) -> Dict[str, str]:
+    """Collect content from supported files in a folder, keyed by file path."""
     if not folder_path or not os.path.isdir(folder_path):
-        return ""
+        return {}
     supported_exts = {
         ".txt",
         ".md",
@@ -68,11 +68,11 @@ def collect_folder_content(
         ".html",
         ".htm",
     }
-    chunks: list[str] = []
+    documents: Dict[str, str] = {}
     for root, _, files in os.walk(folder_path):
         for name in sorted(files):
             if is_interruption_requested_fn and is_interruption_requested_fn():
-                return ""
+                return {}
             _, ext = os.path.splitext(name)
             if ext.lower() not in supported_exts:
                 continue
@@ -81,8 +81,27 @@ def collect_folder_content(
                 resp = process_document_fn(path)
                 content = extract_fn(resp).strip()
                 if content:
-                    chunks.append(f"--- FILE: {path} ---\n{content}")
+                    documents[path] = content
             except Exception as e:
                 logger.warning("Error processing file '%s' in collect_folder_content: %s", path, e)
                 continue
-    return "\n\n".join(chunks)
+    return documents
+
+
+def collect_folder_content(
+    folder_path: str,
+    *,
+    process_document_fn: Callable[[str], Dict[str, Any]],
+    extract_fn: Callable[[Dict[str, Any]], str] = extract_content_from_response,
+    is_interruption_requested_fn: Callable[[], bool] | None = None,
+) -> str:
+    """Collect and concatenate content from supported files in a folder."""
+    documents = collect_folder_documents(
+        folder_path,
+        process_document_fn=process_document_fn,
+        extract_fn=extract_fn,
+        is_interruption_requested_fn=is_interruption_requested_fn,
+    )
+    return "\n\n".join(
+        f"--- FILE: {path} ---\n{content}" for path, content in documents.items()
+    )
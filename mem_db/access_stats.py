@@ -0,0 +1,137 @@
+"""Write-behind buffer for access statistics.
+
+Search paths record hits here instead of issuing an UPDATE per result. Hits are
+aggregated per id (count, latest access time) and flushed through a
+caller-supplied coroutine in one batch when the buffer grows past
+``max_pending`` ids, when ``flush_interval`` elapses, and on ``close()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL_S = float(os.getenv("ACCESS_STATS_FLUSH_INTERVAL", "5.0"))
+DEFAULT_MAX_PENDING = int(os.getenv("ACCESS_STATS_MAX_PENDING", "500"))
+
+# (id, access count delta, latest access as ISO-8601)
+AccessRow = Tuple[str, int, str]
+FlushFn = Callable[[List[AccessRow]], Awaitable[None]]
+
+
+class AccessStatsBuffer:
+    """Aggregate access hits in memory and flush them in one transaction."""
+
+    def __init__(
+        self,
+        flush_fn: FlushFn,
+        *,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_S,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        self._flush_fn = flush_fn
+        self.flush_interval = flush_interval
+        self.max_pending = max(1, max_pending)
+        self._pending: Dict[str, List] = {}
+        self._lock = threading.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self.flushes = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, key: str, when: Optional[datetime] = None) -> None:
+        """Count one access of ``key``; never touches the database."""
+        when = when or datetime.now(timezone.utc)
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = [1, when]
+            else:
+                entry[0] += 1
+                if when > entry[1]:
+                    entry[1] = when
+            size = len(self._pending)
+        if size >= self.max_pending:
+            self._schedule("_flush_task", self.flush)
+        else:
+            self._schedule("_timer", self._run_timer)
+
+    def pending_delta(self, key: str) -> Tuple[int, Optional[datetime]]:
+        """Buffered (count, last access) for ``key`` not yet written to storage."""
+        with self._lock:
+            entry = self._pending.get(key)
+            return (entry[0], entry[1]) if entry else (0, None)
+
+    def discard(self, keys: Iterable[str]) -> None:
+        """Drop buffered hits for rows that were rewritten or deleted."""
+        with self._lock:
+            for key in keys:
+                self._pending.pop(key, None)
+
+    async def flush(self) -> int:
+        """Write all buffered hits; returns the number of ids flushed."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        rows = [(key, count, when.isoformat()) for key, (count, when) in pending.items()]
+        try:
+            await self._flush_fn(rows)
+        except asyncio.CancelledError:
+            self._restore(pending)
+            raise
+        except Exception as e:
+            logger.warning("Access stats flush failed; keeping %d ids buffered: %s", len(rows), e)
+            self._restore(pending)
+            return 0
+        self.flushes += 1
+        return len(rows)
+
+    def _restore(self, pending: Dict[str, List]) -> None:
+        with self._lock:
+            for key, (count, when) in pending.items():
+                entry = self._pending.setdefault(key, [0, when])
+                entry[0] += count
+                entry[1] = max(entry[1], when)
+
+    async def close(self) -> None:
+        """Stop the timer and flush whatever is still buffered."""
+        for task in (self._timer, self._flush_task):
+            if task is not None and not task.done() and task.get_loop() is _running_loop():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._timer = None
+        self._flush_task = None
+        await self.flush()
+
+    def _schedule(self, attr: str, factory: Callable[[], Awaitable]) -> None:
+        loop = _running_loop()
+        if loop is None:
+            return
+        task = getattr(self, attr)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        setattr(self, attr, loop.create_task(factory()))
+
+    async def _run_timer(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
@@ -11,7 +11,7 @@ import sqlite3  # noqa: E402
 import threading
 from contextlib import contextmanager  # noqa: E402
 from pathlib import Path  # noqa: E402
-from typing import Any, Dict, List, Optional, Tuple  # noqa: E402
+from typing import Any, Dict, List, Optional, Sequence, Tuple  # noqa: E402
 
 from utils.models import (  # noqa: E402
     DocumentCreate,
@@ -29,12 +29,16 @@ from mem_db.db.interfaces.logging import (  # noqa: E402
     generate_correlation_id,
 )
 from mem_db.repositories.document_repository import DocumentRepository
-from mem_db.repositories.file_index_repository import FileIndexRepository
+from mem_db.repositories.file_index_repository import (
+    SCOPE_PATH_EXPR,
+    FileIndexRepository,
+)
 from mem_db.repositories.knowledge_repository import KnowledgeRepository
 from mem_db.repositories.organization_repository import OrganizationRepository
 from mem_db.repositories.persona_repository import PersonaRepository
 from mem_db.repositories.taskmaster_repository import TaskMasterRepository
 from mem_db.repositories.watch_repository import WatchRepository
+from mem_db.repositories.webhook_outbox_repository import WebhookOutboxRepository
 from mem_db.repositories.analysis_version_repository import AnalysisVersionRepository
 from mem_db.repositories.learning_path_repository import LearningPathRepository
 
@@ -101,11 +105,14 @@ class DatabaseManager:
         self.taskmaster_repo = TaskMasterRepository(self.get_connection)
         self.knowledge_repo = KnowledgeRepository(self.get_connection)
         self.persona_repo = PersonaRepository(self.get_connection)
-        self.file_index_repo = FileIndexRepository(self.get_connection)
+        self.file_index_repo = FileIndexRepository(
+            self.get_connection, writer_connection_factory=self.dedicated_connection
+        )
         self.watch_repo = WatchRepository(self.get_connection)
         self.document_repo = DocumentRepository(self.get_connection)
         self.analysis_version_repo = AnalysisVersionRepository(self.get_connection)
         self.learning_path_repo = LearningPathRepository(self.get_connection)
+        self.webhook_outbox_repo = WebhookOutboxRepository(self.get_connection)
 
         logger.info(f"Database initialized at: {self.db_path}")
 
@@ -136,6 +143,9 @@ class DatabaseManager:
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys = ON")
         conn.execute(f"PRAGMA busy_timeout = {int(self._busy_timeout_ms)}")
+        # Per-connection setting: under WAL, NORMAL syncs at checkpoints rather
+        # than on every commit
+        conn.execute("PRAGMA synchronous = NORMAL")
 
     def _ensure_wal_mode(self) -> None:
         conn = sqlite3.connect(str(self.db_path), timeout=max(1.0, self._busy_timeout_ms / 1000.0))
@@ -169,6 +179,25 @@ class DatabaseManager:
             logger.error(f"Database error: {e}")
             raise
 
+    @contextmanager
+    def dedicated_connection(self):
+        """Context manager for a private connection, closed on exit.
+
+        For long-lived write transactions (the file index bulk writer): other
+        callers on the thread use ``get_connection``, whose rollback on error
+        would otherwise discard the open batch.
+        """
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=max(1.0, self._busy_timeout_ms / 1000.0),
+            check_same_thread=True,
+        )
+        try:
+            self._configure_connection(conn)
+            yield conn
+        finally:
+            conn.close()
+
     def close(self) -> None:
         conn = getattr(self._conn_local, "conn", None)
         if conn is not None:
@@ -460,7 +489,8 @@ class DatabaseManager:
                 )
             """)
 
-            conn.execute("""
+            conn.execute(
+                """
                 CREATE TABLE IF NOT EXISTS taskmaster_job_queue (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     mode TEXT NOT NULL,
@@ -474,9 +504,13 @@ class DatabaseManager:
                     started_at TIMESTAMP,
                     completed_at TIMESTAMP,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP
+                    updated_at TIMESTAMP,
+                    heartbeat_at TIMESTAMP,
+                    lease_expires_at TIMESTAMP,
+                    lease_token TEXT
                 )
-            """)
+            """
+            )
 
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS taskmaster_dead_letters (
@@ -768,6 +802,29 @@ class DatabaseManager:
                 )
             """)
 
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS workflow_webhook_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_id TEXT NOT NULL UNIQUE,
+                    job_id TEXT,
+                    event_type TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    payload_json TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL DEFAULT 3,
+                    next_attempt_at REAL NOT NULL,
+                    lease_expires_at REAL,
+                    last_status INTEGER,
+                    last_error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    delivered_at TIMESTAMP
+                )
+            """
+            )
+
             # Schema migrations (versioned, auditable)
             from mem_db.migrations.runner import apply_migrations  # noqa: E402
 
@@ -810,6 +867,12 @@ class DatabaseManager:
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_files_index_mime ON files_index(mime_type)"
             )
+            # Serves the case-insensitive path-prefix ranges of
+            # list_indexed_files_in_scope
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_files_index_scope_path "
+                f"ON files_index({SCOPE_PATH_EXPR})"
+            )
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_file_dup_rel_canonical ON file_duplicate_relationships(canonical_file_id)"
             )
@@ -885,6 +948,10 @@ class DatabaseManager:
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_taskmaster_schedules_next_run ON taskmaster_schedules(next_run_at)"
             )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_taskmaster_schedules_active_next_run "
+                "ON taskmaster_schedules(active, next_run_at)"
+            )
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_manager_skill_results_run_id ON manager_skill_results(run_id)"
             )
@@ -912,6 +979,15 @@ class DatabaseManager:
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_workflow_jobs_idempotency_key ON workflow_jobs(idempotency_key)"
             )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_workflow_webhook_outbox_status_next "
+                "ON workflow_webhook_outbox(status, next_attempt_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS "
+                "idx_workflow_webhook_outbox_url_status_next "
+                "ON workflow_webhook_outbox(url, status, next_attempt_at)"
+            )
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_aedis_analysis_versions_analysis_id ON aedis_analysis_versions(analysis_id)"
             )
@@ -937,6 +1013,9 @@ class DatabaseManager:
     def organization_add_proposal(self, proposal: Dict[str, Any]) -> int:
         return self.organization_repo.add_proposal(proposal)
 
+    def organization_add_proposals(self, proposals: List[Dict[str, Any]]) -> List[int]:
+        return self.organization_repo.add_proposals(proposals)
+
     def organization_list_proposals(
         self,
         *,
@@ -1182,6 +1261,17 @@ class DatabaseManager:
     def list_all_indexed_files(self) -> List[Dict[str, Any]]:
         return self.file_index_repo.list_all_indexed_files()
 
+    def list_indexed_files_in_scope(
+        self,
+        prefixes: Sequence[str],
+        *,
+        limit: int,
+        exclude_statuses: Sequence[str] = ("missing",),
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        return self.file_index_repo.list_indexed_files_in_scope(
+            prefixes, limit=limit, exclude_statuses=exclude_statuses
+        )
+
     def replace_file_chunks(
         self,
         file_id: int,
@@ -1231,6 +1321,29 @@ class DatabaseManager:
             embedding=embedding,
         )
 
+    def upsert_chunk_embeddings(
+        self,
+        *,
+        file_id: int,
+        embedding_model: str,
+        embeddings: List[Tuple[int, List[float]]],
+    ) -> int:
+        return self.file_index_repo.upsert_chunk_embeddings(
+            file_id=file_id,
+            embedding_model=embedding_model,
+            embeddings=embeddings,
+        )
+
+    def file_index_bulk_writer(
+        self,
+        files_per_commit: Optional[int] = None,
+        max_latency_seconds: Optional[float] = None,
+    ):
+        """Context manager batching per-file index writes into multi-file transactions."""
+        return self.file_index_repo.bulk_writer(
+            files_per_commit=files_per_commit, max_latency_seconds=max_latency_seconds
+        )
+
     def semantic_similarity_search(
         self,
         *,
@@ -1360,18 +1473,111 @@ class DatabaseManager:
     def taskmaster_queue_enqueue(self, *, mode: str, payload: Optional[Dict[str, Any]] = None, max_retries: int = 2) -> int:
         return self.taskmaster_repo.queue_enqueue(mode=mode, payload=payload, max_retries=max_retries)
 
-    def taskmaster_queue_claim_next(self, *, worker_name: str) -> Optional[Dict[str, Any]]:
-        return self.taskmaster_repo.queue_claim_next(worker_name=worker_name)
+    def taskmaster_queue_claim_next(
+        self, *, worker_name: str, lease_seconds: int = 300
+    ) -> Optional[Dict[str, Any]]:
+        return self.taskmaster_repo.queue_claim_next(
+            worker_name=worker_name, lease_seconds=lease_seconds
+        )
 
-    def taskmaster_queue_mark_completed(self, queue_job_id: int) -> None:
-        self.taskmaster_repo.queue_mark_completed(queue_job_id)
+    def taskmaster_queue_heartbeat(
+        self, queue_job_id: int, *, lease_token: str, lease_seconds: int = 300
+    ) -> bool:
+        return self.taskmaster_repo.queue_heartbeat(
+            queue_job_id, lease_token=lease_token, lease_seconds=lease_seconds
+        )
 
-    def taskmaster_queue_mark_retry_or_dead_letter(self, queue_job_id: int, *, error_message: str) -> str:
-        return self.taskmaster_repo.queue_mark_retry_or_dead_letter(queue_job_id, error_message=error_message)
+    def taskmaster_queue_reclaim_expired(
+        self, *, lease_seconds: int = 300
+    ) -> Dict[str, int]:
+        return self.taskmaster_repo.queue_reclaim_expired(lease_seconds=lease_seconds)
+
+    def taskmaster_queue_mark_completed(
+        self, queue_job_id: int, *, lease_token: Optional[str] = None
+    ) -> bool:
+        return self.taskmaster_repo.queue_mark_completed(
+            queue_job_id, lease_token=lease_token
+        )
+
+    def taskmaster_queue_mark_retry_or_dead_letter(
+        self,
+        queue_job_id: int,
+        *,
+        error_message: str,
+        lease_token: Optional[str] = None,
+    ) -> str:
+        return self.taskmaster_repo.queue_mark_retry_or_dead_letter(
+            queue_job_id, error_message=error_message, lease_token=lease_token
+        )
 
     def taskmaster_dead_letters(self, *, limit: int = 100) -> List[Dict[str, Any]]:
         return self.taskmaster_repo.dead_letters(limit=limit)
 
+    # Workflow Webhook Outbox Operations
+
+    def webhook_outbox_enqueue(
+        self,
+        *,
+        event_id: str,
+        event_type: str,
+        url: str,
+        payload: Dict[str, Any],
+        job_id: Optional[str] = None,
+        max_attempts: int = 3,
+        available_at: float,
+    ) -> Optional[int]:
+        return self.webhook_outbox_repo.enqueue(
+            event_id=event_id,
+            event_type=event_type,
+            url=url,
+            payload=payload,
+            job_id=job_id,
+            max_attempts=max_attempts,
+            available_at=available_at,
+        )
+
+    def webhook_outbox_due_endpoints(
+        self, *, now: float, limit: int = 100
+    ) -> List[str]:
+        return self.webhook_outbox_repo.due_endpoints(now=now, limit=limit)
+
+    def webhook_outbox_claim(
+        self, *, url: str, limit: int, now: float, lease_seconds: float
+    ) -> List[Dict[str, Any]]:
+        return self.webhook_outbox_repo.claim(
+            url=url, limit=limit, now=now, lease_seconds=lease_seconds
+        )
+
+    def webhook_outbox_mark_delivered(
+        self, ids: List[int], *, status_code: Optional[int]
+    ) -> int:
+        return self.webhook_outbox_repo.mark_delivered(ids, status_code=status_code)
+
+    def webhook_outbox_mark_failed(
+        self,
+        ids: List[int],
+        *,
+        retryable: bool,
+        next_attempt_at: float,
+        status_code: Optional[int],
+        error: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        return self.webhook_outbox_repo.mark_failed(
+            ids,
+            retryable=retryable,
+            next_attempt_at=next_attempt_at,
+            status_code=status_code,
+            error=error,
+        )
+
+    def webhook_outbox_stats(self) -> Dict[str, Any]:
+        return self.webhook_outbox_repo.stats()
+
+    def webhook_outbox_purge_delivered(self, *, older_than_seconds: int) -> int:
+        return self.webhook_outbox_repo.purge_delivered(
+            older_than_seconds=older_than_seconds
+        )
+
     # Manager Knowledge Operations
 
     def knowledge_upsert(
@@ -1682,6 +1888,9 @@ class DatabaseManager:
             last_error=last_error,
         )
 
+    def scan_manifest_upsert_many(self, rows: List[Dict[str, Any]]) -> int:
+        return self.file_index_repo.scan_manifest_upsert_many(rows)
+
     # TaskMaster schedule operations
 
     def skill_result_add(
@@ -1722,8 +1931,15 @@ class DatabaseManager:
     def schedule_list(self, active_only: bool = False) -> List[Dict[str, Any]]:
         return self.taskmaster_repo.schedule_list(active_only=active_only)
 
-    def schedule_due(self) -> List[Dict[str, Any]]:
-        return self.taskmaster_repo.schedule_due()
+    def schedule_due(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.taskmaster_repo.schedule_due(limit=limit)
+
+    def schedule_enqueue_due(
+        self, *, limit: int = 100, max_retries: int = 2
+    ) -> List[Dict[str, Any]]:
+        return self.taskmaster_repo.schedule_enqueue_due(
+            limit=limit, max_retries=max_retries
+        )
 
     def schedule_mark_ran(self, schedule_id: int, every_minutes: int) -> None:
         self.taskmaster_repo.schedule_mark_ran(schedule_id, every_minutes)
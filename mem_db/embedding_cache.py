@@ -0,0 +1,439 @@
+"""Append-only, memory-mapped embedding cache shared across processes.
+
+Vectors are appended as raw float32 to ``vectors.<generation>.f32`` and located
+through a small SQLite table mapping key -> (generation, byte offset,
+dimension). Reads slice a read-only ``np.memmap`` of the current file, so
+nothing is loaded into RAM up front and a put never rewrites existing data.
+
+Writers hold an exclusive lock on ``.lock`` in the cache directory, which makes
+one directory safe to share between worker processes. Entries beyond
+``max_entries``/``max_bytes`` are evicted least-recently-used first, and once
+dead bytes (overwritten or evicted vectors) pass ``compact_ratio`` of the file
+the live vectors are copied into the next generation file.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:  # pragma: no cover - Windows
+    FCNTL_AVAILABLE = False
+
+try:
+    import msvcrt
+
+    MSVCRT_AVAILABLE = True
+except ImportError:
+    MSVCRT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "500000"))
+DEFAULT_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(2 << 30)))
+DEFAULT_COMPACT_RATIO = float(os.getenv("EMBEDDING_CACHE_COMPACT_RATIO", "0.5"))
+
+# Eviction trims to this fraction of the limits so it does not run on every put.
+EVICTION_HEADROOM = 0.9
+# Files smaller than this are never worth compacting.
+COMPACT_MIN_BYTES = 1 << 20
+# Recency updates from reads are buffered and written in one statement.
+TOUCH_FLUSH_SIZE = 256
+# Stay under SQLite's bound-parameter limit for IN (...) lookups.
+LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    dim INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (name, value) VALUES ('generation', 0);
+INSERT OR IGNORE INTO meta (name, value) VALUES ('entries', 0);
+INSERT OR IGNORE INTO meta (name, value) VALUES ('live_bytes', 0);
+"""
+
+
+class EmbeddingCacheStore:
+    """Key -> float32 vector store backed by an append-only memory-mapped file."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        compact_ratio: float = DEFAULT_COMPACT_RATIO,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / "index.db"
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.compact_ratio = compact_ratio
+
+        self._lock = threading.RLock()
+        self._lock_path = self.directory / ".lock"
+        self._map: Optional[np.memmap] = None
+        self._map_generation: Optional[int] = None
+        self._touches: Dict[str, float] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.compactions = 0
+
+        self._conn = sqlite3.connect(
+            str(self.index_path), timeout=30.0, check_same_thread=False
+        )
+        with self._file_lock():
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    # ------------------------------------------------------------------ reads
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._meta("entries")
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            return row is not None
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return a copy of the cached vector for ``key`` or ``None``."""
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Look up several keys with one query per chunk; misses are ``None``."""
+        with self._lock:
+            located: Dict[str, Tuple[int, int, int]] = {}
+            for chunk in _chunks(list(dict.fromkeys(keys)), LOOKUP_CHUNK):
+                rows = self._conn.execute(
+                    f"SELECT key, generation, offset, dim FROM entries "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                located.update((key, (gen, off, dim)) for key, gen, off, dim in rows)
+
+            now = time.time()
+            results: List[Optional[np.ndarray]] = []
+            for key in keys:
+                vector = self._read(*located[key]) if key in located else None
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    self._touches[key] = now
+                results.append(vector)
+            if len(self._touches) >= TOUCH_FLUSH_SIZE:
+                self._flush_touches()
+            return results
+
+    def _read(self, generation: int, offset: int, dim: int) -> Optional[np.ndarray]:
+        end = offset + dim * 4
+        if (
+            self._map is None
+            or self._map_generation != generation
+            or self._map.size * 4 < end
+        ):
+            path = self._vector_path(generation)
+            try:
+                size = path.stat().st_size
+            except FileNotFoundError:
+                # Compacted away by another process between lookup and read.
+                return None
+            if size < end:
+                return None
+            self._map = np.memmap(path, dtype=np.float32, mode="r", shape=(size // 4,))
+            self._map_generation = generation
+        start = offset // 4
+        return np.array(self._map[start : start + dim])
+
+    # ----------------------------------------------------------------- writes
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        self.put_many([(key, vector)])
+
+    def put_many(self, items: Iterable[Tuple[str, np.ndarray]]) -> None:
+        """Append vectors and index them in one transaction."""
+        pending = {
+            key: np.ascontiguousarray(vector, dtype=np.float32).reshape(-1)
+            for key, vector in items
+        }
+        if not pending:
+            return
+        now = time.time()
+        with self._lock, self._file_lock():
+            generation = self._meta("generation")
+            rows = []
+            with open(self._vector_path(generation), "ab") as handle:
+                offset = handle.seek(0, os.SEEK_END)
+                for key, vector in pending.items():
+                    handle.write(vector.tobytes())
+                    rows.append((key, generation, offset, vector.size, now))
+                    offset += vector.nbytes
+                handle.flush()
+
+            with self._conn:
+                replaced = self._existing_dims(list(pending))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (key, generation, offset, dim, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._bump_meta(
+                    entries=len(pending) - len(replaced),
+                    live_bytes=4 * (sum(v.size for v in pending.values()) - sum(replaced.values())),
+                )
+            for key in replaced:
+                self._touches.pop(key, None)
+            self._flush_touches()
+            self._evict_if_needed()
+            self._maybe_compact()
+
+    def delete(self, keys: Iterable[str]) -> int:
+        """Drop entries; their bytes are reclaimed by the next compaction."""
+        keys = list(keys)
+        with self._lock, self._file_lock():
+            with self._conn:
+                removed = self._delete_entries(keys)
+            self._maybe_compact()
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry and start a fresh, empty vector file."""
+        with self._lock, self._file_lock():
+            generation = self._meta("generation")
+            with self._conn:
+                self._conn.execute("DELETE FROM entries")
+                self._conn.execute(
+                    "UPDATE meta SET value = CASE name WHEN 'generation' THEN ? ELSE 0 END",
+                    (generation + 1,),
+                )
+            self._touches.clear()
+            self._drop_map()
+            self._remove_stale_files(generation + 1)
+
+    def flush(self) -> None:
+        """Write buffered recency updates."""
+        with self._lock:
+            self._flush_touches()
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._flush_touches()
+            finally:
+                self._drop_map()
+                self._conn.close()
+
+    # ------------------------------------------------------ eviction/compaction
+
+    def _evict_if_needed(self) -> None:
+        """Evict least-recently-used entries once either limit is exceeded.
+
+        Caller holds the thread and file locks.
+        """
+        entries, live_bytes = self._meta("entries"), self._meta("live_bytes")
+        if entries <= self.max_entries and live_bytes <= self.max_bytes:
+            return
+        target_entries = int(self.max_entries * EVICTION_HEADROOM)
+        target_bytes = int(self.max_bytes * EVICTION_HEADROOM)
+        victims = []
+        cursor = self._conn.execute("SELECT key, dim FROM entries ORDER BY last_access")
+        for key, dim in cursor:
+            if entries <= target_entries and live_bytes <= target_bytes:
+                break
+            victims.append(key)
+            entries -= 1
+            live_bytes -= dim * 4
+        cursor.close()
+        with self._conn:
+            self.evictions += self._delete_entries(victims)
+
+    def _maybe_compact(self) -> None:
+        generation = self._meta("generation")
+        try:
+            size = self._vector_path(generation).stat().st_size
+        except FileNotFoundError:
+            return
+        if size >= COMPACT_MIN_BYTES and size - self._meta("live_bytes") > size * self.compact_ratio:
+            self._compact(generation)
+
+    def compact(self) -> int:
+        """Rewrite live vectors into a new generation file; returns bytes reclaimed."""
+        with self._lock, self._file_lock():
+            return self._compact(self._meta("generation"))
+
+    def _compact(self, generation: int) -> int:
+        """Caller holds the thread and file locks."""
+        self._flush_touches()
+        source_path = self._vector_path(generation)
+        target = generation + 1
+        target_path = self._vector_path(target)
+        tmp_path = target_path.with_suffix(".tmp")
+        old_size = source_path.stat().st_size if source_path.exists() else 0
+
+        rows = self._conn.execute(
+            "SELECT key, offset, dim FROM entries ORDER BY offset"
+        ).fetchall()
+        source = (
+            np.memmap(source_path, dtype=np.float32, mode="r", shape=(old_size // 4,))
+            if old_size
+            else None
+        )
+        updates = []
+        offset = 0
+        with open(tmp_path, "wb") as handle:
+            for key, old_offset, dim in rows:
+                start = old_offset // 4
+                handle.write(np.ascontiguousarray(source[start : start + dim]).tobytes())
+                updates.append((target, offset, key))
+                offset += dim * 4
+            handle.flush()
+            os.fsync(handle.fileno())
+        del source
+        os.replace(tmp_path, target_path)
+
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE entries SET generation = ?, offset = ? WHERE key = ?", updates
+            )
+            self._conn.execute(
+                "UPDATE meta SET value = CASE name WHEN 'generation' THEN ? "
+                "WHEN 'live_bytes' THEN ? ELSE value END",
+                (target, offset),
+            )
+        self._drop_map()
+        self._remove_stale_files(target)
+        self.compactions += 1
+        logger.debug(
+            "Compacted embedding cache %s: %d -> %d bytes", self.directory, old_size, offset
+        )
+        return old_size - offset
+
+    # ---------------------------------------------------------------- helpers
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        with self._lock:
+            generation = self._meta("generation")
+            path = self._vector_path(generation)
+            lookups = self.hits + self.misses
+            return {
+                "entries": self._meta("entries"),
+                "live_bytes": self._meta("live_bytes"),
+                "file_bytes": path.stat().st_size if path.exists() else 0,
+                "generation": generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "compactions": self.compactions,
+            }
+
+    def _vector_path(self, generation: int) -> Path:
+        return self.directory / f"vectors.{generation}.f32"
+
+    def _meta(self, name: str) -> int:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def _bump_meta(self, **deltas: int) -> None:
+        self._conn.executemany(
+            "UPDATE meta SET value = value + ? WHERE name = ?",
+            [(delta, name) for name, delta in deltas.items()],
+        )
+
+    def _existing_dims(self, keys: List[str]) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        for chunk in _chunks(keys, LOOKUP_CHUNK):
+            found.update(
+                self._conn.execute(
+                    f"SELECT key, dim FROM entries WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+            )
+        return found
+
+    def _delete_entries(self, keys: List[str]) -> int:
+        """Delete rows and update counters inside the caller's transaction."""
+        existing = self._existing_dims(keys)
+        if not existing:
+            return 0
+        self._conn.executemany(
+            "DELETE FROM entries WHERE key = ?", [(key,) for key in existing]
+        )
+        self._bump_meta(entries=-len(existing), live_bytes=-4 * sum(existing.values()))
+        for key in existing:
+            self._touches.pop(key, None)
+        return len(existing)
+
+    def _flush_touches(self) -> None:
+        if not self._touches:
+            return
+        touches, self._touches = self._touches, {}
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE entries SET last_access = MAX(last_access, ?) WHERE key = ?",
+                [(when, key) for key, when in touches.items()],
+            )
+
+    def _drop_map(self) -> None:
+        self._map = None
+        self._map_generation = None
+
+    def _remove_stale_files(self, current: int) -> None:
+        for path in self.directory.glob("vectors.*.f32"):
+            if path != self._vector_path(current):
+                try:
+                    path.unlink()
+                except OSError:
+                    # Still mapped by a reader (Windows); removed on a later pass.
+                    pass
+
+    @contextlib.contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive inter-process lock for writers."""
+        with open(self._lock_path, "a+b") as handle:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            elif MSVCRT_AVAILABLE:  # pragma: no cover - Windows
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                elif MSVCRT_AVAILABLE:  # pragma: no cover - Windows
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
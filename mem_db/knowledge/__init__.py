@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from typing import Optional  # noqa: E402
 
@@ -7,7 +8,9 @@ _knowledge_manager_singleton = None
 def get_knowledge_manager(graph_dir: Optional[str] = None):
     """Return a singleton UnifiedKnowledgeGraphManager if dependencies are available.
 
-    Falls back to None when required optional deps are missing.
+    Falls back to None when required optional deps are missing. Set
+    ``KNOWLEDGE_GRAPH_LAZY=1`` to keep the graph in SQLite and only cache hot
+    entities (``KNOWLEDGE_GRAPH_HOT_NODES`` bounds that cache).
     """
     global _knowledge_manager_singleton
     if _knowledge_manager_singleton is not None:
@@ -23,8 +26,31 @@ def get_knowledge_manager(graph_dir: Optional[str] = None):
         if graph_dir
         else Path(__file__).parent.parent / "data" / "knowledge_graph"
     )
-    _knowledge_manager_singleton = UnifiedKnowledgeGraphManager(graph_path=base)
+    lazy = str(os.getenv("KNOWLEDGE_GRAPH_LAZY", "0")).strip().lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+    try:
+        hot_nodes = int(os.getenv("KNOWLEDGE_GRAPH_HOT_NODES", "10000"))
+    except ValueError:
+        hot_nodes = 10000
+    _knowledge_manager_singleton = UnifiedKnowledgeGraphManager(
+        graph_path=base,
+        lazy_loading=lazy,
+        hot_node_cache_size=hot_nodes,
+    )
     return _knowledge_manager_singleton
 
 
-__all__ = ["get_knowledge_manager"]
+async def close_knowledge_manager() -> None:
+    """Close the singleton's pooled connections, if it was created.
+
+    The manager stays usable: its pool reopens on next use.
+    """
+    if _knowledge_manager_singleton is not None:
+        await _knowledge_manager_singleton.close()
+
+
+__all__ = ["close_knowledge_manager", "get_knowledge_manager"]
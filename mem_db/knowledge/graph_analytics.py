@@ -0,0 +1,796 @@
+"""
+Graph Analytics
+===============
+
+Compact CSR (compressed sparse row) adjacency built straight from the
+relationship table, plus the whole-graph algorithms the knowledge graph
+manager exposes: degree / PageRank / sampled betweenness centrality,
+label-propagation and Louvain communities, bidirectional BFS and Dijkstra
+shortest paths, and force-directed / hierarchical layouts with viewport
+level-of-detail selection for visualization.
+
+All functions are synchronous and CPU-bound; callers run them off the event
+loop. Nothing here depends on networkx.
+"""
+
+import heapq
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass
+class CSRGraph:
+    """Directed multigraph in CSR form with reverse (in-edge) adjacency."""
+
+    node_ids: List[str]
+    index: Dict[str, int]
+    out_offsets: np.ndarray
+    out_targets: np.ndarray
+    out_weights: np.ndarray
+    in_offsets: np.ndarray
+    in_sources: np.ndarray
+    in_weights: np.ndarray
+    weighted: bool = False
+    _undirected: Optional[List[Dict[int, float]]] = field(default=None, repr=False)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.out_targets.shape[0])
+
+    def edge_sources(self) -> np.ndarray:
+        return np.repeat(
+            np.arange(self.node_count, dtype=np.int64), np.diff(self.out_offsets)
+        )
+
+    def undirected_adjacency(self) -> List[Dict[int, float]]:
+        """Symmetric weighted adjacency (parallel edges merged, self-loops kept once)."""
+        if self._undirected is None:
+            adj: List[Dict[int, float]] = [dict() for _ in range(self.node_count)]
+            offsets = self.out_offsets.tolist()
+            targets = self.out_targets.tolist()
+            weights = self.out_weights.tolist()
+            for u in range(self.node_count):
+                row = adj[u]
+                for pos in range(offsets[u], offsets[u + 1]):
+                    v = targets[pos]
+                    w = weights[pos]
+                    row[v] = row.get(v, 0.0) + w
+                    if v != u:
+                        adj[v][u] = adj[v].get(u, 0.0) + w
+            self._undirected = adj
+        return self._undirected
+
+
+def build_csr(
+    node_ids: Iterable[str], edges: Iterable[Tuple[str, str, float]]
+) -> CSRGraph:
+    """Build a CSRGraph; edge endpoints missing from ``node_ids`` become nodes."""
+    index: Dict[str, int] = {}
+    ids: List[str] = []
+    for node_id in node_ids:
+        if node_id not in index:
+            index[node_id] = len(ids)
+            ids.append(node_id)
+
+    sources: List[int] = []
+    targets: List[int] = []
+    weights: List[float] = []
+    for source, target, weight in edges:
+        for node_id in (source, target):
+            if node_id not in index:
+                index[node_id] = len(ids)
+                ids.append(node_id)
+        sources.append(index[source])
+        targets.append(index[target])
+        weights.append(float(weight))
+
+    n = len(ids)
+    src = np.asarray(sources, dtype=np.int64)
+    dst = np.asarray(targets, dtype=np.int64)
+    wts = np.asarray(weights, dtype=np.float64)
+
+    def _compress(keys: np.ndarray, values: np.ndarray):
+        order = np.argsort(keys, kind="stable")
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        if keys.size:
+            np.cumsum(np.bincount(keys, minlength=n), out=offsets[1:])
+        return offsets, values[order], wts[order]
+
+    out_offsets, out_targets, out_weights = _compress(src, dst)
+    in_offsets, in_sources, in_weights = _compress(dst, src)
+    return CSRGraph(
+        node_ids=ids,
+        index=index,
+        out_offsets=out_offsets,
+        out_targets=out_targets,
+        out_weights=out_weights,
+        in_offsets=in_offsets,
+        in_sources=in_sources,
+        in_weights=in_weights,
+        weighted=bool(wts.size and np.any(wts != 1.0)),
+    )
+
+
+# --- Centrality ---
+
+
+def degree_centrality(graph: CSRGraph) -> np.ndarray:
+    """(in + out degree) / (n - 1), matching networkx for directed graphs."""
+    n = graph.node_count
+    if n <= 1:
+        return np.ones(n, dtype=np.float64)
+    degree = np.diff(graph.out_offsets) + np.diff(graph.in_offsets)
+    return degree.astype(np.float64) / (n - 1)
+
+
+def pagerank(
+    graph: CSRGraph, alpha: float = 0.85, tol: float = 1.0e-6, max_iter: int = 100
+) -> np.ndarray:
+    """Weighted power-iteration PageRank with uniform dangling redistribution."""
+    n = graph.node_count
+    if n == 0:
+        return np.zeros(0, dtype=np.float64)
+    src = graph.edge_sources()
+    dst = graph.out_targets
+    wts = graph.out_weights
+    out_strength = np.bincount(src, weights=wts, minlength=n)
+    dangling = out_strength == 0
+    safe_strength = np.where(dangling, 1.0, out_strength)
+    edge_share = wts / safe_strength[src]
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        previous = rank
+        rank = alpha * np.bincount(dst, weights=previous[src] * edge_share, minlength=n)
+        rank += (alpha * previous[dangling].sum() + (1.0 - alpha)) / n
+        if np.abs(rank - previous).sum() < n * tol:
+            break
+    return rank / rank.sum()
+
+
+def approximate_betweenness(
+    graph: CSRGraph, samples: int = 64, seed: int = 0, normalized: bool = True
+) -> np.ndarray:
+    """Brandes betweenness from ``samples`` random pivots, rescaled by n / k.
+
+    Paths follow edge direction and ignore weights. With ``samples >= n`` the
+    result is exact.
+    """
+    n = graph.node_count
+    centrality = np.zeros(n, dtype=np.float64)
+    if n < 3:
+        return centrality
+    k = min(max(1, samples), n)
+    pivots = range(n) if k == n else random.Random(seed).sample(range(n), k)
+    offsets = graph.out_offsets.tolist()
+    targets = graph.out_targets.tolist()
+
+    for s in pivots:
+        order: List[int] = []
+        preds: List[List[int]] = [[] for _ in range(n)]
+        sigma = [0] * n
+        dist = [-1] * n
+        sigma[s] = 1
+        dist[s] = 0
+        queue = deque([s])
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            next_dist = dist[v] + 1
+            for pos in range(offsets[v], offsets[v + 1]):
+                w = targets[pos]
+                if dist[w] < 0:
+                    dist[w] = next_dist
+                    queue.append(w)
+                if dist[w] == next_dist:
+                    sigma[w] += sigma[v]
+                    preds[w].append(v)
+        delta = [0.0] * n
+        for w in reversed(order):
+            coeff = (1.0 + delta[w]) / sigma[w]
+            for v in preds[w]:
+                delta[v] += sigma[v] * coeff
+            if w != s:
+                centrality[w] += delta[w]
+
+    centrality *= n / k
+    if normalized:
+        centrality /= (n - 1) * (n - 2)
+    return centrality
+
+
+# --- Communities ---
+
+
+def label_propagation(graph: CSRGraph, max_iter: int = 20, seed: int = 0) -> List[int]:
+    """Asynchronous weighted label propagation over the undirected graph."""
+    adj = graph.undirected_adjacency()
+    n = graph.node_count
+    labels = list(range(n))
+    rng = random.Random(seed)
+    nodes = list(range(n))
+    for _ in range(max_iter):
+        rng.shuffle(nodes)
+        changed = False
+        for u in nodes:
+            if not adj[u]:
+                continue
+            scores: Dict[int, float] = {}
+            for v, w in adj[u].items():
+                if v != u:
+                    scores[labels[v]] = scores.get(labels[v], 0.0) + w
+            if not scores:
+                continue
+            best_score = max(scores.values())
+            if scores.get(labels[u], -1.0) >= best_score:
+                continue
+            labels[u] = min(label for label, score in scores.items() if score == best_score)
+            changed = True
+        if not changed:
+            break
+    return _renumber(labels)
+
+
+def louvain(
+    graph: CSRGraph, resolution: float = 1.0, seed: int = 0, max_levels: int = 10
+) -> List[int]:
+    """Multi-level Louvain modularity optimisation over the undirected graph."""
+    adj = [dict(row) for row in graph.undirected_adjacency()]
+    partition = list(range(graph.node_count))
+    rng = random.Random(seed)
+
+    for _ in range(max_levels):
+        degree = [sum(row.values()) + row.get(u, 0.0) for u, row in enumerate(adj)]
+        two_m = sum(degree)
+        if two_m <= 0:
+            break
+        community = list(range(len(adj)))
+        totals = list(degree)
+        moved = False
+        improved = True
+        while improved:
+            improved = False
+            order = list(range(len(adj)))
+            rng.shuffle(order)
+            for u in order:
+                current = community[u]
+                k_u = degree[u]
+                links: Dict[int, float] = {}
+                for v, w in adj[u].items():
+                    if v != u:
+                        links[community[v]] = links.get(community[v], 0.0) + w
+                totals[current] -= k_u
+                best = current
+                best_gain = links.get(current, 0.0) - resolution * totals[current] * k_u / two_m
+                for candidate, weight in links.items():
+                    gain = weight - resolution * totals[candidate] * k_u / two_m
+                    if gain > best_gain:
+                        best, best_gain = candidate, gain
+                totals[best] += k_u
+                if best != current:
+                    community[u] = best
+                    improved = True
+                    moved = True
+        if not moved:
+            break
+
+        community = _renumber(community)
+        partition = [community[c] for c in partition]
+        aggregated: List[Dict[int, float]] = [dict() for _ in range(max(community) + 1)]
+        for u, row in enumerate(adj):
+            cu = community[u]
+            for v, w in row.items():
+                cv = community[v]
+                if u == v:
+                    aggregated[cu][cu] = aggregated[cu].get(cu, 0.0) + w
+                elif cu == cv:
+                    # Each internal edge is visited from both ends.
+                    aggregated[cu][cu] = aggregated[cu].get(cu, 0.0) + w / 2.0
+                else:
+                    aggregated[cu][cv] = aggregated[cu].get(cv, 0.0) + w
+        adj = aggregated
+    return _renumber(partition)
+
+
+def modularity(graph: CSRGraph, partition: Sequence[int], resolution: float = 1.0) -> float:
+    adj = graph.undirected_adjacency()
+    degree = [sum(row.values()) + row.get(u, 0.0) for u, row in enumerate(adj)]
+    two_m = sum(degree)
+    if two_m <= 0:
+        return 0.0
+    internal: Dict[int, float] = {}
+    totals: Dict[int, float] = {}
+    for u, row in enumerate(adj):
+        cu = partition[u]
+        totals[cu] = totals.get(cu, 0.0) + degree[u]
+        for v, w in row.items():
+            if partition[v] == cu:
+                internal[cu] = internal.get(cu, 0.0) + (2.0 * w if u == v else w)
+    return sum(
+        internal.get(c, 0.0) / two_m - resolution * (totals[c] / two_m) ** 2 for c in totals
+    )
+
+
+def _renumber(labels: Sequence[int]) -> List[int]:
+    mapping: Dict[int, int] = {}
+    return [mapping.setdefault(label, len(mapping)) for label in labels]
+
+
+# --- Paths ---
+
+
+def shortest_path(
+    graph: CSRGraph, source: int, target: int, weighted: Optional[bool] = None
+) -> Tuple[Optional[List[int]], float]:
+    """Directed shortest path as (node indices, length); (None, inf) if unreachable."""
+    if source == target:
+        return [source], 0.0
+    use_weights = graph.weighted if weighted is None else weighted
+    if use_weights:
+        return _dijkstra(graph, source, target)
+    return _bidirectional_bfs(graph, source, target)
+
+
+def _bidirectional_bfs(
+    graph: CSRGraph, source: int, target: int
+) -> Tuple[Optional[List[int]], float]:
+    out_offsets = graph.out_offsets
+    out_targets = graph.out_targets
+    in_offsets = graph.in_offsets
+    in_sources = graph.in_sources
+    forward: Dict[int, int] = {source: -1}
+    backward: Dict[int, int] = {target: -1}
+    forward_frontier = [source]
+    backward_frontier = [target]
+
+    while forward_frontier and backward_frontier:
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        if expand_forward:
+            parents, others = forward, backward
+            offsets, neighbors, frontier = out_offsets, out_targets, forward_frontier
+        else:
+            parents, others = backward, forward
+            offsets, neighbors, frontier = in_offsets, in_sources, backward_frontier
+        next_frontier: List[int] = []
+        meeting = None
+        for u in frontier:
+            for v in neighbors[offsets[u] : offsets[u + 1]].tolist():
+                if v in parents:
+                    continue
+                parents[v] = u
+                if v in others:
+                    meeting = v
+                    break
+                next_frontier.append(v)
+            if meeting is not None:
+                break
+        if meeting is not None:
+            path = []
+            node = meeting
+            while node != -1:
+                path.append(node)
+                node = forward[node]
+            path.reverse()
+            node = backward[meeting]
+            while node != -1:
+                path.append(node)
+                node = backward[node]
+            return path, float(len(path) - 1)
+        if expand_forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+    return None, float("inf")
+
+
+def _dijkstra(graph: CSRGraph, source: int, target: int) -> Tuple[Optional[List[int]], float]:
+    if graph.out_weights.size and float(graph.out_weights.min()) < 0:
+        raise ValueError("Dijkstra requires non-negative edge weights")
+    offsets = graph.out_offsets
+    dist: Dict[int, float] = {source: 0.0}
+    parent: Dict[int, int] = {source: -1}
+    done = set()
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        if u == target:
+            path = []
+            while u != -1:
+                path.append(u)
+                u = parent[u]
+            return path[::-1], d
+        done.add(u)
+        start, end = offsets[u], offsets[u + 1]
+        for v, w in zip(
+            graph.out_targets[start:end].tolist(), graph.out_weights[start:end].tolist()
+        ):
+            candidate = d + w
+            if candidate < dist.get(v, float("inf")):
+                dist[v] = candidate
+                parent[v] = u
+                heapq.heappush(heap, (candidate, v))
+    return None, float("inf")
+
+
+# --- Layout ---
+
+# Pairwise repulsion is evaluated this many (row, column) pairs at a time, so
+# the temporaries stay a few tens of MB instead of growing as n^2.
+LAYOUT_BLOCK_PAIRS = 1 << 20
+
+
+def force_directed_layout(
+    node_count: int,
+    edges: Sequence[Tuple[int, int]],
+    iterations: int = 50,
+    seed: int = 0,
+    initial: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Fruchterman-Reingold layout in the unit square.
+
+    O(n^2) time per iteration; repulsion is computed in row blocks of
+    ``LAYOUT_BLOCK_PAIRS`` pairs, so memory stays O(n) plus one block.
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.random((node_count, 2)) if initial is None else np.array(initial, dtype=float)
+    if node_count <= 1:
+        return np.full((node_count, 2), 0.5)
+    edge_array = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    k = np.sqrt(1.0 / node_count)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    rows = max(1, LAYOUT_BLOCK_PAIRS // node_count)
+    displacement = np.empty_like(pos)
+    for _ in range(iterations):
+        for start in range(0, node_count, rows):
+            delta = pos[start : start + rows, None, :] - pos[None, :, :]
+            distance_sq = np.maximum(np.einsum("ijk,ijk->ij", delta, delta), 0.01**2)
+            displacement[start : start + rows] = np.einsum("ijk,ij->ik", delta, (k * k) / distance_sq)
+        if edge_array.size:
+            diff = pos[edge_array[:, 0]] - pos[edge_array[:, 1]]
+            length = np.maximum(np.linalg.norm(diff, axis=1), 0.01)
+            pull = diff * (length / k)[:, None]
+            np.add.at(displacement, edge_array[:, 0], -pull)
+            np.add.at(displacement, edge_array[:, 1], pull)
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 0.01)
+        pos += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+    pos -= pos.min(axis=0)
+    span = pos.max(axis=0)
+    span[span == 0] = 1.0
+    return pos / span
+
+
+def circular_layout(node_count: int) -> np.ndarray:
+    angles = np.linspace(0, 2 * np.pi, node_count, endpoint=False)
+    return np.column_stack([0.5 + 0.5 * np.cos(angles), 0.5 + 0.5 * np.sin(angles)])
+
+
+def _fit_unit_square(pos: np.ndarray) -> np.ndarray:
+    """Scale into [0, 1]^2 keeping the aspect ratio."""
+    if pos.shape[0] == 0:
+        return pos
+    pos = pos - pos.min(axis=0)
+    span = float(pos.max())
+    return pos / span if span > 0 else np.full_like(pos, 0.5)
+
+
+def _sunflower(count: int) -> np.ndarray:
+    """Evenly filled disc in the unit square, first point at the centre."""
+    idx = np.arange(count, dtype=np.float64)
+    radius = 0.5 * np.sqrt((idx + 0.5) / max(count, 1))
+    theta = idx * np.pi * (3.0 - np.sqrt(5.0))
+    return np.column_stack([0.5 + radius * np.cos(theta), 0.5 + radius * np.sin(theta)])
+
+
+def hierarchical_layout(
+    graph: CSRGraph,
+    partition: Sequence[int],
+    iterations: int = 50,
+    seed: int = 0,
+    max_block: int = 200,
+) -> np.ndarray:
+    """Two-level force-directed layout for graphs too large for plain FR.
+
+    Communities are placed by Fruchterman-Reingold on the quotient graph and
+    each community's members inside a disc whose area follows its size, so
+    the cost is bounded by ``max_block`` squared per block instead of n
+    squared. Only the ``max_block`` largest communities take part in the
+    quotient layout; the rest sit next to a placed neighbour. Blocks larger
+    than ``max_block`` are drawn as a sunflower disc with hubs at the centre.
+    """
+    n = graph.node_count
+    if n == 0:
+        return np.zeros((0, 2))
+    labels = np.asarray(partition, dtype=np.int64)
+    count = int(labels.max()) + 1
+    sizes = np.bincount(labels, minlength=count)
+    src, dst = graph.edge_sources(), graph.out_targets
+    cu, cv = labels[src], labels[dst]
+    cross = cu != cv
+
+    order = np.argsort(-sizes, kind="stable")
+    head = order[:max_block]
+    slot = np.full(count, -1, dtype=np.int64)
+    slot[head] = np.arange(head.size)
+    quotient = np.stack([slot[cu[cross]], slot[cv[cross]]], axis=1)
+    quotient = quotient[(quotient >= 0).all(axis=1)]
+    if quotient.size:
+        quotient = np.unique(quotient, axis=0)
+    centers = np.zeros((count, 2))
+    centers[head] = force_directed_layout(head.size, quotient, iterations, seed)
+
+    tail = order[max_block:]
+    if tail.size:
+        rng = np.random.default_rng(seed)
+        anchor = np.full(count, -1, dtype=np.int64)
+        for a, b in ((cu[cross], cv[cross]), (cv[cross], cu[cross])):
+            attach = (slot[a] >= 0) & (slot[b] < 0)
+            anchor[b[attach]] = a[attach]
+        anchored = tail[anchor[tail] >= 0]
+        centers[anchored] = centers[anchor[anchored]] + rng.normal(0.0, 0.02, (anchored.size, 2))
+        loose = tail[anchor[tail] < 0]
+        centers[loose] = rng.random((loose.size, 2))
+
+    radius = 0.5 * np.sqrt(sizes / n)
+    degree = np.diff(graph.out_offsets) + np.diff(graph.in_offsets)
+    by_label = np.argsort(labels, kind="stable")
+    bounds = np.concatenate([[0], np.cumsum(sizes)])
+    intra = np.flatnonzero(~cross)
+    intra = intra[np.argsort(cu[intra], kind="stable")]
+    intra_bounds = np.searchsorted(cu[intra], np.arange(count + 1))
+    local = np.zeros(n, dtype=np.int64)
+    positions = np.empty((n, 2))
+    for community in range(count):
+        members = by_label[bounds[community] : bounds[community + 1]]
+        if members.size == 1:
+            positions[members[0]] = centers[community]
+            continue
+        if members.size <= max_block:
+            local[members] = np.arange(members.size)
+            edge_ids = intra[intra_bounds[community] : intra_bounds[community + 1]]
+            pairs = np.stack([local[src[edge_ids]], local[dst[edge_ids]]], axis=1)
+            unit = force_directed_layout(members.size, pairs, iterations, seed + community)
+        else:
+            members = members[np.argsort(-degree[members], kind="stable")]
+            unit = _sunflower(members.size)
+        positions[members] = centers[community] + (unit - 0.5) * 2.0 * radius[community]
+    return _fit_unit_square(positions)
+
+
+@dataclass
+class GraphLayout:
+    """Positioned graph plus the per-community aggregates used for level of detail.
+
+    Community labels stay stable while a layout is extended incrementally;
+    communities that lost every member keep their slot with size 0.
+    """
+
+    version: int
+    node_ids: List[str]
+    index: Dict[str, int]
+    positions: np.ndarray  # (n, 2) in the unit square
+    communities: np.ndarray  # community label per node
+    degree: np.ndarray
+    rank: np.ndarray  # PageRank; decides which nodes survive LOD culling
+    centers: np.ndarray  # (c, 2) member centroid per community
+    sizes: np.ndarray
+    representatives: np.ndarray  # highest-ranked member per community, -1 if empty
+    edge_src: np.ndarray  # unique directed node pairs, self-loops dropped
+    edge_dst: np.ndarray
+    cluster_src: np.ndarray  # unique community pairs with edge counts
+    cluster_dst: np.ndarray
+    cluster_weight: np.ndarray
+
+
+def _unique_pairs(a: np.ndarray, b: np.ndarray, base: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    keys, counts = np.unique(a.astype(np.int64) * base + b, return_counts=True)
+    return keys // base, keys % base, counts
+
+
+def _finish_layout(
+    graph: CSRGraph, version: int, positions: np.ndarray, labels: np.ndarray
+) -> GraphLayout:
+    n = graph.node_count
+    count = int(labels.max()) + 1 if n else 0
+    sizes = np.bincount(labels, minlength=count)
+    centers = np.zeros((count, 2))
+    np.add.at(centers, labels, positions)
+    centers /= np.maximum(sizes, 1)[:, None]
+    rank = pagerank(graph) if n else np.zeros(0)
+    representatives = np.full(count, -1, dtype=np.int64)
+    if n:
+        order = np.lexsort((-rank, labels))
+        firsts = np.searchsorted(labels[order], np.arange(count))
+        present = sizes > 0
+        representatives[present] = order[firsts[present]]
+    src, dst = graph.edge_sources(), graph.out_targets
+    keep = src != dst
+    edge_src, edge_dst, _ = _unique_pairs(src[keep], dst[keep], max(n, 1))
+    cu, cv = labels[src], labels[dst]
+    cross = cu != cv
+    cluster_src, cluster_dst, cluster_weight = _unique_pairs(cu[cross], cv[cross], max(count, 1))
+    return GraphLayout(
+        version=version,
+        node_ids=list(graph.node_ids),
+        index=dict(graph.index),
+        positions=positions,
+        communities=labels,
+        degree=np.diff(graph.out_offsets) + np.diff(graph.in_offsets),
+        rank=rank,
+        centers=centers,
+        sizes=sizes,
+        representatives=representatives,
+        edge_src=edge_src,
+        edge_dst=edge_dst,
+        cluster_src=cluster_src,
+        cluster_dst=cluster_dst,
+        cluster_weight=cluster_weight,
+    )
+
+
+def extend_layout(
+    graph: CSRGraph, previous: GraphLayout, seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Carry positions and communities over from ``previous``.
+
+    Surviving nodes keep their coordinates so deltas stay small; new nodes
+    are dropped next to the centroid of already placed neighbours and join
+    their most common community, or get a random spot and a new community.
+    """
+    n = graph.node_count
+    rng = np.random.default_rng(seed + previous.version)
+    positions = np.zeros((n, 2))
+    labels = np.full(n, -1, dtype=np.int64)
+    placed = np.zeros(n, dtype=bool)
+    for node, node_id in enumerate(graph.node_ids):
+        old = previous.index.get(node_id)
+        if old is not None:
+            positions[node] = previous.positions[old]
+            labels[node] = previous.communities[old]
+            placed[node] = True
+    next_label = int(previous.sizes.shape[0])
+    pending = np.flatnonzero(~placed).tolist()
+    while pending:
+        deferred = []
+        for node in pending:
+            neighbours = np.concatenate(
+                [
+                    graph.out_targets[graph.out_offsets[node] : graph.out_offsets[node + 1]],
+                    graph.in_sources[graph.in_offsets[node] : graph.in_offsets[node + 1]],
+                ]
+            )
+            neighbours = neighbours[placed[neighbours]]
+            if neighbours.size == 0:
+                deferred.append(node)
+                continue
+            positions[node] = positions[neighbours].mean(axis=0) + rng.normal(0.0, 0.01, 2)
+            labels[node] = int(np.bincount(labels[neighbours]).argmax())
+            placed[node] = True
+        if len(deferred) == len(pending):
+            for node in deferred:
+                positions[node] = rng.random(2)
+                labels[node] = next_label
+                next_label += 1
+            break
+        pending = deferred
+    return np.clip(positions, 0.0, 1.0), labels
+
+
+def build_layout(
+    graph: CSRGraph,
+    version: int,
+    previous: Optional[GraphLayout] = None,
+    seed: int = 0,
+    relayout_ratio: float = 0.2,
+    community_algorithm: str = "louvain",
+) -> GraphLayout:
+    """Full hierarchical layout, or an incremental extension of ``previous``
+    when at most ``relayout_ratio`` of the nodes are new."""
+    if previous is not None and previous.node_ids and graph.node_count:
+        fresh = sum(1 for node_id in graph.node_ids if node_id not in previous.index)
+        if fresh <= relayout_ratio * graph.node_count:
+            positions, labels = extend_layout(graph, previous, seed)
+            return _finish_layout(graph, version, positions, labels)
+    if graph.node_count == 0:
+        return _finish_layout(graph, version, np.zeros((0, 2)), np.zeros(0, dtype=np.int64))
+    if community_algorithm == "louvain":
+        partition = louvain(graph, seed=seed)
+    else:
+        partition = label_propagation(graph, seed=seed)
+    positions = hierarchical_layout(graph, partition, seed=seed)
+    return _finish_layout(graph, version, positions, np.asarray(partition, dtype=np.int64))
+
+
+def _inside(points: np.ndarray, bbox: Tuple[float, float, float, float]) -> np.ndarray:
+    x0, y0, x1, y1 = bbox
+    return (
+        (points[:, 0] >= x0) & (points[:, 0] <= x1) & (points[:, 1] >= y0) & (points[:, 1] <= y1)
+    )
+
+
+def viewport_selection(
+    layout: GraphLayout,
+    bbox: Tuple[float, float, float, float],
+    max_nodes: int = 2000,
+    max_edges: Optional[int] = None,
+) -> Dict[str, object]:
+    """Decide what to draw inside ``bbox`` = (x0, y0, x1, y1).
+
+    Level ``"nodes"`` when every visible node fits in ``max_nodes``;
+    ``"clusters"`` (community super-nodes and aggregated edges) when more
+    are visible and several communities are in view; otherwise
+    ``"sampled"``, the ``max_nodes`` highest-ranked visible nodes.
+    """
+    max_edges = 4 * max_nodes if max_edges is None else max_edges
+    visible = np.flatnonzero(_inside(layout.positions, bbox))
+    total_visible = int(visible.size)
+    if total_visible > max_nodes:
+        clusters = np.flatnonzero(_inside(layout.centers, bbox) & (layout.sizes > 0))
+        if clusters.size > 1:
+            clusters = clusters[np.argsort(-layout.sizes[clusters], kind="stable")[:max_nodes]]
+            keep = np.zeros(layout.sizes.shape[0], dtype=bool)
+            keep[clusters] = True
+            edges = np.flatnonzero(keep[layout.cluster_src] & keep[layout.cluster_dst])
+            edges = edges[np.argsort(-layout.cluster_weight[edges], kind="stable")]
+            return {
+                "level": "clusters",
+                "visible_nodes": total_visible,
+                "clusters": clusters,
+                "edges": edges[:max_edges],
+                "truncated": True,
+            }
+        visible = visible[np.argsort(-layout.rank[visible], kind="stable")[:max_nodes]]
+    keep = np.zeros(len(layout.node_ids), dtype=bool)
+    keep[visible] = True
+    edges = np.flatnonzero(keep[layout.edge_src] & keep[layout.edge_dst])
+    return {
+        "level": "nodes" if total_visible <= max_nodes else "sampled",
+        "visible_nodes": total_visible,
+        "nodes": visible,
+        "edges": edges[:max_edges],
+        "truncated": total_visible > max_nodes or edges.size > max_edges,
+    }
+
+
+CENTRALITY_MEASURES = ("degree", "pagerank", "betweenness")
+COMMUNITY_ALGORITHMS = ("louvain", "label_propagation")
+
+
+def compute_centrality(
+    graph: CSRGraph, measures: Sequence[str], betweenness_samples: int = 64, seed: int = 0
+) -> Dict[str, np.ndarray]:
+    scores: Dict[str, np.ndarray] = {}
+    for measure in measures:
+        if measure == "degree":
+            scores[measure] = degree_centrality(graph)
+        elif measure == "pagerank":
+            scores[measure] = pagerank(graph)
+        elif measure == "betweenness":
+            scores[measure] = approximate_betweenness(graph, betweenness_samples, seed)
+        else:
+            raise ValueError(f"Unsupported centrality measure: {measure}")
+    return scores
+
+
+def compute_communities(
+    graph: CSRGraph, algorithm: str = "louvain", seed: int = 0
+) -> Tuple[List[int], float]:
+    """Return (community index per node, modularity of that partition)."""
+    if algorithm == "louvain":
+        partition = louvain(graph, seed=seed)
+    elif algorithm == "label_propagation":
+        partition = label_propagation(graph, seed=seed)
+    else:
+        raise ValueError(f"Unsupported community algorithm: {algorithm}")
+    return partition, modularity(graph, partition)
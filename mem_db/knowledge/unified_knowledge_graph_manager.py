@@ -16,11 +16,17 @@ Features:
 - Advanced graph analysis and visualization tools
 """
 
+import asyncio
+import bisect
 import logging
 import json
 import threading  # noqa: E402
+import time  # noqa: E402
+from collections import OrderedDict  # noqa: E402
+from functools import partial  # noqa: E402
+from itertools import islice  # noqa: E402
 from pathlib import Path  # noqa: E402
-from typing import Any, Dict, List, Optional, Set  # noqa: E402
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple  # noqa: E402
 import uuid # New import
 
 # Core dependencies
@@ -73,11 +79,34 @@ from .knowledge_graph_models import (  # noqa: E402
     LegalEntity,
     LegalRelationship,
 )
+from . import graph_analytics  # noqa: E402
+from mem_db.sqlite_pool import AsyncSQLitePool  # noqa: E402
 from services.contracts.aedis_models import ProvenanceRecord # New import
 from services.provenance_service import ProvenanceGateError, get_provenance_service # New imports for gate enforcement
 
 logger = logging.getLogger(__name__)
 
+_ENTITY_COLUMNS = "id, name, entity_type, content, jurisdiction, metadata_json"
+_RELATIONSHIP_COLUMNS = "id, source_id, target_id, relation_type, metadata_json"
+_SQL_IN_CHUNK = 500
+
+# Undirected breadth-first walk bounded by depth; both recursive branches hit
+# the relationships(source_id)/(target_id) indexes.
+_NEIGHBORHOOD_CTE = """
+WITH RECURSIVE walk(node_id, depth) AS (
+    SELECT ?, 0
+    UNION
+    SELECT r.target_id, w.depth + 1 FROM walk w
+    JOIN relationships r ON r.source_id = w.node_id
+    WHERE w.depth < ?
+    UNION
+    SELECT r.source_id, w.depth + 1 FROM walk w
+    JOIN relationships r ON r.target_id = w.node_id
+    WHERE w.depth < ?
+),
+nodes(node_id) AS (SELECT DISTINCT node_id FROM walk)
+"""
+
 # New service instance
 provenance_service = get_provenance_service()
 
@@ -94,6 +123,8 @@ class UnifiedKnowledgeGraphManager:
         neo4j_password: Optional[str] = None,
         enable_persistence: bool = True,
         enable_reasoning: bool = True,
+        lazy_loading: bool = False,
+        hot_node_cache_size: int = 10000,
     ):
         self.graph_path = Path(graph_path)
         self.graph_path.mkdir(parents=True, exist_ok=True)
@@ -101,16 +132,36 @@ class UnifiedKnowledgeGraphManager:
         self.enable_neo4j = enable_neo4j
         self.enable_persistence = enable_persistence
         self.enable_reasoning = enable_reasoning
+        # Storage-backed mode: rows stay in SQLite, only hot entities are cached
+        # and networkx is built on demand by materialize_graph().
+        self.lazy_loading = lazy_loading
+        self.hot_node_cache_size = max(1, int(hot_node_cache_size))
 
         self.db_path = self.graph_path / "knowledge_graph.db"
+        # Long-lived readers plus one queued writer instead of a connection per call
+        self._db_pool: Optional[AsyncSQLitePool] = (
+            AsyncSQLitePool(self.db_path)
+            if enable_persistence and AIOSQLITE_AVAILABLE
+            else None
+        )
         self.backup_path = self.graph_path / "backups"
         self.backup_path.mkdir(exist_ok=True)
 
         self.logger = logging.getLogger(__name__)
         self._lock = threading.RLock()
 
+        self._initialized = False
         self._networkx_graph: Optional[nx.MultiDiGraph] = None
         self._neo4j_driver = None
+        self._hot_entities: "OrderedDict[str, LegalEntity]" = OrderedDict()
+
+        # Bumped on every mutation; analytics caches are keyed by it.
+        self._graph_version = 0
+        self._csr_cache: Dict[Optional[str], Tuple[int, Any]] = {}
+        self._analysis_cache: "OrderedDict[Tuple, Tuple[int, Any]]" = OrderedDict()
+        # Recent server-side layouts by graph version, for viewport deltas.
+        self._layout_history: "OrderedDict[int, Any]" = OrderedDict()
+        self._layout_lock = asyncio.Lock()
 
         self._entities: Dict[str, LegalEntity] = {}
         self._relationships: Dict[str, LegalRelationship] = {}
@@ -118,6 +169,14 @@ class UnifiedKnowledgeGraphManager:
         self._entities_by_type: Dict[str, Set[str]] = {}
         self._relationships_by_type: Dict[RelationType, Set[str]] = {}
 
+        # Secondary indexes maintained on every mutation so lookups and paging
+        # never scan the full entity/relationship stores.
+        self._entity_ids_by_name: Dict[str, List[str]] = {}
+        self._outgoing: Dict[str, Set[str]] = {}
+        self._incoming: Dict[str, Set[str]] = {}
+        self._sorted_entity_ids: List[str] = []
+        self._sorted_relationship_ids: List[str] = []
+
         if enable_neo4j and NEO4J_AVAILABLE and neo4j_uri:
             try:
                 self._neo4j_driver = GraphDatabase.driver(
@@ -133,13 +192,23 @@ class UnifiedKnowledgeGraphManager:
             self.logger.error("NetworkX not available - knowledge graph disabled")
             return False
 
-        self._networkx_graph = nx.MultiDiGraph()
-
         if self.enable_persistence:
             await self._init_database()
+
+        if self.lazy_loading and not self.enable_persistence:
+            self.logger.warning("Lazy graph loading requires persistence - loading in memory")
+            self.lazy_loading = False
+
+        if self.lazy_loading:
+            self._initialized = True
+            return True
+
+        self._networkx_graph = nx.MultiDiGraph()
+        if self.enable_persistence:
             await self._load_from_database()
 
         await self._rebuild_indexes()
+        self._initialized = True
         return True
 
     async def _init_database(self):
@@ -162,8 +231,30 @@ class UnifiedKnowledgeGraphManager:
             is_active BOOLEAN, evidence_json TEXT, citations_json TEXT, metadata_json TEXT
         );
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        indexes = """
+        CREATE INDEX IF NOT EXISTS idx_entities_name_key ON entities(name_key);
+        CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(entity_type);
+        CREATE INDEX IF NOT EXISTS idx_relationships_source ON relationships(source_id);
+        CREATE INDEX IF NOT EXISTS idx_relationships_target ON relationships(target_id);
+        """
+        async with self._db_pool.write() as db:
             await db.executescript(schema)
+            async with db.execute("PRAGMA table_info(entities)") as cursor:
+                columns = {row[1] for row in await cursor.fetchall()}
+            if "name_key" not in columns:
+                await db.execute("ALTER TABLE entities ADD COLUMN name_key TEXT")
+            async with db.execute(
+                "SELECT id, name FROM entities WHERE name_key IS NULL"
+            ) as cursor:
+                backfill = [
+                    (self._normalize_name(name), entity_id)
+                    for entity_id, name in await cursor.fetchall()
+                ]
+            if backfill:
+                await db.executemany(
+                    "UPDATE entities SET name_key = ? WHERE id = ?", backfill
+                )
+            await db.executescript(indexes)
             await db.commit()
 
     async def _load_from_database(self) -> None:
@@ -172,78 +263,367 @@ class UnifiedKnowledgeGraphManager:
             return
 
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                async with db.execute(
-                    "SELECT id, name, entity_type, content, jurisdiction, metadata_json FROM entities"
-                ) as cursor:
-                    rows = await cursor.fetchall()
-                    for row in rows:
-                        entity_id, name, entity_type, content, jurisdiction, metadata_json = row
-                        metadata = {}
-                        if metadata_json:
-                            try:
-                                metadata = json.loads(metadata_json)
-                            except Exception:
-                                metadata = {}
-                        self._entities[entity_id] = LegalEntity(
-                            id=entity_id,
-                            name=name,
-                            entity_type=entity_type,
-                            content=content,
-                            jurisdiction=jurisdiction,
-                            metadata=metadata,
-                        )
-
-                async with db.execute(
-                    "SELECT id, source_id, target_id, relation_type, metadata_json FROM relationships"
-                ) as cursor:
-                    rows = await cursor.fetchall()
-                    for row in rows:
-                        rel_id, source_id, target_id, relation_type, metadata_json = row
-                        metadata = {}
-                        if metadata_json:
-                            try:
-                                metadata = json.loads(metadata_json)
-                            except Exception:
-                                metadata = {}
-                        self._relationships[rel_id] = LegalRelationship(
-                            id=rel_id,
-                            source_id=source_id,
-                            target_id=target_id,
-                            relation_type=self._normalize_relation_type(relation_type),
-                            metadata=metadata,
-                        )
+            entities, relationships = await self._db_load_all()
         except Exception as e:
             self.logger.warning(f"Failed loading knowledge graph from database: {e}")
+            return
+        for entity in entities:
+            self._entities[entity.id] = entity
+        for rel in relationships:
+            self._relationships[rel.id] = rel
+
+    @staticmethod
+    def _decode_metadata(metadata_json: Optional[str]) -> Dict[str, Any]:
+        if not metadata_json:
+            return {}
+        try:
+            return json.loads(metadata_json)
+        except Exception:
+            return {}
+
+    def _entity_from_row(self, row) -> LegalEntity:
+        entity_id, name, entity_type, content, jurisdiction, metadata_json = row
+        return LegalEntity(
+            id=entity_id,
+            name=name,
+            entity_type=entity_type,
+            content=content,
+            jurisdiction=jurisdiction,
+            metadata=self._decode_metadata(metadata_json),
+        )
+
+    def _relationship_from_row(self, row) -> LegalRelationship:
+        rel_id, source_id, target_id, relation_type, metadata_json = row
+        return LegalRelationship(
+            id=rel_id,
+            source_id=source_id,
+            target_id=target_id,
+            relation_type=self._normalize_relation_type(relation_type),
+            metadata=self._decode_metadata(metadata_json),
+        )
+
+    async def _db_load_all(self):
+        """Read every entity and relationship row (full export / eager load)."""
+        async with self._db_pool.read() as db:
+            async with db.execute(f"SELECT {_ENTITY_COLUMNS} FROM entities") as cursor:
+                entities = [self._entity_from_row(row) for row in await cursor.fetchall()]
+            async with db.execute(
+                f"SELECT {_RELATIONSHIP_COLUMNS} FROM relationships"
+            ) as cursor:
+                relationships = [
+                    self._relationship_from_row(row) for row in await cursor.fetchall()
+                ]
+        return entities, relationships
 
     async def _rebuild_indexes(self) -> None:
         """Rebuild in-memory indices and networkx graph from entity/relationship stores."""
         self._entities_by_type = {}
         self._relationships_by_type = {}
+        self._entity_ids_by_name = {}
+        self._outgoing = {}
+        self._incoming = {}
 
         if self._networkx_graph is not None:
             self._networkx_graph.clear()
 
         for entity in self._entities.values():
             self._entities_by_type.setdefault(entity.entity_type, set()).add(entity.id)
+            self._entity_ids_by_name.setdefault(
+                self._normalize_name(entity.name), []
+            ).append(entity.id)
             if self._networkx_graph is not None:
                 self._networkx_graph.add_node(entity.id, **entity.to_dict())
 
         for rel in self._relationships.values():
             self._relationships_by_type.setdefault(rel.relation_type, set()).add(rel.id)
+            self._outgoing.setdefault(rel.source_id, set()).add(rel.id)
+            self._incoming.setdefault(rel.target_id, set()).add(rel.id)
             if self._networkx_graph is not None:
-                self._networkx_graph.add_edge(
-                    rel.source_id,
-                    rel.target_id,
-                    key=rel.id,
-                    relation_type=rel.relation_type.value,
-                    **rel.metadata,
-                )
+                self._add_networkx_edge(rel)
+
+        self._sorted_entity_ids = sorted(self._entities)
+        self._sorted_relationship_ids = sorted(self._relationships)
+        self._graph_version += 1
+
+    @staticmethod
+    def _normalize_name(name: Optional[str]) -> str:
+        return (name or "").strip().lower()
+
+    @staticmethod
+    def _sorted_insert(ids: List[str], item_id: str) -> None:
+        pos = bisect.bisect_left(ids, item_id)
+        if pos == len(ids) or ids[pos] != item_id:
+            ids.insert(pos, item_id)
+
+    @staticmethod
+    def _sorted_remove(ids: List[str], item_id: str) -> None:
+        pos = bisect.bisect_left(ids, item_id)
+        if pos < len(ids) and ids[pos] == item_id:
+            del ids[pos]
+
+    def _index_entity(self, entity: LegalEntity) -> None:
+        """Store an entity and update every secondary index (replacing any prior version)."""
+        previous = self._entities.get(entity.id)
+        if previous is not None:
+            self._unindex_entity(previous)
+        self._entities[entity.id] = entity
+        self._entities_by_type.setdefault(entity.entity_type, set()).add(entity.id)
+        self._entity_ids_by_name.setdefault(self._normalize_name(entity.name), []).append(
+            entity.id
+        )
+        self._sorted_insert(self._sorted_entity_ids, entity.id)
+        if self._networkx_graph is not None:
+            self._networkx_graph.add_node(entity.id, **entity.to_dict())
+
+    def _unindex_entity(self, entity: LegalEntity) -> None:
+        self._entities.pop(entity.id, None)
+        self._entities_by_type.get(entity.entity_type, set()).discard(entity.id)
+        key = self._normalize_name(entity.name)
+        ids = self._entity_ids_by_name.get(key)
+        if ids is not None:
+            if entity.id in ids:
+                ids.remove(entity.id)
+            if not ids:
+                self._entity_ids_by_name.pop(key, None)
+        self._sorted_remove(self._sorted_entity_ids, entity.id)
+
+    def _add_networkx_edge(self, rel: LegalRelationship, graph=None) -> None:
+        (graph if graph is not None else self._networkx_graph).add_edge(
+            rel.source_id,
+            rel.target_id,
+            key=rel.id,
+            relation_type=rel.relation_type.value,
+            **rel.metadata,
+        )
+
+    def _index_relationship(self, rel: LegalRelationship) -> None:
+        """Store a relationship and update type/adjacency indexes."""
+        previous = self._relationships.get(rel.id)
+        if previous is not None:
+            self._unindex_relationship(previous)
+        self._relationships[rel.id] = rel
+        self._relationships_by_type.setdefault(rel.relation_type, set()).add(rel.id)
+        self._outgoing.setdefault(rel.source_id, set()).add(rel.id)
+        self._incoming.setdefault(rel.target_id, set()).add(rel.id)
+        self._sorted_insert(self._sorted_relationship_ids, rel.id)
+        if self._networkx_graph is not None:
+            self._add_networkx_edge(rel)
+
+    def _unindex_relationship(self, rel: LegalRelationship) -> None:
+        self._relationships.pop(rel.id, None)
+        self._relationships_by_type.get(rel.relation_type, set()).discard(rel.id)
+        self._outgoing.get(rel.source_id, set()).discard(rel.id)
+        self._incoming.get(rel.target_id, set()).discard(rel.id)
+        self._sorted_remove(self._sorted_relationship_ids, rel.id)
+        if self._networkx_graph is not None and self._networkx_graph.has_edge(
+            rel.source_id, rel.target_id, key=rel.id
+        ):
+            self._networkx_graph.remove_edge(rel.source_id, rel.target_id, key=rel.id)
+
+    def _mark_graph_changed(self) -> None:
+        self._graph_version += 1
+        if self.lazy_loading:
+            self._networkx_graph = None
+
+    def _remember_entity(self, entity: LegalEntity) -> None:
+        self._mark_graph_changed()
+        if self.lazy_loading:
+            self._cache_hot_entity(entity)
+            self._networkx_graph = None
+        else:
+            self._index_entity(entity)
+
+    def _remember_relationship(self, rel: LegalRelationship) -> None:
+        self._mark_graph_changed()
+        if self.lazy_loading:
+            self._networkx_graph = None
+        else:
+            self._index_relationship(rel)
+
+    def _cache_hot_entity(self, entity: LegalEntity) -> None:
+        self._hot_entities[entity.id] = entity
+        self._hot_entities.move_to_end(entity.id)
+        while len(self._hot_entities) > self.hot_node_cache_size:
+            self._hot_entities.popitem(last=False)
+
+    def _next_entity_id(self) -> str:
+        if self.lazy_loading:
+            return f"ent_{uuid.uuid4().hex[:12]}"
+        candidate = len(self._entities) + 1
+        while f"ent_{candidate}" in self._entities:
+            candidate += 1
+        return f"ent_{candidate}"
+
+    def _build_relationship(
+        self,
+        *,
+        source_id: str,
+        target_id: str,
+        relation_type: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        relationship_id: Optional[str] = None,
+    ) -> LegalRelationship:
+        relation_enum = self._normalize_relation_type(relation_type)
+        rel_metadata = dict(metadata or {})
+        if relation_enum is RelationType.RELATED_TO and relation_type:
+            rel_metadata.setdefault("relation_type_raw", relation_type)
+        return LegalRelationship(
+            id=relationship_id or f"rel_{source_id}_{target_id}_{relation_type}",
+            source_id=source_id,
+            target_id=target_id,
+            relation_type=relation_enum,
+            metadata=rel_metadata,
+        )
+
+    @staticmethod
+    def _page_ids(ids: List[str], limit: int, offset: int, cursor: Optional[str]):
+        """Slice a sorted id list by cursor (exclusive) or offset without copying it."""
+        start = bisect.bisect_right(ids, cursor) if cursor else max(0, offset)
+        return islice(ids, start, start + max(0, limit))
 
     async def _ensure_initialized(self) -> None:
-        if self._networkx_graph is None:
+        if not self._initialized:
             await self.initialize()
 
+    # --- Storage-backed (lazy) mode helpers ---
+
+    @staticmethod
+    def _chunks(items: List[str]):
+        for start in range(0, len(items), _SQL_IN_CHUNK):
+            yield items[start : start + _SQL_IN_CHUNK]
+
+    async def _db_load_entities(self, db, entity_ids: List[str]) -> Dict[str, LegalEntity]:
+        """Fetch entities by id, serving hot ones from the LRU cache."""
+        found: Dict[str, LegalEntity] = {}
+        missing: List[str] = []
+        for entity_id in entity_ids:
+            entity = self._hot_entities.get(entity_id)
+            if entity is None:
+                missing.append(entity_id)
+            else:
+                self._hot_entities.move_to_end(entity_id)
+                found[entity_id] = entity
+        for chunk in self._chunks(missing):
+            placeholders = ",".join("?" * len(chunk))
+            async with db.execute(
+                f"SELECT {_ENTITY_COLUMNS} FROM entities WHERE id IN ({placeholders})",
+                chunk,
+            ) as cursor:
+                for row in await cursor.fetchall():
+                    entity = self._entity_from_row(row)
+                    self._cache_hot_entity(entity)
+                    found[entity.id] = entity
+        return found
+
+    async def _db_ids_for_names(self, names: List[Optional[str]]) -> Dict[str, str]:
+        """Map normalized names to the first matching entity id."""
+        keys = list({self._normalize_name(name) for name in names})
+        found: Dict[str, str] = {}
+        async with self._db_pool.read() as db:
+            for chunk in self._chunks(keys):
+                placeholders = ",".join("?" * len(chunk))
+                async with db.execute(
+                    f"SELECT name_key, id FROM entities WHERE name_key IN ({placeholders}) "
+                    "ORDER BY rowid",
+                    chunk,
+                ) as cursor:
+                    for key, entity_id in await cursor.fetchall():
+                        found.setdefault(key, entity_id)
+        return found
+
+    async def _db_row_exists(self, table: str, row_id: str) -> bool:
+        async with self._db_pool.read() as db:
+            async with db.execute(f"SELECT 1 FROM {table} WHERE id = ?", (row_id,)) as cursor:
+                return await cursor.fetchone() is not None
+
+    async def _db_page(
+        self, table: str, columns: str, limit: int, offset: int, cursor: Optional[str]
+    ) -> List[tuple]:
+        if cursor:
+            sql = f"SELECT {columns} FROM {table} WHERE id > ? ORDER BY id LIMIT ?"
+            params: tuple = (cursor, max(0, limit))
+        else:
+            sql = f"SELECT {columns} FROM {table} ORDER BY id LIMIT ? OFFSET ?"
+            params = (max(0, limit), max(0, offset))
+        async with self._db_pool.read() as db:
+            async with db.execute(sql, params) as db_cursor:
+                return list(await db_cursor.fetchall())
+
+    async def _db_stats(self) -> Dict[str, Any]:
+        async with self._db_pool.read() as db:
+            async with db.execute(
+                "SELECT entity_type, COUNT(*) FROM entities GROUP BY entity_type"
+            ) as cursor:
+                entity_types = {row[0]: row[1] for row in await cursor.fetchall()}
+            async with db.execute(
+                "SELECT relation_type, COUNT(*) FROM relationships GROUP BY relation_type"
+            ) as cursor:
+                relationship_types = {row[0]: row[1] for row in await cursor.fetchall()}
+        return {
+            "total_entities": sum(entity_types.values()),
+            "total_relationships": sum(relationship_types.values()),
+            "entity_types": entity_types,
+            "relationship_types": relationship_types,
+        }
+
+    async def _db_subgraph(self, node_id: str, depth: int) -> Dict[str, Any]:
+        radius = max(1, depth)
+        params = (node_id, radius, radius)
+        async with self._db_pool.read() as db:
+            async with db.execute(
+                _NEIGHBORHOOD_CTE + "SELECT node_id FROM nodes", params
+            ) as cursor:
+                node_ids = [row[0] for row in await cursor.fetchall()]
+            async with db.execute(
+                _NEIGHBORHOOD_CTE
+                + f"SELECT {_RELATIONSHIP_COLUMNS} FROM relationships "
+                "WHERE source_id IN (SELECT node_id FROM nodes) "
+                "AND target_id IN (SELECT node_id FROM nodes)",
+                params,
+            ) as cursor:
+                relationships = [
+                    self._relationship_from_row(row) for row in await cursor.fetchall()
+                ]
+            entities = await self._db_load_entities(db, node_ids)
+
+        if not relationships and node_id not in entities:
+            return {"nodes": [], "edges": []}
+        nodes = [
+            {"id": nid, **(entities[nid].to_dict() if nid in entities else {})}
+            for nid in node_ids
+        ]
+        edges = [
+            {
+                "source": rel.source_id,
+                "target": rel.target_id,
+                "key": rel.id,
+                "relation_type": rel.relation_type.value,
+                **rel.metadata,
+            }
+            for rel in relationships
+        ]
+        return {"nodes": nodes, "edges": edges}
+
+    async def materialize_graph(self) -> "nx.MultiDiGraph":
+        """Return a networkx view of the whole graph for analytics.
+
+        In lazy mode the graph is built from SQLite on first use and dropped
+        again by the next mutation.
+        """
+        await self._ensure_initialized()
+        if self._networkx_graph is None:
+            version = self._graph_version
+            graph = nx.MultiDiGraph()
+            entities, relationships = await self._db_load_all()
+            for entity in entities:
+                graph.add_node(entity.id, **entity.to_dict())
+            for rel in relationships:
+                self._add_networkx_edge(rel, graph)
+            if version != self._graph_version:
+                return graph
+            self._networkx_graph = graph
+        return self._networkx_graph
+
     @staticmethod
     def _normalize_relation_type(relation_type: str) -> RelationType:
         raw = (relation_type or "").strip().lower()
@@ -260,9 +640,20 @@ class UnifiedKnowledgeGraphManager:
 
     async def get_status(self) -> Dict[str, Any]:
         await self._ensure_initialized()
+        if self.lazy_loading:
+            return {
+                "available": True,
+                "initialized": self._initialized,
+                "storage_mode": "lazy",
+                "db_pool": self._db_pool.stats() if self._db_pool is not None else None,
+                "hot_entities_cached": len(self._hot_entities),
+                "stats": await self._db_stats(),
+            }
         return {
             "available": True,
-            "initialized": self._networkx_graph is not None,
+            "initialized": self._initialized,
+            "storage_mode": "memory",
+            "db_pool": self._db_pool.stats() if self._db_pool is not None else None,
             "stats": {
                 "total_entities": len(self._entities),
                 "total_relationships": len(self._relationships),
@@ -297,27 +688,23 @@ class UnifiedKnowledgeGraphManager:
             )
 
         entity = LegalEntity(
-            id=entity_id or f"ent_{len(self._entities) + 1}",
+            id=entity_id or self._next_entity_id(),
             name=name,
             entity_type=entity_type,
             content=content,
             jurisdiction=jurisdiction,
             metadata=metadata or {},
         )
-        self._entities[entity.id] = entity
-        self._entities_by_type.setdefault(entity.entity_type, set()).add(entity.id)
-
-        if self._networkx_graph is not None:
-            self._networkx_graph.add_node(entity.id, **entity.to_dict())
+        self._remember_entity(entity)
 
         if self.enable_persistence and AIOSQLITE_AVAILABLE:
             try:
-                async with aiosqlite.connect(self.db_path) as db:
+                async with self._db_pool.write() as db:
                     await db.execute(
                         """
                         INSERT OR REPLACE INTO entities
-                        (id, name, entity_type, content, jurisdiction, metadata_json)
-                        VALUES (?, ?, ?, ?, ?, ?)
+                        (id, name, entity_type, content, jurisdiction, metadata_json, name_key)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
                         """,
                         (
                             entity.id,
@@ -326,6 +713,7 @@ class UnifiedKnowledgeGraphManager:
                             entity.content,
                             entity.jurisdiction,
                             json.dumps(entity.metadata),
+                            self._normalize_name(entity.name),
                         ),
                     )
                     await db.commit()
@@ -346,7 +734,7 @@ class UnifiedKnowledgeGraphManager:
                 entity.metadata["provenance_id"] = prov_id
                 # And update the entity in DB to store this
                 if self.enable_persistence and AIOSQLITE_AVAILABLE:
-                    async with aiosqlite.connect(self.db_path) as db:
+                    async with self._db_pool.write() as db:
                         await db.execute(
                             "UPDATE entities SET metadata_json = ? WHERE id = ?",
                             (json.dumps(entity.metadata), entity.id),
@@ -365,19 +753,25 @@ class UnifiedKnowledgeGraphManager:
 
     async def delete_entity(self, entity_id: str) -> bool:
         await self._ensure_initialized()
-        if entity_id not in self._entities:
-            return False
+        if self.lazy_loading:
+            if not await self._db_row_exists("entities", entity_id):
+                return False
+            self._hot_entities.pop(entity_id, None)
+        else:
+            if entity_id not in self._entities:
+                return False
 
-        # Remove from in-memory stores
-        entity = self._entities.pop(entity_id)
-        self._entities_by_type.get(entity.entity_type, set()).discard(entity_id)
-        if self._networkx_graph is not None:
-            self._networkx_graph.remove_node(entity_id)
+            # Remove from in-memory stores
+            entity = self._entities[entity_id]
+            self._unindex_entity(entity)
+            if self._networkx_graph is not None and entity_id in self._networkx_graph:
+                self._networkx_graph.remove_node(entity_id)
+        self._mark_graph_changed()
 
         # Remove from persistent store
         if self.enable_persistence and AIOSQLITE_AVAILABLE:
             try:
-                async with aiosqlite.connect(self.db_path) as db:
+                async with self._db_pool.write() as db:
                     await db.execute("DELETE FROM entities WHERE id = ?", (entity_id,))
                     await db.commit()
             except Exception as e:
@@ -398,19 +792,190 @@ class UnifiedKnowledgeGraphManager:
 
         return True
 
-    async def list_entities(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+    async def list_entities(
+        self, limit: int = 50, offset: int = 0, cursor: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return entities ordered by id; ``cursor`` resumes after the given id."""
         await self._ensure_initialized()
-        values = list(self._entities.values())
-        page = values[offset : offset + limit]
-        return [entity.to_dict() for entity in page]
+        if self.lazy_loading:
+            rows = await self._db_page("entities", _ENTITY_COLUMNS, limit, offset, cursor)
+            return [self._entity_from_row(row).to_dict() for row in rows]
+        page = self._page_ids(self._sorted_entity_ids, limit, offset, cursor)
+        return [self._entities[entity_id].to_dict() for entity_id in page]
+
+    def _first_id_for_name(self, name: Optional[str]) -> Optional[str]:
+        ids = self._entity_ids_by_name.get(self._normalize_name(name))
+        return ids[0] if ids else None
 
     async def find_entity_id_by_name(self, name: str) -> Optional[str]:
         await self._ensure_initialized()
-        target = (name or "").strip().lower()
-        for entity in self._entities.values():
-            if entity.name.strip().lower() == target:
-                return entity.id
-        return None
+        if self.lazy_loading:
+            return (await self._db_ids_for_names([name])).get(self._normalize_name(name))
+        return self._first_id_for_name(name)
+
+    async def find_entity_ids_by_names(self, names: List[str]) -> Dict[str, Optional[str]]:
+        """Resolve many names at once; keys are the names as given."""
+        await self._ensure_initialized()
+        if self.lazy_loading:
+            found = await self._db_ids_for_names(names)
+            return {name: found.get(self._normalize_name(name)) for name in names}
+        return {name: self._first_id_for_name(name) for name in names}
+
+    async def list_entity_ids_by_type(self, entity_type: str) -> List[str]:
+        await self._ensure_initialized()
+        if self.lazy_loading:
+            async with self._db_pool.read() as db:
+                async with db.execute(
+                    "SELECT id FROM entities WHERE entity_type = ? ORDER BY id",
+                    (entity_type,),
+                ) as cursor:
+                    return [row[0] for row in await cursor.fetchall()]
+        return sorted(self._entities_by_type.get(entity_type, ()))
+
+    async def get_entity_relationships(
+        self, entity_id: str, direction: str = "both"
+    ) -> List[Dict[str, Any]]:
+        """Return relationships touching ``entity_id`` using the adjacency index.
+
+        ``direction`` is one of ``"out"``, ``"in"`` or ``"both"``.
+        """
+        await self._ensure_initialized()
+        if self.lazy_loading:
+            clauses = []
+            if direction in ("out", "both"):
+                clauses.append("source_id = ?")
+            if direction in ("in", "both"):
+                clauses.append("target_id = ?")
+            if not clauses:
+                return []
+            async with self._db_pool.read() as db:
+                async with db.execute(
+                    f"SELECT {_RELATIONSHIP_COLUMNS} FROM relationships "
+                    f"WHERE {' OR '.join(clauses)} ORDER BY id",
+                    (entity_id,) * len(clauses),
+                ) as cursor:
+                    return [
+                        self._relationship_from_row(row).to_dict()
+                        for row in await cursor.fetchall()
+                    ]
+        rel_ids: Set[str] = set()
+        if direction in ("out", "both"):
+            rel_ids |= self._outgoing.get(entity_id, set())
+        if direction in ("in", "both"):
+            rel_ids |= self._incoming.get(entity_id, set())
+        return [self._relationships[rid].to_dict() for rid in sorted(rel_ids)]
+
+    async def bulk_upsert(
+        self,
+        *,
+        entities: Optional[List[Dict[str, Any]]] = None,
+        relationships: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, List[str]]:
+        """Insert or replace many entities and relationships in one transaction.
+
+        Entity dicts accept ``name``, ``entity_type``, ``content``, ``jurisdiction``,
+        ``metadata`` and ``entity_id``; relationship dicts accept ``source_id``,
+        ``target_id``, ``relation_type``, ``metadata`` and ``relationship_id``.
+        Endpoints may instead be given as ``source_name``/``target_name``, resolved
+        through the name index after the entities in this batch are applied;
+        unresolvable relationships are skipped. Provenance-gated writes must go
+        through ``add_entity``/``add_relationship``.
+        """
+        await self._ensure_initialized()
+
+        new_entities: List[LegalEntity] = []
+        for item in entities or []:
+            entity = LegalEntity(
+                id=item.get("entity_id") or self._next_entity_id(),
+                name=item["name"],
+                entity_type=item.get("entity_type") or "generic",
+                content=item.get("content"),
+                jurisdiction=item.get("jurisdiction"),
+                metadata=dict(item.get("metadata") or {}),
+            )
+            self._remember_entity(entity)
+            new_entities.append(entity)
+
+        resolve_name = self._first_id_for_name
+        if self.lazy_loading:
+            wanted = [
+                item.get(key)
+                for item in relationships or []
+                for key in ("source_name", "target_name")
+                if item.get(key)
+            ]
+            name_ids = await self._db_ids_for_names(wanted) if wanted else {}
+            for entity in new_entities:
+                name_ids.setdefault(self._normalize_name(entity.name), entity.id)
+
+            def resolve_name(name: Optional[str]) -> Optional[str]:
+                return name_ids.get(self._normalize_name(name))
+
+        new_relationships: List[LegalRelationship] = []
+        for item in relationships or []:
+            source_id = item.get("source_id") or resolve_name(item.get("source_name"))
+            target_id = item.get("target_id") or resolve_name(item.get("target_name"))
+            if not source_id or not target_id:
+                continue
+            rel = self._build_relationship(
+                source_id=source_id,
+                target_id=target_id,
+                relation_type=item.get("relation_type") or "",
+                metadata=item.get("metadata"),
+                relationship_id=item.get("relationship_id"),
+            )
+            self._remember_relationship(rel)
+            new_relationships.append(rel)
+
+        if self.enable_persistence and AIOSQLITE_AVAILABLE and (
+            new_entities or new_relationships
+        ):
+            try:
+                async with self._db_pool.write() as db:
+                    await db.executemany(
+                        """
+                        INSERT OR REPLACE INTO entities
+                        (id, name, entity_type, content, jurisdiction, metadata_json, name_key)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        [
+                            (
+                                e.id,
+                                e.name,
+                                e.entity_type,
+                                e.content,
+                                e.jurisdiction,
+                                json.dumps(e.metadata),
+                                self._normalize_name(e.name),
+                            )
+                            for e in new_entities
+                        ],
+                    )
+                    await db.executemany(
+                        """
+                        INSERT OR REPLACE INTO relationships
+                        (id, source_id, target_id, relation_type, metadata_json)
+                        VALUES (?, ?, ?, ?, ?)
+                        """,
+                        [
+                            (
+                                r.id,
+                                r.source_id,
+                                r.target_id,
+                                r.relation_type.value,
+                                json.dumps(r.metadata),
+                            )
+                            for r in new_relationships
+                        ],
+                    )
+                    await db.commit()
+            except Exception as e:
+                self.logger.warning(f"Failed persisting bulk upsert: {e}")
+
+        return {
+            "entity_ids": [e.id for e in new_entities],
+            "relationship_ids": [r.id for r in new_relationships],
+        }
 
     async def add_relationship(
         self,
@@ -433,35 +998,18 @@ class UnifiedKnowledgeGraphManager:
                 temp_relationship_id, # Use temporary ID for validation
             )
 
-        relation_enum = self._normalize_relation_type(relation_type)
-        rel_metadata = dict(metadata or {})
-        if relation_enum is RelationType.RELATED_TO and relation_type:
-            rel_metadata.setdefault("relation_type_raw", relation_type)
-
-        relationship = LegalRelationship(
-            id=relationship_id or f"rel_{source_id}_{target_id}_{relation_type}",
+        relationship = self._build_relationship(
             source_id=source_id,
             target_id=target_id,
-            relation_type=relation_enum,
-            metadata=rel_metadata,
+            relation_type=relation_type,
+            metadata=metadata,
+            relationship_id=relationship_id,
         )
-        self._relationships[relationship.id] = relationship
-        self._relationships_by_type.setdefault(relationship.relation_type, set()).add(
-            relationship.id
-        )
-
-        if self._networkx_graph is not None:
-            self._networkx_graph.add_edge(
-                relationship.source_id,
-                relationship.target_id,
-                key=relationship.id,
-                relation_type=relationship.relation_type.value,
-                **relationship.metadata,
-            )
+        self._remember_relationship(relationship)
 
         if self.enable_persistence and AIOSQLITE_AVAILABLE:
             try:
-                async with aiosqlite.connect(self.db_path) as db:
+                async with self._db_pool.write() as db:
                     await db.execute(
                         """
                         INSERT OR REPLACE INTO relationships
@@ -494,7 +1042,7 @@ class UnifiedKnowledgeGraphManager:
                 )
                 relationship.metadata["provenance_id"] = prov_id
                 if self.enable_persistence and AIOSQLITE_AVAILABLE:
-                    async with aiosqlite.connect(self.db_path) as db:
+                    async with self._db_pool.write() as db:
                         await db.execute(
                             "UPDATE relationships SET metadata_json = ? WHERE id = ?",
                             (json.dumps(relationship.metadata), relationship.id),
@@ -513,21 +1061,21 @@ class UnifiedKnowledgeGraphManager:
 
     async def delete_relationship(self, relationship_id: str) -> bool:
         await self._ensure_initialized()
-        if relationship_id not in self._relationships:
-            return False
+        if self.lazy_loading:
+            if not await self._db_row_exists("relationships", relationship_id):
+                return False
+        else:
+            if relationship_id not in self._relationships:
+                return False
 
-        # Remove from in-memory stores
-        rel = self._relationships.pop(relationship_id)
-        self._relationships_by_type.get(rel.relation_type, set()).discard(relationship_id)
-        if self._networkx_graph is not None:
-            # networkx remove_edge requires source, target, and key
-            if self._networkx_graph.has_edge(rel.source_id, rel.target_id, key=relationship_id):
-                self._networkx_graph.remove_edge(rel.source_id, rel.target_id, key=relationship_id)
+            # Remove from in-memory stores (also drops the networkx edge)
+            self._unindex_relationship(self._relationships[relationship_id])
+        self._mark_graph_changed()
 
         # Remove from persistent store
         if self.enable_persistence and AIOSQLITE_AVAILABLE:
             try:
-                async with aiosqlite.connect(self.db_path) as db:
+                async with self._db_pool.write() as db:
                     await db.execute("DELETE FROM relationships WHERE id = ?", (relationship_id,))
                     await db.commit()
             except Exception as e:
@@ -545,15 +1093,22 @@ class UnifiedKnowledgeGraphManager:
         return True
 
     async def list_relationships(
-        self, limit: int = 50, offset: int = 0
+        self, limit: int = 50, offset: int = 0, cursor: Optional[str] = None
     ) -> List[Dict[str, Any]]:
+        """Return relationships ordered by id; ``cursor`` resumes after the given id."""
         await self._ensure_initialized()
-        values = list(self._relationships.values())
-        page = values[offset : offset + limit]
-        return [relationship.to_dict() for relationship in page]
+        if self.lazy_loading:
+            rows = await self._db_page(
+                "relationships", _RELATIONSHIP_COLUMNS, limit, offset, cursor
+            )
+            return [self._relationship_from_row(row).to_dict() for row in rows]
+        page = self._page_ids(self._sorted_relationship_ids, limit, offset, cursor)
+        return [self._relationships[rel_id].to_dict() for rel_id in page]
 
     async def get_subgraph(self, node_id: str, depth: int = 1) -> Dict[str, Any]:
         await self._ensure_initialized()
+        if self.lazy_loading:
+            return await self._db_subgraph(node_id, depth)
         if self._networkx_graph is None or node_id not in self._networkx_graph:
             return {"nodes": [], "edges": []}
 
@@ -570,12 +1125,17 @@ class UnifiedKnowledgeGraphManager:
 
     async def export_graph_data(self) -> Dict[str, Any]:
         await self._ensure_initialized()
-        if self._networkx_graph is None:
+        if self.lazy_loading:
+            entities, relationships = await self._db_load_all()
+        elif self._networkx_graph is None:
             return {"nodes": [], "edges": []}
+        else:
+            entities = self._entities.values()
+            relationships = self._relationships.values()
 
         nodes = [
             {"id": entity.id, **entity.to_dict()}
-            for entity in self._entities.values()
+            for entity in entities
         ]
         edges = [
             {
@@ -585,39 +1145,460 @@ class UnifiedKnowledgeGraphManager:
                 "relation_type": rel.relation_type.value,
                 "metadata": rel.metadata,
             }
-            for rel in self._relationships.values()
+            for rel in relationships
         ]
         return {"nodes": nodes, "edges": edges}
 
-    # --- Methods from knowledge_graph_agent.py ---
+    async def close(self) -> None:
+        """Close pooled SQLite connections and the Neo4j driver, if any."""
+        if self._db_pool is not None:
+            await self._db_pool.close()
+        if self._neo4j_driver is not None:
+            self._neo4j_driver.close()
+            self._neo4j_driver = None
+
+    # --- Graph analytics (CSR-backed, cached per graph version) ---
+
+    @staticmethod
+    async def _run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(func, *args))
+
+    @staticmethod
+    def _edge_weight(metadata: Dict[str, Any], weight: Optional[str]) -> float:
+        if not weight:
+            return 1.0
+        try:
+            return float(metadata.get(weight, 1.0))
+        except (TypeError, ValueError):
+            return 1.0
+
+    async def _analytics_edges(self, weight: Optional[str]):
+        if not self.lazy_loading:
+            node_ids = list(self._entities)
+            edges = [
+                (rel.source_id, rel.target_id, self._edge_weight(rel.metadata, weight))
+                for rel in self._relationships.values()
+            ]
+            return node_ids, edges
+
+        columns = "source_id, target_id, metadata_json" if weight else "source_id, target_id"
+        async with self._db_pool.read() as db:
+            async with db.execute("SELECT id FROM entities") as cursor:
+                node_ids = [row[0] for row in await cursor.fetchall()]
+            async with db.execute(f"SELECT {columns} FROM relationships") as cursor:
+                rows = await cursor.fetchall()
+        if weight:
+            edges = [
+                (src, dst, self._edge_weight(self._decode_metadata(raw), weight))
+                for src, dst, raw in rows
+            ]
+        else:
+            edges = [(src, dst, 1.0) for src, dst in rows]
+        return node_ids, edges
+
+    async def get_csr_graph(self, weight: Optional[str] = None) -> "graph_analytics.CSRGraph":
+        """Return the compact CSR adjacency for the current graph version."""
+        await self._ensure_initialized()
+        version = self._graph_version
+        cached = self._csr_cache.get(weight)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        node_ids, edges = await self._analytics_edges(weight)
+        graph = await self._run_blocking(graph_analytics.build_csr, node_ids, edges)
+        if version == self._graph_version:
+            self._csr_cache = {
+                key: value for key, value in self._csr_cache.items() if value[0] == version
+            }
+            self._csr_cache[weight] = (version, graph)
+        return graph
+
+    # Analysis results kept per graph version; shortest paths add one entry per
+    # endpoint pair, so the cache evicts least recently used results.
+    ANALYSIS_CACHE_SIZE = 256
+
+    async def _cached_analysis(
+        self, key: Tuple, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        version = self._graph_version
+        hit = self._analysis_cache.get(key)
+        if hit is not None and hit[0] == version:
+            self._analysis_cache.move_to_end(key)
+            return hit[1]
+        result = await compute()
+        if version == self._graph_version:
+            self._analysis_cache = OrderedDict(
+                (k, v)
+                for k, v in self._analysis_cache.items()
+                if v[0] == version and k != key
+            )
+            self._analysis_cache[key] = (version, result)
+            while len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        return result
+
+    async def _lookup_entities(self, entity_ids: List[str]) -> Dict[str, LegalEntity]:
+        if not self.lazy_loading:
+            return {eid: self._entities[eid] for eid in entity_ids if eid in self._entities}
+        async with self._db_pool.read() as db:
+            return await self._db_load_entities(db, list(entity_ids))
+
+    async def _entity_names(self, entity_ids: List[str]) -> Dict[str, str]:
+        entities = await self._lookup_entities(entity_ids)
+        return {eid: entity.name for eid, entity in entities.items()}
+
+    @staticmethod
+    def _require_numpy() -> None:
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for graph analytics.")
 
     async def analyze_centrality(
-        self, measures: List[str] = None, top_k: int = 10
+        self,
+        measures: List[str] = None,
+        top_k: int = 10,
+        betweenness_samples: int = 64,
     ) -> GraphAnalysisResult:
-        if not VIZ_AVAILABLE:
-            raise ImportError("Visualization libraries not installed.")
-        # ... (implementation from knowledge_graph_agent.py) ...
+        """Top-k nodes by degree, PageRank and/or sampled betweenness centrality."""
+        self._require_numpy()
+        selected = [m.strip().lower() for m in (measures or graph_analytics.CENTRALITY_MEASURES)]
+        unknown = sorted(set(selected) - set(graph_analytics.CENTRALITY_MEASURES))
+        if unknown:
+            raise ValueError(f"Unsupported centrality measures: {unknown}")
+
+        async def compute() -> GraphAnalysisResult:
+            graph = await self.get_csr_graph()
+            started = time.perf_counter()
+            scores = await self._run_blocking(
+                graph_analytics.compute_centrality, graph, selected, betweenness_samples
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            results: Dict[str, List[Dict[str, Any]]] = {}
+            for measure, values in scores.items():
+                top = np.argsort(-values, kind="stable")[: max(0, top_k)]
+                results[measure] = [
+                    {"id": graph.node_ids[i], "score": float(values[i])} for i in top.tolist()
+                ]
+            names = await self._entity_names(
+                list({row["id"] for rows in results.values() for row in rows})
+            )
+            for rows in results.values():
+                for row in rows:
+                    row["name"] = names.get(row["id"])
+            return GraphAnalysisResult(
+                analysis_type="centrality",
+                results=results,
+                metadata={
+                    "measures": selected,
+                    "node_count": graph.node_count,
+                    "edge_count": graph.edge_count,
+                    "betweenness_samples": min(betweenness_samples, graph.node_count),
+                    "graph_version": self._graph_version,
+                    "elapsed_ms": round(elapsed_ms, 3),
+                },
+            )
+
+        key = ("centrality", tuple(selected), top_k, betweenness_samples)
+        return await self._cached_analysis(key, compute)
 
     async def detect_communities(
         self, algorithm: str = "louvain", min_community_size: int = 3
     ) -> GraphAnalysisResult:
-        if not VIZ_AVAILABLE:
-            raise ImportError("Visualization libraries not installed.")
-        # ... (implementation from knowledge_graph_agent.py) ...
+        """Partition the (undirected) graph with Louvain or label propagation."""
+        self._require_numpy()
+        algorithm = (algorithm or "louvain").strip().lower()
+        if algorithm not in graph_analytics.COMMUNITY_ALGORITHMS:
+            raise ValueError(f"Unsupported community algorithm: {algorithm}")
+
+        async def compute() -> GraphAnalysisResult:
+            graph = await self.get_csr_graph()
+            started = time.perf_counter()
+            partition, score = await self._run_blocking(
+                graph_analytics.compute_communities, graph, algorithm
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            members: Dict[int, List[str]] = {}
+            for node_index, community in enumerate(partition):
+                members.setdefault(community, []).append(graph.node_ids[node_index])
+            communities = sorted(
+                (ids for ids in members.values() if len(ids) >= min_community_size),
+                key=len,
+                reverse=True,
+            )
+            return GraphAnalysisResult(
+                analysis_type="communities",
+                results={
+                    "communities": [
+                        {"id": idx, "size": len(ids), "members": ids}
+                        for idx, ids in enumerate(communities)
+                    ],
+                    "modularity": float(score),
+                },
+                metadata={
+                    "algorithm": algorithm,
+                    "min_community_size": min_community_size,
+                    "total_communities": len(members),
+                    "node_count": graph.node_count,
+                    "edge_count": graph.edge_count,
+                    "graph_version": self._graph_version,
+                    "elapsed_ms": round(elapsed_ms, 3),
+                },
+            )
+
+        return await self._cached_analysis(("communities", algorithm, min_community_size), compute)
 
     async def find_shortest_path(
         self, source: str, target: str, weight: str = "weight"
     ) -> GraphAnalysisResult:
-        if not VIZ_AVAILABLE:
-            raise ImportError("Visualization libraries not installed.")
-        # ... (implementation from knowledge_graph_agent.py) ...
+        """Directed shortest path; Dijkstra when edges carry ``weight`` metadata, else BFS."""
+        self._require_numpy()
+
+        async def compute() -> GraphAnalysisResult:
+            graph = await self.get_csr_graph(weight or None)
+            path: Optional[List[str]] = None
+            length = float("inf")
+            if source in graph.index and target in graph.index:
+                indices, length = await self._run_blocking(
+                    graph_analytics.shortest_path,
+                    graph,
+                    graph.index[source],
+                    graph.index[target],
+                )
+                if indices is not None:
+                    path = [graph.node_ids[i] for i in indices]
+            return GraphAnalysisResult(
+                analysis_type="shortest_path",
+                results={
+                    "found": path is not None,
+                    "path": path or [],
+                    "hops": len(path) - 1 if path else None,
+                    "length": length if path is not None else None,
+                },
+                metadata={
+                    "source": source,
+                    "target": target,
+                    "weighted": graph.weighted,
+                    "algorithm": "dijkstra" if graph.weighted else "bidirectional_bfs",
+                    "graph_version": self._graph_version,
+                },
+            )
+
+        return await self._cached_analysis(("path", source, target, weight), compute)
 
     async def create_interactive_visualization(
-        self, layout_type: str = "force_directed"
+        self, layout_type: str = "force_directed", max_nodes: int = 500
+    ) -> Dict[str, Any]:
+        """Lay out the ``max_nodes`` highest-PageRank nodes, coloured by community."""
+        self._require_numpy()
+        layout_type = (layout_type or "force_directed").strip().lower()
+        if layout_type not in ("force_directed", "circular"):
+            raise ValueError(f"Unsupported layout type: {layout_type}")
+
+        async def compute() -> Dict[str, Any]:
+            graph = await self.get_csr_graph()
+            ranking = await self.analyze_centrality(["pagerank"], top_k=max_nodes)
+            communities = await self.detect_communities(min_community_size=1)
+            community_of = {
+                member: item["id"]
+                for item in communities.results["communities"]
+                for member in item["members"]
+            }
+            shown = [row["id"] for row in ranking.results["pagerank"]]
+            local = {node_id: pos for pos, node_id in enumerate(shown)}
+            edges: List[Tuple[int, int]] = []
+            for node_id in shown:
+                u = graph.index[node_id]
+                start, end = graph.out_offsets[u], graph.out_offsets[u + 1]
+                for v in graph.out_targets[start:end].tolist():
+                    target_pos = local.get(graph.node_ids[v])
+                    if target_pos is not None:
+                        edges.append((local[node_id], target_pos))
+            if layout_type == "circular":
+                positions = graph_analytics.circular_layout(len(shown))
+            else:
+                positions = await self._run_blocking(
+                    graph_analytics.force_directed_layout, len(shown), edges
+                )
+            scores = {row["id"]: row for row in ranking.results["pagerank"]}
+            return {
+                "layout_type": layout_type,
+                "nodes": [
+                    {
+                        "id": node_id,
+                        "label": scores[node_id].get("name") or node_id,
+                        "x": float(positions[pos][0]),
+                        "y": float(positions[pos][1]),
+                        "size": scores[node_id]["score"],
+                        "community": community_of.get(node_id),
+                    }
+                    for pos, node_id in enumerate(shown)
+                ],
+                "edges": [{"source": shown[u], "target": shown[v]} for u, v in edges],
+                "metadata": {
+                    "total_nodes": graph.node_count,
+                    "shown_nodes": len(shown),
+                    "graph_version": self._graph_version,
+                },
+            }
+
+        return await self._cached_analysis(("visualization", layout_type, max_nodes), compute)
+
+    # Layouts kept for "since_version" deltas, and the size above which the
+    # layout partitions with label propagation instead of Louvain.
+    LAYOUT_HISTORY = 4
+    LAYOUT_LOUVAIN_MAX_NODES = 20000
+
+    async def get_graph_layout(self) -> "graph_analytics.GraphLayout":
+        """Server-side hierarchical layout for the current graph version.
+
+        Built once, then extended incrementally on later versions so that
+        existing nodes keep their coordinates.
+        """
+        self._require_numpy()
+        await self._ensure_initialized()
+        async with self._layout_lock:
+            version = self._graph_version
+            latest = self._layout_history.get(version)
+            if latest is not None:
+                return latest
+            previous = (
+                next(reversed(self._layout_history.values())) if self._layout_history else None
+            )
+            graph = await self.get_csr_graph()
+            algorithm = (
+                "louvain"
+                if graph.node_count <= self.LAYOUT_LOUVAIN_MAX_NODES
+                else "label_propagation"
+            )
+            layout = await self._run_blocking(
+                partial(
+                    graph_analytics.build_layout,
+                    graph,
+                    version,
+                    previous,
+                    community_algorithm=algorithm,
+                )
+            )
+            self._layout_history[version] = layout
+            while len(self._layout_history) > self.LAYOUT_HISTORY:
+                self._layout_history.popitem(last=False)
+            return layout
+
+    @staticmethod
+    def _viewport_items(
+        layout: "graph_analytics.GraphLayout", selection: Dict[str, Any]
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Geometry-only node/edge dicts keyed by id, comparable across versions."""
+        nodes: Dict[str, Dict[str, Any]] = {}
+        edges: Dict[str, Dict[str, Any]] = {}
+        if selection["level"] == "clusters":
+            for community in selection["clusters"].tolist():
+                key = f"cluster:{community}"
+                nodes[key] = {
+                    "id": key,
+                    "x": round(float(layout.centers[community][0]), 6),
+                    "y": round(float(layout.centers[community][1]), 6),
+                    "size": int(layout.sizes[community]),
+                    "community": community,
+                    "cluster": True,
+                    "representative": layout.node_ids[layout.representatives[community]],
+                }
+            for edge in selection["edges"].tolist():
+                source = f"cluster:{int(layout.cluster_src[edge])}"
+                target = f"cluster:{int(layout.cluster_dst[edge])}"
+                edges[f"{source}->{target}"] = {
+                    "key": f"{source}->{target}",
+                    "source": source,
+                    "target": target,
+                    "weight": int(layout.cluster_weight[edge]),
+                }
+            return nodes, edges
+        for node in selection["nodes"].tolist():
+            node_id = layout.node_ids[node]
+            nodes[node_id] = {
+                "id": node_id,
+                "x": round(float(layout.positions[node][0]), 6),
+                "y": round(float(layout.positions[node][1]), 6),
+                "size": int(layout.degree[node]),
+                "community": int(layout.communities[node]),
+                "cluster": False,
+            }
+        for edge in selection["edges"].tolist():
+            source = layout.node_ids[layout.edge_src[edge]]
+            target = layout.node_ids[layout.edge_dst[edge]]
+            edges[f"{source}->{target}"] = {
+                "key": f"{source}->{target}",
+                "source": source,
+                "target": target,
+            }
+        return nodes, edges
+
+    async def get_layout_viewport(
+        self,
+        x0: float = 0.0,
+        y0: float = 0.0,
+        x1: float = 1.0,
+        y1: float = 1.0,
+        max_nodes: int = 2000,
+        since_version: Optional[int] = None,
     ) -> Dict[str, Any]:
-        if not VIZ_AVAILABLE:
-            raise ImportError("Visualization libraries not installed.")
-        # ... (implementation from knowledge_graph_agent.py) ...
+        """Level-of-detail slice of the server-side layout inside a viewport.
+
+        Coordinates are in the layout's unit square. With ``since_version``
+        naming a layout still held in history, only nodes and edges that
+        appeared or changed since then are returned, plus the ids/keys that
+        left the viewport; otherwise the full slice comes back.
+        """
+        if x1 < x0 or y1 < y0:
+            raise ValueError("Viewport must satisfy x0 <= x1 and y0 <= y1")
+        max_nodes = max(1, int(max_nodes))
+        bbox = (float(x0), float(y0), float(x1), float(y1))
+        layout = await self.get_graph_layout()
+        selection = graph_analytics.viewport_selection(layout, bbox, max_nodes)
+        nodes, edges = self._viewport_items(layout, selection)
+
+        previous = self._layout_history.get(since_version) if since_version is not None else None
+        removed_nodes: List[str] = []
+        removed_edges: List[str] = []
+        if previous is not None:
+            old_nodes, old_edges = self._viewport_items(
+                previous, graph_analytics.viewport_selection(previous, bbox, max_nodes)
+            )
+            removed_nodes = [key for key in old_nodes if key not in nodes]
+            removed_edges = [key for key in old_edges if key not in edges]
+            nodes = {key: item for key, item in nodes.items() if old_nodes.get(key) != item}
+            edges = {key: item for key, item in edges.items() if old_edges.get(key) != item}
+
+        entity_ids = [
+            item["representative"] if item["cluster"] else item["id"] for item in nodes.values()
+        ]
+        entities = await self._lookup_entities(entity_ids)
+        for item in nodes.values():
+            entity = entities.get(item.pop("representative", None) or item["id"])
+            name = entity.name if entity is not None else item["id"]
+            if item["cluster"]:
+                item["label"] = f"{name} (+{item['size'] - 1})"
+                item["type"] = "cluster"
+            else:
+                item["label"] = name
+                item["type"] = entity.entity_type if entity is not None else None
+
+        return {
+            "version": layout.version,
+            "since_version": since_version if previous is not None else None,
+            "delta": previous is not None,
+            "level": selection["level"],
+            "viewport": list(bbox),
+            "nodes": list(nodes.values()),
+            "edges": list(edges.values()),
+            "removed_nodes": removed_nodes,
+            "removed_edges": removed_edges,
+            "metadata": {
+                "total_nodes": len(layout.node_ids),
+                "visible_nodes": selection["visible_nodes"],
+                "truncated": bool(selection["truncated"]),
+                "max_nodes": max_nodes,
+            },
+        }
 
 
 # Factory function
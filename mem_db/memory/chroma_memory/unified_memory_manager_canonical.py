@@ -109,6 +109,7 @@ from .data_models import (  # noqa: E402
     SemanticSearchResult,
 )
 from .protocols import MemoryBackend, ReviewSystem, VectorStore  # noqa: E402
+from mem_db.stage_timings import StageTimings  # noqa: E402
 from .storage_backends import (  # noqa: E402
     InMemoryBackend,
     LegacyMemoryAdapter,
@@ -230,6 +231,7 @@ class UnifiedMemoryManager:
         self._operation_counts: Dict[str, int] = defaultdict(int)
         self._error_counts: Dict[str, int] = defaultdict(int)
         self._last_operations: Dict[str, datetime] = {}
+        self._search_timings = StageTimings()
 
         # Legacy compatibility
         self._legacy_adapter: Optional[LegacyMemoryAdapter] = None
@@ -2082,6 +2084,8 @@ class UnifiedMemoryManager:
                 stats["pending_reviews"] = 0
                 stats["knowledge_facts_count"] = 0
 
+        stats["search_latency_ms"] = self._search_timings.snapshot()
+
         if self.enable_decision_logging:
             try:
                 decision_db_path = self.storage_dir / "decision_logging.db"
@@ -2472,13 +2476,39 @@ class UnifiedMemoryManager:
         confidence_threshold: float = 0.0,
     ) -> List[Dict[str, Any]]:
         """Search memories using both database and vector store."""
-        results = []
+        with self._search_timings.measure("total"):
+            # The review DB and the vector store are independent; query both at once
+            enhanced, vector = await asyncio.gather(
+                self._search_enhanced_entries(
+                    query, memory_types, limit, confidence_threshold
+                ),
+                self._search_vector_store(query, limit, confidence_threshold),
+            )
+            results = enhanced + vector
+
+            # Sort combined results by confidence/similarity
+            with self._search_timings.measure("rank"):
+                results.sort(
+                    key=lambda x: x.get("confidence", 0) + x.get("similarity_score", 0),
+                    reverse=True,
+                )
 
+        return results[:limit]
+
+    async def _search_enhanced_entries(
+        self,
+        query: str,
+        memory_types: Optional[List[MemoryType]],
+        limit: int,
+        confidence_threshold: float,
+    ) -> List[Dict[str, Any]]:
         # Search enhanced memory entries if review system is enabled
-        if self.enable_review_system:
-            try:
-                review_db_path = self.storage_dir / "review_system.db"
+        if not self.enable_review_system:
+            return []
+        try:
+            review_db_path = self.storage_dir / "review_system.db"
 
+            with self._search_timings.measure("enhanced_query"):
                 async with aiosqlite.connect(review_db_path) as db:
                     sql = """
                         SELECT id, memory_type, content, confidence, source, created_at,
@@ -2496,61 +2526,67 @@ class UnifiedMemoryManager:
                     sql += f" AND confidence >= ? ORDER BY confidence DESC, created_at DESC LIMIT {limit}"
                     params.append(confidence_threshold)
 
+                    # One fetch instead of a worker-thread round-trip per row
                     async with db.execute(sql, params) as cursor:
-                        async for row in cursor:
-                            results.append(
-                                {
-                                    "id": row[0],
-                                    "memory_type": row[1],
-                                    "content": json.loads(row[2]),  # noqa: F821
-                                    "confidence": row[3],
-                                    "source": row[4],
-                                    "created_at": row[5],
-                                    "review_status": row[6],
-                                    "metadata": json.loads(row[7]),  # noqa: F821
-                                    "tags": json.loads(row[8]),  # noqa: F821
-                                    "search_source": "enhanced_memory",
-                                }
-                            )
-            except Exception as e:
-                memory_logger.error(f"Enhanced memory search failed: {e}")
+                        rows = await cursor.fetchall()
+
+            with self._search_timings.measure("hydrate"):
+                return [self._enhanced_entry_result(row) for row in rows]
+        except Exception as e:
+            memory_logger.error(f"Enhanced memory search failed: {e}")
+            return []
+
+    @staticmethod
+    def _enhanced_entry_result(row) -> Dict[str, Any]:
+        return {
+            "id": row[0],
+            "memory_type": row[1],
+            "content": json.loads(row[2]),  # noqa: F821
+            "confidence": row[3],
+            "source": row[4],
+            "created_at": row[5],
+            "review_status": row[6],
+            "metadata": json.loads(row[7]),  # noqa: F821
+            "tags": json.loads(row[8]),  # noqa: F821
+            "search_source": "enhanced_memory",
+        }
 
+    async def _search_vector_store(
+        self, query: str, limit: int, confidence_threshold: float
+    ) -> List[Dict[str, Any]]:
         # Search vector store if available
-        if self.vector_store and hasattr(self.vector_store, "search_similar_async"):
-            try:
+        if not (
+            self.vector_store and hasattr(self.vector_store, "search_similar_async")
+        ):
+            return []
+        try:
+            with self._search_timings.measure("vector_query"):
                 vector_results = await self.vector_store.search_similar_async(
                     query_text=query,
                     top_k=limit,
                     similarity_threshold=confidence_threshold,
                 )
 
-                for result in vector_results:
-                    results.append(
-                        {
-                            "id": result.vector_id,
-                            "content": {"text": result.content_preview},
-                            "confidence": result.similarity_score,
-                            "source": "vector_store",
-                            "metadata": (
-                                result.metadata.__dict__
-                                if hasattr(result.metadata, "__dict__")
-                                else {}
-                            ),
-                            "search_source": "vector_store",
-                            "similarity_score": result.similarity_score,
-                            "distance": result.distance,
-                        }
-                    )
-            except Exception as e:
-                memory_logger.warning(f"Vector store search failed: {e}")
-
-        # Sort combined results by confidence/similarity
-        results.sort(
-            key=lambda x: x.get("confidence", 0) + x.get("similarity_score", 0),
-            reverse=True,
-        )
-
-        return results[:limit]
+            return [
+                {
+                    "id": result.vector_id,
+                    "content": {"text": result.content_preview},
+                    "confidence": result.similarity_score,
+                    "source": "vector_store",
+                    "metadata": (
+                        result.metadata.__dict__
+                        if hasattr(result.metadata, "__dict__")
+                        else {}
+                    ),
+                    "search_source": "vector_store",
+                    "similarity_score": result.similarity_score,
+                    "distance": result.distance,
+                }
+                for result in vector_results
+            ]
+        except Exception as e:
+            memory_logger.warning(f"Vector store search failed: {e}")
+            return []
 
     # ==================== SEMANTIC SEARCH OPERATIONS ====================
 
@@ -54,34 +54,47 @@ def init_schema() -> None:
             """)
 
 
+def _proposal_row(data: Dict[str, Any]) -> tuple:
+    return (
+        data.get("namespace"),
+        data.get("key"),
+        data.get("content"),
+        data.get("memory_type", "analysis"),
+        data.get("agent_id"),
+        data.get("document_id"),
+        json.dumps(data.get("metadata") or {}),
+        float(data.get("confidence_score", 1.0)),
+        float(data.get("importance_score", 1.0)),
+        data.get("status", "pending"),
+        json.dumps(data.get("flags") or []),
+        data.get("created_at"),
+    )
+
+
+_INSERT_PROPOSAL = """
+    INSERT INTO memory_proposals
+    (namespace, key, content, memory_type, agent_id, document_id, metadata_json,
+     confidence, importance, status, flags_json, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 def add_proposal(data: Dict[str, Any]) -> int:
     init_schema()
     with _conn() as con:
-        cur = con.execute(
-            """
-            INSERT INTO memory_proposals
-            (namespace, key, content, memory_type, agent_id, document_id, metadata_json,
-             confidence, importance, status, flags_json, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                data.get("namespace"),
-                data.get("key"),
-                data.get("content"),
-                data.get("memory_type", "analysis"),
-                data.get("agent_id"),
-                data.get("document_id"),
-                json.dumps(data.get("metadata") or {}),
-                float(data.get("confidence_score", 1.0)),
-                float(data.get("importance_score", 1.0)),
-                data.get("status", "pending"),
-                json.dumps(data.get("flags") or []),
-                data.get("created_at"),
-            ),
-        )
+        cur = con.execute(_INSERT_PROPOSAL, _proposal_row(data))
         return int(cur.lastrowid)
 
 
+def add_proposals(items: List[Dict[str, Any]]) -> List[int]:
+    """Insert several proposals in one transaction; returns their ids in order."""
+    if not items:
+        return []
+    init_schema()
+    with _conn() as con:
+        return [int(con.execute(_INSERT_PROPOSAL, _proposal_row(d)).lastrowid) for d in items]
+
+
 def list_proposals(limit: int = 200, offset: int = 0) -> List[Dict[str, Any]]:
     init_schema()
     with _conn() as con:
@@ -23,6 +23,7 @@ import json  # noqa: E402
 import logging  # noqa: E402
 import sqlite3  # noqa: E402
 import uuid  # noqa: E402
+from collections import OrderedDict  # noqa: E402
 from contextlib import asynccontextmanager  # noqa: E402
 from datetime import datetime  # noqa: E402
 from pathlib import Path  # noqa: E402
@@ -58,6 +59,10 @@ except ImportError:
     AIOSQLITE_AVAILABLE = False
     aiosqlite = None
 
+from mem_db.access_stats import AccessRow, AccessStatsBuffer  # noqa: E402
+from mem_db.sqlite_pool import AsyncSQLitePool  # noqa: E402
+from mem_db.stage_timings import StageTimings  # noqa: E402
+
 from .memory_interfaces import (  # noqa: E402
     MemoryProvider,
     MemoryQuery,
@@ -68,6 +73,10 @@ from .memory_interfaces import (  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
+# Ids per ``WHERE record_id IN (...)`` query; stays under SQLite's historical
+# 999 bound-parameter limit.
+HYDRATE_CHUNK_SIZE = 500
+
 def _blob_to_numpy(blob_data: bytes) -> Optional[np.ndarray]:
     """Converts BLOB data from SQLite to a NumPy array."""
     if np is None or blob_data is None:
@@ -110,15 +119,17 @@ class UnifiedMemoryManager(MemoryProvider):
             self.enable_vector_search = True
         self._async_db = AIOSQLITE_AVAILABLE
 
-        # Storage components
-        self._db_connection: Optional[
-            Union[sqlite3.Connection, aiosqlite.Connection]
-        ] = None
+        # Storage components: long-lived readers plus one queued writer
+        self._db_pool: Optional[AsyncSQLitePool] = (
+            AsyncSQLitePool(self.db_path, row_factory=aiosqlite.Row)
+            if AIOSQLITE_AVAILABLE
+            else None
+        )
         self._vector_store = None
         self._vector_collection = None  # For ChromaDB
 
-        # In-memory caches
-        self._record_cache: Dict[str, MemoryRecord] = {}
+        # In-memory caches; the record cache is kept in LRU order
+        self._record_cache: "OrderedDict[str, MemoryRecord]" = OrderedDict()
         self._search_cache: Dict[str, List[SearchResult]] = {}
         self._cache_max_size = 1000
 
@@ -129,19 +140,22 @@ class UnifiedMemoryManager(MemoryProvider):
             "cache_hits": 0,
             "cache_misses": 0,
         }
+        self._search_timings = StageTimings()
 
         self._initialized = False
         self._lock = asyncio.Lock()
 
+        # Access counts from retrieve/search hits are written behind in batches
+        self._access_buffer = AccessStatsBuffer(self._flush_record_access)
+
         logger.info(
             f"UnifiedMemoryManager initialized with db={self.db_path}, vector_backend={self.vector_backend}"
         )
 
     @asynccontextmanager
-    async def _get_db_connection(self):
-        if AIOSQLITE_AVAILABLE:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+    async def _get_db_connection(self, write: bool = False):
+        if self._db_pool is not None:
+            async with (self._db_pool.write() if write else self._db_pool.read()) as db:
                 yield db
         else:
             # Fallback path when aiosqlite is unavailable; direct sqlite access may block.
@@ -248,7 +262,7 @@ class UnifiedMemoryManager(MemoryProvider):
         CREATE INDEX IF NOT EXISTS idx_memory_code_links_memory_record_id
             ON memory_code_links(memory_record_id);
         """
-        async with self._get_db_connection() as db:
+        async with self._get_db_connection(write=True) as db:
             if self._async_db:
                 await db.executescript(schema)
                 await db.commit()
@@ -295,7 +309,7 @@ class UnifiedMemoryManager(MemoryProvider):
 
         record.record_id = record.record_id or str(uuid.uuid4())
 
-        async with self._get_db_connection() as db:
+        async with self._get_db_connection(write=True) as db:
             if _um_tracer:
                 with _um_tracer.start_as_current_span("unified_memory._store_sqlite", attributes={"record_id": record.record_id, "namespace": record.namespace}):
                     await self._store_sqlite(db, record)
@@ -310,7 +324,9 @@ class UnifiedMemoryManager(MemoryProvider):
             else:
                 await self._store_vector(record)
 
+        self._access_buffer.discard([record.record_id])
         self._record_cache[record.record_id] = record
+        self._record_cache.move_to_end(record.record_id)
         self._manage_cache()
         self._stats["total_stores"] += 1
 
@@ -370,24 +386,48 @@ class UnifiedMemoryManager(MemoryProvider):
         logger.warning("FAISS storage logic is not fully implemented.")
 
     async def retrieve(self, record_id: str) -> Optional[MemoryRecord]:
-        if record_id in self._record_cache:
-            self._stats["cache_hits"] += 1
-            return self._record_cache[record_id]
+        record = await self._load_record(record_id)
+        if record is not None:
+            self._note_access([record])
+        return record
 
-        self._stats["cache_misses"] += 1
+    async def _load_record(self, record_id: str) -> Optional[MemoryRecord]:
+        return (await self._load_records([record_id])).get(record_id)
+
+    async def _load_records(self, record_ids: List[str]) -> Dict[str, MemoryRecord]:
+        """Hydrate records from the LRU cache; misses cost one query per chunk."""
+        found: Dict[str, MemoryRecord] = {}
+        missing: List[str] = []
+        for record_id in dict.fromkeys(record_ids):
+            record = self._record_cache.get(record_id)
+            if record is not None:
+                self._record_cache.move_to_end(record_id)
+                found[record_id] = record
+            else:
+                missing.append(record_id)
+        self._stats["cache_hits"] += len(found)
+        self._stats["cache_misses"] += len(missing)
+        if not missing:
+            return found
 
         async with self._get_db_connection() as db:
-            cursor = await db.execute(
-                "SELECT * FROM memory_records WHERE record_id = ?", (record_id,)
-            )
-            row = await cursor.fetchone()
-
-        if not row:
-            return None
-
-        record = self._row_to_record(row)
-        self._record_cache[record_id] = record
-        return record
+            for start in range(0, len(missing), HYDRATE_CHUNK_SIZE):
+                chunk = missing[start : start + HYDRATE_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                sql = (
+                    f"SELECT * FROM memory_records WHERE record_id IN ({placeholders})"
+                )
+                if self._async_db:
+                    cursor = await db.execute(sql, chunk)
+                    rows = await cursor.fetchall()
+                else:
+                    rows = db.execute(sql, chunk).fetchall()
+                for row in rows:
+                    record = self._row_to_record(row)
+                    found[record.record_id] = record
+                    self._record_cache[record.record_id] = record
+        self._manage_cache()
+        return found
 
     async def search(
         self,
@@ -428,21 +468,26 @@ class UnifiedMemoryManager(MemoryProvider):
                 q.min_similarity = min_similarity
                 query = q
 
-            # Keyword search from SQLite
-            keyword_results = await self._search_sqlite(query)
+            with self._search_timings.measure("total"):
+                # Keyword search from SQLite
+                with self._search_timings.measure("keyword"):
+                    keyword_results = await self._search_sqlite(query)
 
-            # Semantic search from vector store
-            semantic_results = []
-            if self.enable_vector_search and query.query_text:
-                semantic_results = await self._search_vector(query)
+                # Semantic search from vector store
+                semantic_results = []
+                if self.enable_vector_search and query.query_text:
+                    semantic_results = await self._search_vector(query)
 
-            # Combine and rank results
-            combined_results = self._combine_search_results(
-                keyword_results, semantic_results
-            )
-            combined_results.sort(key=lambda x: x.combined_score, reverse=True)
+                # Combine and rank results
+                with self._search_timings.measure("rank"):
+                    combined_results = self._combine_search_results(
+                        keyword_results, semantic_results
+                    )
+                    combined_results.sort(key=lambda x: x.combined_score, reverse=True)
 
-            return combined_results[: query.limit]
+                hits = combined_results[: query.limit]
+                self._note_access([res.record for res in hits])
+            return hits
         finally:
             if _span_ctx is not None:
                 try:
@@ -510,22 +555,26 @@ class UnifiedMemoryManager(MemoryProvider):
         if query.agent_id:
             where_clause["agent_id"] = query.agent_id
 
-        chroma_results = self._vector_collection.query(
-            query_texts=[query.query_text],
-            n_results=query.limit,
-            where=where_clause if where_clause else None,
-        )
+        with self._search_timings.measure("vector_query"):
+            chroma_results = self._vector_collection.query(
+                query_texts=[query.query_text],
+                n_results=query.limit,
+                where=where_clause if where_clause else None,
+            )
 
         results = []
         if chroma_results and chroma_results["ids"][0]:
-            for i, doc_id in enumerate(chroma_results["ids"][0]):
-                record = await self.retrieve(doc_id)
+            ids = chroma_results["ids"][0]
+            with self._search_timings.measure("hydrate"):
+                records = await self._load_records(ids)
+            # Iterate Chroma's ids so results keep vector rank order
+            for doc_id, distance in zip(ids, chroma_results["distances"][0]):
+                record = records.get(doc_id)
                 if record:
-                    similarity = 1.0 - chroma_results["distances"][0][i]
                     results.append(
                         SearchResult(
                             record=record,
-                            similarity_score=similarity,
+                            similarity_score=1.0 - distance,
                             relevance_score=float(record.confidence_score or 0.5),
                             match_type="semantic",
                         )
@@ -558,7 +607,26 @@ class UnifiedMemoryManager(MemoryProvider):
             return 0.0
         return len(q_words.intersection(c_words)) / len(q_words)
 
+    def _note_access(self, records: List[MemoryRecord]) -> None:
+        for record in records:
+            record.access_count += 1
+            self._access_buffer.record(record.record_id)
+
+    async def _flush_record_access(self, rows: List[AccessRow]) -> None:
+        """Apply buffered access deltas in a single transaction."""
+        async with self._get_db_connection(write=True) as db:
+            params = [(count, record_id) for record_id, count, _ in rows]
+            sql = "UPDATE memory_records SET access_count = access_count + ? WHERE record_id = ?"
+            if self._async_db:
+                await db.executemany(sql, params)
+                await db.commit()
+            else:
+                db.executemany(sql, params)
+                db.commit()
+
     def _row_to_record(self, row) -> MemoryRecord:
+        # Rows read before a flush still reflect buffered hits.
+        pending, _ = self._access_buffer.pending_delta(row["record_id"])
         return MemoryRecord(
             record_id=row["record_id"],
             namespace=row["namespace"],
@@ -570,40 +638,41 @@ class UnifiedMemoryManager(MemoryProvider):
             metadata=json.loads(row["metadata"] or "{}"),
             importance_score=row["importance_score"],
             confidence_score=row["confidence_score"],
-            access_count=row["access_count"],
+            access_count=row["access_count"] + pending,
             created_at=datetime.fromisoformat(row["created_at"]),
             updated_at=datetime.fromisoformat(row["updated_at"]),
             embedding_vector=_blob_to_numpy(row["embedding_vector"]),
         )
 
     def _manage_cache(self):
-        if len(self._record_cache) > self._cache_max_size:
-            # Simple FIFO cache eviction
-            num_to_remove = len(self._record_cache) - self._cache_max_size
-            for _ in range(num_to_remove):
-                self._record_cache.pop(next(iter(self._record_cache)))
+        # Least recently used records are at the front
+        while len(self._record_cache) > self._cache_max_size:
+            self._record_cache.popitem(last=False)
 
 
     async def update(self, record: MemoryRecord) -> bool:
         if not self._initialized:
             await self.initialize()
         record.updated_at = datetime.now()
-        async with self._get_db_connection() as db:
+        async with self._get_db_connection(write=True) as db:
             cur = await db.execute("SELECT 1 FROM memory_records WHERE record_id = ?", (record.record_id,))
             if not await cur.fetchone():
                 return False
             await self._store_sqlite(db, record)
             await db.commit()
+        # The rewritten row carries the record's own access_count.
+        self._access_buffer.discard([record.record_id])
         self._record_cache[record.record_id] = record
         return True
 
     async def delete(self, record_id: str) -> bool:
         if not self._initialized:
             await self.initialize()
-        async with self._get_db_connection() as db:
+        async with self._get_db_connection(write=True) as db:
             cur = await db.execute("DELETE FROM memory_records WHERE record_id = ?", (record_id,))
             await db.commit()
             deleted = cur.rowcount > 0
+        self._access_buffer.discard([record_id])
         self._record_cache.pop(record_id, None)
         return deleted
 
@@ -705,6 +774,9 @@ class UnifiedMemoryManager(MemoryProvider):
         return {
             "total_records": total_records,
             "cache_size": len(self._record_cache),
+            "pending_access_updates": len(self._access_buffer),
+            "search_latency_ms": self._search_timings.snapshot(),
+            "db_pool": self._db_pool.stats() if self._db_pool is not None else None,
             "vector_search_enabled": self.enable_vector_search,
             "vector_backend": (
                 self.vector_backend if self.enable_vector_search else None
@@ -727,7 +799,7 @@ class UnifiedMemoryManager(MemoryProvider):
             logger.warning("Cannot link memory to file with empty identifiers")
             return False
 
-        async with self._get_db_connection() as db:
+        async with self._get_db_connection(write=True) as db:
             exists_cursor = await db.execute(
                 "SELECT 1 FROM memory_records WHERE record_id = ?",
                 (memory_record_id,),
@@ -1001,9 +1073,10 @@ class UnifiedMemoryManager(MemoryProvider):
 
 
     async def close(self) -> None:
+        await self._access_buffer.close()
         async with self._lock:
-            if self._db_connection and AIOSQLITE_AVAILABLE:
-                await self._db_connection.close()
+            if self._db_pool is not None:
+                await self._db_pool.close()
             self._initialized = False
             logger.info("UnifiedMemoryManager closed")
 
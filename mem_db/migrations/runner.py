@@ -14,6 +14,9 @@ MIGRATION_MODULES = [
     "mem_db.migrations.versions.0004_learning_path_storage",
     "mem_db.migrations.versions.0005_memory_code_links",
     "mem_db.migrations.versions.0006_ai_model_version",
+    "mem_db.migrations.versions.0007_taskmaster_queue_leases",
+    "mem_db.migrations.versions.0008_workflow_webhook_outbox",
+    "mem_db.migrations.versions.0009_taskmaster_queue_lease_token",
 ]
 
 
@@ -0,0 +1,35 @@
+"""
+Migration adding worker lease columns to the TaskMaster job queue.
+"""
+
+VERSION = 7
+NAME = "Add lease and heartbeat columns to taskmaster_job_queue"
+
+_COLUMNS = [
+    "ALTER TABLE taskmaster_job_queue ADD COLUMN heartbeat_at TIMESTAMP",
+    "ALTER TABLE taskmaster_job_queue ADD COLUMN lease_expires_at TIMESTAMP",
+]
+
+
+def up(conn):
+    """
+    Adds heartbeat/lease columns (already present on freshly created tables)
+    and an index for finding expired leases.
+    """
+    for stmt in _COLUMNS:
+        try:
+            conn.execute(stmt)
+        except Exception as e:
+            if "duplicate column name" not in str(e).lower():
+                raise
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_taskmaster_queue_status_lease "
+        "ON taskmaster_job_queue(status, lease_expires_at)"
+    )
+
+
+def down(conn):
+    """
+    Drops the lease index; the columns are left in place (see 0006).
+    """
+    conn.execute("DROP INDEX IF EXISTS idx_taskmaster_queue_status_lease")
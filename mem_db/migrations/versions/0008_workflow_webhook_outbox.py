@@ -0,0 +1,52 @@
+"""
+Migration adding the workflow webhook outbox table.
+"""
+
+VERSION = 8
+NAME = "Add workflow_webhook_outbox for queued webhook delivery"
+
+
+def up(conn):
+    """
+    Creates the outbox (already present on freshly created databases) and the
+    indexes the dispatcher uses to find due deliveries per endpoint.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS workflow_webhook_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_id TEXT NOT NULL UNIQUE,
+            job_id TEXT,
+            event_type TEXT NOT NULL,
+            url TEXT NOT NULL,
+            payload_json TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            next_attempt_at REAL NOT NULL,
+            lease_expires_at REAL,
+            last_status INTEGER,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            delivered_at TIMESTAMP
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_workflow_webhook_outbox_status_next "
+        "ON workflow_webhook_outbox(status, next_attempt_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_workflow_webhook_outbox_url_status_next "
+        "ON workflow_webhook_outbox(url, status, next_attempt_at)"
+    )
+
+
+def down(conn):
+    """
+    Drops the outbox and its indexes.
+    """
+    conn.execute("DROP INDEX IF EXISTS idx_workflow_webhook_outbox_url_status_next")
+    conn.execute("DROP INDEX IF EXISTS idx_workflow_webhook_outbox_status_next")
+    conn.execute("DROP TABLE IF EXISTS workflow_webhook_outbox")
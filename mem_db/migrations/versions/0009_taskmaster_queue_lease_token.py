@@ -0,0 +1,26 @@
+"""
+Migration adding a per-claim lease token to the TaskMaster job queue.
+"""
+
+VERSION = 9
+NAME = "Add lease_token to taskmaster_job_queue"
+
+
+def up(conn):
+    """
+    Adds the lease_token column (already present on freshly created tables).
+    Worker names repeat across processes, so heartbeats and completions are
+    fenced on the token issued at claim time instead.
+    """
+    try:
+        conn.execute("ALTER TABLE taskmaster_job_queue ADD COLUMN lease_token TEXT")
+    except Exception as e:
+        if "duplicate column name" not in str(e).lower():
+            raise
+
+
+def down(conn):
+    """
+    No-op; the column is left in place (see 0006).
+    """
+    pass
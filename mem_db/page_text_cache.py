@@ -0,0 +1,143 @@
+"""SQLite cache of extracted page text keyed by ``(sha256, page_no, extractor)``.
+
+Extraction results depend only on the file's bytes and the extractor used, so
+re-processing an unchanged document (or a copy of it under another name) can
+reuse every page it already extracted. Pages that produced no text are cached
+too; for scanned documents those are exactly the pages that are expensive to
+rediscover. Entries beyond ``max_entries`` are evicted least-recently-used
+first.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("PAGE_TEXT_CACHE_MAX_ENTRIES", "200000"))
+
+# Eviction trims to this fraction of the limit so it does not run on every put.
+EVICTION_HEADROOM = 0.9
+# Stay under SQLite's bound-parameter limit for IN (...) lookups.
+LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    sha256 TEXT NOT NULL,
+    page_no INTEGER NOT NULL,
+    extractor TEXT NOT NULL,
+    text TEXT NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (sha256, extractor, page_no)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages(last_access);
+"""
+
+
+class PageTextCache:
+    """``(sha256, page_no, extractor) -> text`` store shared by document processors."""
+
+    def __init__(
+        self, path: Union[str, Path], *, max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30.0, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get_pages(
+        self, sha256: str, page_numbers: Sequence[int], *, extractor: str
+    ) -> Dict[int, str]:
+        """Cached text for the requested pages; uncached pages are left out."""
+        found: Dict[int, str] = {}
+        wanted = list(dict.fromkeys(int(p) for p in page_numbers))
+        with self._lock:
+            for start in range(0, len(wanted), LOOKUP_CHUNK):
+                chunk = wanted[start : start + LOOKUP_CHUNK]
+                rows = self._conn.execute(
+                    "SELECT page_no, text FROM pages "
+                    "WHERE sha256 = ? AND extractor = ? "
+                    f"AND page_no IN ({','.join('?' * len(chunk))})",
+                    (sha256, extractor, *chunk),
+                ).fetchall()
+                found.update((int(page_no), text) for page_no, text in rows)
+            if found:
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE pages SET last_access = ? "
+                        "WHERE sha256 = ? AND extractor = ?",
+                        (time.time(), sha256, extractor),
+                    )
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+        return found
+
+    def put_pages(
+        self, sha256: str, pages: Iterable[Tuple[int, str]], *, extractor: str
+    ) -> None:
+        now = time.time()
+        rows = [
+            (sha256, int(page_no), extractor, text or "", now)
+            for page_no, text in pages
+        ]
+        if not rows:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO pages "
+                    "(sha256, page_no, extractor, text, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            self._evict_if_needed()
+
+    def _evict_if_needed(self) -> None:
+        """Caller holds the lock."""
+        (entries,) = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+        if entries <= self.max_entries:
+            return
+        excess = entries - int(self.max_entries * EVICTION_HEADROOM)
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM pages WHERE rowid IN "
+                "(SELECT rowid FROM pages ORDER BY last_access LIMIT ?)",
+                (excess,),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_shared: Dict[str, PageTextCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_page_text_cache(path: Union[str, Path]) -> Optional[PageTextCache]:
+    """Process-wide cache instance for ``path``; None if it cannot be opened."""
+    key = str(Path(path).resolve())
+    with _shared_lock:
+        cache = _shared.get(key)
+        if cache is None:
+            try:
+                cache = PageTextCache(key)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Page text cache unavailable at %s: %s", key, e)
+                return None
+            _shared[key] = cache
+        return cache
@@ -5,6 +5,7 @@ from .organization_repository import OrganizationRepository
 from .persona_repository import PersonaRepository
 from .taskmaster_repository import TaskMasterRepository
 from .watch_repository import WatchRepository
+from .webhook_outbox_repository import WebhookOutboxRepository
 
 __all__ = [
     "OrganizationRepository",
@@ -14,4 +15,5 @@ __all__ = [
     "FileIndexRepository",
     "DocumentRepository",
     "WatchRepository",
+    "WebhookOutboxRepository",
 ]
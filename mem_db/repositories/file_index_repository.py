@@ -2,16 +2,517 @@ from __future__ import annotations
 
 import hashlib
 import json
+import logging
 import math
+import os
 import re
 import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from .base import BaseRepository
 
+logger = logging.getLogger(__name__)
+
+# Files written per commit by FileIndexBulkWriter unless the caller overrides it.
+DEFAULT_FILES_PER_COMMIT = max(1, int(os.getenv("FILE_INDEX_FILES_PER_COMMIT", "32") or 32))
+# ...or once the oldest uncommitted file has waited this long, whichever comes first.
+DEFAULT_COMMIT_LATENCY_SECONDS = max(
+    0.0, float(os.getenv("FILE_INDEX_COMMIT_LATENCY_MS", "500") or 500) / 1000.0
+)
+
+# Case-folded, slash-normalised path; ``idx_files_index_scope_path`` indexes this
+# exact expression so scope prefixes become index range scans.
+SCOPE_PATH_EXPR = "lower(replace(trim(normalized_path), char(92), '/'))"
+_STATUS_EXPR = "lower(trim(coalesce(status, '')))"
+
+
+def _ascii_lower(value: str) -> str:
+    # SQLite's lower() only folds ASCII; fold the bounds the same way
+    return "".join(chr(ord(c) + 32) if "A" <= c <= "Z" else c for c in value)
+
+
+def _prefix_range(prefix: str) -> Tuple[str, str]:
+    """Half-open string range covering every value that starts with ``prefix``."""
+    low = _ascii_lower(prefix)
+    return low, low[:-1] + chr(ord(low[-1]) + 1)
+
+_UPSERT_INDEXED_FILE_SQL = """
+    INSERT INTO files_index (
+        display_name, original_path, normalized_path, path_hash,
+        file_size, mtime, mime_type, mime_source, sha256, ext, status, last_checked_at, last_error, metadata_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?, ?)
+    ON CONFLICT(path_hash) DO UPDATE SET
+        display_name=excluded.display_name,
+        original_path=excluded.original_path,
+        normalized_path=excluded.normalized_path,
+        file_size=excluded.file_size,
+        mtime=excluded.mtime,
+        mime_type=excluded.mime_type,
+        mime_source=excluded.mime_source,
+        sha256=excluded.sha256,
+        ext=excluded.ext,
+        status=excluded.status,
+        last_checked_at=CURRENT_TIMESTAMP,
+        last_error=excluded.last_error,
+        metadata_json=excluded.metadata_json
+"""
+
+_INSERT_CHUNK_SQL = """
+    INSERT INTO file_content_chunks (
+        file_id, chunk_index, chunk_type, title, content,
+        token_estimate, char_count, metadata_json, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+_INSERT_ENTITY_SQL = """
+    INSERT INTO file_entities (
+        file_id, entity_text, entity_type, ontology_id, confidence, provenance, metadata_json, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+_INSERT_TABLE_SQL = """
+    INSERT INTO file_extracted_tables (
+        file_id, source_chunk_id, table_index, extraction_status,
+        extraction_method, headers_json, rows_json, metadata_json, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+_UPSERT_EMBEDDING_SQL = """
+    INSERT INTO file_chunk_embeddings (
+        file_id, chunk_id, embedding_model, vector_dim, embedding_json, embedding_hash, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(chunk_id, embedding_model) DO UPDATE SET
+        file_id=excluded.file_id,
+        vector_dim=excluded.vector_dim,
+        embedding_json=excluded.embedding_json,
+        embedding_hash=excluded.embedding_hash,
+        updated_at=CURRENT_TIMESTAMP
+"""
+
+_UPSERT_MANIFEST_SQL = """
+    INSERT INTO scan_manifest (path_hash, normalized_path, file_size, mtime, sha256, last_status, last_error, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(path_hash) DO UPDATE SET
+        normalized_path=excluded.normalized_path,
+        file_size=excluded.file_size,
+        mtime=excluded.mtime,
+        sha256=excluded.sha256,
+        last_status=excluded.last_status,
+        last_error=excluded.last_error,
+        updated_at=CURRENT_TIMESTAMP
+"""
+
+
+def _chunk_params(file_id: int, chunks: Sequence[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+    params: List[Tuple[Any, ...]] = []
+    for idx, chunk in enumerate(chunks):
+        content = str(chunk.get("content") or "")
+        params.append(
+            (
+                file_id,
+                int(chunk.get("chunk_index", idx)),
+                str(chunk.get("chunk_type") or "text"),
+                chunk.get("title"),
+                content,
+                int(chunk.get("token_estimate") or 0),
+                int(chunk.get("char_count") or len(content)),
+                json.dumps(chunk.get("metadata") or {}),
+            )
+        )
+    return params
+
+
+def _entity_params(file_id: int, entities: Sequence[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+    params: List[Tuple[Any, ...]] = []
+    for entity in entities:
+        entity_text = str(entity.get("entity_text") or entity.get("text") or "").strip()
+        if not entity_text:
+            continue
+        params.append(
+            (
+                file_id,
+                entity_text,
+                entity.get("entity_type") or entity.get("label"),
+                entity.get("ontology_id"),
+                float(entity.get("confidence") or 0.5),
+                entity.get("provenance"),
+                json.dumps(entity.get("metadata") or {}),
+            )
+        )
+    return params
+
+
+def _table_params(file_id: int, tables: Sequence[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+    return [
+        (
+            file_id,
+            table.get("source_chunk_id"),
+            int(table.get("table_index", i)),
+            str(table.get("extraction_status") or "unknown"),
+            table.get("extraction_method"),
+            json.dumps(table.get("headers") or []),
+            json.dumps(table.get("rows") or []),
+            json.dumps(table.get("metadata") or {}),
+        )
+        for i, table in enumerate(tables)
+    ]
+
+
+def _embedding_params(
+    file_id: int, embedding_model: str, embeddings: Sequence[Tuple[int, Sequence[float]]]
+) -> List[Tuple[Any, ...]]:
+    params: List[Tuple[Any, ...]] = []
+    for chunk_id, embedding in embeddings:
+        vector = [float(v) for v in embedding]
+        encoded = json.dumps(vector)
+        emb_hash = hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+        params.append((file_id, chunk_id, embedding_model, len(vector), encoded, emb_hash))
+    return params
+
+
+def _manifest_params(rows: Sequence[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+    return [
+        (
+            row["path_hash"],
+            row["normalized_path"],
+            row.get("file_size"),
+            row.get("mtime"),
+            row.get("sha256"),
+            row.get("last_status"),
+            row.get("last_error"),
+        )
+        for row in rows
+    ]
+
+
+# --- Connection-level writers: no commit, shared by the repository and the bulk writer.
+
+
+def _indexed_file_params(**fields: Any) -> Tuple[str, Tuple[Any, ...]]:
+    normalized_path = fields["normalized_path"]
+    path_hash = hashlib.sha1(normalized_path.encode("utf-8")).hexdigest()
+    return path_hash, (
+        fields["display_name"],
+        fields["original_path"],
+        normalized_path,
+        path_hash,
+        fields.get("file_size"),
+        fields.get("mtime"),
+        fields.get("mime_type"),
+        fields.get("mime_source"),
+        fields.get("sha256"),
+        fields.get("ext"),
+        fields["status"],
+        fields.get("last_error"),
+        json.dumps(fields.get("metadata") or {}),
+    )
+
+
+def _insert_indexed_file(conn: Any, path_hash: str, params: Tuple[Any, ...]) -> int:
+    conn.execute(_UPSERT_INDEXED_FILE_SQL, params)
+    row = conn.execute("SELECT id FROM files_index WHERE path_hash = ?", (path_hash,)).fetchone()
+    return int(row[0]) if row else 0
+
+
+def _write_indexed_file(conn: Any, **fields: Any) -> int:
+    return _insert_indexed_file(conn, *_indexed_file_params(**fields))
+
+
+def _insert_chunks(conn: Any, file_id: int, params: List[Tuple[Any, ...]]) -> List[int]:
+    conn.execute("DELETE FROM file_chunk_embeddings WHERE file_id = ?", (file_id,))
+    conn.execute("DELETE FROM file_extracted_tables WHERE file_id = ?", (file_id,))
+    conn.execute("DELETE FROM file_content_chunks WHERE file_id = ?", (file_id,))
+    if not params:
+        return []
+    conn.executemany(_INSERT_CHUNK_SQL, params)
+    # The file's chunks were just deleted, so its rowids are exactly this batch in insert order.
+    rows = conn.execute(
+        "SELECT id FROM file_content_chunks WHERE file_id = ? ORDER BY id ASC", (file_id,)
+    ).fetchall()
+    return [int(row[0]) for row in rows]
+
+
+def _write_chunks(
+    conn: Any, file_id: int, chunks: Sequence[Dict[str, Any]]
+) -> List[int]:
+    return _insert_chunks(conn, file_id, _chunk_params(file_id, chunks))
+
+
+def _insert_entities(conn: Any, file_id: int, params: List[Tuple[Any, ...]]) -> int:
+    conn.execute("DELETE FROM file_entities WHERE file_id = ?", (file_id,))
+    if params:
+        conn.executemany(_INSERT_ENTITY_SQL, params)
+    return len(params)
+
+
+def _write_entities(conn: Any, file_id: int, entities: Sequence[Dict[str, Any]]) -> int:
+    return _insert_entities(conn, file_id, _entity_params(file_id, entities))
+
+
+def _insert_tables(conn: Any, file_id: int, params: List[Tuple[Any, ...]]) -> int:
+    conn.execute("DELETE FROM file_extracted_tables WHERE file_id = ?", (file_id,))
+    if params:
+        conn.executemany(_INSERT_TABLE_SQL, params)
+    return len(params)
+
+
+def _write_tables(conn: Any, file_id: int, tables: Sequence[Dict[str, Any]]) -> int:
+    return _insert_tables(conn, file_id, _table_params(file_id, tables))
+
+
+def _insert_embeddings(conn: Any, params: List[Tuple[Any, ...]]) -> int:
+    if params:
+        conn.executemany(_UPSERT_EMBEDDING_SQL, params)
+    return len(params)
+
+
+def _write_embeddings(
+    conn: Any,
+    file_id: int,
+    embedding_model: str,
+    embeddings: Sequence[Tuple[int, Sequence[float]]],
+) -> int:
+    return _insert_embeddings(
+        conn, _embedding_params(file_id, embedding_model, embeddings)
+    )
+
+
+def _insert_manifest(conn: Any, params: List[Tuple[Any, ...]]) -> int:
+    if params:
+        conn.executemany(_UPSERT_MANIFEST_SQL, params)
+    return len(params)
+
+
+def _write_manifest(conn: Any, rows: Sequence[Dict[str, Any]]) -> int:
+    return _insert_manifest(conn, _manifest_params(rows))
+
+
+class PendingFileWrite:
+    """One file's buffered writes inside a FileIndexBulkWriter.
+
+    ``file_id`` and ``chunk_ids`` are filled in when the batch is flushed;
+    ``error`` is set instead if the file's statements failed there.
+    """
+
+    def __init__(self) -> None:
+        self.ops: List[Callable[[Any, "PendingFileWrite"], None]] = []
+        self.file_id: Optional[int] = None
+        self.chunk_ids: List[int] = []
+        self.error: Optional[str] = None
+
+    def apply(self, conn: Any) -> None:
+        for op in self.ops:
+            op(conn, self)
+
+
+class FileIndexBulkWriter:
+    """Buffers per-file writes and flushes them in short multi-file transactions.
+
+    Wrap each file's writes in ``with writer.file():``. The writer methods
+    only build statement parameters; nothing touches the database until the
+    batch is flushed, so the write lock is held for the flush alone and not
+    while the caller parses or waits on OCR. A file whose block raises is
+    dropped; at flush time each file runs behind its own savepoint, so one
+    failing file is rolled back without the rest of the batch. The batch is
+    flushed every ``files_per_commit`` files, once the oldest pending file is
+    ``max_latency_seconds`` old, and when the writer closes.
+    """
+
+    def __init__(
+        self,
+        conn: Any,
+        files_per_commit: int = DEFAULT_FILES_PER_COMMIT,
+        max_latency_seconds: float = DEFAULT_COMMIT_LATENCY_SECONDS,
+    ):
+        self.conn = conn
+        self.files_per_commit = max(1, int(files_per_commit))
+        self.max_latency_seconds = max(0.0, float(max_latency_seconds))
+        self.commits = 0
+        self.failed_files = 0
+        self._pending: List[PendingFileWrite] = []
+        self._current: Optional[PendingFileWrite] = None
+        self._first_pending_at: Optional[float] = None
+
+    @property
+    def pending_files(self) -> int:
+        return len(self._pending)
+
+    def commit_if_due(self) -> bool:
+        """Flush when the batch is full or has waited too long; True if it did."""
+        if not self._pending:
+            return False
+        full = len(self._pending) >= self.files_per_commit
+        stale = (
+            self._first_pending_at is not None
+            and time.monotonic() - self._first_pending_at >= self.max_latency_seconds
+        )
+        if full or stale:
+            self.commit()
+            return True
+        return False
+
+    @contextmanager
+    def file(self) -> Iterator[PendingFileWrite]:
+        # A slow parse between files must not hold earlier files back past the bound
+        self.commit_if_due()
+        pending = PendingFileWrite()
+        self._current = pending
+        try:
+            yield pending
+        finally:
+            self._current = None
+        self._pending.append(pending)
+        if self._first_pending_at is None:
+            self._first_pending_at = time.monotonic()
+        self.commit_if_due()
+
+    def commit(self) -> None:
+        """Write every pending file in one transaction and commit it."""
+        batch, self._pending = self._pending, []
+        self._first_pending_at = None
+        if not batch:
+            return
+        conn = self.conn
+        if not conn.in_transaction:
+            # Take the write lock up front rather than upgrading mid-batch.
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            for pending in batch:
+                conn.execute("SAVEPOINT file_index_file")
+                try:
+                    pending.apply(conn)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO SAVEPOINT file_index_file")
+                    conn.execute("RELEASE SAVEPOINT file_index_file")
+                    pending.error = str(e)
+                    pending.file_id = None
+                    pending.chunk_ids = []
+                    self.failed_files += 1
+                    logger.warning("File index write rolled back: %s", e)
+                    continue
+                conn.execute("RELEASE SAVEPOINT file_index_file")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        self.commits += 1
+
+    def _queue(self, op: Callable[[Any, PendingFileWrite], None]) -> None:
+        if self._current is None:
+            with self.file() as pending:
+                pending.ops.append(op)
+            return
+        self._current.ops.append(op)
+
+    def upsert_indexed_file(self, **fields: Any) -> None:
+        path_hash, params = _indexed_file_params(**fields)
+
+        def op(conn: Any, pending: PendingFileWrite) -> None:
+            pending.file_id = _insert_indexed_file(conn, path_hash, params)
+
+        self._queue(op)
+
+    def replace_file_chunks(
+        self,
+        file_id: int,
+        chunks: Sequence[Dict[str, Any]],
+        *,
+        embedding_model: Optional[str] = None,
+        embeddings: Optional[Sequence[Sequence[float]]] = None,
+    ) -> int:
+        """Queue the file's chunks, plus one embedding per chunk when given.
+
+        Chunk ids only exist once the batch is flushed, so embeddings for new
+        chunks are matched to them by position instead of by id.
+        """
+        params = _chunk_params(file_id, chunks)
+        # Encoded now, off the write lock; the position stands in for the chunk id.
+        vectors = _embedding_params(
+            file_id, embedding_model or "", enumerate(embeddings or [])
+        )
+        vectors = vectors[: len(params)]
+
+        def op(conn: Any, pending: PendingFileWrite) -> None:
+            chunk_ids = _insert_chunks(conn, file_id, params)
+            pending.chunk_ids = chunk_ids
+            _insert_embeddings(conn, [(v[0], chunk_ids[v[1]], *v[2:]) for v in vectors])
+
+        self._queue(op)
+        return len(params)
+
+    def replace_file_entities(self, file_id: int, entities: Sequence[Dict[str, Any]]) -> int:
+        params = _entity_params(file_id, entities)
+        self._queue(lambda conn, pending: _insert_entities(conn, file_id, params))
+        return len(params)
+
+    def replace_file_tables(self, file_id: int, tables: Sequence[Dict[str, Any]]) -> int:
+        params = _table_params(file_id, tables)
+        self._queue(lambda conn, pending: _insert_tables(conn, file_id, params))
+        return len(params)
+
+    def upsert_chunk_embeddings(
+        self, *, file_id: int, embedding_model: str, embeddings: Sequence[Tuple[int, Sequence[float]]]
+    ) -> int:
+        params = _embedding_params(file_id, embedding_model, embeddings)
+        self._queue(lambda conn, pending: _insert_embeddings(conn, params))
+        return len(params)
+
+    def scan_manifest_upsert(self, **row: Any) -> None:
+        params = _manifest_params([row])
+        self._queue(lambda conn, pending: _insert_manifest(conn, params))
+
 
 class FileIndexRepository(BaseRepository):
+    def __init__(
+        self,
+        connection_factory: Callable[[], ContextManager[Any]],
+        writer_connection_factory: Optional[Callable[[], ContextManager[Any]]] = None,
+    ):
+        super().__init__(connection_factory)
+        self._writer_connection_factory = writer_connection_factory
+
+    @contextmanager
+    def bulk_writer(
+        self,
+        files_per_commit: Optional[int] = None,
+        max_latency_seconds: Optional[float] = None,
+    ) -> Iterator[FileIndexBulkWriter]:
+        """Yield a FileIndexBulkWriter; flushes the tail on exit, drops it on error.
+
+        The writer gets its own connection when a ``writer_connection_factory``
+        was given, so commits and rollbacks made through ``connection()`` while
+        a flush is running cannot end its transaction.
+        """
+        factory = self._writer_connection_factory or self._connection_factory
+        with factory() as conn:
+            if conn.in_transaction:
+                conn.commit()
+            writer = FileIndexBulkWriter(
+                conn,
+                files_per_commit or DEFAULT_FILES_PER_COMMIT,
+                DEFAULT_COMMIT_LATENCY_SECONDS
+                if max_latency_seconds is None
+                else max_latency_seconds,
+            )
+            try:
+                yield writer
+            except Exception:
+                conn.rollback()
+                raise
+            writer.commit()
+
     def upsert_indexed_file(
         self,
         *,
@@ -28,50 +529,24 @@ class FileIndexRepository(BaseRepository):
         last_error: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> int:
-        path_hash = hashlib.sha1(normalized_path.encode("utf-8")).hexdigest()
         with self.connection() as conn:
-            conn.execute(
-                """
-                INSERT INTO files_index (
-                    display_name, original_path, normalized_path, path_hash,
-                    file_size, mtime, mime_type, mime_source, sha256, ext, status, last_checked_at, last_error, metadata_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?, ?)
-                ON CONFLICT(path_hash) DO UPDATE SET
-                    display_name=excluded.display_name,
-                    original_path=excluded.original_path,
-                    normalized_path=excluded.normalized_path,
-                    file_size=excluded.file_size,
-                    mtime=excluded.mtime,
-                    mime_type=excluded.mime_type,
-                    mime_source=excluded.mime_source,
-                    sha256=excluded.sha256,
-                    ext=excluded.ext,
-                    status=excluded.status,
-                    last_checked_at=CURRENT_TIMESTAMP,
-                    last_error=excluded.last_error,
-                    metadata_json=excluded.metadata_json
-                """,
-                (
-                    display_name,
-                    original_path,
-                    normalized_path,
-                    path_hash,
-                    file_size,
-                    mtime,
-                    mime_type,
-                    mime_source,
-                    sha256,
-                    ext,
-                    status,
-                    last_error,
-                    json.dumps(metadata or {}),
-                ),
+            file_id = _write_indexed_file(
+                conn,
+                display_name=display_name,
+                original_path=original_path,
+                normalized_path=normalized_path,
+                file_size=file_size,
+                mtime=mtime,
+                mime_type=mime_type,
+                mime_source=mime_source,
+                sha256=sha256,
+                ext=ext,
+                status=status,
+                last_error=last_error,
+                metadata=metadata,
             )
-            row = conn.execute(
-                "SELECT id FROM files_index WHERE path_hash = ?", (path_hash,)
-            ).fetchone()
             conn.commit()
-            return int(row[0]) if row else 0
+            return file_id
 
     def get_indexed_file(self, file_id: int) -> Optional[Dict[str, Any]]:
         with self.connection() as conn:
@@ -173,6 +648,80 @@ class FileIndexRepository(BaseRepository):
                 out.append(item)
             return out
 
+    def list_indexed_files_in_scope(
+        self,
+        prefixes: Sequence[str],
+        *,
+        limit: int,
+        exclude_statuses: Sequence[str] = ("missing",),
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """Return up to ``limit`` indexed files under any of ``prefixes``, oldest first.
+
+        Prefixes match case-insensitively with backslashes treated as slashes;
+        an empty ``prefixes`` selects the whole index. Rows whose status is in
+        ``exclude_statuses`` are skipped. The counts dict carries ``scoped``
+        (all rows in scope), ``ready`` and ``candidates`` (rows not excluded).
+        """
+        ranges = [
+            _prefix_range(p)
+            for p in (str(x or "").replace("\\", "/").strip() for x in prefixes)
+            if p
+        ]
+        where = "1=1"
+        params: List[Any] = []
+        if ranges:
+            where = " OR ".join(
+                f"({SCOPE_PATH_EXPR} >= ? AND {SCOPE_PATH_EXPR} < ?)" for _ in ranges
+            )
+            for low, high in ranges:
+                params.extend([low, high])
+        excluded = sorted(
+            {str(s).strip().lower() for s in exclude_statuses if str(s).strip()}
+        )
+        excluded_sql = (
+            f"{_STATUS_EXPR} IN ({','.join('?' for _ in excluded)})"
+            if excluded
+            else "0"
+        )
+
+        with self.connection() as conn:
+            counts_row = conn.execute(
+                f"""
+                SELECT COUNT(*) AS scoped,
+                       COALESCE(SUM(CASE WHEN {_STATUS_EXPR} = 'ready'
+                                    THEN 1 ELSE 0 END), 0) AS ready,
+                       COALESCE(SUM(CASE WHEN {excluded_sql}
+                                    THEN 0 ELSE 1 END), 0) AS candidates
+                FROM files_index
+                WHERE {where}
+                """,
+                [*excluded, *params],
+            ).fetchone()
+            rows = conn.execute(
+                f"""
+                SELECT * FROM files_index
+                WHERE ({where}) AND NOT ({excluded_sql})
+                ORDER BY id ASC
+                LIMIT ?
+                """,
+                [*params, *excluded, max(0, int(limit))],
+            ).fetchall()
+
+        items: List[Dict[str, Any]] = []
+        for row in rows:
+            item = dict(row)
+            try:
+                item["metadata_json"] = json.loads(item.get("metadata_json") or "{}")
+            except Exception:
+                item["metadata_json"] = {}
+            items.append(item)
+        counts = {
+            "scoped": int(counts_row["scoped"] or 0),
+            "ready": int(counts_row["ready"] or 0),
+            "candidates": int(counts_row["candidates"] or 0),
+        }
+        return items, counts
+
     def update_indexed_file_metadata(self, file_id: int, metadata_json: str) -> bool:
         """Update only the metadata_json field for a given file_id."""
         with self.connection() as conn:
@@ -184,32 +733,8 @@ class FileIndexRepository(BaseRepository):
             return cursor.rowcount > 0
 
     def replace_file_chunks(self, file_id: int, chunks: List[Dict[str, Any]]) -> List[int]:
-        chunk_ids: List[int] = []
         with self.connection() as conn:
-            conn.execute("DELETE FROM file_chunk_embeddings WHERE file_id = ?", (file_id,))
-            conn.execute("DELETE FROM file_extracted_tables WHERE file_id = ?", (file_id,))
-            conn.execute("DELETE FROM file_content_chunks WHERE file_id = ?", (file_id,))
-
-            for idx, chunk in enumerate(chunks):
-                cur = conn.execute(
-                    """
-                    INSERT INTO file_content_chunks (
-                        file_id, chunk_index, chunk_type, title, content,
-                        token_estimate, char_count, metadata_json, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    """,
-                    (
-                        file_id,
-                        int(chunk.get("chunk_index", idx)),
-                        str(chunk.get("chunk_type") or "text"),
-                        chunk.get("title"),
-                        str(chunk.get("content") or ""),
-                        int(chunk.get("token_estimate") or 0),
-                        int(chunk.get("char_count") or len(str(chunk.get("content") or ""))),
-                        json.dumps(chunk.get("metadata") or {}),
-                    ),
-                )
-                chunk_ids.append(int(cur.lastrowid))
+            chunk_ids = _write_chunks(conn, file_id, chunks)
             conn.commit()
         return chunk_ids
 
@@ -231,29 +756,7 @@ class FileIndexRepository(BaseRepository):
 
     def replace_file_entities(self, file_id: int, entities: List[Dict[str, Any]]) -> int:
         with self.connection() as conn:
-            conn.execute("DELETE FROM file_entities WHERE file_id = ?", (file_id,))
-            inserted = 0
-            for entity in entities:
-                entity_text = str(entity.get("entity_text") or entity.get("text") or "").strip()
-                if not entity_text:
-                    continue
-                conn.execute(
-                    """
-                    INSERT INTO file_entities (
-                        file_id, entity_text, entity_type, ontology_id, confidence, provenance, metadata_json, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    """,
-                    (
-                        file_id,
-                        entity_text,
-                        entity.get("entity_type") or entity.get("label"),
-                        entity.get("ontology_id"),
-                        float(entity.get("confidence") or 0.5),
-                        entity.get("provenance"),
-                        json.dumps(entity.get("metadata") or {}),
-                    ),
-                )
-                inserted += 1
+            inserted = _write_entities(conn, file_id, entities)
             conn.commit()
             return inserted
 
@@ -386,28 +889,7 @@ class FileIndexRepository(BaseRepository):
 
     def replace_file_tables(self, file_id: int, tables: List[Dict[str, Any]]) -> int:
         with self.connection() as conn:
-            conn.execute("DELETE FROM file_extracted_tables WHERE file_id = ?", (file_id,))
-            inserted = 0
-            for i, table in enumerate(tables):
-                conn.execute(
-                    """
-                    INSERT INTO file_extracted_tables (
-                        file_id, source_chunk_id, table_index, extraction_status,
-                        extraction_method, headers_json, rows_json, metadata_json, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    """,
-                    (
-                        file_id,
-                        table.get("source_chunk_id"),
-                        int(table.get("table_index", i)),
-                        str(table.get("extraction_status") or "unknown"),
-                        table.get("extraction_method"),
-                        json.dumps(table.get("headers") or []),
-                        json.dumps(table.get("rows") or []),
-                        json.dumps(table.get("metadata") or {}),
-                    ),
-                )
-                inserted += 1
+            inserted = _write_tables(conn, file_id, tables)
             conn.commit()
             return inserted
 
@@ -428,25 +910,22 @@ class FileIndexRepository(BaseRepository):
                 out.append(item)
             return out
 
+    def upsert_chunk_embeddings(
+        self,
+        *,
+        file_id: int,
+        embedding_model: str,
+        embeddings: Sequence[Tuple[int, Sequence[float]]],
+    ) -> int:
+        """Upsert (chunk_id, vector) pairs for one model in a single executemany."""
+        with self.connection() as conn:
+            written = _write_embeddings(conn, file_id, embedding_model, embeddings)
+            conn.commit()
+            return written
+
     def upsert_chunk_embedding(self, *, file_id: int, chunk_id: int, embedding_model: str, embedding: List[float]) -> int:
-        vector = [float(v) for v in embedding]
-        vector_dim = len(vector)
-        emb_hash = hashlib.sha1(json.dumps(vector, sort_keys=False).encode("utf-8")).hexdigest()
         with self.connection() as conn:
-            conn.execute(
-                """
-                INSERT INTO file_chunk_embeddings (
-                    file_id, chunk_id, embedding_model, vector_dim, embedding_json, embedding_hash, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(chunk_id, embedding_model) DO UPDATE SET
-                    file_id=excluded.file_id,
-                    vector_dim=excluded.vector_dim,
-                    embedding_json=excluded.embedding_json,
-                    embedding_hash=excluded.embedding_hash,
-                    updated_at=CURRENT_TIMESTAMP
-                """,
-                (file_id, chunk_id, embedding_model, vector_dim, json.dumps(vector), emb_hash),
-            )
+            _write_embeddings(conn, file_id, embedding_model, [(chunk_id, embedding)])
             row = conn.execute(
                 "SELECT id FROM file_chunk_embeddings WHERE chunk_id = ? AND embedding_model = ?",
                 (chunk_id, embedding_model),
@@ -620,23 +1099,25 @@ class FileIndexRepository(BaseRepository):
         last_status: Optional[str],
         last_error: Optional[str],
     ) -> None:
+        self.scan_manifest_upsert_many(
+            [
+                {
+                    "path_hash": path_hash,
+                    "normalized_path": normalized_path,
+                    "file_size": file_size,
+                    "mtime": mtime,
+                    "sha256": sha256,
+                    "last_status": last_status,
+                    "last_error": last_error,
+                }
+            ]
+        )
+
+    def scan_manifest_upsert_many(self, rows: Sequence[Dict[str, Any]]) -> int:
         with self.connection() as conn:
-            conn.execute(
-                """
-                INSERT INTO scan_manifest (path_hash, normalized_path, file_size, mtime, sha256, last_status, last_error, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(path_hash) DO UPDATE SET
-                    normalized_path=excluded.normalized_path,
-                    file_size=excluded.file_size,
-                    mtime=excluded.mtime,
-                    sha256=excluded.sha256,
-                    last_status=excluded.last_status,
-                    last_error=excluded.last_error,
-                    updated_at=CURRENT_TIMESTAMP
-                """,
-                (path_hash, normalized_path, file_size, mtime, sha256, last_status, last_error),
-            )
+            written = _write_manifest(conn, rows)
             conn.commit()
+            return written
 
     def search_file_chunks_fulltext(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
         q = str(query or "").strip()
@@ -7,31 +7,43 @@ from .base import BaseRepository
 
 
 class OrganizationRepository(BaseRepository):
+    @staticmethod
+    def _insert_proposal(conn: Any, proposal: Dict[str, Any]) -> int:
+        cur = conn.execute(
+            """
+            INSERT INTO organization_proposals
+            (run_id, file_id, current_path, proposed_folder, proposed_filename,
+             confidence, rationale, alternatives_json, provider, model, status,
+             metadata_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                proposal.get("run_id"),
+                proposal.get("file_id"),
+                proposal.get("current_path"),
+                proposal.get("proposed_folder"),
+                proposal.get("proposed_filename"),
+                float(proposal.get("confidence", 0.5)),
+                proposal.get("rationale"),
+                json.dumps(proposal.get("alternatives") or []),
+                proposal.get("provider"),
+                proposal.get("model"),
+                proposal.get("status", "proposed"),
+                json.dumps(proposal.get("metadata") or {}),
+            ),
+        )
+        return int(cur.lastrowid)
+
     def add_proposal(self, proposal: Dict[str, Any]) -> int:
-        def _op(conn: Any) -> int:
-            cur = conn.execute(
-                """
-                INSERT INTO organization_proposals
-                (run_id, file_id, current_path, proposed_folder, proposed_filename, confidence,
-                 rationale, alternatives_json, provider, model, status, metadata_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    proposal.get("run_id"),
-                    proposal.get("file_id"),
-                    proposal.get("current_path"),
-                    proposal.get("proposed_folder"),
-                    proposal.get("proposed_filename"),
-                    float(proposal.get("confidence", 0.5)),
-                    proposal.get("rationale"),
-                    json.dumps(proposal.get("alternatives") or []),
-                    proposal.get("provider"),
-                    proposal.get("model"),
-                    proposal.get("status", "proposed"),
-                    json.dumps(proposal.get("metadata") or {}),
-                ),
-            )
-            return int(cur.lastrowid)
+        return self.write_with_retry(lambda conn: self._insert_proposal(conn, proposal))
+
+    def add_proposals(self, proposals: List[Dict[str, Any]]) -> List[int]:
+        """Insert several proposals in one transaction; returns their ids in order."""
+        if not proposals:
+            return []
+
+        def _op(conn: Any) -> List[int]:
+            return [self._insert_proposal(conn, p) for p in proposals]
 
         return self.write_with_retry(_op)
 
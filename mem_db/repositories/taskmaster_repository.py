@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import uuid
 from typing import Any, Dict, List, Optional
 
 from .base import BaseRepository
@@ -241,31 +242,36 @@ class TaskMasterRepository(BaseRepository):
 
         return self.write_with_retry(_op)
 
-    def queue_claim_next(self, *, worker_name: str) -> Optional[Dict[str, Any]]:
+    def queue_claim_next(
+        self, *, worker_name: str, lease_seconds: int = 300
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically claim the oldest available job and take a lease on it.
+
+        Selection and update are one statement, so concurrent workers can never
+        claim the same row. The returned ``lease_token`` is unique to this
+        claim; pass it to heartbeat, complete and retry.
+        """
         def _op(conn: Any) -> Optional[Dict[str, Any]]:
             row = conn.execute(
-                """
-                SELECT * FROM taskmaster_job_queue
-                WHERE status = 'queued' AND available_at <= datetime('now')
-                ORDER BY id ASC
-                LIMIT 1
-                """
-            ).fetchone()
-            if not row:
-                return None
-            job_id = int(row["id"])
-            conn.execute(
                 """
                 UPDATE taskmaster_job_queue
-                SET status = 'running', worker_name = ?, started_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ? AND status = 'queued'
+                SET status = 'running', worker_name = ?, lease_token = ?,
+                    started_at = CURRENT_TIMESTAMP, heartbeat_at = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP,
+                    lease_expires_at = datetime('now', '+' || ? || ' seconds')
+                WHERE id = (
+                    SELECT id FROM taskmaster_job_queue
+                    WHERE status = 'queued' AND available_at <= datetime('now')
+                    ORDER BY id ASC
+                    LIMIT 1
+                ) AND status = 'queued'
+                RETURNING *
                 """,
-                (worker_name, job_id),
-            )
-            claimed = conn.execute("SELECT * FROM taskmaster_job_queue WHERE id = ?", (job_id,)).fetchone()
-            if not claimed or str(claimed["status"]) != "running":
+                (worker_name, uuid.uuid4().hex, int(lease_seconds)),
+            ).fetchone()
+            if not row:
                 return None
-            out = dict(claimed)
+            out = dict(row)
             try:
                 out["payload_json"] = json.loads(out.get("payload_json") or "{}")
             except Exception:
@@ -274,59 +280,165 @@ class TaskMasterRepository(BaseRepository):
 
         return self.write_with_retry(_op)
 
-    def queue_mark_completed(self, queue_job_id: int) -> None:
-        def _op(conn: Any) -> None:
-            conn.execute(
+    def queue_heartbeat(
+        self, queue_job_id: int, *, lease_token: str, lease_seconds: int = 300
+    ) -> bool:
+        """Extend a running job's lease; False means the lease was lost to a reclaim."""
+
+        def _op(conn: Any) -> bool:
+            cur = conn.execute(
                 """
                 UPDATE taskmaster_job_queue
-                SET status = 'completed', completed_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
+                SET heartbeat_at = CURRENT_TIMESTAMP,
+                    lease_expires_at = datetime('now', '+' || ? || ' seconds')
+                WHERE id = ? AND status = 'running' AND lease_token = ?
                 """,
-                (queue_job_id,),
+                (int(lease_seconds), queue_job_id, lease_token),
             )
+            return cur.rowcount > 0
 
-        self.write_with_retry(_op)
+        return self.write_with_retry(_op)
 
-    def queue_mark_retry_or_dead_letter(self, queue_job_id: int, *, error_message: str) -> str:
-        with self.connection() as conn:
-            row = conn.execute("SELECT * FROM taskmaster_job_queue WHERE id = ?", (queue_job_id,)).fetchone()
-            if not row:
-                return "missing"
-            retry_count = int(row["retry_count"] or 0) + 1
-            max_retries = int(row["max_retries"] or 0)
-            mode = str(row["mode"])
-            payload_raw = str(row["payload_json"] or "{}")
-            if retry_count <= max_retries:
-                conn.execute(
+    def queue_reclaim_expired(self, *, lease_seconds: int = 300) -> Dict[str, int]:
+        """Requeue (or dead-letter) running jobs whose lease ran out unrenewed.
+
+        Rows claimed before leases existed have no expiry; they are treated as
+        expired ``lease_seconds`` after their last update.
+        """
+
+        def _op(conn: Any) -> Dict[str, int]:
+            expired = """
+                status = 'running'
+                AND COALESCE(
+                    lease_expires_at, datetime(updated_at, '+' || ? || ' seconds')
+                ) <= datetime('now')
+            """
+            dead = conn.execute(
+                f"""
+                UPDATE taskmaster_job_queue
+                SET status = 'dead_letter', retry_count = retry_count + 1,
+                    last_error = 'lease expired', lease_token = NULL,
+                    lease_expires_at = NULL,
+                    completed_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE {expired} AND retry_count + 1 > max_retries
+                RETURNING id, mode, payload_json, retry_count
+                """,
+                (int(lease_seconds),),
+            ).fetchall()
+            if dead:
+                conn.executemany(
                     """
-                    UPDATE taskmaster_job_queue
-                    SET status = 'queued', retry_count = ?, last_error = ?,
-                        available_at = datetime('now', '+10 seconds'), updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
+                    INSERT INTO taskmaster_dead_letters
+                        (queue_job_id, mode, payload_json, error_message, retry_count)
+                    VALUES (?, ?, ?, 'lease expired', ?)
                     """,
-                    (retry_count, str(error_message), queue_job_id),
+                    [
+                        (r["id"], r["mode"], r["payload_json"], r["retry_count"])
+                        for r in dead
+                    ],
                 )
-                conn.commit()
-                return "retry"
+            requeued = conn.execute(
+                f"""
+                UPDATE taskmaster_job_queue
+                SET status = 'queued', retry_count = retry_count + 1,
+                    last_error = 'lease expired', worker_name = NULL,
+                    lease_token = NULL, lease_expires_at = NULL,
+                    available_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE {expired}
+                """,
+                (int(lease_seconds),),
+            ).rowcount
+            return {"requeued": int(requeued), "dead_lettered": len(dead)}
 
-            conn.execute(
-                """
+        return self.write_with_retry(_op)
+
+    def queue_mark_completed(
+        self, queue_job_id: int, *, lease_token: Optional[str] = None
+    ) -> bool:
+        """Complete a job; with ``lease_token`` only while that claim still holds it."""
+
+        def _op(conn: Any) -> bool:
+            sql = """
                 UPDATE taskmaster_job_queue
-                SET status = 'dead_letter', retry_count = ?, last_error = ?, completed_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                SET status = 'completed', lease_token = NULL, lease_expires_at = NULL,
+                    completed_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
                 WHERE id = ?
+            """
+            params: List[Any] = [queue_job_id]
+            if lease_token is not None:
+                sql += " AND status = 'running' AND lease_token = ?"
+                params.append(lease_token)
+            return conn.execute(sql, params).rowcount > 0
+
+        return self.write_with_retry(_op)
+
+    def queue_mark_retry_or_dead_letter(
+        self,
+        queue_job_id: int,
+        *,
+        error_message: str,
+        lease_token: Optional[str] = None,
+    ) -> str:
+        """Requeue a failed job, or dead-letter it once its retries are spent.
+
+        Each update carries the lease fence in its WHERE clause, so a job
+        reclaimed (and possibly claimed again) meanwhile is left to its new
+        owner and ``"lease_lost"`` is returned.
+        """
+        fence = ""
+        fence_params: List[Any] = []
+        if lease_token is not None:
+            fence = " AND status = 'running' AND lease_token = ?"
+            fence_params.append(lease_token)
+
+        def _op(conn: Any) -> str:
+            retried = conn.execute(
+                f"""
+                UPDATE taskmaster_job_queue
+                SET status = 'queued', retry_count = retry_count + 1, last_error = ?,
+                    lease_token = NULL, lease_expires_at = NULL,
+                    available_at = datetime('now', '+10 seconds'),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND retry_count + 1 <= max_retries{fence}
                 """,
-                (retry_count, str(error_message), queue_job_id),
-            )
+                [str(error_message), queue_job_id, *fence_params],
+            ).rowcount
+            if retried:
+                return "retry"
+
+            dead = conn.execute(
+                f"""
+                UPDATE taskmaster_job_queue
+                SET status = 'dead_letter', retry_count = retry_count + 1,
+                    last_error = ?, lease_token = NULL, lease_expires_at = NULL,
+                    completed_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND retry_count + 1 > max_retries{fence}
+                RETURNING mode, payload_json, retry_count
+                """,
+                [str(error_message), queue_job_id, *fence_params],
+            ).fetchone()
+            if not dead:
+                exists = conn.execute(
+                    "SELECT 1 FROM taskmaster_job_queue WHERE id = ?", (queue_job_id,)
+                ).fetchone()
+                return "lease_lost" if exists else "missing"
             conn.execute(
                 """
                 INSERT INTO taskmaster_dead_letters (queue_job_id, mode, payload_json, error_message, retry_count)
                 VALUES (?, ?, ?, ?, ?)
                 """,
-                (queue_job_id, mode, payload_raw, str(error_message), retry_count),
+                (
+                    queue_job_id,
+                    str(dead["mode"]),
+                    str(dead["payload_json"] or "{}"),
+                    str(error_message),
+                    int(dead["retry_count"]),
+                ),
             )
-            conn.commit()
             return "dead_letter"
 
+        return self.write_with_retry(_op)
+
     def dead_letters(self, *, limit: int = 100) -> List[Dict[str, Any]]:
         with self.connection() as conn:
             rows = conn.execute(
@@ -371,10 +483,13 @@ class TaskMasterRepository(BaseRepository):
                 out.append(item)
             return out
 
-    def schedule_due(self) -> List[Dict[str, Any]]:
+    def schedule_due(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         with self.connection() as conn:
             rows = conn.execute(
-                "SELECT * FROM taskmaster_schedules WHERE active = 1 AND next_run_at <= datetime('now') ORDER BY next_run_at ASC"
+                "SELECT * FROM taskmaster_schedules "
+                "WHERE active = 1 AND next_run_at <= datetime('now') "
+                "ORDER BY next_run_at ASC LIMIT ?",
+                (-1 if limit is None else int(limit),),
             ).fetchall()
             out = []
             for r in rows:
@@ -400,3 +515,50 @@ class TaskMasterRepository(BaseRepository):
             )
 
         self.write_with_retry(_op)
+
+    def schedule_enqueue_due(
+        self, *, limit: int = 100, max_retries: int = 2
+    ) -> List[Dict[str, Any]]:
+        """Advance due schedules and enqueue one job each, in a single transaction.
+
+        Claiming and rescheduling is one UPDATE, so two scheduler ticks (or
+        processes) can never enqueue the same due run twice.
+        """
+
+        def _op(conn: Any) -> List[Dict[str, Any]]:
+            rows = conn.execute(
+                """
+                UPDATE taskmaster_schedules
+                SET last_run_at = CURRENT_TIMESTAMP,
+                    next_run_at = datetime('now', '+' || every_minutes || ' minutes'),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id IN (
+                    SELECT id FROM taskmaster_schedules
+                    WHERE active = 1 AND next_run_at <= datetime('now')
+                    ORDER BY next_run_at ASC
+                    LIMIT ?
+                )
+                RETURNING id, mode, payload_json
+                """,
+                (int(limit),),
+            ).fetchall()
+            out: List[Dict[str, Any]] = []
+            for row in rows:
+                cur = conn.execute(
+                    """
+                    INSERT INTO taskmaster_job_queue
+                        (mode, payload_json, max_retries, status)
+                    VALUES (?, ?, ?, 'queued')
+                    """,
+                    (str(row["mode"]), row["payload_json"] or "{}", int(max_retries)),
+                )
+                out.append(
+                    {
+                        "schedule_id": int(row["id"]),
+                        "mode": str(row["mode"]),
+                        "queue_job_id": int(cur.lastrowid),
+                    }
+                )
+            return out
+
+        return self.write_with_retry(_op)
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from .base import BaseRepository
+
+# Pending rows whose retry time has come, plus in-flight rows whose dispatcher
+# lease ran out (e.g. the process died mid-delivery).
+_DUE_CLAUSE = """
+    ((status = 'pending' AND next_attempt_at <= ?)
+     OR (status = 'delivering' AND lease_expires_at <= ?))
+"""
+
+
+class WebhookOutboxRepository(BaseRepository):
+    def enqueue(
+        self,
+        *,
+        event_id: str,
+        event_type: str,
+        url: str,
+        payload: Dict[str, Any],
+        job_id: Optional[str] = None,
+        max_attempts: int = 3,
+        available_at: float,
+    ) -> Optional[int]:
+        """Insert one delivery; re-enqueueing an existing ``event_id`` is a no-op.
+
+        With a ``job_id``, the job's webhook status is set to
+        ``queued:<event_type>`` in the same transaction.
+        """
+
+        def _op(conn: Any) -> Optional[int]:
+            cur = conn.execute(
+                """
+                INSERT INTO workflow_webhook_outbox
+                    (event_id, job_id, event_type, url, payload_json, max_attempts,
+                     next_attempt_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(event_id) DO NOTHING
+                """,
+                (
+                    event_id,
+                    job_id,
+                    event_type,
+                    url,
+                    json.dumps(payload, default=str),
+                    max(1, int(max_attempts)),
+                    float(available_at),
+                ),
+            )
+            if not cur.rowcount:
+                return None
+            row_id = int(cur.lastrowid)
+            if job_id:
+                conn.execute(
+                    "UPDATE workflow_jobs SET webhook_last_delivery_status = ? "
+                    "WHERE job_id = ?",
+                    (f"queued:{event_type}", job_id),
+                )
+            return row_id
+
+        return self.write_with_retry(_op)
+
+    def due_endpoints(self, *, now: float, limit: int = 100) -> List[str]:
+        with self.connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT url FROM workflow_webhook_outbox
+                WHERE {_DUE_CLAUSE}
+                GROUP BY url
+                ORDER BY MIN(next_attempt_at) ASC
+                LIMIT ?
+                """,
+                (now, now, max(1, int(limit))),
+            ).fetchall()
+        return [str(r[0]) for r in rows]
+
+    def claim(
+        self, *, url: str, limit: int, now: float, lease_seconds: float
+    ) -> List[Dict[str, Any]]:
+        """Atomically lease up to ``limit`` due deliveries to ``url``, oldest first."""
+
+        def _op(conn: Any) -> List[Dict[str, Any]]:
+            rows = conn.execute(
+                f"""
+                UPDATE workflow_webhook_outbox
+                SET status = 'delivering', attempts = attempts + 1,
+                    lease_expires_at = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id IN (
+                    SELECT id FROM workflow_webhook_outbox
+                    WHERE url = ? AND {_DUE_CLAUSE}
+                    ORDER BY id ASC
+                    LIMIT ?
+                )
+                RETURNING *
+                """,
+                (now + float(lease_seconds), url, now, now, max(1, int(limit))),
+            ).fetchall()
+            out = []
+            for row in rows:
+                item = dict(row)
+                try:
+                    item["payload_json"] = json.loads(item.get("payload_json") or "{}")
+                except Exception:
+                    item["payload_json"] = {}
+                out.append(item)
+            out.sort(key=lambda r: r["id"])
+            return out
+
+        return self.write_with_retry(_op)
+
+    def mark_delivered(self, ids: Sequence[int], *, status_code: Optional[int]) -> int:
+        if not ids:
+            return 0
+
+        def _op(conn: Any) -> int:
+            placeholders = ",".join("?" for _ in ids)
+            cur = conn.execute(
+                f"""
+                UPDATE workflow_webhook_outbox
+                SET status = 'delivered', last_status = ?, last_error = NULL,
+                    lease_expires_at = NULL, delivered_at = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id IN ({placeholders}) AND status = 'delivering'
+                """,
+                (status_code, *[int(i) for i in ids]),
+            )
+            return int(cur.rowcount or 0)
+
+        return self.write_with_retry(_op)
+
+    def mark_failed(
+        self,
+        ids: Sequence[int],
+        *,
+        retryable: bool,
+        next_attempt_at: float,
+        status_code: Optional[int],
+        error: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """Reschedule failed deliveries; returns the rows dead-lettered instead."""
+        if not ids:
+            return []
+
+        def _op(conn: Any) -> List[Dict[str, Any]]:
+            placeholders = ",".join("?" for _ in ids)
+            rows = conn.execute(
+                f"""
+                UPDATE workflow_webhook_outbox
+                SET status = CASE WHEN ? = 0 OR attempts >= max_attempts
+                                  THEN 'dead_letter' ELSE 'pending' END,
+                    next_attempt_at = ?, last_status = ?, last_error = ?,
+                    lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE id IN ({placeholders}) AND status = 'delivering'
+                RETURNING id, event_id, job_id, event_type, url, payload_json,
+                          status, attempts
+                """,
+                (
+                    1 if retryable else 0,
+                    float(next_attempt_at),
+                    status_code,
+                    error,
+                    *[int(i) for i in ids],
+                ),
+            ).fetchall()
+            dead = []
+            for row in rows:
+                item = dict(row)
+                if item["status"] != "dead_letter":
+                    continue
+                try:
+                    item["payload_json"] = json.loads(item.get("payload_json") or "{}")
+                except Exception:
+                    item["payload_json"] = {}
+                dead.append(item)
+            return dead
+
+        return self.write_with_retry(_op)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS n, MIN(next_attempt_at) AS oldest "
+                "FROM workflow_webhook_outbox GROUP BY status"
+            ).fetchall()
+        out: Dict[str, Any] = {
+            "pending": 0,
+            "delivering": 0,
+            "delivered": 0,
+            "dead_letter": 0,
+        }
+        oldest_pending = None
+        for row in rows:
+            out[str(row["status"])] = int(row["n"])
+            if row["status"] == "pending":
+                oldest_pending = row["oldest"]
+        out["oldest_pending_at"] = oldest_pending
+        return out
+
+    def purge_delivered(self, *, older_than_seconds: int) -> int:
+        def _op(conn: Any) -> int:
+            cur = conn.execute(
+                """
+                DELETE FROM workflow_webhook_outbox
+                WHERE status = 'delivered'
+                  AND delivered_at <= datetime('now', '-' || ? || ' seconds')
+                """,
+                (int(older_than_seconds),),
+            )
+            return int(cur.rowcount or 0)
+
+        return self.write_with_retry(_op)
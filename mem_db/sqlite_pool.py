@@ -0,0 +1,209 @@
+"""Small asyncio pool of long-lived aiosqlite connections.
+
+Opening ``aiosqlite.connect()`` per operation starts a worker thread and
+re-applies connection setup every time. ``AsyncSQLitePool`` keeps ``size``
+reader connections plus one dedicated writer, runs the WAL/pragma setup once
+per connection, and keeps sqlite3's per-connection statement cache warm so
+repeated SQL is not re-prepared.
+
+Writes queue on a FIFO lock in front of the writer connection, so only one
+write transaction is open at a time; under WAL readers never wait on it.
+Checkout waits are recorded for ``stats()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+try:
+    import aiosqlite
+
+    AIOSQLITE_AVAILABLE = True
+except ImportError:
+    AIOSQLITE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "4"))
+DEFAULT_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# sqlite3 keeps this many prepared statements per connection
+STATEMENT_CACHE_SIZE = 256
+
+
+class _LoopState:
+    """Synchronisation primitives bound to one event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, readers: int):
+        self.loop = loop
+        self.open_lock = asyncio.Lock()
+        self.write_lock = asyncio.Lock()
+        self.readers = asyncio.Semaphore(readers)
+
+
+class AsyncSQLitePool:
+    """Fixed set of reader connections and one queued writer for a SQLite file."""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        *,
+        size: int = DEFAULT_POOL_SIZE,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        row_factory: Any = None,
+    ):
+        if not AIOSQLITE_AVAILABLE:
+            raise ImportError("AsyncSQLitePool requires aiosqlite")
+        self.db_path = Path(db_path)
+        self.size = max(1, size)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.row_factory = row_factory
+
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle: List[aiosqlite.Connection] = []
+        self._state: Optional[_LoopState] = None
+
+        self._metrics: Dict[str, float] = {
+            "reads": 0,
+            "writes": 0,
+            "read_wait_ms_total": 0.0,
+            "read_wait_ms_max": 0.0,
+            "write_wait_ms_total": 0.0,
+            "write_wait_ms_max": 0.0,
+            "overflow_connections": 0,
+        }
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    def _loop_state(self) -> _LoopState:
+        # aiosqlite connections work from any loop, asyncio primitives do not.
+        loop = asyncio.get_running_loop()
+        if self._state is None or self._state.loop is not loop:
+            self._state = _LoopState(loop, self.size)
+        return self._state
+
+    async def _connect(self) -> "aiosqlite.Connection":
+        conn = aiosqlite.connect(
+            str(self.db_path),
+            timeout=max(1.0, self.busy_timeout_ms / 1000.0),
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        # Pool connections live for the process; their worker threads must not
+        # block interpreter exit if a caller never closes the pool.
+        thread = getattr(conn, "_thread", None)
+        if thread is not None:
+            thread.daemon = True
+        await conn
+        await self._pragma(conn, f"busy_timeout = {int(self.busy_timeout_ms)}")
+        await self._pragma(conn, "synchronous = NORMAL")
+        await self._pragma(conn, "temp_store = MEMORY")
+        conn.row_factory = self.row_factory
+        return conn
+
+    @staticmethod
+    async def _pragma(conn: "aiosqlite.Connection", statement: str) -> None:
+        # Drain and close the cursor: an unfinished PRAGMA statement keeps its
+        # lock, which makes the other pool connections see "database is locked".
+        async with conn.execute(f"PRAGMA {statement}") as cursor:
+            await cursor.fetchall()
+
+    async def open(self) -> None:
+        state = self._loop_state()
+        async with state.open_lock:
+            if self._writer is not None:
+                return
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            writer = await self._connect()
+            await self._pragma(writer, "journal_mode = WAL")
+            readers = [await self._connect() for _ in range(self.size)]
+            self._writer, self._readers, self._idle = writer, readers, list(readers)
+
+    async def close(self) -> None:
+        """Close every connection; the pool reopens on next use."""
+        writer, readers = self._writer, self._readers
+        self._writer, self._readers, self._idle = None, [], []
+        for conn in ([writer] if writer is not None else []) + readers:
+            try:
+                await conn.close()
+            except Exception as e:  # pragma: no cover - best effort shutdown
+                logger.debug("Error closing pooled SQLite connection: %s", e)
+
+    async def _release(self, conn: "aiosqlite.Connection") -> None:
+        # Match per-operation connections: uncommitted work does not leak out.
+        if conn.in_transaction:
+            await conn.rollback()
+        conn.row_factory = self.row_factory
+
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator["aiosqlite.Connection"]:
+        """Check out a reader connection."""
+        if self._writer is None:
+            await self.open()
+        state = self._loop_state()
+        started = time.perf_counter()
+        async with state.readers:
+            self._record_wait("read", started)
+            overflow = not self._idle
+            if overflow:
+                # Only when connections are still checked out under another loop.
+                self._metrics["overflow_connections"] += 1
+                conn = await self._connect()
+            else:
+                conn = self._idle.pop()
+            try:
+                yield conn
+            finally:
+                if overflow:
+                    await conn.close()
+                elif conn in self._readers:
+                    await self._release(conn)
+                    self._idle.append(conn)
+                else:
+                    # The pool was closed and reopened while this was checked out.
+                    await conn.close()
+
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator["aiosqlite.Connection"]:
+        """Check out the writer connection; callers commit their own work."""
+        if self._writer is None:
+            await self.open()
+        state = self._loop_state()
+        started = time.perf_counter()
+        async with state.write_lock:
+            self._record_wait("write", started)
+            if self._writer is None:
+                await self.open()
+            conn = self._writer
+            try:
+                yield conn
+            finally:
+                await self._release(conn)
+
+    def _record_wait(self, kind: str, started: float) -> None:
+        waited = (time.perf_counter() - started) * 1000.0
+        self._metrics[f"{kind}s"] += 1
+        self._metrics[f"{kind}_wait_ms_total"] += waited
+        if waited > self._metrics[f"{kind}_wait_ms_max"]:
+            self._metrics[f"{kind}_wait_ms_max"] = waited
+
+    def stats(self) -> Dict[str, Any]:
+        metrics = dict(self._metrics)
+        for kind in ("read", "write"):
+            count = metrics[f"{kind}s"]
+            metrics[f"{kind}_wait_ms_avg"] = (
+                round(metrics[f"{kind}_wait_ms_total"] / count, 3) if count else 0.0
+            )
+            metrics[f"{kind}_wait_ms_max"] = round(metrics[f"{kind}_wait_ms_max"], 3)
+            del metrics[f"{kind}_wait_ms_total"]
+        metrics["size"] = self.size
+        metrics["idle_readers"] = len(self._idle)
+        metrics["open"] = self.is_open
+        return metrics
@@ -0,0 +1,51 @@
+"""Per-stage latency counters for multi-step read paths.
+
+A search is usually several awaits in a row (keyword query, vector query,
+record hydration, ranking). ``StageTimings`` keeps a running count, average,
+maximum and last value per stage so ``get_statistics()`` can show where the
+time goes without a tracing backend.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+
+class StageTimings:
+    """Running latency statistics, in milliseconds, keyed by stage name."""
+
+    def __init__(self) -> None:
+        # stage -> [count, total_ms, max_ms, last_ms]
+        self._stages: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - started) * 1000.0)
+
+    def record(self, stage: str, elapsed_ms: float) -> None:
+        with self._lock:
+            entry = self._stages.setdefault(stage, [0, 0.0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed_ms
+            entry[2] = max(entry[2], elapsed_ms)
+            entry[3] = elapsed_ms
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                stage: {
+                    "count": int(count),
+                    "avg_ms": round(total / count, 3) if count else 0.0,
+                    "max_ms": round(max_ms, 3),
+                    "last_ms": round(last_ms, 3),
+                }
+                for stage, (count, total, max_ms, last_ms) in self._stages.items()
+            }
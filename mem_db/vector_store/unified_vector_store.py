@@ -17,11 +17,15 @@ Features:
 - Thread-safe operations
 - Cache management with TTL
 - Similarity search with legal domain optimization
+- Configurable ANN index types (flat, IVF-Flat, IVF-PQ, HNSW)
+- On-disk index persistence with memory-mapped reload
 - Backup and recovery capabilities
 """
 
+import asyncio
 import json
 import logging  # noqa: E402
+import os  # noqa: E402
 import shutil  # noqa: E402
 import threading  # noqa: E402
 import time  # noqa: E402
@@ -30,8 +34,10 @@ from dataclasses import dataclass, field  # noqa: E402
 from datetime import datetime, timezone  # noqa: E402
 from enum import Enum  # noqa: E402
 from pathlib import Path  # noqa: E402
-from typing import Any, Dict, List, Optional  # noqa: E402
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union  # noqa: E402
 
+from mem_db.access_stats import AccessRow, AccessStatsBuffer  # noqa: E402
+from mem_db.sqlite_pool import AsyncSQLitePool  # noqa: E402
 from mem_db.db.interfaces.logging import (  # noqa: E402
     LogCategory,
     LogLevel,
@@ -60,6 +66,21 @@ except ImportError:
     aiosqlite = None
 
 
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+DEFAULT_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "flat").strip().lower()
+DEFAULT_NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", "16"))
+DEFAULT_EF_SEARCH = int(os.getenv("VECTOR_INDEX_EF_SEARCH", "64"))
+# IVF variants stay on a flat index until this many vectors exist to train on.
+DEFAULT_TRAIN_MIN_VECTORS = int(os.getenv("VECTOR_INDEX_TRAIN_MIN", "10000"))
+# Compact once this fraction of indexed vectors are tombstoned deletes.
+DEFAULT_COMPACT_RATIO = float(os.getenv("VECTOR_INDEX_COMPACT_RATIO", "0.2"))
+# Filters matching at most this fraction of documents search only the matches.
+DEFAULT_PREFILTER_RATIO = float(os.getenv("VECTOR_PREFILTER_RATIO", "0.1"))
+# Metadata fields with posting-set indexes; "tags" indexes each tag.
+FILTER_FIELDS = ("legal_domain", "document_type", "case_id", "jurisdiction", "tags")
+INDEX_MANIFEST_VERSION = 2
+
+
 class VectorStoreState(Enum):
     """Vector store operational states."""
 
@@ -154,6 +175,16 @@ class UnifiedVectorStore:
         cache_size: int = 10000,
         enable_persistence: bool = True,
         structured_logger: Optional[StructuredLogger] = None,
+        index_type: Optional[str] = None,
+        nlist: Optional[int] = None,
+        pq_m: int = 16,
+        hnsw_m: int = 32,
+        nprobe: int = DEFAULT_NPROBE,
+        ef_search: int = DEFAULT_EF_SEARCH,
+        train_min_vectors: int = DEFAULT_TRAIN_MIN_VECTORS,
+        train_sample_size: int = 100000,
+        compact_ratio: float = DEFAULT_COMPACT_RATIO,
+        prefilter_ratio: float = DEFAULT_PREFILTER_RATIO,
     ):
         self.store_path = Path(store_path)
         self.dimension = dimension
@@ -162,9 +193,26 @@ class UnifiedVectorStore:
         self.cache_size = cache_size
         self.enable_persistence = enable_persistence
 
+        # ANN index configuration
+        self.index_type = (index_type or DEFAULT_INDEX_TYPE).strip().lower()
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(
+                f"Unsupported index_type {self.index_type!r}; expected one of {INDEX_TYPES}"
+            )
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.hnsw_m = hnsw_m
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.train_min_vectors = max(1, train_min_vectors)
+        self.train_sample_size = max(self.train_min_vectors, train_sample_size)
+        self.compact_ratio = compact_ratio
+        self.prefilter_ratio = prefilter_ratio
+
         # Create directories
         self.store_path.mkdir(parents=True, exist_ok=True)
         self.index_path = self.store_path / "faiss_index"
+        self.index_manifest_path = self.store_path / "faiss_index.json"
         self.db_path = self.store_path / "metadata.db"
         self.backup_path = self.store_path / "backups"
         self.backup_path.mkdir(exist_ok=True)
@@ -179,15 +227,31 @@ class UnifiedVectorStore:
 
         # FAISS components
         self._index: Optional[faiss.Index] = None
+        self._active_index_type = "flat"
+        self._index_read_only = False
+        self._index_dirty = False
         self._gpu_resources = None
         self._embedding_cache: Dict[str, np.ndarray] = {}
+        self._rebuild_lock = asyncio.Lock()
+        self._compaction_task: Optional[asyncio.Task] = None
 
-        # Document storage
+        # Deleted labels stay in the index until compaction; the bitmap backs
+        # the FAISS selector that hides them from search.
+        self._tombstones: Set[int] = set()
+        self._tombstone_bitmap = None
+        self._tombstone_selector = None
+
+        # Document storage; "index" values are stable IndexIDMap2 labels
         self._documents: Dict[str, VectorDocument] = {}
         self._id_to_index: Dict[str, int] = {}
         self._index_to_id: Dict[int, str] = {}
         self._next_index = 0
 
+        # field -> value -> labels of live documents, for filter pre-selection
+        self._postings: Dict[str, Dict[Any, Set[int]]] = {
+            name: {} for name in FILTER_FIELDS
+        }
+
         # Statistics
         self._stats = {
             "total_documents": 0,
@@ -195,6 +259,16 @@ class UnifiedVectorStore:
             "cache_hits": 0,
             "cache_misses": 0,
             "index_rebuilds": 0,
+            "index_compactions": 0,
+            "documents_deleted": 0,
+            "batch_inserts": 0,
+            "batch_documents": 0,
+            "batch_docs_per_second": None,
+            "prefiltered_searches": 0,
+            "overfetch_retries": 0,
+            "exact_fallbacks": 0,
+            "index_loaded_from_disk": False,
+            "index_saves": 0,
             "last_backup": None,
             "startup_time": None,
         }
@@ -203,6 +277,14 @@ class UnifiedVectorStore:
         self._search_times: List[float] = []
         self._index_times: List[float] = []
 
+        # Search hits are written behind in batches, not one UPDATE per result
+        self._access_buffer = AccessStatsBuffer(self._flush_document_access)
+
+        # Metadata DB: long-lived readers plus one queued writer
+        self._db_pool: Optional[AsyncSQLitePool] = (
+            AsyncSQLitePool(self.db_path) if AIOSQLITE_AVAILABLE else None
+        )
+
     def _log(
         self,
         level: LogLevel,
@@ -320,7 +402,7 @@ class UnifiedVectorStore:
         CREATE INDEX IF NOT EXISTS idx_last_accessed ON documents(last_accessed);
         """
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._db_pool.write() as db:
             await db.executescript(schema)
             await db.commit()
 
@@ -330,17 +412,16 @@ class UnifiedVectorStore:
             return
 
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._db_pool.read() as db:
                 cursor = await db.execute("SELECT * FROM documents")
                 rows = await cursor.fetchall()
 
+                # Index positions are assigned by _init_faiss_index, which may
+                # reuse the order recorded alongside a persisted index.
                 for row in rows:
                     doc = self._row_to_document(row)
                     if not doc.is_expired():
                         self._documents[doc.id] = doc
-                        self._id_to_index[doc.id] = self._next_index
-                        self._index_to_id[self._next_index] = doc.id
-                        self._next_index += 1
 
                 self._stats["total_documents"] = len(self._documents)
                 self.logger.info(
@@ -374,41 +455,434 @@ class UnifiedVectorStore:
         )
 
     async def _init_faiss_index(self):
-        """Initialize FAISS index."""
-        if self.similarity_metric == SimilarityMetric.COSINE:
-            self._index = faiss.IndexFlatIP(self.dimension)
-        elif self.similarity_metric == SimilarityMetric.EUCLIDEAN:
-            self._index = faiss.IndexFlatL2(self.dimension)
-        else:  # INNER_PRODUCT
-            self._index = faiss.IndexFlatIP(self.dimension)
-
-        # Add existing embeddings to index
-        if self._documents:
-            embeddings = []
-            for doc_id in sorted(self._id_to_index.keys()):
-                doc = self._documents[doc_id]
-                if doc.embedding is not None:
-                    if doc.embedding.ndim == 2:
-                        embeddings.append(doc.embedding[0])
-                    else:
-                        embeddings.append(doc.embedding)
+        """Initialize FAISS index, reusing the persisted index unless it is stale."""
+        loaded = self.enable_persistence and await asyncio.to_thread(
+            self._load_persisted_index
+        )
+        if loaded:
+            self._stats["index_loaded_from_disk"] = True
+            with self._lock:
+                # Rows written after the last save (e.g. a crash before shutdown)
+                # are appended rather than forcing a full rebuild.
+                missing = [
+                    doc_id for doc_id in self._documents if doc_id not in self._id_to_index
+                ]
+                if missing:
+                    self._ensure_index_writable()
+                    self._add_to_index(missing)
+        else:
+            order = list(self._documents)
+            index, kind = await asyncio.to_thread(
+                self._build_index, self._index_matrix(order)
+            )
+            with self._lock:
+                self._index = index
+                self._active_index_type = kind
+                self._index_read_only = False
+                self._assign_labels(order)
+                self._reset_tombstones([])
+                self._index_dirty = bool(order)
+
+        with self._lock:
+            self._rebuild_postings()
+
+        await self._maybe_upgrade_index()
+        if self._tombstones and self._tombstone_ratio() >= self.compact_ratio:
+            await self.compact_index()
+        if self.enable_persistence and self._index_dirty:
+            await self.save_index()
+
+        self.logger.info(
+            f"FAISS index initialized with {self._index.ntotal} vectors "
+            f"({self._active_index_type}, loaded_from_disk={bool(loaded)})"
+        )
+
+    def _faiss_metric(self) -> int:
+        if self.similarity_metric == SimilarityMetric.EUCLIDEAN:
+            return faiss.METRIC_L2
+        return faiss.METRIC_INNER_PRODUCT
+
+    def _train_threshold(self) -> int:
+        """Vectors required before the configured IVF index can be trained."""
+        if self.index_type == "ivf_pq":
+            # 8-bit PQ codebooks need at least 256 training points.
+            return max(self.train_min_vectors, 256)
+        return self.train_min_vectors
+
+    def _effective_index_type(self, count: int) -> str:
+        if self.index_type in ("ivf_flat", "ivf_pq") and count < self._train_threshold():
+            return "flat"
+        return self.index_type
+
+    def _nlist_for(self, count: int) -> int:
+        nlist = self.nlist or int(4 * np.sqrt(max(count, 1)))
+        # FAISS wants roughly 39 training points per centroid.
+        return int(max(1, min(nlist, count // 39)))
+
+    def _pq_subquantizers(self) -> int:
+        return max(m for m in range(1, max(1, self.pq_m) + 1) if self.dimension % m == 0)
+
+    def _training_sample(self, vectors: "np.ndarray") -> "np.ndarray":
+        if len(vectors) <= self.train_sample_size:
+            return vectors
+        rng = np.random.default_rng(0)
+        rows = rng.choice(len(vectors), size=self.train_sample_size, replace=False)
+        return vectors[np.sort(rows)]
+
+    def _create_index(self, kind: str, vectors: "np.ndarray"):
+        """Create an empty (trained, when required) FAISS index of ``kind``."""
+        metric = self._faiss_metric()
+        if kind == "hnsw":
+            return faiss.IndexHNSWFlat(self.dimension, self.hnsw_m, metric)
+        if kind in ("ivf_flat", "ivf_pq"):
+            nlist = self._nlist_for(len(vectors))
+            quantizer = faiss.IndexFlat(self.dimension, metric)
+            if kind == "ivf_flat":
+                index = faiss.IndexIVFFlat(quantizer, self.dimension, nlist, metric)
+            else:
+                index = faiss.IndexIVFPQ(
+                    quantizer, self.dimension, nlist, self._pq_subquantizers(), 8, metric
+                )
+            index.train(self._training_sample(vectors))
+            return index
+        if metric == faiss.METRIC_L2:
+            return faiss.IndexFlatL2(self.dimension)
+        return faiss.IndexFlatIP(self.dimension)
+
+    def _build_index(self, vectors: "np.ndarray", labels: Optional["np.ndarray"] = None):
+        """Build a populated ID-mapped index; returns ``(index, kind)``.
+
+        ``labels`` default to row positions. Wrapping in ``IndexIDMap2`` keeps
+        labels stable across rebuilds so deletes never renumber documents.
+        """
+        kind = self._effective_index_type(len(vectors))
+        index = faiss.IndexIDMap2(self._create_index(kind, vectors))
+        if len(vectors):
+            if labels is None:
+                labels = np.arange(len(vectors), dtype=np.int64)
+            index.add_with_ids(vectors, np.asarray(labels, dtype=np.int64))
+        self._apply_search_params(index)
+        return index, kind
+
+    @staticmethod
+    def _base_index(index):
+        """The ANN index beneath an ``IndexIDMap2`` wrapper."""
+        if hasattr(index, "id_map"):
+            return faiss.downcast_index(index.index)
+        return index
+
+    def _index_matrix(self, doc_ids: List[str]) -> "np.ndarray":
+        matrix = np.zeros((len(doc_ids), self.dimension), dtype=np.float32)
+        for row, doc_id in enumerate(doc_ids):
+            embedding = self._documents[doc_id].embedding
+            if embedding is not None:
+                # Missing embeddings keep a zero row so positions stay aligned.
+                matrix[row] = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        return matrix
+
+    def _assign_labels(self, doc_ids: List[str]) -> None:
+        self._id_to_index = {doc_id: pos for pos, doc_id in enumerate(doc_ids)}
+        self._index_to_id = dict(enumerate(doc_ids))
+        self._next_index = len(doc_ids)
+
+    def _add_to_index(
+        self, doc_ids: List[str], matrix: Optional["np.ndarray"] = None
+    ) -> None:
+        """Append documents to the live index. Caller holds ``self._lock``."""
+        labels = np.arange(
+            self._next_index, self._next_index + len(doc_ids), dtype=np.int64
+        )
+        if matrix is None:
+            matrix = self._index_matrix(doc_ids)
+        self._index.add_with_ids(matrix, labels)
+        for doc_id in doc_ids:
+            self._id_to_index[doc_id] = self._next_index
+            self._index_to_id[self._next_index] = doc_id
+            self._update_postings(self._documents[doc_id], self._next_index, add=True)
+            self._next_index += 1
+        self._index_dirty = True
+
+    @staticmethod
+    def _filter_values(document: VectorDocument, name: str) -> Iterable[Any]:
+        if name == "tags":
+            return document.tags or ()
+        value = getattr(document, name)
+        return () if value is None else (value,)
+
+    def _update_postings(self, document: VectorDocument, label: int, add: bool) -> None:
+        for name in FILTER_FIELDS:
+            field_postings = self._postings[name]
+            for value in self._filter_values(document, name):
+                if add:
+                    field_postings.setdefault(value, set()).add(label)
+                else:
+                    labels = field_postings.get(value)
+                    if labels is not None:
+                        labels.discard(label)
+                        if not labels:
+                            del field_postings[value]
+
+    def _rebuild_postings(self) -> None:
+        self._postings = {name: {} for name in FILTER_FIELDS}
+        for doc_id, label in self._id_to_index.items():
+            self._update_postings(self._documents[doc_id], label, add=True)
+
+    def _candidate_labels(self, filters: Dict[str, Any]) -> Optional[Set[int]]:
+        """Labels matching every indexed filter, or None when nothing is indexed."""
+        sets: List[Set[int]] = []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            values = value if name == "tags" else [value]
+            for item in values:
+                sets.append(self._postings[name].get(item, set()))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        candidates = set(sets[0])
+        for other in sets[1:]:
+            candidates &= other
+            if not candidates:
+                break
+        return candidates
+
+    def _apply_search_params(self, index=None) -> None:
+        index = index if index is not None else self._index
+        if index is None:
+            return
+        index = self._base_index(index)
+        if hasattr(index, "nprobe"):
+            index.nprobe = max(1, int(self.nprobe))
+        if hasattr(index, "hnsw"):
+            index.hnsw.efSearch = max(1, int(self.ef_search))
+
+    def set_search_params(
+        self, nprobe: Optional[int] = None, ef_search: Optional[int] = None
+    ) -> None:
+        """Tune ANN recall/latency: IVF ``nprobe`` and HNSW ``efSearch``."""
+        with self._lock:
+            if nprobe is not None:
+                self.nprobe = nprobe
+            if ef_search is not None:
+                self.ef_search = ef_search
+            self._apply_search_params()
+
+    async def _maybe_upgrade_index(self, correlation_id: Optional[str] = None) -> None:
+        """Swap the interim flat index for the configured IVF index once trainable."""
+        if self._active_index_type != "flat" or self._rebuild_lock.locked():
+            return
+        if self._effective_index_type(len(self._documents)) == "flat":
+            return
+        await self._rebuild_index(correlation_id=correlation_id)
+
+    def _reset_tombstones(self, labels: Iterable[int]) -> None:
+        self._tombstones = set()
+        self._tombstone_bitmap = np.zeros(max(1, (self._next_index + 7) // 8), dtype=np.uint8)
+        self._tombstone_selector = None
+        self._tombstone(labels)
+
+    def _tombstone(self, labels: Iterable[int]) -> None:
+        """Mark labels deleted in O(len(labels)). Caller holds ``self._lock``."""
+        for label in labels:
+            label = int(label)
+            if label in self._tombstones:
+                continue
+            byte = label >> 3
+            if byte >= len(self._tombstone_bitmap):
+                grown = np.zeros(max(byte + 1, 2 * len(self._tombstone_bitmap)), dtype=np.uint8)
+                grown[: len(self._tombstone_bitmap)] = self._tombstone_bitmap
+                self._tombstone_bitmap = grown
+                # The selector holds a raw pointer into the old buffer.
+                self._tombstone_selector = None
+            self._tombstone_bitmap[byte] |= np.uint8(1 << (label & 7))
+            self._tombstones.add(label)
+
+    def _tombstone_ratio(self) -> float:
+        total = self._index.ntotal if self._index is not None else 0
+        return len(self._tombstones) / total if total else 0.0
+
+    def _search_params(self, selector=None):
+        """FAISS search parameters restricted to ``selector`` (default: skip tombstones)."""
+        if self._gpu_resources is not None:
+            # GPU indexes do not take selectors; search() post-filters instead.
+            return None
+        if selector is None:
+            if not self._tombstones:
+                return None
+            if self._tombstone_selector is None:
+                bitmap = faiss.IDSelectorBitmap(
+                    len(self._tombstone_bitmap) * 8,
+                    faiss.swig_ptr(self._tombstone_bitmap),
+                )
+                self._tombstone_selector = (bitmap, faiss.IDSelectorNot(bitmap))
+            selector = self._tombstone_selector[1]
+        base = self._base_index(self._index)
+        if hasattr(base, "nprobe"):
+            return faiss.SearchParametersIVF(sel=selector, nprobe=max(1, int(self.nprobe)))
+        if hasattr(base, "hnsw"):
+            return faiss.SearchParametersHNSW(
+                sel=selector, efSearch=max(1, int(self.ef_search))
+            )
+        return faiss.SearchParameters(sel=selector)
+
+    def _maybe_schedule_compaction(self, correlation_id: Optional[str] = None) -> None:
+        if self._tombstone_ratio() < self.compact_ratio:
+            return
+        if self._compaction_task is not None and not self._compaction_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._compaction_task = loop.create_task(
+            self.compact_index(correlation_id=correlation_id)
+        )
+
+    async def compact_index(self, correlation_id: Optional[str] = None) -> int:
+        """Physically drop tombstoned vectors; returns how many were dropped."""
+        dropped = len(self._tombstones)
+        if not dropped:
+            return 0
+        await self._rebuild_index(correlation_id=correlation_id)
+        self._stats["index_compactions"] += 1
+        return dropped
+
+    def _index_params(self) -> Dict[str, Any]:
+        """Build-time parameters; a persisted index is reused only if these match."""
+        return {
+            "index_type": self.index_type,
+            "dimension": self.dimension,
+            "metric": self.similarity_metric.value,
+            "nlist": self.nlist,
+            "pq_m": self.pq_m,
+            "hnsw_m": self.hnsw_m,
+        }
+
+    def _load_persisted_index(self) -> bool:
+        """Memory-map the saved index if its manifest matches this configuration."""
+        if not (self.index_path.exists() and self.index_manifest_path.exists()):
+            return False
+        try:
+            manifest = json.loads(self.index_manifest_path.read_text(encoding="utf-8"))
+            if (
+                manifest.get("version") != INDEX_MANIFEST_VERSION
+                or manifest.get("params") != self._index_params()
+            ):
+                self.logger.info("Persisted FAISS index is stale; rebuilding")
+                return False
+            index = faiss.read_index(
+                str(self.index_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to load persisted FAISS index: {e}")
+            return False
+
+        labels = faiss.vector_to_array(index.id_map).tolist() if hasattr(index, "id_map") else None
+        doc_ids = manifest.get("doc_ids") or []
+        if (
+            labels is None
+            or labels != manifest.get("labels")
+            or len(doc_ids) != len(labels)
+            or index.d != self.dimension
+        ):
+            self.logger.info("Persisted FAISS index does not match its manifest; rebuilding")
+            return False
+
+        self._apply_search_params(index)
+        with self._lock:
+            self._index = index
+            self._active_index_type = manifest.get("active_index_type", "flat")
+            # Memory-mapped inverted lists are read-only until the first write.
+            self._index_read_only = hasattr(self._base_index(index), "invlists")
+            self._index_to_id = {}
+            self._id_to_index = {}
+            dead = []
+            for label, doc_id in zip(labels, doc_ids):
+                # Rows deleted or expired since the save become tombstones.
+                if doc_id in self._documents and doc_id not in self._id_to_index:
+                    self._index_to_id[label] = doc_id
+                    self._id_to_index[doc_id] = label
                 else:
-                    # Create zero embedding for missing embeddings
-                    embeddings.append(np.zeros(self.dimension))
+                    dead.append(label)
+            self._next_index = max(
+                int(manifest.get("next_label") or 0), max(labels, default=-1) + 1
+            )
+            self._reset_tombstones(dead)
+            self._index_dirty = False
+        return True
 
-            if embeddings:
-                embeddings_array = np.array(embeddings, dtype=np.float32)
-                self._index.add(embeddings_array)
+    def _ensure_index_writable(self) -> None:
+        """Replace a memory-mapped index with an in-memory copy. Caller holds the lock."""
+        if not self._index_read_only:
+            return
+        index = faiss.read_index(str(self.index_path))
+        self._apply_search_params(index)
+        self._index = index
+        self._index_read_only = False
+        self._tombstone_selector = None
 
-        self.logger.info(f"FAISS index initialized with {self._index.ntotal} vectors")
+    def _write_index_files(self) -> None:
+        with self._lock:
+            index = self._index
+            if self._gpu_resources is not None:
+                index = faiss.index_gpu_to_cpu(index)
+            labels = faiss.vector_to_array(index.id_map).tolist()
+            manifest = {
+                "version": INDEX_MANIFEST_VERSION,
+                "params": self._index_params(),
+                "active_index_type": self._active_index_type,
+                "ntotal": int(index.ntotal),
+                "next_label": self._next_index,
+                "labels": labels,
+                # Tombstoned labels map to None and are re-tombstoned on load.
+                "doc_ids": [self._index_to_id.get(label) for label in labels],
+                "saved_at": datetime.now(timezone.utc).isoformat(),
+            }
+            index_tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+            manifest_tmp = self.index_manifest_path.with_name(
+                self.index_manifest_path.name + ".tmp"
+            )
+            faiss.write_index(index, str(index_tmp))
+            manifest_tmp.write_text(json.dumps(manifest), encoding="utf-8")
+            # Index first: a crash in between leaves a manifest whose ntotal
+            # no longer matches, which the loader treats as stale.
+            os.replace(index_tmp, self.index_path)
+            os.replace(manifest_tmp, self.index_manifest_path)
+            self._index_dirty = False
+
+    async def save_index(self) -> bool:
+        """Persist the FAISS index and its id manifest for fast restarts."""
+        if self._index is None:
+            return False
+        try:
+            await asyncio.to_thread(self._write_index_files)
+        except Exception as e:
+            self.logger.error(f"Failed to save FAISS index: {e}")
+            return False
+        self._stats["index_saves"] += 1
+        return True
+
+    async def close(self) -> None:
+        """Flush buffered access stats, and the index if it changed since the last save."""
+        await self._access_buffer.close()
+        if self._compaction_task is not None and not self._compaction_task.done():
+            await self._compaction_task
+        if self.enable_persistence and self._index_dirty:
+            await self.save_index()
+        if self._db_pool is not None:
+            await self._db_pool.close()
 
     async def _init_gpu_resources(self):
         """Initialize GPU resources for FAISS."""
         try:
             if faiss.get_num_gpus() > 0:
                 self._gpu_resources = faiss.StandardGpuResources()
-                gpu_index = faiss.index_cpu_to_gpu(self._gpu_resources, 0, self._index)
-                self._index = gpu_index
+                with self._lock:
+                    self._ensure_index_writable()
+                    gpu_index = faiss.index_cpu_to_gpu(
+                        self._gpu_resources, 0, self._index
+                    )
+                    self._index = gpu_index
                 self.logger.info("GPU acceleration enabled for FAISS")
             else:
                 self.logger.warning("No GPUs available for FAISS acceleration")
@@ -436,7 +910,8 @@ class UnifiedVectorStore:
         cid = correlation_id or generate_correlation_id()
         doc_id = str(uuid.uuid4())
 
-        # Normalize embedding
+        # Normalize embedding; stored as float32 so it round-trips through SQLite
+        embedding = np.asarray(embedding, dtype=np.float32)
         if embedding.ndim == 1:
             embedding = embedding.reshape(1, -1)
 
@@ -462,21 +937,18 @@ class UnifiedVectorStore:
         )
 
         with self._lock:
-            # Add to collections
+            # Add to collections and the FAISS index
             self._documents[doc_id] = document
-            self._id_to_index[doc_id] = self._next_index
-            self._index_to_id[self._next_index] = doc_id
-
-            # Add to FAISS index
-            self._index.add(embedding.astype(np.float32))
-
-            self._next_index += 1
+            self._ensure_index_writable()
+            self._add_to_index([doc_id])
             self._stats["total_documents"] += 1
 
         # Persist to database
         if self.enable_persistence:
             await self._save_document_to_db(document)
 
+        await self._maybe_upgrade_index(correlation_id=cid)
+
         self._log(
             LogLevel.INFO,
             "vector document indexed",
@@ -489,14 +961,147 @@ class UnifiedVectorStore:
         )
         return doc_id
 
+    async def add_documents(
+        self,
+        contents: Sequence[str],
+        embeddings: Union[np.ndarray, Sequence[np.ndarray]],
+        metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+        document_type: Union[str, Sequence[str]] = "general",
+        legal_domain: Union[Optional[str], Sequence[Optional[str]]] = None,
+        case_id: Union[Optional[str], Sequence[Optional[str]]] = None,
+        jurisdiction: Union[Optional[str], Sequence[Optional[str]]] = None,
+        importance_score: Union[float, Sequence[float]] = 1.0,
+        tags: Optional[Sequence[Optional[List[str]]]] = None,
+        ttl_seconds: Union[Optional[int], Sequence[Optional[int]]] = None,
+        correlation_id: Optional[str] = None,
+    ) -> List[str]:
+        """Add many documents in one index call and one database transaction.
+
+        ``embeddings`` is an ``(n, dimension)`` matrix (or a sequence of
+        vectors) aligned with ``contents``. Per-document fields accept either a
+        single value applied to every document or a sequence of ``n`` values.
+        Returns the new document ids in input order.
+        """
+        if self._state != VectorStoreState.READY:
+            raise RuntimeError(f"Vector store not ready: {self._state}")
+
+        count = len(contents)
+        if count == 0:
+            return []
+        matrix = np.array(embeddings, dtype=np.float32).reshape(count, -1)
+        if matrix.shape[1] != self.dimension:
+            raise ValueError(
+                f"Embedding dimension {matrix.shape[1]} does not match store dimension {self.dimension}"
+            )
+
+        def per_doc(value: Any, name: str, scalar: bool) -> List[Any]:
+            if scalar:
+                return [value] * count
+            values = list(value)
+            if len(values) != count:
+                raise ValueError(f"{name} has {len(values)} entries, expected {count}")
+            return values
+
+        def is_scalar(value: Any) -> bool:
+            return value is None or isinstance(value, (str, int, float))
+
+        metadatas = per_doc(metadatas, "metadatas", metadatas is None)
+        tags = per_doc(tags, "tags", tags is None)
+        document_types = per_doc(document_type, "document_type", is_scalar(document_type))
+        legal_domains = per_doc(legal_domain, "legal_domain", is_scalar(legal_domain))
+        case_ids = per_doc(case_id, "case_id", is_scalar(case_id))
+        jurisdictions = per_doc(jurisdiction, "jurisdiction", is_scalar(jurisdiction))
+        importances = per_doc(importance_score, "importance_score", is_scalar(importance_score))
+        ttls = per_doc(ttl_seconds, "ttl_seconds", is_scalar(ttl_seconds))
+
+        cid = correlation_id or generate_correlation_id()
+        start_time = time.time()
+
+        if self.similarity_metric == SimilarityMetric.COSINE:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+        documents = [
+            VectorDocument(
+                id=str(uuid.uuid4()),
+                content=contents[row],
+                embedding=matrix[row : row + 1].copy(),
+                metadata=metadatas[row] or {},
+                document_type=document_types[row],
+                legal_domain=legal_domains[row],
+                case_id=case_ids[row],
+                jurisdiction=jurisdictions[row],
+                importance_score=importances[row],
+                tags=tags[row] or [],
+                ttl_seconds=ttls[row],
+            )
+            for row in range(count)
+        ]
+        doc_ids = [document.id for document in documents]
+
+        with self._lock:
+            for document in documents:
+                self._documents[document.id] = document
+            self._ensure_index_writable()
+            self._add_to_index(doc_ids, matrix)
+            self._stats["total_documents"] += count
+
+        if self.enable_persistence:
+            await self._save_documents_to_db(documents)
+
+        await self._maybe_upgrade_index(correlation_id=cid)
+
+        elapsed = time.time() - start_time
+        self._index_times.append(elapsed)
+        self._stats["batch_inserts"] += 1
+        self._stats["batch_documents"] += count
+        self._stats["batch_docs_per_second"] = round(count / elapsed, 1) if elapsed > 0 else None
+
+        self._log(
+            LogLevel.INFO,
+            "vector documents indexed",
+            correlation_id=cid,
+            documents=count,
+            elapsed_s=round(elapsed, 4),
+            docs_per_second=self._stats["batch_docs_per_second"],
+        )
+        return doc_ids
+
     async def _save_document_to_db(self, document: VectorDocument):
         """Save document to database."""
-        if not AIOSQLITE_AVAILABLE:
+        await self._save_documents_to_db([document])
+
+    @staticmethod
+    def _document_row(document: VectorDocument) -> Tuple[Any, ...]:
+        return (
+            document.id,
+            document.content,
+            (
+                document.embedding.tobytes()
+                if document.embedding is not None
+                else None
+            ),
+            json.dumps(document.metadata),
+            document.document_type,
+            document.legal_domain,
+            document.case_id,
+            document.jurisdiction,
+            document.date_created.isoformat(),
+            document.importance_score,
+            document.access_count,
+            document.last_accessed.isoformat(),
+            json.dumps(document.tags),
+            document.ttl_seconds,
+        )
+
+    async def _save_documents_to_db(self, documents: List[VectorDocument]):
+        """Save documents to the database in a single transaction."""
+        if not AIOSQLITE_AVAILABLE or not documents:
             return
 
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute(
+            async with self._db_pool.write() as db:
+                await db.executemany(
                     """
                     INSERT OR REPLACE INTO documents
                     (id, content, embedding, metadata_json, document_type, legal_domain,
@@ -504,26 +1109,7 @@ class UnifiedVectorStore:
                      last_accessed, tags_json, ttl_seconds)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                    (
-                        document.id,
-                        document.content,
-                        (
-                            document.embedding.tobytes()
-                            if document.embedding is not None
-                            else None
-                        ),
-                        json.dumps(document.metadata),
-                        document.document_type,
-                        document.legal_domain,
-                        document.case_id,
-                        document.jurisdiction,
-                        document.date_created.isoformat(),
-                        document.importance_score,
-                        document.access_count,
-                        document.last_accessed.isoformat(),
-                        json.dumps(document.tags),
-                        document.ttl_seconds,
-                    ),
+                    [self._document_row(document) for document in documents],
                 )
                 await db.commit()
         except Exception as e:
@@ -540,8 +1126,17 @@ class UnifiedVectorStore:
         boost_recent: bool = True,
         boost_domain: bool = True,
         correlation_id: Optional[str] = None,
+        case_id: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+        tags: Optional[List[str]] = None,
     ) -> List[SearchResult]:
-        """Perform enhanced vector search with legal domain optimization."""
+        """Perform enhanced vector search with legal domain optimization.
+
+        Filters on indexed fields (legal domain, document type, case id,
+        jurisdiction, tags) are resolved from posting sets first. Selective
+        filters search only the matching vectors; broad ones over-fetch and
+        retry, so k results come back whenever k documents match.
+        """
         if self._state != VectorStoreState.READY:
             raise RuntimeError(f"Vector store not ready: {self._state}")
 
@@ -569,35 +1164,39 @@ class UnifiedVectorStore:
                 if norm > 0:
                     query_embedding = query_embedding / norm
 
-            # Perform FAISS search
-            with self._lock:
-                distances, indices = self._index.search(
-                    query_embedding.astype(np.float32),
-                    min(k * 2, self._index.ntotal),  # Get more results for filtering
-                )
-
-            # Process results
-            results = []
-            for i, (distance, idx) in enumerate(zip(distances[0], indices[0])):
-                if idx == -1:  # Invalid index
-                    continue
-
-                doc_id = self._index_to_id.get(idx)
-                if not doc_id or doc_id not in self._documents:
-                    continue
-
-                document = self._documents[doc_id]
-
-                # Apply filters
-                if self._should_filter_document(
+            def accept(document: VectorDocument) -> bool:
+                return not self._should_filter_document(
                     document,
                     filter_metadata,
                     legal_domain,
                     document_type,
                     min_importance,
-                ):
-                    continue
+                    case_id=case_id,
+                    jurisdiction=jurisdiction,
+                    tags=tags,
+                )
 
+            # Collect k*2 filtered candidates for re-ranking (at least k when
+            # that many documents match).
+            with self._lock:
+                candidates = self._collect_candidates(
+                    query_embedding.astype(np.float32),
+                    k * 2,
+                    self._candidate_labels(
+                        {
+                            "legal_domain": legal_domain,
+                            "document_type": document_type,
+                            "case_id": case_id,
+                            "jurisdiction": jurisdiction,
+                            "tags": tags,
+                        }
+                    ),
+                    accept,
+                )
+
+            # Process results
+            results = []
+            for i, (distance, document) in enumerate(candidates):
                 # Calculate similarity score
                 if self.similarity_metric == SimilarityMetric.EUCLIDEAN:
                     similarity_score = 1.0 / (1.0 + distance)
@@ -634,11 +1233,13 @@ class UnifiedVectorStore:
             results.sort(key=lambda x: x.combined_score, reverse=True)
             results = results[:k]
 
-            # Update access statistics
+            # Update access statistics; persisted by the write-behind buffer
             for result in results:
                 result.document.update_access()
                 if self.enable_persistence:
-                    await self._update_document_access(result.document.id)
+                    self._access_buffer.record(
+                        result.document.id, result.document.last_accessed
+                    )
 
             search_time = time.time() - start_time
             self._search_times.append(search_time)
@@ -661,6 +1262,98 @@ class UnifiedVectorStore:
         finally:
             self._state = VectorStoreState.READY
 
+    def _collect_candidates(
+        self,
+        query: "np.ndarray",
+        want: int,
+        labels: Optional[Set[int]],
+        accept: Callable[[VectorDocument], bool],
+    ) -> List[Tuple[float, VectorDocument]]:
+        """Nearest accepted documents as ``(distance, document)``. Caller holds the lock."""
+        live = len(self._id_to_index)
+        if labels is not None:
+            want = min(want, len(labels))
+            if not want:
+                return []
+            if len(labels) <= live * self.prefilter_ratio:
+                # Selective filter: search only the matching vectors.
+                self._stats["prefiltered_searches"] += 1
+                selected = np.fromiter(labels, dtype=np.int64, count=len(labels))
+                found = self._faiss_candidates(
+                    query, want, accept, faiss.IDSelectorBatch(selected)
+                )
+                if len(found) < want:
+                    # ANN probes can miss sparse matches; score them exactly.
+                    found = self._exact_candidates(query, want, labels, accept)
+                return found
+
+        # Broad or unindexed filter: over-fetch by the expected selectivity.
+        selectivity = len(labels) / live if labels is not None and live else 1.0
+        fetch = int(np.ceil(want / max(selectivity, 1e-6)))
+        total = self._index.ntotal
+        while True:
+            found = self._faiss_candidates(query, fetch, accept)
+            if len(found) >= want or fetch >= total:
+                break
+            self._stats["overfetch_retries"] += 1
+            fetch = min(total, max(fetch * 2, int(fetch * want / max(len(found), 1))))
+        if len(found) < want and self._active_index_type != "flat":
+            found = self._exact_candidates(query, want, labels, accept)
+        return found
+
+    def _faiss_candidates(
+        self,
+        query: "np.ndarray",
+        fetch: int,
+        accept: Callable[[VectorDocument], bool],
+        selector=None,
+    ) -> List[Tuple[float, VectorDocument]]:
+        fetch = min(fetch, self._index.ntotal)
+        if fetch <= 0:
+            return []
+        params = self._search_params(selector)
+        if params is not None:
+            distances, found = self._index.search(query, fetch, params=params)
+        else:
+            distances, found = self._index.search(query, fetch)
+        out = []
+        for distance, label in zip(distances[0], found[0]):
+            if label == -1:  # Invalid index
+                continue
+            document = self._documents.get(self._index_to_id.get(int(label)))
+            if document is not None and accept(document):
+                out.append((float(distance), document))
+        return out
+
+    def _exact_candidates(
+        self,
+        query: "np.ndarray",
+        want: int,
+        labels: Optional[Set[int]],
+        accept: Callable[[VectorDocument], bool],
+    ) -> List[Tuple[float, VectorDocument]]:
+        """Brute-force scoring over the accepted documents (fallback path)."""
+        self._stats["exact_fallbacks"] += 1
+        if labels is None:
+            pool = list(self._documents.values())
+        else:
+            pool = [
+                self._documents[self._index_to_id[label]]
+                for label in labels
+                if label in self._index_to_id
+            ]
+        pool = [document for document in pool if accept(document)]
+        if not pool:
+            return []
+        matrix = self._index_matrix([document.id for document in pool])
+        if self.similarity_metric == SimilarityMetric.EUCLIDEAN:
+            scores = ((matrix - query) ** 2).sum(axis=1)
+            order = np.argsort(scores)[:want]
+        else:
+            scores = matrix @ query[0]
+            order = np.argsort(-scores)[:want]
+        return [(float(scores[i]), pool[i]) for i in order]
+
     def _should_filter_document(
         self,
         document: VectorDocument,
@@ -668,6 +1361,9 @@ class UnifiedVectorStore:
         legal_domain: Optional[str],
         document_type: Optional[str],
         min_importance: float,
+        case_id: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+        tags: Optional[List[str]] = None,
     ) -> bool:
         """Check if document should be filtered out."""
         # Check expiration
@@ -686,6 +1382,14 @@ class UnifiedVectorStore:
         if legal_domain and document.legal_domain != legal_domain:
             return True
 
+        # Check case, jurisdiction and tags
+        if case_id and document.case_id != case_id:
+            return True
+        if jurisdiction and document.jurisdiction != jurisdiction:
+            return True
+        if tags and not set(tags).issubset(document.tags or ()):
+            return True
+
         # Check metadata filters
         if filter_metadata:
             for key, value in filter_metadata.items():
@@ -701,10 +1405,10 @@ class UnifiedVectorStore:
         score = 0.0
 
         # Content length normalization
-        contentlength = len(document.content)  # noqa: F841
-        if 100 <= content_length <= 2000:  # Optimal range  # noqa: F821
+        content_length = len(document.content)
+        if 100 <= content_length <= 2000:  # Optimal range
             score += 0.1
-        elif content_length > 5000:  # Penalize very long documents  # noqa: F821
+        elif content_length > 5000:  # Penalize very long documents
             score -= 0.05
 
         # Access frequency boost
@@ -746,24 +1450,21 @@ class UnifiedVectorStore:
         else:
             return 0.0
 
-    async def _update_document_access(self, doc_id: str):
-        """Update document access statistics in database."""
+    async def _flush_document_access(self, rows: List[AccessRow]) -> None:
+        """Apply buffered access deltas in a single transaction."""
         if not AIOSQLITE_AVAILABLE:
             return
 
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute(
-                    """
-                    UPDATE documents
-                    SET access_count = access_count + 1, last_accessed = ?
-                    WHERE id = ?
-                """,
-                    (datetime.now(timezone.utc).isoformat(), doc_id),
-                )
-                await db.commit()
-        except Exception as e:
-            self.logger.error(f"Failed to update document access: {e}")
+        async with self._db_pool.write() as db:
+            await db.executemany(
+                """
+                UPDATE documents
+                SET access_count = access_count + ?, last_accessed = MAX(last_accessed, ?)
+                WHERE id = ?
+            """,
+                [(count, last_accessed, doc_id) for doc_id, count, last_accessed in rows],
+            )
+            await db.commit()
 
     async def get_statistics(self) -> Dict[str, Any]:
         """Get comprehensive vector store statistics."""
@@ -788,7 +1489,17 @@ class UnifiedVectorStore:
         stats["state"] = self._state.value
         stats["dimension"] = self.dimension
         stats["similarity_metric"] = self.similarity_metric.value
+        stats["index_type"] = self.index_type
+        stats["active_index_type"] = self._active_index_type
+        stats["nprobe"] = self.nprobe
+        stats["ef_search"] = self.ef_search
+        stats["tombstones"] = len(self._tombstones)
+        stats["pending_access_updates"] = len(self._access_buffer)
+        stats["access_flushes"] = self._access_buffer.flushes
+        stats["tombstone_ratio"] = round(self._tombstone_ratio(), 4)
         stats["gpu_enabled"] = self.enable_gpu and self._gpu_resources is not None
+        if self._db_pool is not None:
+            stats["db_pool"] = self._db_pool.stats()
 
         # Document type distribution
         type_distribution = {}
@@ -807,110 +1518,125 @@ class UnifiedVectorStore:
 
         return stats
 
-    async def cleanup_expired(self, correlation_id: Optional[str] = None) -> int:  # noqa: C901
-        """Clean up expired documents."""
-        if self._state != VectorStoreState.READY:
-            return 0
-
+    async def delete_documents(
+        self, doc_ids: Iterable[str], correlation_id: Optional[str] = None
+    ) -> int:
+        """Delete documents; their vectors are tombstoned rather than rebuilt."""
         cid = correlation_id or generate_correlation_id()
-
-        expired_ids = []
-
+        removed: List[str] = []
         with self._lock:
-            for doc_id, document in self._documents.items():
-                if document.is_expired():
-                    expired_ids.append(doc_id)
-
-        if not expired_ids:
+            labels = []
+            for doc_id in doc_ids:
+                document = self._documents.pop(doc_id, None)
+                if document is None:
+                    continue
+                removed.append(doc_id)
+                label = self._id_to_index.pop(doc_id, None)
+                if label is not None:
+                    self._index_to_id.pop(label, None)
+                    self._update_postings(document, label, add=False)
+                    labels.append(label)
+            self._tombstone(labels)
+            self._stats["total_documents"] = len(self._documents)
+
+        if not removed:
             return 0
-
-        # Remove from collections
-        removed_count = 0
-        with self._lock:
-            for doc_id in expired_ids:
-                if doc_id in self._documents:
-                    del self._documents[doc_id]
-                    if doc_id in self._id_to_index:
-                        index = self._id_to_index[doc_id]
-                        del self._id_to_index[doc_id]
-                        del self._index_to_id[index]
-                    removed_count += 1
+        self._access_buffer.discard(removed)
 
         # Remove from database
         if self.enable_persistence and AIOSQLITE_AVAILABLE:
             try:
-                async with aiosqlite.connect(self.db_path) as db:
-                    for doc_id in expired_ids:
-                        await db.execute(
-                            "DELETE FROM documents WHERE id = ?", (doc_id,)
-                        )
+                async with self._db_pool.write() as db:
+                    await db.executemany(
+                        "DELETE FROM documents WHERE id = ?",
+                        [(doc_id,) for doc_id in removed],
+                    )
                     await db.commit()
             except Exception as e:
-                self.logger.error(
-                    f"Failed to remove expired documents from database: {e}"
-                )
+                self.logger.error(f"Failed to remove documents from database: {e}")
 
-        # Rebuild index if many documents were removed
-        if removed_count > 0:
-            await self._rebuild_index(correlation_id=cid)
-            self._log(
-                LogLevel.INFO,
-                "expired documents cleaned",
-                correlation_id=cid,
-                removed=removed_count,
-            )
+        self._stats["documents_deleted"] += len(removed)
+        self._log(
+            LogLevel.INFO,
+            "vector documents deleted",
+            correlation_id=cid,
+            removed=len(removed),
+            tombstones=len(self._tombstones),
+        )
+        self._maybe_schedule_compaction(correlation_id=cid)
+        return len(removed)
 
+    async def cleanup_expired(self, correlation_id: Optional[str] = None) -> int:
+        """Clean up expired documents."""
+        if self._state != VectorStoreState.READY:
+            return 0
+
+        cid = correlation_id or generate_correlation_id()
+
+        with self._lock:
+            expired_ids = [
+                doc_id
+                for doc_id, document in self._documents.items()
+                if document.is_expired()
+            ]
+
+        if not expired_ids:
+            return 0
+
+        removed_count = await self.delete_documents(expired_ids, correlation_id=cid)
+        self._log(
+            LogLevel.INFO,
+            "expired documents cleaned",
+            correlation_id=cid,
+            removed=removed_count,
+        )
         return removed_count
 
     async def _rebuild_index(self, correlation_id: Optional[str] = None):
-        """Rebuild FAISS index after document removal."""
+        """Rebuild the FAISS index from live documents, keeping their labels.
+
+        The build runs off the lock; documents added or deleted meanwhile are
+        reconciled before the swap, so search and writes are never blocked.
+        """
         cid = correlation_id or generate_correlation_id()
-        self._state = VectorStoreState.INDEXING
-        start_time = time.time()
-        self._log(LogLevel.INFO, "rebuilding vector index", correlation_id=cid)
+        async with self._rebuild_lock:
+            start_time = time.time()
+            self._log(LogLevel.INFO, "rebuilding vector index", correlation_id=cid)
 
-        try:
-            # Create new index
-            if self.similarity_metric == SimilarityMetric.COSINE:
-                new_index = faiss.IndexFlatIP(self.dimension)
-            elif self.similarity_metric == SimilarityMetric.EUCLIDEAN:
-                new_index = faiss.IndexFlatL2(self.dimension)
-            else:  # INNER_PRODUCT
-                new_index = faiss.IndexFlatIP(self.dimension)
-
-            # Rebuild mappings and add embeddings
-            embeddings = []
-            new_id_to_index = {}
-            new_index_to_id = {}
-            new_index = 0
-
-            for doc_id, document in self._documents.items():
-                if document.embedding is not None:
-                    new_id_to_index[doc_id] = new_index
-                    new_index_to_id[new_index] = doc_id
-
-                    embedding = document.embedding
-                    if embedding.ndim == 2:
-                        embeddings.append(embedding[0])
-                    else:
-                        embeddings.append(embedding)
-
-                    new_index += 1
-
-            if embeddings:
-                embeddings_array = np.array(embeddings, dtype=np.float32)
-                new_index.add(embeddings_array)
+            with self._lock:
+                order = list(self._id_to_index)
+                labels = np.fromiter(
+                    (self._id_to_index[doc_id] for doc_id in order),
+                    dtype=np.int64,
+                    count=len(order),
+                )
+                vectors = self._index_matrix(order)
+                snapshot_next = self._next_index
+                snapshot_tombstones = set(self._tombstones)
+
+            new_index, kind = await asyncio.to_thread(self._build_index, vectors, labels)
 
             # Apply GPU if enabled
-            if self.enable_gpu and self._gpu_resources:
+            if self.enable_gpu and self._gpu_resources and kind != "hnsw":
                 new_index = faiss.index_cpu_to_gpu(self._gpu_resources, 0, new_index)
 
             # Replace old index
             with self._lock:
+                added = [
+                    (label, self._index_to_id[label])
+                    for label in range(snapshot_next, self._next_index)
+                    if label in self._index_to_id
+                ]
+                if added:
+                    new_index.add_with_ids(
+                        self._index_matrix([doc_id for _, doc_id in added]),
+                        np.array([label for label, _ in added], dtype=np.int64),
+                    )
                 self._index = new_index
-                self._id_to_index = new_id_to_index
-                self._index_to_id = new_index_to_id
-                self._next_index = new_index
+                self._active_index_type = kind
+                self._index_read_only = False
+                self._reset_tombstones(self._tombstones - snapshot_tombstones)
+                self._index_dirty = True
 
             index_time = time.time() - start_time
             self._index_times.append(index_time)
@@ -920,13 +1646,11 @@ class UnifiedVectorStore:
                 LogLevel.INFO,
                 "vector index rebuilt",
                 correlation_id=cid,
-                documents=new_index,
+                documents=len(order) + len(added),
+                index_type=kind,
                 duration_ms=round(index_time * 1000, 2),
             )
 
-        finally:
-            self._state = VectorStoreState.READY
-
     async def backup(self) -> str:
         """Create backup of vector store."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -934,7 +1658,10 @@ class UnifiedVectorStore:
         backup_dir.mkdir(exist_ok=True)
 
         try:
-            # Backup database
+            # Backup database; fold the WAL into the main file so the copy is complete
+            if self._db_pool is not None and self._db_pool.is_open:
+                async with self._db_pool.write() as db:
+                    await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
             if self.db_path.exists():
                 shutil.copy2(self.db_path, backup_dir / "metadata.db")
 
@@ -979,6 +1706,7 @@ class UnifiedVectorStore:
             "index_operational": self._index is not None,
             "document_count": len(self._documents),
             "index_size": self._index.ntotal if self._index else 0,
+            "index_type": self._active_index_type,
             "gpu_enabled": self.enable_gpu and self._gpu_resources is not None,
         }
 
@@ -997,8 +1725,9 @@ class UnifiedVectorStore:
 
             # Check database accessibility
             if self.enable_persistence and AIOSQLITE_AVAILABLE:
-                async with aiosqlite.connect(self.db_path) as db:
-                    await db.execute("SELECT 1")
+                async with self._db_pool.read() as db:
+                    async with db.execute("SELECT 1") as cursor:
+                        await cursor.fetchone()
                     health["database_accessible"] = True
             else:
                 health["database_accessible"] = not self.enable_persistence
@@ -1019,6 +1748,8 @@ async def create_unified_vector_store(
     enable_gpu: bool = False,
     cache_size: int = 10000,
     enable_persistence: bool = True,
+    index_type: Optional[str] = None,
+    **index_options: Any,
 ) -> UnifiedVectorStore:
     """Create and initialize a unified vector store."""
     store = UnifiedVectorStore(
@@ -1028,6 +1759,8 @@ async def create_unified_vector_store(
         enable_gpu=enable_gpu,
         cache_size=cache_size,
         enable_persistence=enable_persistence,
+        index_type=index_type,
+        **index_options,
     )
 
     if await store.initialize():
@@ -232,17 +232,21 @@ async def run_pipeline(  # noqa: C901
             prompt = builder.generate_expert_prompt(agent, task_type, task_data)
             ctx.setdefault("expert_prompt", {})[agent] = prompt
         elif name == "embed_index":
-            text = opts.get("text") or ctx.get("text") or ""
-            res = await manager.embed_texts([text], **opts)
-            emb = res.data.get("embeddings", [[]])[0]
-            if emb and vs is not None:
+            texts = opts.get("texts") or [opts.get("text") or ctx.get("text") or ""]
+            res = await manager.embed_texts(
+                texts, **{k: v for k, v in opts.items() if k != "texts"}
+            )
+            embeddings = res.data.get("embeddings") or []
+            pairs = [(t, e) for t, e in zip(texts, embeddings) if e]
+            if pairs and vs is not None:
                 await vs.initialize()
                 import numpy as np  # noqa: E402
 
-                await vs.add_document(
-                    text,
-                    np.array(emb, dtype="float32"),
-                    metadata=opts.get("metadata") or {},
+                # One FAISS add and one SQLite transaction for the whole step
+                await vs.add_documents(
+                    [t for t, _ in pairs],
+                    np.array([e for _, e in pairs], dtype="float32"),
+                    metadatas=[opts.get("metadata") or {}] * len(pairs),
                 )
         elif name == "kg_propose":
             if kg is not None:
@@ -1,12 +1,25 @@
 """Agent analysis endpoints."""
 
+import asyncio
 import json
 import logging
 import os
+import shutil
 import tempfile
-from typing import Any, Dict, List, Optional
-
-from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile, Depends
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from services.agent_service import AgentService
@@ -20,6 +33,10 @@ from services.dependencies import get_database_manager_strict_dep
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Files of one /agents/process-documents batch processed at the same time
+PROCESS_DOCUMENTS_CONCURRENCY = int(os.getenv("PROCESS_DOCUMENTS_CONCURRENCY", "4"))
+UPLOAD_COPY_CHUNK_BYTES = 1024 * 1024
+
 
 def _v(agent_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     return enforce_agent_response(agent_type, payload)
@@ -816,97 +833,180 @@ async def process_document(
         raise HTTPException(status_code=500, detail="Process document failed")
 
 
-@router.post("/agents/process-documents")
-async def process_documents(
-    files: List[UploadFile] = File(default_factory=list),
-    options: str | None = Form(default=None),
-    service: AgentService = Depends(get_agent_service),
+async def _spool_upload(up: UploadFile) -> str:
+    """Copy an upload to a temp file in fixed-size chunks; returns its path."""
+    suffix = os.path.splitext(up.filename or "")[1] or ""
+
+    def _copy() -> str:
+        up.file.seek(0)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            shutil.copyfileobj(up.file, tmp, UPLOAD_COPY_CHUNK_BYTES)
+            return tmp.name
+
+    return await asyncio.to_thread(_copy)
+
+
+def _normalize_batch_result(result: Any, filename: Optional[str]) -> Dict[str, Any]:
+    if result is None:
+        logger.error("Processing failed: empty result for %s", filename)
+        return {
+            "success": False,
+            "error": "Processing failed: empty result",
+            "data": {},
+            "agent_type": "document_processor",
+            "metadata": {"recoverable": True},
+        }
+    if not isinstance(result, dict):
+        return {
+            "success": bool(getattr(result, "success", False)),
+            "data": getattr(result, "data", {}),
+            "error": getattr(result, "error", None),
+            "processing_time": getattr(result, "processing_time", None),
+            "agent_type": getattr(result, "agent_type", "document_processor"),
+            "metadata": getattr(result, "metadata", {}),
+        }
+    if not result.get("success", True) and not result.get("error"):
+        nested_data = result.get("data") if isinstance(result.get("data"), dict) else {}
+        nested_err = nested_data.get("error")
+        result["error"] = (
+            str(nested_err) if nested_err else "Document processing failed"
+        )
+    return result
+
+
+async def _process_upload(
+    index: int,
+    up: UploadFile,
+    service: AgentService,
+    parsed_options: Dict[str, Any],
+    slots: asyncio.Semaphore,
 ) -> Dict[str, Any]:
-    """Batch document processing endpoint used by GUI folder/multi-file workers."""
-    logger.info("process-documents called with %d files", len(files))
-    parsed_options = _parse_processing_options(options)
-    if not files:
-        logger.warning("No files provided in process-documents")
-        raise HTTPException(status_code=400, detail="No files provided")
-
-    results: List[Dict[str, Any]] = []
-
-    for i, up in enumerate(files):
-        logger.info("Processing file %d: %s", i + 1, up.filename)
-        suffix = os.path.splitext(up.filename or "")[1] or ""
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            blob = await up.read()
-            tmp.write(blob)
-            tmp_path = tmp.name
-        logger.info("Created temp file: %s", tmp_path)
-
-        try:
-            logger.info("Dispatching process_document for %s", tmp_path)
+    """Spool and process one upload of a batch; failures become a failed item."""
+    async with slots:
+        started = time.perf_counter()
+        tmp_path: Optional[str] = None
+        upload_seconds = 0.0
+        try:
+            tmp_path = await _spool_upload(up)
+            upload_seconds = time.perf_counter() - started
             result = await service.dispatch_task(
                 "process_document",
                 {"file_path": tmp_path, "options": parsed_options},
             )
-            logger.info(
-                "Dispatch result: success=%s, error=%s",
-                result.get("success")
-                if isinstance(result, dict)
-                else getattr(result, "success", None),
-                result.get("error")
-                if isinstance(result, dict)
-                else getattr(result, "error", None),
-            )
-            if result is None:
-                logger.error("Processing failed: empty result for %s", up.filename)
-                result = {
-                    "success": False,
-                    "error": "Processing failed: empty result",
-                    "data": {},
-                    "agent_type": "document_processor",
-                    "metadata": {"recoverable": True},
-                }
-            elif not isinstance(result, dict):
-                result = {
-                    "success": bool(getattr(result, "success", False)),
-                    "data": getattr(result, "data", {}),
-                    "error": getattr(result, "error", None),
-                    "processing_time": getattr(result, "processing_time", None),
-                    "agent_type": getattr(result, "agent_type", "document_processor"),
-                    "metadata": getattr(result, "metadata", {}),
-                }
-            elif not result.get("success", True):
-                if not result.get("error"):
-                    nested_data = result.get("data") if isinstance(result.get("data"), dict) else {}
-                    nested_err = nested_data.get("error")
-                    result["error"] = (
-                        str(nested_err) if nested_err else "Document processing failed"
-                    )
-            if isinstance(result, dict):
-                result = _apply_processing_options(result, parsed_options)
-
-            validated = _v("document_processor", result)
-            results.append({"filename": up.filename, **validated})
-            logger.info(
-                "File %s processed successfully: %s",
-                up.filename,
-                validated.get("success"),
-            )
-        except Exception as e:
-            logger.error("Exception processing file %s: %s", up.filename, e)
-            raise
-        finally:
-            try:
-                os.unlink(tmp_path)
-                logger.info("Cleaned up temp file: %s", tmp_path)
-            except Exception as e:
-                logger.warning("Failed to clean up temp file %s: %s", tmp_path, e)
-
-    success_count = sum(1 for r in results if r.get("success"))
+            result = _apply_processing_options(
+                _normalize_batch_result(result, up.filename), parsed_options
+            )
+        except Exception as e:
+            logger.error("Exception processing file %s: %s", up.filename, e)
+            result = {
+                "success": False,
+                "error": f"Processing failed: {e}",
+                "data": {},
+                "agent_type": "document_processor",
+                "metadata": {"recoverable": True},
+            }
+        finally:
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except Exception as e:
+                    logger.warning("Failed to clean up temp file %s: %s", tmp_path, e)
+        total_seconds = time.perf_counter() - started
+
+    validated = _v("document_processor", result)
+    logger.info("File %s processed: success=%s", up.filename, validated.get("success"))
+    return {
+        "index": index,
+        "filename": up.filename,
+        **validated,
+        "timing": {
+            "upload_seconds": round(upload_seconds, 4),
+            "processing_seconds": round(total_seconds - upload_seconds, 4),
+            "total_seconds": round(total_seconds, 4),
+        },
+    }
+
+
+async def _iter_batch_results(
+    files: List[UploadFile],
+    service: AgentService,
+    parsed_options: Dict[str, Any],
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield per-file results in completion order.
+
+    At most PROCESS_DOCUMENTS_CONCURRENCY files are processed at once.
+    """
+    slots = asyncio.Semaphore(max(1, PROCESS_DOCUMENTS_CONCURRENCY))
+    tasks = [
+        asyncio.create_task(_process_upload(i, up, service, parsed_options, slots))
+        for i, up in enumerate(files)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away mid-stream: stop the files that have not finished
+        for task in tasks:
+            task.cancel()
+
+
+def _batch_summary(results: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    success_count = sum(1 for r in results if r.get("success"))
     return {
         "success": success_count == len(results),
         "processed_count": success_count,
         "failed_count": len(results) - success_count,
         "processed": success_count,
         "failed": len(results) - success_count,
+        "elapsed_seconds": round(elapsed, 4),
+    }
+
+
+@router.post("/agents/process-documents")
+async def process_documents(
+    request: Request,
+    files: List[UploadFile] = File(default_factory=list),
+    options: str | None = Form(default=None),
+    stream: bool = Query(default=False),
+    service: AgentService = Depends(get_agent_service),
+) -> Any:
+    """Batch document processing endpoint used by GUI folder/multi-file workers.
+
+    Files are processed concurrently. With ``?stream=true`` (or
+    ``Accept: application/x-ndjson``) each file's result is sent as an NDJSON
+    line as soon as it finishes, followed by a ``summary`` line; otherwise
+    the results are returned together in upload order.
+    """
+    logger.info("process-documents called with %d files", len(files))
+    parsed_options = _parse_processing_options(options)
+    if not files:
+        logger.warning("No files provided in process-documents")
+        raise HTTPException(status_code=400, detail="No files provided")
+
+    started = time.perf_counter()
+    if stream or "application/x-ndjson" in request.headers.get("accept", ""):
+
+        async def _ndjson() -> AsyncIterator[bytes]:
+            results: List[Dict[str, Any]] = []
+            async for item in _iter_batch_results(files, service, parsed_options):
+                results.append(item)
+                yield (
+                    json.dumps({"event": "file", **item}, default=str) + "\n"
+                ).encode("utf-8")
+            summary = _batch_summary(results, time.perf_counter() - started)
+            yield (
+                json.dumps({"event": "summary", "total": len(results), **summary})
+                + "\n"
+            ).encode("utf-8")
+
+        return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+    results = [
+        item async for item in _iter_batch_results(files, service, parsed_options)
+    ]
+    results.sort(key=lambda r: r["index"])
+    return {
+        **_batch_summary(results, time.perf_counter() - started),
         "items": results,
         "files": results,
         "results": results,
@@ -789,6 +789,7 @@ async def semantic_enrich_all(
         if not items:
             break
 
+        file_ids: List[int] = []
         for rec in items:
             file_id = int(rec.get("id") or 0)
             if file_id <= 0:
@@ -796,29 +797,31 @@ async def semantic_enrich_all(
                 if len(failures) < limit_failures:
                     failures.append({"file_id": file_id, "error": "invalid_file_id"})
                 continue
-            try:
-                out = await run_in_threadpool(
-                    functools.partial(
-                        svc.enrich_file,
-                        file_id=file_id,
-                        embedding_model=embedding_model,
-                    )
+            file_ids.append(file_id)
+
+        # One page per worker call so its writes share multi-file transactions.
+        try:
+            outs = await run_in_threadpool(
+                functools.partial(
+                    svc.enrich_files,
+                    file_ids=file_ids,
+                    embedding_model=embedding_model,
                 )
-                if out.get("success"):
-                    success_count += 1
-                else:
-                    failed_count += 1
-                    if len(failures) < limit_failures:
-                        failures.append(
-                            {
-                                "file_id": file_id,
-                                "error": str(out.get("error") or "enrich_failed"),
-                            }
-                        )
-            except Exception as e:
+            )
+        except Exception as e:
+            outs = [{"file_id": file_id, "success": False, "error": str(e)} for file_id in file_ids]
+        for out in outs:
+            if out.get("success"):
+                success_count += 1
+            else:
                 failed_count += 1
                 if len(failures) < limit_failures:
-                    failures.append({"file_id": file_id, "error": str(e)})
+                    failures.append(
+                        {
+                            "file_id": out.get("file_id"),
+                            "error": str(out.get("error") or "enrich_failed"),
+                        }
+                    )
 
         processed += len(items)
         cursor += len(items)
@@ -1,13 +1,13 @@
 import logging
 from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
 from pydantic import BaseModel, Field
 
 from services.dependencies import get_database_manager_strict_dep, resolve_typed_service
 from services.contracts.aedis_models import ProvenanceRecord
 from services.jurisdiction_service import jurisdiction_service
-from services.knowledge_service import KnowledgeService
+from services.knowledge_service import LAYOUT_TILE_MAX_ZOOM, KnowledgeService
 from services.provenance_service import get_provenance_service
 
 router = APIRouter()
@@ -241,10 +241,11 @@ async def add_entity(payload: EntityPayload, service: KnowledgeService = Depends
 async def list_entities(
     limit: int = 50,
     offset: int = 0,
+    cursor: Optional[str] = None,
     service: KnowledgeService = Depends(get_knowledge_service)
 ) -> Dict[str, Any]:
     try:
-        return await service.list_entities(limit=limit, offset=offset)
+        return await service.list_entities(limit=limit, offset=offset, cursor=cursor)
     except Exception as e:
         logger.error(f"List entities error: {e}")
         raise HTTPException(status_code=500, detail="Failed to list entities")
@@ -268,15 +269,119 @@ async def add_relationship(payload: RelationshipPayload, service: KnowledgeServi
 async def list_relationships(
     limit: int = 50,
     offset: int = 0,
+    cursor: Optional[str] = None,
     service: KnowledgeService = Depends(get_knowledge_service)
 ) -> Dict[str, Any]:
     try:
-        return await service.list_relationships(limit=limit, offset=offset)
+        return await service.list_relationships(limit=limit, offset=offset, cursor=cursor)
     except Exception as e:
         logger.error(f"List relationships error: {e}")
         raise HTTPException(status_code=500, detail="Failed to list relationships")
 
 
+@router.get("/knowledge/analytics/centrality")
+async def knowledge_centrality(
+    measures: Optional[str] = Query(None, description="Comma-separated: degree,pagerank,betweenness"),
+    top_k: int = Query(10, ge=1, le=1000),
+    service: KnowledgeService = Depends(get_knowledge_service),
+) -> Dict[str, Any]:
+    selected = [m for m in (measures or "").split(",") if m.strip()] or None
+    try:
+        return await service.analyze_centrality(measures=selected, top_k=top_k)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Centrality analysis error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to analyze centrality")
+
+
+@router.get("/knowledge/analytics/communities")
+async def knowledge_communities(
+    algorithm: str = Query("louvain"),
+    min_size: int = Query(3, ge=1),
+    service: KnowledgeService = Depends(get_knowledge_service),
+) -> Dict[str, Any]:
+    try:
+        return await service.detect_communities(algorithm=algorithm, min_community_size=min_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Community detection error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to detect communities")
+
+
+@router.get("/knowledge/analytics/path")
+async def knowledge_shortest_path(
+    source: str,
+    target: str,
+    weight: str = Query("weight"),
+    service: KnowledgeService = Depends(get_knowledge_service),
+) -> Dict[str, Any]:
+    try:
+        return await service.find_shortest_path(source=source, target=target, weight=weight)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Shortest path error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to find shortest path")
+
+
+@router.get("/knowledge/visualization")
+async def knowledge_visualization(
+    layout: str = Query("force_directed"),
+    max_nodes: int = Query(500, ge=1, le=5000),
+    service: KnowledgeService = Depends(get_knowledge_service),
+) -> Dict[str, Any]:
+    try:
+        return await service.get_visualization(layout_type=layout, max_nodes=max_nodes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Knowledge visualization error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to build visualization")
+
+
+@router.get("/knowledge/layout")
+async def knowledge_layout_viewport(
+    x0: float = Query(0.0),
+    y0: float = Query(0.0),
+    x1: float = Query(1.0),
+    y1: float = Query(1.0),
+    max_nodes: int = Query(2000, ge=1, le=20000),
+    since_version: Optional[int] = Query(None),
+    service: KnowledgeService = Depends(get_knowledge_service),
+) -> Dict[str, Any]:
+    try:
+        return await service.get_layout_viewport(
+            x0=x0, y0=y0, x1=x1, y1=y1, max_nodes=max_nodes, since_version=since_version
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Knowledge layout error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to build graph layout")
+
+
+@router.get("/knowledge/layout/tiles/{zoom}/{tile_x}/{tile_y}")
+async def knowledge_layout_tile(
+    zoom: int = Path(..., ge=0, le=LAYOUT_TILE_MAX_ZOOM),
+    tile_x: int = Path(..., ge=0),
+    tile_y: int = Path(..., ge=0),
+    max_nodes: int = Query(2000, ge=1, le=20000),
+    since_version: Optional[int] = Query(None),
+    service: KnowledgeService = Depends(get_knowledge_service),
+) -> Dict[str, Any]:
+    try:
+        return await service.get_layout_tile(
+            zoom, tile_x, tile_y, max_nodes=max_nodes, since_version=since_version
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Knowledge layout tile error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to build graph layout tile")
+
+
 @router.post("/knowledge/import_triples")
 async def import_triples(payload: TriplesPayload, service: KnowledgeService = Depends(get_knowledge_service)) -> Dict[str, Any]:
     try:
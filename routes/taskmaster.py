@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -174,4 +175,5 @@ async def run_due_schedules(
     db=Depends(get_database_manager_strict_dep),
 ) -> Dict[str, Any]:
     svc = TaskMasterService(db)
-    return svc.run_due_schedules()
+    # Runs pipelines inline; keep them off the event loop
+    return await asyncio.to_thread(svc.run_due_schedules)
@@ -19,6 +19,10 @@ class IndexPayload(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
+class BatchIndexPayload(BaseModel):
+    documents: List[IndexPayload]
+
+
 class SearchPayload(BaseModel):
     embedding: List[float]
     top_k: int = 5
@@ -99,6 +103,43 @@ async def vector_index(
         raise HTTPException(status_code=500, detail="Failed to index document")
 
 
+@router.post("/vector/index/batch")
+async def vector_index_batch(
+    payload: BatchIndexPayload, store=Depends(get_vector_store_strict_dep)
+) -> Dict[str, Any]:
+    try:
+        import numpy as np
+
+        if store is None:
+            raise HTTPException(
+                status_code=501,
+                detail={
+                    "error": "vector_store_unavailable",
+                    "required_dependencies": ["faiss", "numpy"],
+                },
+            )
+        if not await store.initialize():
+            raise HTTPException(status_code=500, detail="Vector store not initialized")
+        if not payload.documents:
+            return {"ids": [], "count": 0}
+        embeddings = np.array(
+            [doc.embedding for doc in payload.documents], dtype=np.float32
+        )
+        doc_ids = await store.add_documents(
+            contents=[doc.content for doc in payload.documents],
+            embeddings=embeddings,
+            metadatas=[doc.metadata or {} for doc in payload.documents],
+        )
+        return {"ids": doc_ids, "count": len(doc_ids)}
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Vector batch index error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to index documents")
+
+
 @router.post("/vector/search")
 async def vector_search(
     payload: SearchPayload, store=Depends(get_vector_store_strict_dep)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Dict, Optional
+import asyncio
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, Header, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from app.contracts.workflow import (
     CreateJobRequest,
@@ -26,19 +30,19 @@ from services.workflow import (
     default_stepper,
     deliver_workflow_callback,
     derive_draft_state_for_proposal,
-    execute_index_extract,
-    execute_summarize,
     load_job,
-    persist_step_result,
     read_idempotent_response,
     save_job,
-    step_index,
-    update_step_status,
+    submit_workflow_step,
+    workflow_progress_snapshot,
     write_idempotent_response,
 )
 
 router = APIRouter()
 
+# How often the events stream re-reads the job record
+EVENTS_POLL_SECONDS = float(os.getenv("WORKFLOW_EVENTS_POLL_SECONDS", "0.5"))
+
 
 @router.post("/workflow/jobs", response_model=JobStatusResponse)
 async def create_workflow_job(
@@ -76,9 +80,10 @@ async def get_workflow_job_status(job_id: str, db=Depends(get_database_manager_s
     job = load_job(db, job_id)
     if not job:
         job = JobStatus(job_id=job_id, status="failed", draft_state="failed", stepper=default_stepper())
-    job.updated_at = datetime.utcnow()
-    if job.job_id.startswith("wf_"):
-        save_job(db, job)
+        if job.job_id.startswith("wf_"):
+            save_job(db, job)
+    # Existing jobs are not re-saved here: a background step may be writing
+    # progress to the same row, and a stale copy would overwrite it.
     return JobStatusResponse(success=True, job=job)
 
 
@@ -87,119 +92,79 @@ async def execute_workflow_step(
     job_id: str,
     step_name: str,
     payload: ExecuteStepRequest,
+    wait: bool = Query(
+        False,
+        description=(
+            "Block until the step finishes instead of returning once it is queued"
+        ),
+    ),
     idempotency_key: Optional[str] = Header(None),
     db=Depends(get_database_manager_strict_dep),
 ) -> ResultResponse:
+    if step_name not in STEP_ORDER:
+        raise HTTPException(
+            status_code=404, detail=f"Unknown workflow step '{step_name}'"
+        )
+
     key = payload.idempotency_key or idempotency_key
     scope = f"execute_step:{job_id}:{step_name}"
     cached = read_idempotent_response(db, scope, key)
     if cached:
         return ResultResponse.model_validate(cached)
 
-    job = load_job(db, job_id)
-    if not job:
-        job = JobStatus(job_id=job_id, stepper=default_stepper(), metadata={"completed_steps": [], "last_result_by_step": {}})
+    # Steps run on the workflow step pool; progress is streamed from /events.
+    accepted, future = await asyncio.to_thread(
+        submit_workflow_step,
+        db,
+        job_id,
+        step_name,
+        payload.payload,
+        scope=scope,
+        key=key,
+    )
+    if wait:
+        return await asyncio.wrap_future(future)
+    return accepted
 
-    job.status = "running"
-    job.current_step = step_name  # type: ignore[assignment]
-    job.draft_state = "saving"
-    job.progress = max(job.progress, min((step_index(step_name) + 1) / max(len(STEP_ORDER), 1), 1.0))
-    job.idempotency_key = key or job.idempotency_key
-    job.updated_at = datetime.utcnow()
-    update_step_status(job, step_name, "in_progress")
 
-    result = ResultSchema(
-        summary=f"Execution accepted for step '{step_name}'",
-        items=[],
-        bulk={"supported": True},
-        ontology_edits={"supported": True, "granular": True},
-        pagination=PaginationMeta(count=0, has_more=False, next_cursor=None),
+@router.get("/workflow/jobs/{job_id}/events")
+async def stream_workflow_job_events(
+    job_id: str,
+    step: Optional[str] = Query(None),
+    timeout: float = Query(300.0, ge=1.0, le=3600.0),
+    db=Depends(get_database_manager_strict_dep),
+) -> StreamingResponse:
+    """Server-sent events with step progress until no step is queued or running."""
+
+    async def _events() -> AsyncIterator[str]:
+        deadline = time.monotonic() + timeout
+        last: Optional[Dict[str, Any]] = None
+        while True:
+            job = await asyncio.to_thread(load_job, db, job_id)
+            if job is None:
+                yield _sse("error", {"job_id": job_id, "error": "job_not_found"})
+                return
+            snapshot = workflow_progress_snapshot(job, step)
+            if snapshot != last:
+                yield _sse("progress", snapshot)
+                last = snapshot
+            if not snapshot["active"]:
+                yield _sse("done", snapshot)
+                return
+            if time.monotonic() >= deadline:
+                yield _sse("timeout", snapshot)
+                return
+            await asyncio.sleep(EVENTS_POLL_SECONDS)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    try:
-        if step_name == "index_extract":
-            result = execute_index_extract(db, payload.payload)
-        elif step_name == "summarize":
-            result = execute_summarize(db, payload.payload)
-            job.metadata["summary_artifact"] = result.items[0].payload if result.items else {}
-        elif step_name == "proposals":
-            svc = OrganizationService(db)
-            try:
-                limit_val = int(payload.payload.get("limit", 50))
-            except (ValueError, TypeError):
-                limit_val = 50
-            generate_out = svc.generate_proposals(
-                run_id=payload.payload.get("run_id"),
-                limit=limit_val,
-                provider=payload.payload.get("provider"),
-                model=payload.payload.get("model"),
-                root_prefix=payload.payload.get("root_prefix"),
-            )
-            try:
-                created = int(generate_out.get("created", 0))
-            except (ValueError, TypeError):
-                created = 0
-            result.summary = f"Generated {created} proposal(s)"
-            result.pagination = PaginationMeta(count=created, has_more=False, next_cursor=None)
-        elif step_name == "apply":
-            svc = OrganizationService(db)
-            dry_run = bool(payload.payload.get("dry_run", True))
-            try:
-                apply_limit = int(payload.payload.get("limit", 200))
-            except (ValueError, TypeError):
-                apply_limit = 200
-            out = svc.apply_approved(limit=apply_limit, dry_run=dry_run)
-            undo_token = str(out.get("rollback_group") or uuid4().hex)
-            undo_entry = {
-                "undo_token": undo_token,
-                "step": "apply",
-                "created_at": datetime.utcnow().isoformat(),
-                "dry_run": dry_run,
-                "operation": "organization_move_batch",
-                "result": {"applied": out.get("applied", 0), "failed": out.get("failed", 0)},
-            }
-            stack = list(job.metadata.get("undo_stack") or [])
-            stack.append(undo_entry)
-            job.metadata["undo_stack"] = stack[-25:]
-            job.undo.depth = len(job.metadata.get("undo_stack") or [])
-            job.undo.last_undo_token = undo_token
-            result.summary = f"Apply finished: applied={out.get('applied', 0)}, failed={out.get('failed', 0)}, dry_run={dry_run}"
-            result.items = [
-                ResultItem(
-                    id=f"apply_{undo_token[:12]}",
-                    type="apply_result",
-                    status="complete" if out.get("success") else "failed",
-                    payload=out,
-                    undo_token=undo_token,
-                    version=1,
-                )
-            ]
-            result.pagination = PaginationMeta(count=1, has_more=False, next_cursor=None)
-    except Exception as e:
-        update_step_status(job, step_name, "failed")
-        job.status = "failed"
-        job.draft_state = "failed"
-        job.metadata["last_error"] = str(e)
-        save_job(db, job)
-        response = ResultResponse(success=False, job_id=job_id, step=step_name, result=result, errors=[str(e)])
-        write_idempotent_response(db, scope, key, response.model_dump(mode="json"))
-        deliver_workflow_callback(db, job=job, event_type="step.failed", payload={"step": step_name, "errors": [str(e)]})
-        return response
-
-    update_step_status(job, step_name, "complete")
-    persist_step_result(job, step_name=step_name, result=result)
-    job.draft_state = "clean"
-    save_job(db, job)
 
-    response = ResultResponse(success=True, job_id=job_id, step=step_name, result=result, errors=[])
-    write_idempotent_response(db, scope, key, response.model_dump(mode="json"))
-    deliver_workflow_callback(
-        db,
-        job=job,
-        event_type="step.completed",
-        payload={"step": step_name, "summary": result.summary, "count": result.pagination.count},
-    )
-    return response
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
 
 @router.post("/workflow/jobs/{job_id}/proposals/bulk", response_model=WorkflowMutationResponse)
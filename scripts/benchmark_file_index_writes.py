@@ -0,0 +1,199 @@
+"""Micro-benchmark file index writes: per-call commits vs the bulk writer.
+
+With ``--ingest-files`` it also times ``FileIndexService.index_roots`` over
+small text files, committing per file vs in group-commit windows.
+
+Usage:
+    python scripts/benchmark_file_index_writes.py \
+        --files 200 --chunks 50 --ingest-files 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from mem_db.database import DatabaseManager  # noqa: E402
+from services.file_index_service import FileIndexService  # noqa: E402
+
+
+def _payload(file_no: int, chunks: int, entities: int, dim: int) -> Dict[str, Any]:
+    return {
+        "chunks": [
+            {
+                "chunk_index": i,
+                "title": f"Section {i}",
+                "content": f"file {file_no} chunk {i} " * 20,
+                "metadata": {"pipeline": "benchmark"},
+            }
+            for i in range(chunks)
+        ],
+        "entities": [
+            {"entity_text": f"Entity {file_no}-{i}", "entity_type": "ORG", "confidence": 0.9}
+            for i in range(entities)
+        ],
+        "tables": [{"headers": ["a", "b"], "rows": [[1, 2]] * 10, "metadata": {}}],
+        "embeddings": [[float((i + j) % 7) / 7.0 for j in range(dim)] for i in range(chunks)],
+    }
+
+
+def _register_files(db: DatabaseManager, root: Path, files: int) -> List[int]:
+    return [
+        db.upsert_indexed_file(
+            display_name=f"f{n}.txt",
+            original_path=str(root / f"f{n}.txt"),
+            normalized_path=str(root / f"f{n}.txt"),
+            file_size=1,
+            mtime=1.0,
+            mime_type="text/plain",
+            mime_source="benchmark",
+            sha256=None,
+            ext=".txt",
+            status="ready",
+        )
+        for n in range(files)
+    ]
+
+
+def _per_call(db: DatabaseManager, file_ids: List[int], payloads: List[Dict[str, Any]]) -> None:
+    for file_id, data in zip(file_ids, payloads):
+        chunk_ids = db.replace_file_chunks(file_id, data["chunks"])
+        for chunk_id, vector in zip(chunk_ids, data["embeddings"]):
+            db.upsert_chunk_embedding(
+                file_id=file_id, chunk_id=chunk_id, embedding_model="bench", embedding=vector
+            )
+        db.replace_file_entities(file_id, data["entities"])
+        db.replace_file_tables(file_id, data["tables"])
+
+
+def _bulk(
+    db: DatabaseManager,
+    file_ids: List[int],
+    payloads: List[Dict[str, Any]],
+    files_per_commit: Optional[int],
+) -> None:
+    with db.file_index_bulk_writer(files_per_commit=files_per_commit) as writer:
+        for file_id, data in zip(file_ids, payloads):
+            with writer.file():
+                writer.replace_file_chunks(
+                    file_id,
+                    data["chunks"],
+                    embedding_model="bench",
+                    embeddings=data["embeddings"],
+                )
+                writer.replace_file_entities(file_id, data["entities"])
+                writer.replace_file_tables(file_id, data["tables"])
+
+
+def _ingest(root: Path, db: DatabaseManager, files_per_commit: int) -> Dict[str, Any]:
+    return FileIndexService(db).index_roots(
+        [str(root)],
+        allowed_exts={".txt"},
+        max_files=10**9,
+        files_per_commit=files_per_commit,
+        commit_latency_seconds=3600.0,
+        defer_ocr=False,
+    )
+
+
+def run_ingest_benchmark(
+    files: int = 500, files_per_commit: int = 32
+) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"files": files, "modes": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "docs"
+        root.mkdir()
+        for n in range(files):
+            (root / f"note_{n}.txt").write_text(
+                f"note {n} about matter {n % 17}\n" * 20, encoding="utf-8"
+            )
+        for label, per_commit in (
+            ("commit_per_file", 1),
+            (f"group_commit_{files_per_commit}", files_per_commit),
+        ):
+            db = DatabaseManager(str(Path(tmp) / f"{label}.db"))
+            try:
+                started = time.perf_counter()
+                out = _ingest(root, db, per_commit)
+                elapsed = time.perf_counter() - started
+            finally:
+                db.close()
+            report["modes"][label] = {
+                "seconds": round(elapsed, 4),
+                "files_per_sec": round(out["indexed"] / elapsed, 1)
+                if elapsed > 0
+                else None,
+                "indexed": out["indexed"],
+            }
+    return report
+
+
+def run_benchmark(
+    files: int = 200,
+    chunks: int = 50,
+    entities: int = 20,
+    dim: int = 64,
+    files_per_commit: int = 32,
+    ingest_files: int = 0,
+) -> Dict[str, Any]:
+    payloads = [_payload(n, chunks, entities, dim) for n in range(files)]
+    rows = files * (2 * chunks + entities + 1)
+    report: Dict[str, Any] = {"files": files, "rows": rows, "modes": {}}
+    modes = {
+        "per_call_commit": lambda db, ids: _per_call(db, ids, payloads),
+        "bulk_commit_per_file": lambda db, ids: _bulk(db, ids, payloads, 1),
+        f"bulk_commit_every_{files_per_commit}": lambda db, ids: _bulk(
+            db, ids, payloads, files_per_commit
+        ),
+    }
+    for label, fn in modes.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(str(Path(tmp) / "bench.db"))
+            try:
+                file_ids = _register_files(db, Path(tmp), files)
+                started = time.perf_counter()
+                fn(db, file_ids)
+                elapsed = time.perf_counter() - started
+                written = sum(len(db.list_file_chunks(fid)) for fid in file_ids)
+            finally:
+                db.close()
+        report["modes"][label] = {
+            "seconds": round(elapsed, 4),
+            "rows_per_sec": round(rows / elapsed, 1) if elapsed > 0 else None,
+            "chunks_written": written,
+        }
+    if ingest_files:
+        report["ingest"] = run_ingest_benchmark(ingest_files, files_per_commit)
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--chunks", type=int, default=50)
+    parser.add_argument("--entities", type=int, default=20)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--files-per-commit", type=int, default=32)
+    parser.add_argument("--ingest-files", type=int, default=0)
+    args = parser.parse_args()
+    report = run_benchmark(
+        files=args.files,
+        chunks=args.chunks,
+        entities=args.entities,
+        dim=args.dim,
+        files_per_commit=args.files_per_commit,
+        ingest_files=args.ingest_files,
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+"""Benchmark knowledge graph analytics on a generated graph.
+
+Usage:
+    python scripts/benchmark_knowledge_graph.py --nodes 50000 --edges 300000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from mem_db.knowledge import graph_analytics  # noqa: E402
+
+
+def generate_edges(nodes: int, edges: int, communities: int, seed: int):
+    """Planted-partition graph: most edges stay inside a node's community."""
+    rng = random.Random(seed)
+    size = max(1, nodes // max(1, communities))
+    out = []
+    for _ in range(edges):
+        u = rng.randrange(nodes)
+        if rng.random() < 0.9:
+            base = (u // size) * size
+            v = min(nodes - 1, base + rng.randrange(size))
+        else:
+            v = rng.randrange(nodes)
+        out.append((f"ent_{u}", f"ent_{v}", 1.0))
+    return out
+
+
+def _timed(label: str, fn: Callable[[], Any], report: Dict[str, float]) -> Any:
+    started = time.perf_counter()
+    result = fn()
+    report[label] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def run_benchmark(
+    nodes: int = 20000,
+    edges: int = 100000,
+    communities: int = 50,
+    betweenness_samples: int = 32,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    timings: Dict[str, float] = {}
+    edge_list = generate_edges(nodes, edges, communities, seed)
+    node_ids = [f"ent_{i}" for i in range(nodes)]
+
+    graph = _timed("build_csr_s", lambda: graph_analytics.build_csr(node_ids, edge_list), timings)
+    _timed("degree_s", lambda: graph_analytics.degree_centrality(graph), timings)
+    _timed("pagerank_s", lambda: graph_analytics.pagerank(graph), timings)
+    _timed(
+        "betweenness_s",
+        lambda: graph_analytics.approximate_betweenness(graph, betweenness_samples, seed),
+        timings,
+    )
+    partition, score = _timed(
+        "louvain_s", lambda: graph_analytics.compute_communities(graph, "louvain", seed), timings
+    )
+    _timed(
+        "label_propagation_s",
+        lambda: graph_analytics.compute_communities(graph, "label_propagation", seed),
+        timings,
+    )
+    rng = random.Random(seed)
+    pairs = [(rng.randrange(nodes), rng.randrange(nodes)) for _ in range(100)]
+    _timed(
+        "shortest_path_x100_s",
+        lambda: [graph_analytics.shortest_path(graph, s, t) for s, t in pairs],
+        timings,
+    )
+    return {
+        "nodes": graph.node_count,
+        "edges": graph.edge_count,
+        "communities_found": len(set(partition)),
+        "modularity": round(score, 4),
+        "timings": timings,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--edges", type=int, default=100000)
+    parser.add_argument("--communities", type=int, default=50)
+    parser.add_argument("--betweenness-samples", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    report = run_benchmark(
+        nodes=args.nodes,
+        edges=args.edges,
+        communities=args.communities,
+        betweenness_samples=args.betweenness_samples,
+        seed=args.seed,
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,193 @@
+"""Benchmark proposal generation against a local stub LLM provider.
+
+The stub answers every completion after a fixed delay, so the run measures
+scoping, prompt fan-out and proposal writes rather than a real model.
+
+Usage:
+    python scripts/benchmark_organization_proposals.py --files 200 --latency-ms 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import services.provenance_service as provenance_module  # noqa: E402
+from mem_db.database import DatabaseManager  # noqa: E402
+from services.organization_service import OrganizationService  # noqa: E402
+from services.provenance_service import ProvenanceService  # noqa: E402
+
+# generate_proposals refuses unconfigured providers; the stub never uses the key
+os.environ.setdefault("XAI_API_KEY", "benchmark-stub")
+
+_BATCH_ENTRY = re.compile(r"^\[(\d+)\]$", re.MULTILINE)
+
+
+class StubLLMManager:
+    """Stands in for ``LLMManager``: waits ``latency`` seconds, returns proposals."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _answer(index: int) -> Dict[str, Any]:
+        return {
+            "index": index,
+            "proposed_folder": "Clients/Acme/Contracts",
+            "proposed_filename": f"contract_{index}.pdf",
+            "confidence": 0.8,
+            "rationale": "stub",
+            "alternatives": ["Inbox/Review"],
+            "evidence_spans": [{"start_char": 0, "end_char": 8, "quote": "contract"}],
+        }
+
+    def complete_sync(
+        self,
+        prompt: str,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        **_: Any,
+    ) -> str:
+        with self._lock:
+            self.calls += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            time.sleep(self.latency)
+            indexes = [int(m) for m in _BATCH_ENTRY.findall(prompt)]
+            if indexes:
+                return json.dumps([self._answer(i) for i in indexes])
+            return json.dumps(self._answer(0))
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+def _register_files(db: DatabaseManager, root: Path, files: int, folders: int) -> None:
+    for n in range(files):
+        path = root / "inbox" / f"matter_{n % folders}" / f"contract_{n}.pdf"
+        db.upsert_indexed_file(
+            display_name=path.name,
+            original_path=str(path),
+            normalized_path=str(path),
+            file_size=1,
+            mtime=1.0,
+            mime_type="application/pdf",
+            mime_source="benchmark",
+            sha256=hashlib.sha256(str(path).encode("utf-8")).hexdigest(),
+            ext=".pdf",
+            status="ready",
+            metadata={"preview": f"contract number {n} between Acme and a supplier"},
+        )
+    # Files outside the scope the run asks for
+    for n in range(files):
+        path = root / "archive" / f"old_{n}.pdf"
+        db.upsert_indexed_file(
+            display_name=path.name,
+            original_path=str(path),
+            normalized_path=str(path),
+            file_size=1,
+            mtime=1.0,
+            mime_type="application/pdf",
+            mime_source="benchmark",
+            sha256=hashlib.sha256(str(path).encode("utf-8")).hexdigest(),
+            ext=".pdf",
+            status="ready",
+        )
+
+
+def run_benchmark(
+    files: int = 200,
+    folders: int = 10,
+    latency_ms: float = 50.0,
+    concurrency: int = 4,
+    batch_size: int = 8,
+    write_chunk: int = 50,
+) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"files": files, "latency_ms": latency_ms, "modes": {}}
+    modes = {
+        "sequential": (1, 1),
+        f"concurrent_{concurrency}": (concurrency, 1),
+        f"concurrent_{concurrency}_batched_{batch_size}": (concurrency, batch_size),
+    }
+    saved_provenance = provenance_module.provenance_service
+    try:
+        for label, (workers, batch) in modes.items():
+            with tempfile.TemporaryDirectory() as tmp:
+                db = DatabaseManager(str(Path(tmp) / "bench.db"))
+                try:
+                    provenance_module.provenance_service = ProvenanceService(db)
+                    _register_files(db, Path(tmp), files, folders)
+                    svc = OrganizationService(db)
+                    stub = StubLLMManager(latency_ms / 1000.0)
+                    svc.llm_manager = stub
+                    svc.llm_concurrency = workers
+                    svc.llm_batch_size = batch
+                    svc.proposal_write_chunk = write_chunk
+                    svc._known_folders_from_root = lambda *_args, **_kwargs: []
+                    svc._seed_index_from_root = lambda *_args, **_kwargs: 0
+                    OrganizationService._llm_circuit_record_success()
+
+                    started = time.perf_counter()
+                    out = svc.generate_proposals(
+                        limit=files,
+                        provider="xai",
+                        model="stub",
+                        root_prefix=str(Path(tmp) / "inbox"),
+                    )
+                    elapsed = time.perf_counter() - started
+                finally:
+                    db.close()
+            report["modes"][label] = {
+                "seconds": round(elapsed, 4),
+                "proposals_per_sec": round(out["created"] / elapsed, 1)
+                if elapsed > 0
+                else None,
+                "created": out["created"],
+                "scoped_indexed_count": out["scoped_indexed_count"],
+                "llm_calls": stub.calls,
+                "max_llm_in_flight": stub.max_in_flight,
+            }
+    finally:
+        provenance_module.provenance_service = saved_provenance
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--folders", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--write-chunk", type=int, default=50)
+    args = parser.parse_args()
+    report = run_benchmark(
+        files=args.files,
+        folders=args.folders,
+        latency_ms=args.latency_ms,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        write_chunk=args.write_chunk,
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
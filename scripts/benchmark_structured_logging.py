@@ -0,0 +1,102 @@
+"""Benchmark the caller-side cost of structured file logging.
+
+Compares writing each record on the calling thread (format, open, append,
+close, as FileLogHandler used to) with the queued FileLogHandler, and reports
+how long the background writer needs to drain the burst.
+
+Usage:
+    python scripts/benchmark_structured_logging.py --records 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tools.db.interfaces.logging import LogCategory, LogLevel, LogRecord  # noqa: E402
+from tools.db.structured_logging.formatters import JsonLogFormatter  # noqa: E402
+from tools.db.structured_logging.handlers import FileLogHandler  # noqa: E402
+
+
+def _records(count: int) -> List[LogRecord]:
+    return [
+        LogRecord(
+            level=LogLevel.INFO,
+            message=f"indexed file {n}",
+            category=LogCategory.DATABASE,
+            timestamp=datetime.now(),
+            logger_name="benchmark",
+            context={
+                "file_id": n,
+                "path": f"/data/docs/file_{n}.pdf",
+                "chunks": n % 40,
+            },
+        )
+        for n in range(count)
+    ]
+
+
+def _per_call_write(path: Path, records: List[LogRecord]) -> float:
+    formatter = JsonLogFormatter(indent=2)
+    started = time.perf_counter()
+    for record in records:
+        line = formatter.format(record)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+    return time.perf_counter() - started
+
+
+def run_benchmark(records: int = 20000, queue_size: int = 100000) -> Dict[str, Any]:
+    batch = _records(records)
+    report: Dict[str, Any] = {"records": records, "modes": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        elapsed = _per_call_write(Path(tmp) / "direct.log", batch)
+        report["modes"]["per_call_open_append"] = {
+            "caller_seconds": round(elapsed, 4),
+            "caller_us_per_record": round(elapsed / records * 1e6, 2),
+        }
+
+        handler = FileLogHandler(
+            str(Path(tmp) / "queued.log"), max_size=1 << 40, queue_size=queue_size
+        )
+        handler.set_formatter(JsonLogFormatter(indent=2))
+        started = time.perf_counter()
+        for record in batch:
+            handler.enqueue(record)
+        elapsed = time.perf_counter() - started
+        handler.close(timeout=600)
+        drained = time.perf_counter() - started
+        report["modes"]["queued_background_writer"] = {
+            "caller_seconds": round(elapsed, 4),
+            "caller_us_per_record": round(elapsed / records * 1e6, 2),
+            "drain_seconds": round(drained, 4),
+            "written": handler.written,
+            "dropped": handler.dropped,
+        }
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--queue-size", type=int, default=100000)
+    args = parser.parse_args()
+    print(
+        json.dumps(
+            run_benchmark(records=args.records, queue_size=args.queue_size), indent=2
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+"""Benchmark filtered vector search at 1%, 10% and 50% filter selectivity.
+
+Compares UnifiedVectorStore.search against the previous post-filter approach
+(fetch k*2 from FAISS, then drop non-matching documents).
+
+Usage:
+    python scripts/benchmark_vector_filters.py --vectors 50000 --index-type hnsw
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from mem_db.vector_store.unified_vector_store import UnifiedVectorStore  # noqa: E402
+
+SELECTIVITIES = (0.01, 0.10, 0.50)
+
+
+def _domain_for(row: int, total: int) -> str:
+    """Assign domains so 'sel_1', 'sel_10' and 'sel_50' cover 1/10/50% of rows."""
+    fraction = row / total
+    if fraction < 0.01:
+        return "sel_1"
+    if fraction < 0.11:
+        return "sel_10"
+    if fraction < 0.61:
+        return "sel_50"
+    return "other"
+
+
+async def _run(
+    vectors: int, dimension: int, queries: int, k: int, index_type: str, seed: int
+) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    data = rng.standard_normal((vectors, dimension)).astype(np.float32)
+    query_vectors = rng.standard_normal((queries, dimension)).astype(np.float32)
+    report: Dict[str, Any] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = UnifiedVectorStore(
+            store_path=Path(tmp),
+            dimension=dimension,
+            enable_persistence=False,
+            index_type=index_type,
+            train_min_vectors=min(vectors, 10000),
+        )
+        assert await store.initialize()
+        # Rows are shuffled so each domain is spread through the index.
+        for row in rng.permutation(vectors):
+            await store.add_document(
+                f"doc {row}", data[row], legal_domain=_domain_for(int(row), vectors)
+            )
+
+        for selectivity in SELECTIVITIES:
+            domain = f"sel_{int(selectivity * 100)}"
+            post_counts, post_time = [], 0.0
+            new_counts, new_time = [], 0.0
+            for query in query_vectors:
+                q = query / np.linalg.norm(query)
+                started = time.perf_counter()
+                _d, labels = store._index.search(q.reshape(1, -1), k * 2)
+                post_counts.append(
+                    min(
+                        k,
+                        sum(
+                            1
+                            for label in labels[0]
+                            if label != -1
+                            and store._documents[store._index_to_id[int(label)]].legal_domain
+                            == domain
+                        ),
+                    )
+                )
+                post_time += time.perf_counter() - started
+
+                started = time.perf_counter()
+                hits = await store.search(
+                    query, k=k, legal_domain=domain, boost_recent=False
+                )
+                new_time += time.perf_counter() - started
+                new_counts.append(len(hits))
+
+            report[f"{int(selectivity * 100)}%"] = {
+                "postfilter_avg_results": round(float(np.mean(post_counts)), 2),
+                "postfilter_query_ms": round(post_time * 1000 / queries, 3),
+                "filtered_avg_results": round(float(np.mean(new_counts)), 2),
+                "filtered_query_ms": round(new_time * 1000 / queries, 3),
+            }
+        stats = await store.get_statistics()
+
+    return {
+        "vectors": vectors,
+        "dimension": dimension,
+        "k": k,
+        "index_type": index_type,
+        "selectivity": report,
+        "prefiltered_searches": stats["prefiltered_searches"],
+        "overfetch_retries": stats["overfetch_retries"],
+        "exact_fallbacks": stats["exact_fallbacks"],
+    }
+
+
+def run_benchmark(
+    vectors: int = 20000,
+    dimension: int = 64,
+    queries: int = 50,
+    k: int = 10,
+    index_type: str = "flat",
+    seed: int = 0,
+) -> Dict[str, Any]:
+    return asyncio.run(_run(vectors, dimension, queries, k, index_type, seed))
+
+
+def main(argv: Iterable[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--dimension", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--index-type", default="flat")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = run_benchmark(
+        vectors=args.vectors,
+        dimension=args.dimension,
+        queries=args.queries,
+        k=args.k,
+        index_type=args.index_type,
+        seed=args.seed,
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,133 @@
+"""Benchmark ANN index types in UnifiedVectorStore: recall@k vs latency against flat.
+
+Usage:
+    python scripts/benchmark_vector_index.py --vectors 200000 --dimension 384 --queries 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import faiss
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from mem_db.vector_store.unified_vector_store import (  # noqa: E402
+    INDEX_TYPES,
+    UnifiedVectorStore,
+)
+
+
+def generate_vectors(count: int, dimension: int, clusters: int, seed: int) -> np.ndarray:
+    """Clustered unit vectors, closer to real embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, clusters), dimension)).astype(np.float32)
+    labels = rng.integers(0, len(centers), size=count)
+    vectors = centers[labels] + 0.35 * rng.standard_normal((count, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def _recall(expected: np.ndarray, actual: np.ndarray) -> float:
+    hits = sum(len(set(e) & set(a)) for e, a in zip(expected, actual))
+    return hits / float(expected.size)
+
+
+def run_benchmark(
+    vectors: int = 50000,
+    dimension: int = 128,
+    queries: int = 200,
+    k: int = 10,
+    clusters: int = 100,
+    index_types: Optional[Iterable[str]] = None,
+    nprobe: int = 16,
+    ef_search: int = 64,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    data = generate_vectors(vectors + queries, dimension, clusters, seed)
+    base, query = data[:vectors], data[vectors:]
+    results: Dict[str, Dict[str, float]] = {}
+    ground_truth = None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in ["flat"] + [t for t in (index_types or INDEX_TYPES) if t != "flat"]:
+            store = UnifiedVectorStore(
+                store_path=Path(tmp) / kind,
+                dimension=dimension,
+                enable_persistence=False,
+                index_type=kind,
+                nprobe=nprobe,
+                ef_search=ef_search,
+                train_min_vectors=min(vectors, 10000),
+            )
+            started = time.perf_counter()
+            index, active = store._build_index(base)
+            build_s = time.perf_counter() - started
+
+            started = time.perf_counter()
+            _distances, ids = index.search(query, k)
+            search_s = time.perf_counter() - started
+            if ground_truth is None:
+                ground_truth = ids
+
+            index_file = str(Path(tmp) / f"{kind}.faiss")
+            faiss.write_index(index, index_file)
+            started = time.perf_counter()
+            faiss.read_index(index_file, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            load_s = time.perf_counter() - started
+
+            results[kind] = {
+                "active_index_type": active,
+                "build_s": round(build_s, 4),
+                "load_s": round(load_s, 4),
+                "query_ms": round(search_s * 1000 / len(query), 4),
+                f"recall_at_{k}": round(_recall(ground_truth, ids), 4),
+            }
+
+    return {
+        "vectors": vectors,
+        "dimension": dimension,
+        "queries": queries,
+        "k": k,
+        "nprobe": nprobe,
+        "ef_search": ef_search,
+        "results": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--dimension", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--clusters", type=int, default=100)
+    parser.add_argument("--index-types", nargs="*", default=list(INDEX_TYPES))
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--ef-search", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    report = run_benchmark(
+        vectors=args.vectors,
+        dimension=args.dimension,
+        queries=args.queries,
+        k=args.k,
+        clusters=args.clusters,
+        index_types=args.index_types,
+        nprobe=args.nprobe,
+        ef_search=args.ef_search,
+        seed=args.seed,
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
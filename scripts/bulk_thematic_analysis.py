@@ -1,4 +1,5 @@
 
+import argparse
 import os
 import sys
 import json
@@ -6,13 +7,17 @@ from pathlib import Path
 import docx2txt
 import PyPDF2
 from datetime import datetime
-import nltk
-from nltk.tokenize import sent_tokenize
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from agents.utils.evidence_clusterer import EvidenceClusterer
+from agents.utils.evidence_clusterer import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CLUSTER_METHOD,
+    DEFAULT_NUM_THREADS,
+    DEFAULT_SAMPLE_SIZE,
+    EvidenceClusterer,
+)
 
 def extract_text(file_path):
     ext = Path(file_path).suffix.lower()
@@ -33,50 +38,58 @@ def extract_text(file_path):
         print(f"Error extracting {file_path}: {e}")
     return ""
 
-def main():
-    target_dir = "/mnt/e/Organization_Folder/02_Working_Folder/02_Analysis/08_Interviews"
-    print(f"Starting Bounded Bulk Thematic Analysis for: {target_dir}")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk thematic analysis of a folder")
+    parser.add_argument(
+        "--target-dir",
+        default="/mnt/e/Organization_Folder/02_Working_Folder/02_Analysis/08_Interviews",
+    )
+    parser.add_argument("--clusters", type=int, default=7)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--threads", type=int, default=DEFAULT_NUM_THREADS)
+    parser.add_argument("--method", choices=["reservoir", "minibatch"], default=DEFAULT_CLUSTER_METHOD)
+    parser.add_argument("--sample-size", type=int, default=DEFAULT_SAMPLE_SIZE)
+    args = parser.parse_args(argv)
+
+    target_dir = args.target_dir
+    print(f"Starting Bulk Thematic Analysis for: {target_dir}")
     
-    all_text = []
     files = list(Path(target_dir).glob("*"))
     print(f"Found {len(files)} files.")
     
+    # Sentences are split per file; the corpus is never joined into one string
+    all_sentences = []
+    files_processed = 0
     for f in files:
         if f.is_file():
             print(f"Extracting: {f.name}")
             content = extract_text(str(f))
             if content.strip():
-                all_text.append(f"--- FILE: {f.name} ---\n{content}")
+                files_processed += 1
+                all_sentences.extend(EvidenceClusterer.split_sentences(content))
     
-    full_corpus = "\n\n".join(all_text)
-    if not full_corpus.strip():
+    if not all_sentences:
         print("No text extracted.")
         return
-
-    # Bounded sentence tokenization to avoid memory overflow
-    print("Tokenizing sentences...")
-    all_sentences = sent_tokenize(full_corpus)
     print(f"Total sentences: {len(all_sentences)}")
-    
-    # Take a representative sample if too large
-    limit = 3000
-    if len(all_sentences) > limit:
-        print(f"Limiting to first {limit} sentences for memory safety.")
-        sentences_to_cluster = all_sentences[:limit]
-    else:
-        sentences_to_cluster = all_sentences
 
     print("Initializing Clusterer...")
-    clusterer = EvidenceClusterer()
-    
-    # We skip the internal tokenization of clusterer by passing sentences if we can, 
-    # but evidence_clusterer.py expects 'text' and does its own tokenization.
-    # Let's re-join the bounded set.
-    bounded_text = "\n".join(sentences_to_cluster)
+    clusterer = EvidenceClusterer(batch_size=args.batch_size, num_threads=args.threads)
+
+    def report_progress(done, total):
+        if done == total or done % (args.batch_size * 50) < args.batch_size:
+            print(f"  encoded {done}/{total} sentences")
 
-    num_clusters = 7
-    print(f"Clustering corpus into {num_clusters} themes...")
-    clusters = clusterer.cluster_document(bounded_text, num_clusters=num_clusters)
+    num_clusters = args.clusters
+    print(f"Clustering corpus into {num_clusters} themes ({args.method})...")
+    labels = clusterer.cluster_sentences(
+        all_sentences,
+        num_clusters=num_clusters,
+        method=args.method,
+        sample_size=args.sample_size,
+        progress=report_progress,
+    )
+    clusters = EvidenceClusterer.group_by_label(all_sentences, labels)
     
     # Generate Report
     report_dir = Path("documents/reports")
@@ -84,15 +97,14 @@ def main():
     report_path = report_dir / "Bulk_Interviews_Thematic_Analysis.md"
     
     with open(report_path, "w", encoding="utf-8") as f:
-        f.write("# AEDIS Bulk Thematic Analysis Report (Bounded)\n")
+        f.write("# AEDIS Bulk Thematic Analysis Report\n")
         f.write(f"**Source Folder**: {target_dir}\n")
         f.write(f"**Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"**Total Files Processed**: {len(all_text)}\n")
-        f.write(f"**Total Sentences in Files**: {len(all_sentences)}\n")
-        f.write(f"**Sentences Analyzed**: {len(sentences_to_cluster)}\n")
+        f.write(f"**Total Files Processed**: {files_processed}\n")
+        f.write(f"**Sentences Analyzed**: {len(all_sentences)}\n")
         f.write("=" * 40 + "\n\n")
         
-        for i, items in clusters.items():
+        for i, items in sorted(clusters.items()):
             f.write(f"## [STRATEGIC THEME {i+1}]\n")
             f.write(f"- **Evidence Count**: {len(items)} items\n")
             f.write("-" * 20 + "\n")
@@ -13,14 +13,17 @@ import stat
 import sys
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, Optional
 
 from mem_db.database import DatabaseManager
+from mem_db.page_text_cache import get_page_text_cache
 from services.extraction_contracts import build_extraction_contract
 from services.file_ingest_pipeline import FileIngestPipeline
 from services.file_parsers import FileParserRegistry, build_default_parser_registry
 from services.file_tagging_rules import RuleTagger
+from utils.ocr_pages import OCR_WORKERS, ocr_document, ocr_quality_score
 
 try:
     import magic  # type: ignore
@@ -29,6 +32,20 @@ except Exception:
     magic = None
     MAGIC_AVAILABLE = False
 
+# OCR runs after the walk so text-native files are not queued behind scans.
+OCR_DEFERRED = str(os.getenv("FILE_INDEX_OCR_DEFERRED", "1")).strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+OCR_FILE_CONCURRENCY = int(
+    os.getenv("FILE_INDEX_OCR_FILE_CONCURRENCY", str(OCR_WORKERS))
+)
+OCR_CACHE_PATH = os.getenv(
+    "FILE_INDEX_OCR_CACHE_PATH", "storage/page_text_cache/pages.db"
+)
+
 _WIN_DRIVE_RE = re.compile(r"^([A-Za-z]):[\\/](.*)$")
 
 
@@ -73,6 +90,9 @@ class FileIndexService:
         self.parser_registry = parser_registry or build_default_parser_registry()
         self.rule_tagger = RuleTagger()
         self.ingest_pipeline = FileIngestPipeline()
+        self.ocr_workers = OCR_WORKERS
+        self.ocr_file_concurrency = OCR_FILE_CONCURRENCY
+        self.ocr_cache_path = Path(OCR_CACHE_PATH)
 
     def _legacy_quick_validity(self, path: Path, ext: str) -> tuple[str, Optional[str]]:
         try:
@@ -396,22 +416,7 @@ class FileIndexService:
 
     @staticmethod
     def _ocr_quality_score(text: str) -> float:
-        sample = str(text or "")
-        if not sample.strip():
-            return 0.0
-        useful = sum(1 for ch in sample if ch.isalnum() or ch in " .,;:-_/\n")
-        density = useful / max(1, len(sample))
-        words = len([w for w in re.split(r"\s+", sample) if w.strip()])
-        long_words = len([w for w in re.split(r"\s+", sample) if len(w) >= 3])
-        vocab = len(set(re.findall(r"[A-Za-z]{3,}", sample)))
-        score = 0.45 * density + 0.25 * min(1.0, words / 40.0) + 0.2 * min(1.0, long_words / 30.0) + 0.1 * min(1.0, vocab / 25.0)
-        return round(max(0.0, min(1.0, score)), 3)
-
-    @staticmethod
-    def _run_tesseract_attempt(image_obj: Any, *, psm: int = 6) -> str:
-        import pytesseract  # type: ignore
-
-        return str(pytesseract.image_to_string(image_obj, config=f"--psm {int(psm)}") or "")
+        return ocr_quality_score(text)
 
     @staticmethod
     def _thumbnail_for_image(path: Path, ext: str, mime_type: Optional[str]) -> Dict[str, Any]:
@@ -486,91 +491,292 @@ class FileIndexService:
         unique = sorted(set(flags))
         return {"evidence_classes": unique, "evidence_profile": {"flag_count": len(unique), "flagged": bool(unique)}}
 
-    def _ocr_fallback(self, path: Path, ext: str, mime_type: Optional[str], parser_meta: Dict[str, Any], file_size: Optional[int] = None) -> Dict[str, Any]:
+    def _ocr_precheck(
+        self,
+        path: Path,
+        ext: str,
+        mime_type: Optional[str],
+        parser_meta: Dict[str, Any],
+        file_size: Optional[int] = None,
+    ) -> tuple[Dict[str, Any], Optional[str], Dict[str, Any]]:
+        """Return ``(metadata_profile, kind, skipped)``; ``kind`` None means no OCR."""
         existing_preview = parser_meta.get("preview") if isinstance(parser_meta.get("preview"), str) else ""
         metadata_profile = self._metadata_first_profile(ext, mime_type, file_size)
         is_image = ext in {".jpg", ".jpeg", ".png", ".tif", ".tiff", ".webp"} or str(mime_type or "").startswith("image/")
         is_pdf = ext == ".pdf" or str(mime_type or "").lower() == "application/pdf"
         if not (is_image or is_pdf):
-            return {**metadata_profile, "ocr": {"attempted": False, "reason": "unsupported_type"}}
+            return (
+                metadata_profile,
+                None,
+                {
+                    **metadata_profile,
+                    "ocr": {"attempted": False, "reason": "unsupported_type"},
+                },
+            )
         if existing_preview.strip():
-            return {**metadata_profile, "ocr": {"attempted": False, "reason": "existing_preview"}}
-        if metadata_profile.get("processing_profile", {}).get("metadata_first") and not is_pdf:
-            return {**metadata_profile, "ocr": {"attempted": False, "reason": "metadata_first"}}
+            return (
+                metadata_profile,
+                None,
+                {
+                    **metadata_profile,
+                    "ocr": {"attempted": False, "reason": "existing_preview"},
+                },
+            )
+        if (
+            metadata_profile.get("processing_profile", {}).get("metadata_first")
+            and not is_pdf
+        ):
+            return (
+                metadata_profile,
+                None,
+                {
+                    **metadata_profile,
+                    "ocr": {"attempted": False, "reason": "metadata_first"},
+                },
+            )
+        if is_image:
+            return metadata_profile, "image", {}
+        # PyMuPDF OCR rendering can SIGBUS on some WSL hosts; keep disabled by default.
+        allow_pdf_ocr = str(os.getenv("ALLOW_PDF_OCR", "0")).strip().lower() in {
+            "1",
+            "true",
+            "yes",
+            "on",
+        }
+        if not allow_pdf_ocr:
+            return (
+                metadata_profile,
+                None,
+                {
+                    **metadata_profile,
+                    "ocr": {
+                        "attempted": False,
+                        "used": False,
+                        "error": "pdf_ocr_disabled_for_stability",
+                    },
+                },
+            )
+        return metadata_profile, "pdf", {}
+
+    def _ocr_deferred(
+        self,
+        path: Path,
+        ext: str,
+        mime_type: Optional[str],
+        parser_meta: Dict[str, Any],
+        file_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Like ``_ocr_fallback`` but only marks files that need OCR as pending."""
+        metadata_profile, kind, skipped = self._ocr_precheck(
+            path, ext, mime_type, parser_meta, file_size
+        )
+        if kind is None:
+            return skipped
+        return {
+            **metadata_profile,
+            "ocr": {"attempted": False, "pending": True, "reason": "deferred"},
+        }
+
+    def _ocr_fallback(
+        self,
+        path: Path,
+        ext: str,
+        mime_type: Optional[str],
+        parser_meta: Dict[str, Any],
+        file_size: Optional[int] = None,
+        *,
+        sha256: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        metadata_profile, kind, skipped = self._ocr_precheck(
+            path, ext, mime_type, parser_meta, file_size
+        )
+        if kind is None:
+            return skipped
 
         try:
-            from PIL import Image, ImageOps  # type: ignore
-
-            attempts: list[Dict[str, Any]] = []
-            best_text = ""
-            best_score = 0.0
-
-            def _consider(text: str, label: str) -> None:
-                nonlocal best_text, best_score
-                t = str(text or "").strip()
-                score = self._ocr_quality_score(t)
-                attempts.append({"attempt": label, "chars": len(t), "quality": score})
-                if score > best_score:
-                    best_score = score
-                    best_text = t
-
-            if is_image:
-                with Image.open(path) as img:
-                    _consider(self._run_tesseract_attempt(img, psm=6), "raw_psm6")
-                    if best_score < 0.45:
-                        gray = ImageOps.grayscale(img)
-                        _consider(self._run_tesseract_attempt(gray, psm=6), "grayscale_psm6")
-                    if best_score < 0.45:
-                        high_contrast = ImageOps.autocontrast(ImageOps.grayscale(img))
-                        _consider(self._run_tesseract_attempt(high_contrast, psm=11), "autocontrast_psm11")
-            elif is_pdf:
-                # PyMuPDF OCR rendering can SIGBUS on some WSL hosts; keep disabled by default.
-                import os
-                allow_pdf_ocr = str(os.getenv("ALLOW_PDF_OCR", "0")).strip().lower() in {"1", "true", "yes", "on"}
-                if not allow_pdf_ocr:
-                    return {
-                        **metadata_profile,
-                        "ocr": {
-                            "attempted": False,
-                            "used": False,
-                            "error": "pdf_ocr_disabled_for_stability",
-                        },
-                    }
+            if kind == "pdf":
                 try:
-                    import fitz  # type: ignore
+                    import fitz  # type: ignore  # noqa: F401
                 except Exception as e:
                     return {**metadata_profile, "ocr": {"attempted": True, "used": False, "error": f"pdf_render_unavailable: {e}"}}
-                doc = fitz.open(str(path))
-                page_count = int(doc.page_count)
-                pages_processed = 0
-                for i in range(min(page_count, 3)):
-                    page = doc.load_page(i)
-                    pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-                    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                    _consider(self._run_tesseract_attempt(img, psm=6), f"pdf_page_{i+1}_raw")
-                    if best_score < 0.45:
-                        _consider(self._run_tesseract_attempt(ImageOps.autocontrast(ImageOps.grayscale(img)), psm=11), f"pdf_page_{i+1}_retry")
-                    pages_processed += 1
-                    if best_score >= 0.6:
-                        break
-                doc.close()
-                attempts.append({"pdf_pages_processed": pages_processed, "pdf_page_count": page_count})
-
+            result = ocr_document(
+                str(path),
+                kind,
+                sha256=sha256 or self._sha256(path),
+                cache=get_page_text_cache(self.ocr_cache_path),
+                workers=self.ocr_workers,
+            )
+            attempts: list[Dict[str, Any]] = [
+                a for page in result["pages"] for a in page["attempts"]
+            ]
+            if kind == "pdf":
+                attempts.append(
+                    {
+                        "pdf_pages_processed": len(result["pages"]),
+                        "pdf_page_count": result.get("page_count"),
+                    }
+                )
+            ocr = {
+                "attempted": True,
+                "used": True,
+                "chars": len(result["text"]),
+                "engine": "pytesseract",
+                "attempts": attempts,
+                "cache_hits": result["cache_hits"],
+                "pages_cancelled": result["pages_cancelled"],
+                "timed_out": result["timed_out"],
+            }
+            best_text, best_score = result["text"], result["quality"]
             if best_text:
                 return {
                     **metadata_profile,
-                    "ocr": {"attempted": True, "used": True, "chars": len(best_text), "engine": "pytesseract", "attempts": attempts},
+                    "ocr": ocr,
                     "preview": best_text[:500],
                     "ocr_quality": {"confidence": best_score, "retry_performed": len(attempts) > 1},
                 }
-            return {**metadata_profile, "ocr": {"attempted": True, "used": True, "chars": 0, "engine": "pytesseract", "attempts": attempts}, "ocr_quality": {"confidence": best_score}}
+            return {
+                **metadata_profile,
+                "ocr": ocr,
+                "ocr_quality": {"confidence": best_score},
+            }
         except Exception as e:
             return {**metadata_profile, "ocr": {"attempted": True, "used": False, "error": str(e)}}
 
+    def _run_deferred_ocr(
+        self,
+        contexts: list[Any],
+        *,
+        progress_cb: Optional[Callable[[Dict[str, Any]], None]] = None,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Dict[str, Any]:
+        """Second indexing phase: OCR the files queued during the walk, in parallel.
+
+        Results are persisted on the calling thread as each file finishes.
+        Files left over when ``should_stop`` fires keep their pending marker
+        and no scan manifest entry, so the next scan picks them up again.
+        """
+        summary: Dict[str, Any] = {
+            "queued": len(contexts),
+            "completed": 0,
+            "used": 0,
+            "errors": 0,
+            "cancelled": False,
+        }
+        if not contexts:
+            return summary
+        started = time.monotonic()
+        pool = ThreadPoolExecutor(
+            max_workers=max(1, min(int(self.ocr_file_concurrency), len(contexts))),
+            thread_name_prefix="file-index-ocr",
+        )
+        futures = {
+            pool.submit(
+                self._ocr_fallback,
+                ctx.path,
+                ctx.ext,
+                ctx.mime_type,
+                ctx.parser_meta,
+                int(ctx.stat.st_size),
+                sha256=ctx.sha256,
+            ): ctx
+            for ctx in contexts
+        }
+        try:
+            for fut in as_completed(futures):
+                if should_stop and should_stop():
+                    summary["cancelled"] = True
+                    break
+                ctx = futures[fut]
+                ocr_meta = fut.result()
+                ingest = self.ingest_pipeline.complete_ocr(self, ctx, ocr_meta)
+                summary["completed"] += 1
+                if not ingest.success:
+                    summary["errors"] += 1
+                elif (ocr_meta.get("ocr") or {}).get("chars"):
+                    summary["used"] += 1
+                if progress_cb:
+                    if ctx.writer is not None:
+                        # Report only what is on disk
+                        ctx.writer.commit()
+                    progress_cb(
+                        {
+                            "stage": "ocr",
+                            "completed": summary["completed"],
+                            "queued": summary["queued"],
+                        }
+                    )
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        summary["seconds"] = round(time.monotonic() - started, 3)
+        return summary
+
+    def _record_unindexed(
+        self, writer: Any, *, manifest_path_hash: Optional[str] = None, **fields: Any
+    ) -> None:
+        """Store a failure row, and its manifest entry if given, in the scan's batch."""
+        if writer is None:
+            with self.db.file_index_bulk_writer(files_per_commit=1) as own_writer:
+                self._record_unindexed(
+                    own_writer, manifest_path_hash=manifest_path_hash, **fields
+                )
+            return
+        with writer.file():
+            writer.upsert_indexed_file(**fields)
+            if manifest_path_hash:
+                writer.scan_manifest_upsert(
+                    path_hash=manifest_path_hash,
+                    normalized_path=fields["normalized_path"],
+                    file_size=None,
+                    mtime=None,
+                    sha256=None,
+                    last_status=fields["status"],
+                    last_error=fields.get("last_error"),
+                )
+
     def index_roots(
         self,
         roots: Iterable[str],
         *,
+        files_per_commit: Optional[int] = None,
+        commit_latency_seconds: Optional[float] = None,
+        defer_ocr: Optional[bool] = None,
+        **options: Any,
+    ) -> Dict[str, Any]:
+        """Scan ``roots`` (options as for ``_index_roots``).
+
+        Each file's writes are applied as one unit through a shared bulk
+        writer, which group-commits every ``files_per_commit`` files or
+        ``commit_latency_seconds`` after the oldest uncommitted one. With
+        ``defer_ocr`` (default ``OCR_DEFERRED``) files that need OCR are
+        stored without it during the walk and OCR'd in a second phase.
+        """
+        defer = OCR_DEFERRED if defer_ocr is None else bool(defer_ocr)
+        ocr_queue: Optional[list[Any]] = [] if defer else None
+        with self.db.file_index_bulk_writer(
+            files_per_commit=files_per_commit,
+            max_latency_seconds=commit_latency_seconds,
+        ) as writer:
+            result = self._index_roots(
+                roots, writer=writer, ocr_queue=ocr_queue, **options
+            )
+            if ocr_queue:
+                # Publish the text-native rows before the slow phase starts
+                writer.commit()
+                result["ocr"] = self._run_deferred_ocr(
+                    ocr_queue,
+                    progress_cb=options.get("progress_cb"),
+                    should_stop=options.get("should_stop"),
+                )
+        # Runs after the tail flush so every scanned file is visible to it
+        result["dedupe"] = self.db.refresh_exact_duplicate_relationships()
+        return result
+
+    def _index_roots(
+        self,
+        roots: Iterable[str],
+        *,
+        writer: Any = None,
+        ocr_queue: Optional[list[Any]] = None,
         recursive: bool = True,
         allowed_exts: Optional[set[str]] = None,
         include_paths: Optional[list[str]] = None,
@@ -609,7 +815,8 @@ class FileIndexService:
             root_path = Path(root_norm)
             if not root_path.exists() or not root_path.is_dir():
                 errors += 1
-                self.db.upsert_indexed_file(
+                self._record_unindexed(
+                    writer,
                     display_name=root_path.name or root_norm,
                     original_path=root,
                     normalized_path=root_norm,
@@ -634,7 +841,8 @@ class FileIndexService:
                 except PermissionError as pe:
                     errors += 1
                     permission_errors += 1
-                    self.db.upsert_indexed_file(
+                    self._record_unindexed(
+                        writer,
                         display_name=root_path.name or root_norm,
                         original_path=root,
                         normalized_path=root_norm,
@@ -661,7 +869,6 @@ class FileIndexService:
                         "truncated": True,
                         "runtime_budget_hit": True,
                         "next_cursor": last_processed_path or cursor or None,
-                        "dedupe": self.db.refresh_exact_duplicate_relationships(),
                     }
 
                 try:
@@ -691,7 +898,6 @@ class FileIndexService:
                             "truncated": False,
                             "cancelled": True,
                             "next_cursor": last_processed_path or cursor or None,
-                            "dedupe": self.db.refresh_exact_duplicate_relationships(),
                         }
 
                     if indexed >= max_files:
@@ -702,11 +908,15 @@ class FileIndexService:
                             "scanned": scanned,
                             "truncated": True,
                             "next_cursor": last_processed_path or cursor or None,
-                            "dedupe": self.db.refresh_exact_duplicate_relationships(),
                         }
 
                     scanned += 1
+                    if writer is not None:
+                        writer.commit_if_due()
                     if progress_cb and scanned % 100 == 0:
+                        if writer is not None:
+                            # Report only what is on disk
+                            writer.commit()
                         progress_cb({"stage": "index", "scanned": scanned, "indexed": indexed, "errors": errors})
                     p = Path(dirpath) / name
                     p_str = normalize_runtime_path(str(p))
@@ -741,15 +951,32 @@ class FileIndexService:
 
                         if _file_index_tracer:
                             with _file_index_tracer.start_as_current_span("file_index.ingest_file", attributes={"path": str(p), "ext": ext}):
-                                ingest = self.ingest_pipeline.ingest_file(self, root_norm=root_norm, path=p, ext=ext, st=st)
+                                ingest = self.ingest_pipeline.ingest_file(
+                                    self,
+                                    root_norm=root_norm,
+                                    path=p,
+                                    ext=ext,
+                                    st=st,
+                                    writer=writer,
+                                    ocr_queue=ocr_queue,
+                                )
                         else:
-                            ingest = self.ingest_pipeline.ingest_file(self, root_norm=root_norm, path=p, ext=ext, st=st)
+                            ingest = self.ingest_pipeline.ingest_file(
+                                self,
+                                root_norm=root_norm,
+                                path=p,
+                                ext=ext,
+                                st=st,
+                                writer=writer,
+                                ocr_queue=ocr_queue,
+                            )
 
                         if ingest.success:
                             indexed += 1
                         else:
                             errors += 1
-                            self.db.upsert_indexed_file(
+                            self._record_unindexed(
+                                writer,
                                 display_name=p.name,
                                 original_path=str(p),
                                 normalized_path=str(p),
@@ -771,22 +998,12 @@ class FileIndexService:
                                         "stage_results": ingest.stage_results,
                                     },
                                 },
+                                manifest_path_hash=path_hash,
                             )
-                            try:
-                                self.db.scan_manifest_upsert(
-                                    path_hash=path_hash,
-                                    normalized_path=str(p),
-                                    file_size=None,
-                                    mtime=None,
-                                    sha256=None,
-                                    last_status="unreadable",
-                                    last_error=f"{ingest.failed_stage}:{ingest.error or ingest.failure_reason}",
-                                )
-                            except Exception:
-                                pass
                     except Exception as e:
                         errors += 1
-                        self.db.upsert_indexed_file(
+                        self._record_unindexed(
+                            writer,
                             display_name=p.name,
                             original_path=str(p),
                             normalized_path=str(p),
@@ -798,26 +1015,25 @@ class FileIndexService:
                             ext=ext,
                             status="unreadable",
                             last_error=str(e),
-                            metadata={"root": root_norm, **self._preview_meta(p), **self._provenance_meta(), "ingest_result": {"failed_stage": "unknown", "failure_reason": "exception", "error": str(e)}},
+                            metadata={
+                                "root": root_norm,
+                                **self._preview_meta(p),
+                                **self._provenance_meta(),
+                                "ingest_result": {
+                                    "failed_stage": "unknown",
+                                    "failure_reason": "exception",
+                                    "error": str(e),
+                                },
+                            },
+                            manifest_path_hash=hashlib.sha1(
+                                str(p).encode("utf-8")
+                            ).hexdigest(),
                         )
-                        try:
-                            self.db.scan_manifest_upsert(
-                                path_hash=hashlib.sha1(str(p).encode("utf-8")).hexdigest(),
-                                normalized_path=str(p),
-                                file_size=None,
-                                mtime=None,
-                                sha256=None,
-                                last_status="unreadable",
-                                last_error=str(e),
-                            )
-                        except Exception:
-                            pass
 
             if walk_errors:
                 permission_errors += len(walk_errors)
                 errors += len(walk_errors)
 
-        dedupe = self.db.refresh_exact_duplicate_relationships()
         return {
             "success": True,
             "indexed": indexed,
@@ -827,7 +1043,6 @@ class FileIndexService:
             "skipped": skipped,
             "truncated": False,
             "next_cursor": None,
-            "dedupe": dedupe,
         }
 
     def add_watch(
@@ -849,7 +1064,11 @@ class FileIndexService:
             active=active,
         )
 
-    def run_watched_index(self, max_files_per_watch: int = 5000) -> Dict[str, Any]:
+    def run_watched_index(
+        self,
+        max_files_per_watch: int = 5000,
+        progress_cb: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
         watches = self.db.list_watched_directories(active_only=True)
         total = {"success": True, "indexed": 0, "errors": 0, "permission_errors": 0, "scanned": 0, "watches": len(watches)}
         for w in watches:
@@ -861,6 +1080,7 @@ class FileIndexService:
                 recursive=bool(w.get("recursive", 1)),
                 allowed_exts=allowed or None,
                 max_files=max_files_per_watch,
+                progress_cb=progress_cb,
             )
             total["indexed"] += int(res.get("indexed", 0))
             total["errors"] += int(res.get("errors", 0))
@@ -880,73 +1100,104 @@ class FileIndexService:
         damaged = 0
         now = dt.datetime.now(dt.timezone.utc)
 
-        for i, row in enumerate(rows, start=1):
-            if should_stop and should_stop():
-                return {
-                    "success": False,
-                    "updated": updated,
-                    "missing": missing,
-                    "damaged": damaged,
-                    "stale": 0,
-                    "total": len(rows),
-                    "cancelled": True,
-                    "dedupe": self.db.refresh_exact_duplicate_relationships(),
-                }
-            if progress_cb and i % 100 == 0:
-                progress_cb({"stage": "refresh", "processed": i, "total": len(rows), "updated": updated, "missing": missing, "damaged": damaged})
-            p = Path(row.get("normalized_path") or "")
-            ext = str(row.get("ext") or "").lower()
-            if not p.exists() or not p.is_file():
-                self.db.upsert_indexed_file(
-                    display_name=row.get("display_name") or p.name,
-                    original_path=row.get("original_path") or str(p),
-                    normalized_path=str(p),
-                    file_size=None,
-                    mtime=None,
-                    mime_type=row.get("mime_type"),
-                    mime_source=row.get("mime_source"),
-                    sha256=row.get("sha256"),
-                    ext=ext,
-                    status="missing",
-                    last_error="file_missing",
-                    metadata=row.get("metadata_json") or {},
+        cancelled = False
+        with self.db.file_index_bulk_writer() as writer:
+            for i, row in enumerate(rows, start=1):
+                if should_stop and should_stop():
+                    cancelled = True
+                    break
+                if progress_cb and i % 100 == 0:
+                    writer.commit()
+                    progress_cb(
+                        {
+                            "stage": "refresh",
+                            "processed": i,
+                            "total": len(rows),
+                            "updated": updated,
+                            "missing": missing,
+                            "damaged": damaged,
+                        }
+                    )
+                p = Path(row.get("normalized_path") or "")
+                ext = str(row.get("ext") or "").lower()
+                if not p.exists() or not p.is_file():
+                    with writer.file():
+                        writer.upsert_indexed_file(
+                            display_name=row.get("display_name") or p.name,
+                            original_path=row.get("original_path") or str(p),
+                            normalized_path=str(p),
+                            file_size=None,
+                            mtime=None,
+                            mime_type=row.get("mime_type"),
+                            mime_source=row.get("mime_source"),
+                            sha256=row.get("sha256"),
+                            ext=ext,
+                            status="missing",
+                            last_error="file_missing",
+                            metadata=row.get("metadata_json") or {},
+                        )
+                    missing += 1
+                    continue
+
+                st = p.stat()
+                mime, mime_source = self._detect_mime(p)
+                status, err = self._quick_validity(p, ext, mime)
+                sha256 = self._sha256(p)
+                parser_meta = self._parser_metadata(p, ext, mime)
+                fs_meta = self._fs_metadata(p, st)
+                if status == "damaged":
+                    damaged += 1
+
+                ocr_meta = self._ocr_fallback(
+                    p, ext, mime, parser_meta, int(st.st_size), sha256=sha256
                 )
-                missing += 1
-                continue
+                parser_meta = {**parser_meta, **ocr_meta}
+                thumb_meta = self._thumbnail_for_image(p, ext, mime)
+                parser_meta = {**parser_meta, **thumb_meta}
+                norm_meta = self._normalization_quality_metadata(p, ext, mime)
+                quality_meta = self._extraction_confidence(
+                    status, parser_meta, norm_meta
+                )
+                snippet_meta = self._preview_snippet(parser_meta, norm_meta)
+                rule_meta = self._rule_tags(p, parser_meta, norm_meta)
+                parser_meta = {**parser_meta, **rule_meta}
+                with writer.file():
+                    writer.upsert_indexed_file(
+                        display_name=row.get("display_name") or p.name,
+                        original_path=row.get("original_path") or str(p),
+                        normalized_path=str(p),
+                        file_size=int(st.st_size),
+                        mtime=float(st.st_mtime),
+                        mime_type=mime or row.get("mime_type"),
+                        mime_source=mime_source,
+                        sha256=sha256,
+                        ext=ext,
+                        status=status,
+                        last_error=err,
+                        metadata={
+                            **(row.get("metadata_json") or {}),
+                            **fs_meta,
+                            **self._provenance_meta(),
+                            **parser_meta,
+                            **norm_meta,
+                            **quality_meta,
+                            **snippet_meta,
+                            **rule_meta,
+                        },
+                    )
+                updated += 1
 
-            st = p.stat()
-            mime, mime_source = self._detect_mime(p)
-            status, err = self._quick_validity(p, ext, mime)
-            sha256 = self._sha256(p)
-            parser_meta = self._parser_metadata(p, ext, mime)
-            fs_meta = self._fs_metadata(p, st)
-            if status == "damaged":
-                damaged += 1
-
-            ocr_meta = self._ocr_fallback(p, ext, mime, parser_meta, int(st.st_size))
-            parser_meta = {**parser_meta, **ocr_meta}
-            thumb_meta = self._thumbnail_for_image(p, ext, mime)
-            parser_meta = {**parser_meta, **thumb_meta}
-            norm_meta = self._normalization_quality_metadata(p, ext, mime)
-            quality_meta = self._extraction_confidence(status, parser_meta, norm_meta)
-            snippet_meta = self._preview_snippet(parser_meta, norm_meta)
-            rule_meta = self._rule_tags(p, parser_meta, norm_meta)
-            parser_meta = {**parser_meta, **rule_meta}
-            self.db.upsert_indexed_file(
-                display_name=row.get("display_name") or p.name,
-                original_path=row.get("original_path") or str(p),
-                normalized_path=str(p),
-                file_size=int(st.st_size),
-                mtime=float(st.st_mtime),
-                mime_type=mime or row.get("mime_type"),
-                mime_source=mime_source,
-                sha256=sha256,
-                ext=ext,
-                status=status,
-                last_error=err,
-                metadata={**(row.get("metadata_json") or {}), **fs_meta, **self._provenance_meta(), **parser_meta, **norm_meta, **quality_meta, **snippet_meta, **rule_meta},
-            )
-            updated += 1
+        if cancelled:
+            return {
+                "success": False,
+                "updated": updated,
+                "missing": missing,
+                "damaged": damaged,
+                "stale": 0,
+                "total": len(rows),
+                "cancelled": True,
+                "dedupe": self.db.refresh_exact_duplicate_relationships(),
+            }
 
         stale_cutoff = now.timestamp() - (stale_after_hours * 3600)
         stale = 0
@@ -3,7 +3,7 @@ from __future__ import annotations
 import hashlib
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -38,6 +38,11 @@ class IngestContext:
     class_meta: Dict[str, Any] = field(default_factory=dict)
     rule_meta: Dict[str, Any] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Optional FileIndexBulkWriter shared across files of one scan.
+    writer: Any = None
+    # When set, files needing OCR are appended here instead of OCR'd inline.
+    ocr_queue: Optional[List["IngestContext"]] = None
+    ocr_pending: bool = False
 
 
 class FileDiscoveryStage:
@@ -74,12 +79,26 @@ class ExtractionStage:
     def run(self, svc: Any, ctx: IngestContext) -> Dict[str, Any]:
         ctx.parser_meta = svc._parser_metadata(ctx.path, ctx.ext, ctx.mime_type)
         ctx.fs_meta = svc._fs_metadata(ctx.path, ctx.stat)
-        ocr_meta = svc._ocr_fallback(ctx.path, ctx.ext, ctx.mime_type, ctx.parser_meta, int(ctx.stat.st_size))
+        if ctx.ocr_queue is not None:
+            ocr_meta = svc._ocr_deferred(
+                ctx.path, ctx.ext, ctx.mime_type, ctx.parser_meta, int(ctx.stat.st_size)
+            )
+            ctx.ocr_pending = bool((ocr_meta.get("ocr") or {}).get("pending"))
+        else:
+            ocr_meta = svc._ocr_fallback(
+                ctx.path,
+                ctx.ext,
+                ctx.mime_type,
+                ctx.parser_meta,
+                int(ctx.stat.st_size),
+                sha256=ctx.sha256,
+            )
         thumb_meta = svc._thumbnail_for_image(ctx.path, ctx.ext, ctx.mime_type)
         ctx.parser_meta = {**ctx.parser_meta, **ocr_meta, **thumb_meta}
         return {
             "parser_keys": sorted(list(ctx.parser_meta.keys()))[:100],
             "ocr_used": bool(((ctx.parser_meta.get("ocr") or {}).get("used")) if isinstance(ctx.parser_meta.get("ocr"), dict) else False),
+            "ocr_pending": ctx.ocr_pending,
         }
 
 
@@ -114,10 +133,17 @@ class PersistenceStage:
             **ctx.snippet_meta,
             **ctx.class_meta,
         }
-        # Stage boundary: canonical file row first; dependent records cleanup on failure.
-        file_id: Optional[int] = None
-        try:
-            file_id = svc.db.upsert_indexed_file(
+        if ctx.writer is None:
+            with svc.db.file_index_bulk_writer(files_per_commit=1) as writer:
+                return self._persist(svc, ctx, writer, metadata)
+        return self._persist(svc, ctx, ctx.writer, metadata)
+
+    @staticmethod
+    def _persist(svc: Any, ctx: IngestContext, writer: Any, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        # One unit per file: the row and its manifest entry land together or
+        # not at all, and the batch they sit in is group-committed.
+        with writer.file() as pending:
+            writer.upsert_indexed_file(
                 display_name=ctx.path.name,
                 original_path=str(ctx.path),
                 normalized_path=str(ctx.path),
@@ -131,33 +157,20 @@ class PersistenceStage:
                 last_error=ctx.last_error,
                 metadata=metadata,
             )
-            svc.db.scan_manifest_upsert(
-                path_hash=ctx.path_hash,
-                normalized_path=str(ctx.path),
-                file_size=int(ctx.stat.st_size),
-                mtime=float(ctx.stat.st_mtime),
-                sha256=ctx.sha256,
-                last_status=ctx.status,
-                last_error=ctx.last_error,
-            )
-        except Exception:
-            if file_id:
-                # Rollback policy for dependent records: never leave partial children.
-                try:
-                    svc.db.replace_file_chunks(file_id, [])
-                except Exception:
-                    pass
-                try:
-                    svc.db.replace_file_entities(file_id, [])
-                except Exception:
-                    pass
-                try:
-                    svc.db.replace_file_tables(file_id, [])
-                except Exception:
-                    pass
-            raise
-
-        return {"file_id": file_id, "status": ctx.status}
+            if not ctx.ocr_pending:
+                # Left out until OCR lands so an interrupted scan revisits the file
+                writer.scan_manifest_upsert(
+                    path_hash=ctx.path_hash,
+                    normalized_path=str(ctx.path),
+                    file_size=int(ctx.stat.st_size),
+                    mtime=float(ctx.stat.st_mtime),
+                    sha256=ctx.sha256,
+                    last_status=ctx.status,
+                    last_error=ctx.last_error,
+                )
+
+        # None while the file still waits in a shared writer's batch
+        return {"file_id": pending.file_id, "status": ctx.status}
 
 
 class FileIngestPipeline:
@@ -168,7 +181,17 @@ class FileIngestPipeline:
         self.enrichment = EnrichmentStage()
         self.persistence = PersistenceStage()
 
-    def ingest_file(self, svc: Any, *, root_norm: str, path: Path, ext: str, st: Any) -> IngestJobResult:
+    def ingest_file(
+        self,
+        svc: Any,
+        *,
+        root_norm: str,
+        path: Path,
+        ext: str,
+        st: Any,
+        writer: Any = None,
+        ocr_queue: Optional[List[IngestContext]] = None,
+    ) -> IngestJobResult:
         stage_results: Dict[str, Any] = {}
         path_hash = hashlib.sha1(str(path).encode("utf-8")).hexdigest()
         ctx = IngestContext(
@@ -178,6 +201,8 @@ class FileIngestPipeline:
             stat=st,
             path_hash=path_hash,
             prior_manifest=svc.db.scan_manifest_get(path_hash),
+            writer=writer,
+            ocr_queue=ocr_queue,
         )
         try:
             stage_results[self.discovery.name] = self.discovery.run(svc, ctx)
@@ -186,6 +211,8 @@ class FileIngestPipeline:
             stage_results[self.enrichment.name] = self.enrichment.run(svc, ctx)
             persist_out = self.persistence.run(svc, ctx)
             stage_results[self.persistence.name] = persist_out
+            if ctx.ocr_pending and ocr_queue is not None:
+                ocr_queue.append(ctx)
             return IngestJobResult(
                 success=True,
                 file_path=str(path),
@@ -202,3 +229,32 @@ class FileIngestPipeline:
                 error=str(e),
                 stage_results=stage_results,
             )
+
+    def complete_ocr(
+        self, svc: Any, ctx: IngestContext, ocr_meta: Dict[str, Any]
+    ) -> IngestJobResult:
+        """Fold deferred OCR output into a queued file and persist it again."""
+        stage_results: Dict[str, Any] = {}
+        ctx.parser_meta = {**ctx.parser_meta, **ocr_meta}
+        ctx.ocr_pending = False
+        try:
+            stage_results[self.enrichment.name] = self.enrichment.run(svc, ctx)
+            persist_out = self.persistence.run(svc, ctx)
+            stage_results[self.persistence.name] = persist_out
+            return IngestJobResult(
+                success=True,
+                file_path=str(ctx.path),
+                file_id=persist_out.get("file_id"),
+                stage_results=stage_results,
+            )
+        except Exception as e:
+            return IngestJobResult(
+                success=False,
+                file_path=str(ctx.path),
+                failed_stage=self.persistence.name
+                if self.enrichment.name in stage_results
+                else self.enrichment.name,
+                failure_reason="stage_failure",
+                error=str(e),
+                stage_results=stage_results,
+            )
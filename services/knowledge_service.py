@@ -5,6 +5,7 @@ Handles operations on the Knowledge Graph.
 """
 import logging
 import re
+from dataclasses import asdict
 from typing import Dict, Any, List, Optional, Tuple
 
 from mem_db.database import get_database_manager
@@ -15,6 +16,9 @@ from services.contracts.aedis_models import ProvenanceRecord # New import for ty
 
 logger = logging.getLogger(__name__)
 
+# Deepest layout tile zoom; at 2^24 tiles per side a tile is far smaller than a node.
+LAYOUT_TILE_MAX_ZOOM = 24
+
 class KnowledgeService:
     """
     Service for Knowledge Graph interactions.
@@ -98,12 +102,22 @@ class KnowledgeService:
 
         return {"id": ent_id}
 
-    async def list_entities(self, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
-        """List entities with pagination."""
+    @staticmethod
+    def _next_cursor(items: List[Dict[str, Any]], limit: int) -> Optional[str]:
+        if limit > 0 and len(items) >= limit:
+            return items[-1].get("id")
+        return None
+
+    async def list_entities(self, limit: int = 50, offset: int = 0,
+                            cursor: Optional[str] = None) -> Dict[str, Any]:
+        """List entities with offset or cursor pagination."""
         if not self._check_available():
             raise RuntimeError("Knowledge manager unavailable")
 
-        entities = await self.knowledge_manager.list_entities(limit=limit, offset=offset)
+        if cursor:
+            entities = await self.knowledge_manager.list_entities(limit=limit, cursor=cursor)
+        else:
+            entities = await self.knowledge_manager.list_entities(limit=limit, offset=offset)
         total = len(entities)
         if hasattr(self.knowledge_manager, "get_status"):
             try:
@@ -111,7 +125,11 @@ class KnowledgeService:
                 total = int(status.get("stats", {}).get("total_entities", total))
             except Exception:
                 pass
-        return {"items": entities, "count": total}
+        return {
+            "items": entities,
+            "count": total,
+            "next_cursor": self._next_cursor(entities, limit),
+        }
 
     async def add_relationship(self,
                                source_id: str,
@@ -132,11 +150,15 @@ class KnowledgeService:
         )
         return {"id": rel_id}
 
-    async def list_relationships(self, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
-        """List relationships with pagination."""
+    async def list_relationships(self, limit: int = 50, offset: int = 0,
+                                 cursor: Optional[str] = None) -> Dict[str, Any]:
+        """List relationships with offset or cursor pagination."""
         if not self._check_available():
             raise RuntimeError("Knowledge manager unavailable")
-        rels = await self.knowledge_manager.list_relationships(limit=limit, offset=offset)
+        if cursor:
+            rels = await self.knowledge_manager.list_relationships(limit=limit, cursor=cursor)
+        else:
+            rels = await self.knowledge_manager.list_relationships(limit=limit, offset=offset)
         total = len(rels)
         if hasattr(self.knowledge_manager, "get_status"):
             try:
@@ -144,7 +166,11 @@ class KnowledgeService:
                 total = int(status.get("stats", {}).get("total_relationships", total))
             except Exception:
                 pass
-        return {"items": rels, "count": total}
+        return {
+            "items": rels,
+            "count": total,
+            "next_cursor": self._next_cursor(rels, limit),
+        }
 
     async def _find_entity_id_by_name(self, name: str) -> Optional[str]:
         if hasattr(self.knowledge_manager, "find_entity_id_by_name"):
@@ -270,6 +296,9 @@ class KnowledgeService:
             except Exception:
                 pass
 
+        if hasattr(self.knowledge_manager, "bulk_upsert"):
+            return await self._import_triples_bulk(triples, default_type, create_missing)
+
         for head, rel, tail in triples:
             h_id = await self._find_entity_id_by_name(head)
             t_id = await self._find_entity_id_by_name(tail)
@@ -302,6 +331,46 @@ class KnowledgeService:
             "created_relationships": created_rels,
         }
 
+    async def _import_triples_bulk(self, triples: List[Tuple[str, str, str]],
+                                   default_type: str,
+                                   create_missing: bool) -> Dict[str, int]:
+        """Resolve names once and write all new entities/relationships in one transaction."""
+        names = list(dict.fromkeys(n for h, _r, t in triples for n in (h, t)))
+        resolved = await self.knowledge_manager.find_entity_ids_by_names(names)
+
+        pending_entities: List[Dict[str, Any]] = []
+        if create_missing:
+            pending_keys = set()
+            for name in names:
+                key = (name or "").strip().lower()
+                if resolved.get(name) or key in pending_keys:
+                    continue
+                attrs = self._extract_entity_attributes(name, default_type)
+                pending_keys.add(key)
+                pending_entities.append({
+                    "name": name,
+                    "entity_type": default_type,
+                    "jurisdiction": jurisdiction_service.resolve(None, metadata=attrs),
+                    "metadata": attrs,
+                })
+
+        relationships = [
+            {
+                "source_name": head,
+                "target_name": tail,
+                "relation_type": self._infer_relationship_type(rel),
+            }
+            for head, rel, tail in triples
+        ]
+        result = await self.knowledge_manager.bulk_upsert(
+            entities=pending_entities,
+            relationships=relationships,
+        )
+        return {
+            "created_entities": len(result.get("entity_ids", [])),
+            "created_relationships": len(result.get("relationship_ids", [])),
+        }
+
     async def import_entities(self, items: List[Dict[str, Any]]) -> Dict[str, int]:
         if not self._check_available():
             raise RuntimeError("Knowledge manager unavailable")
@@ -420,3 +489,66 @@ class KnowledgeService:
         if hasattr(self.knowledge_manager, "export_graph_data"):
             return await self.knowledge_manager.export_graph_data()
         return {"nodes": [], "edges": []}
+
+    async def analyze_centrality(self, measures: Optional[List[str]] = None,
+                                 top_k: int = 10) -> Dict[str, Any]:
+        """Top-ranked entities by centrality measure."""
+        if not self._check_available():
+            raise RuntimeError("Knowledge manager unavailable")
+        result = await self.knowledge_manager.analyze_centrality(measures=measures, top_k=top_k)
+        return asdict(result)
+
+    async def detect_communities(self, algorithm: str = "louvain",
+                                 min_community_size: int = 3) -> Dict[str, Any]:
+        """Entity communities over the whole graph."""
+        if not self._check_available():
+            raise RuntimeError("Knowledge manager unavailable")
+        result = await self.knowledge_manager.detect_communities(
+            algorithm=algorithm, min_community_size=min_community_size
+        )
+        return asdict(result)
+
+    async def find_shortest_path(self, source: str, target: str,
+                                 weight: str = "weight") -> Dict[str, Any]:
+        """Shortest directed path between two entity ids."""
+        if not self._check_available():
+            raise RuntimeError("Knowledge manager unavailable")
+        result = await self.knowledge_manager.find_shortest_path(source, target, weight=weight)
+        return asdict(result)
+
+    async def get_visualization(self, layout_type: str = "force_directed",
+                                max_nodes: int = 500) -> Dict[str, Any]:
+        """Laid-out nodes/edges for the most central part of the graph."""
+        if not self._check_available():
+            raise RuntimeError("Knowledge manager unavailable")
+        return await self.knowledge_manager.create_interactive_visualization(
+            layout_type=layout_type, max_nodes=max_nodes
+        )
+
+    async def get_layout_viewport(self, x0: float = 0.0, y0: float = 0.0,
+                                  x1: float = 1.0, y1: float = 1.0,
+                                  max_nodes: int = 2000,
+                                  since_version: Optional[int] = None) -> Dict[str, Any]:
+        """Level-of-detail nodes/edges of the server-side layout inside a viewport."""
+        if not self._check_available():
+            raise RuntimeError("Knowledge manager unavailable")
+        return await self.knowledge_manager.get_layout_viewport(
+            x0=x0, y0=y0, x1=x1, y1=y1, max_nodes=max_nodes, since_version=since_version
+        )
+
+    async def get_layout_tile(self, zoom: int, tile_x: int, tile_y: int,
+                              max_nodes: int = 2000,
+                              since_version: Optional[int] = None) -> Dict[str, Any]:
+        """Same as get_layout_viewport for tile (zoom, x, y) of a 2^zoom grid."""
+        if not 0 <= zoom <= LAYOUT_TILE_MAX_ZOOM:
+            raise ValueError(f"Tile zoom must be between 0 and {LAYOUT_TILE_MAX_ZOOM}")
+        if not (0 <= tile_x < 2 ** zoom and 0 <= tile_y < 2 ** zoom):
+            raise ValueError(f"Tile {zoom}/{tile_x}/{tile_y} is out of range")
+        span = 1.0 / (2 ** zoom)
+        result = await self.get_layout_viewport(
+            x0=tile_x * span, y0=tile_y * span,
+            x1=(tile_x + 1) * span, y1=(tile_y + 1) * span,
+            max_nodes=max_nodes, since_version=since_version,
+        )
+        result["tile"] = {"zoom": zoom, "x": tile_x, "y": tile_y}
+        return result
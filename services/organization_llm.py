@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -26,7 +26,8 @@ class OrganizationPromptAdapter:
         if folders:
             sample = folders[:120]
             folder_hint = (
-                "Known existing folders (prefer these; only create a new folder when necessary):\n"
+                "Known existing folders "
+                "(prefer these; only create a new folder when necessary):\n"
                 + "\n".join(f"- {f}" for f in sample)
                 + "\n"
             )
@@ -63,6 +64,59 @@ class OrganizationPromptAdapter:
         )
 
 
+    @staticmethod
+    def build_batch_proposal_prompt(
+        *,
+        files: List[Dict[str, Any]],
+        known_folders: Optional[list[str]] = None,
+        preview_chars: int = 600,
+    ) -> str:
+        """One prompt classifying several similar files.
+
+        Each entry of ``files`` carries ``file_name``, ``current_path`` and
+        ``preview``; the answer is keyed by the entry's position.
+        """
+        folder_hint = ""
+        folders = [str(x).strip() for x in (known_folders or []) if str(x).strip()]
+        if folders:
+            sample = folders[:120]
+            folder_hint = (
+                "Known existing folders "
+                "(prefer these; only create a new folder when necessary):\n"
+                + "\n".join(f"- {f}" for f in sample)
+                + "\n"
+            )
+
+        entries = []
+        for i, f in enumerate(files):
+            semantic = f.get("semantic_summary") or {}
+            semantic_line = ""
+            if semantic:
+                semantic_line = (
+                    f"semantic: type={semantic.get('document_type') or 'N/A'}; "
+                    f"domain={semantic.get('legal_domain') or 'N/A'}; "
+                    f"summary={semantic.get('document_summary') or 'N/A'}\n"
+                )
+            entries.append(
+                f"[{i}]\n"
+                f"file_name: {f.get('file_name') or ''}\n"
+                f"current_path: {f.get('current_path') or ''}\n"
+                f"preview: {str(f.get('preview') or '')[:preview_chars]}\n"
+                f"{semantic_line}"
+            )
+
+        return (
+            "You are a file organization assistant. Classify each numbered file below. "
+            "Return ONLY a valid JSON array with one object per file, each with keys: "
+            "index, proposed_folder, proposed_filename, confidence, rationale, "
+            "alternatives, evidence_spans (list of objects with keys: start_char, "
+            "end_char, quote). index is the file's number. Use concise rationale. "
+            "Evidence spans should point to the exact character offsets in that "
+            "file's preview that justify the folder choice.\n"
+            f"{folder_hint}" + "".join(entries)
+        )
+
+
 class OrganizationLLMPolicy:
     @staticmethod
     def resolve(
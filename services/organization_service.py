@@ -7,10 +7,12 @@ import time
 import uuid
 import difflib
 import logging
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from core.llm_providers import LLMManager
 from mem_db.database import DatabaseManager
@@ -21,15 +23,28 @@ from services.contracts.aedis_models import ProvenanceRecord, EvidenceSpan
 
 logger = logging.getLogger(__name__)
 
+# Proposal generation fans LLM calls out over this many threads
+ORGANIZER_LLM_CONCURRENCY = int(os.getenv("ORGANIZER_LLM_CONCURRENCY", "4"))
+# Files sharing a folder and extension are classified together, this many per prompt
+ORGANIZER_LLM_BATCH_SIZE = int(os.getenv("ORGANIZER_LLM_BATCH_SIZE", "8"))
+# Proposals are committed in chunks this size so an interrupted run keeps finished work
+ORGANIZER_PROPOSAL_WRITE_CHUNK = int(os.getenv("ORGANIZER_PROPOSAL_WRITE_CHUNK", "50"))
+
 
 class OrganizationService:
     _runtime_provider: Optional[str] = None
     _runtime_model: Optional[str] = None
     _llm_fail_count: int = 0
     _llm_circuit_open_until: float = 0.0
+    _llm_circuit_lock = threading.Lock()
 
     def __init__(self, db: DatabaseManager, provenance_service: Optional[ProvenanceService] = None):
         self.db = db
+        # Feedback and maps learned from it, shared across one generate_proposals run
+        self._run_cache: Optional[Dict[Any, Any]] = None
+        self.llm_concurrency = max(1, ORGANIZER_LLM_CONCURRENCY)
+        self.llm_batch_size = max(1, ORGANIZER_LLM_BATCH_SIZE)
+        self.proposal_write_chunk = max(1, ORGANIZER_PROPOSAL_WRITE_CHUNK)
         self.naming_rules = OrganizationNamingRules()
         self.provenance_service = provenance_service or get_provenance_service() # New service
         self.llm_manager = LLMManager(
@@ -54,14 +69,16 @@ class OrganizationService:
 
     @classmethod
     def _llm_circuit_record_failure(cls) -> None:
-        cls._llm_fail_count += 1
-        if cls._llm_fail_count >= 3:
-            cls._llm_circuit_open_until = time.time() + 120.0
+        with cls._llm_circuit_lock:
+            cls._llm_fail_count += 1
+            if cls._llm_fail_count >= 3:
+                cls._llm_circuit_open_until = time.time() + 120.0
 
     @classmethod
     def _llm_circuit_record_success(cls) -> None:
-        cls._llm_fail_count = 0
-        cls._llm_circuit_open_until = 0.0
+        with cls._llm_circuit_lock:
+            cls._llm_fail_count = 0
+            cls._llm_circuit_open_until = 0.0
 
     def _sanitize_path_parts(self, folder: str, filename: str) -> tuple[str, str]:
         safe_folder = str(folder or "Inbox/Review").replace("\\", "/").strip().strip("/")
@@ -97,6 +114,46 @@ class OrganizationService:
         except Exception:
             return folder, filename
 
+    @staticmethod
+    def _parse_llm_json(text: str) -> Any:
+        if not text:
+            raise RuntimeError("empty_llm_response")
+        raw = text.strip()
+        try:
+            return json.loads(raw)
+        except Exception:
+            pass
+        # Handle fenced code blocks
+        if "```" in raw:
+            raw = raw.replace("```json", "```")
+            parts = raw.split("```")
+            for p in parts:
+                p = p.strip()
+                if not p:
+                    continue
+                try:
+                    return json.loads(p)
+                except Exception:
+                    continue
+        raise RuntimeError("invalid_llm_json_response")
+
+    def _llm_complete_json(self, *, provider: str, model: str, prompt: str) -> Any:
+        if self._llm_circuit_is_open():
+            raise RuntimeError("llm_circuit_open")
+
+        try:
+            out = self.llm_manager.complete_sync(
+                prompt=prompt,
+                provider=provider,
+                model=model,
+                temperature=0.1,
+            )
+            self._llm_circuit_record_success()
+            return self._parse_llm_json(str(out))
+        except Exception as exc:
+            self._llm_circuit_record_failure()
+            raise RuntimeError(f"llm_suggest_failed: {exc}") from exc
+
     def _llm_suggest(
         self,
         *,
@@ -115,44 +172,37 @@ class OrganizationService:
             known_folders=known_folders or [],
             semantic_summary=semantic_summary,
         )
+        return self._llm_complete_json(provider=provider, model=model, prompt=prompt)
 
-        def _parse_json_maybe(text: str) -> Dict[str, Any]:
-            if not text:
-                raise RuntimeError("empty_llm_response")
-            raw = text.strip()
+    def _llm_suggest_batch(
+        self,
+        *,
+        provider: str,
+        model: str,
+        files: List[Dict[str, Any]],
+        known_folders: Optional[List[str]] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Classify ``files`` with one prompt; skipped files come back as None."""
+        prompt = OrganizationPromptAdapter.build_batch_proposal_prompt(
+            files=files,
+            known_folders=known_folders or [],
+        )
+        parsed = self._llm_complete_json(provider=provider, model=model, prompt=prompt)
+        if isinstance(parsed, dict):
+            parsed = parsed.get("items") or parsed.get("results") or []
+        out: List[Optional[Dict[str, Any]]] = [None] * len(files)
+        if not isinstance(parsed, list):
+            return out
+        for pos, entry in enumerate(parsed):
+            if not isinstance(entry, dict):
+                continue
             try:
-                return json.loads(raw)
-            except Exception:
-                pass
-            # Handle fenced code blocks
-            if "```" in raw:
-                raw = raw.replace("```json", "```")
-                parts = raw.split("```")
-                for p in parts:
-                    p = p.strip()
-                    if not p:
-                        continue
-                    try:
-                        return json.loads(p)
-                    except Exception:
-                        continue
-            raise RuntimeError("invalid_llm_json_response")
-
-        if self._llm_circuit_is_open():
-            raise RuntimeError("llm_circuit_open")
-
-        try:
-            out = self.llm_manager.complete_sync(
-                prompt=prompt,
-                provider=provider,
-                model=model,
-                temperature=0.1,
-            )
-            self._llm_circuit_record_success()
-            return _parse_json_maybe(str(out))
-        except Exception as exc:
-            self._llm_circuit_record_failure()
-            raise RuntimeError(f"llm_suggest_failed: {exc}") from exc
+                idx = int(entry.get("index", pos))
+            except (ValueError, TypeError):
+                continue
+            if 0 <= idx < len(files) and out[idx] is None:
+                out[idx] = entry
+        return out
 
     def llm_status(self) -> Dict[str, Any]:
         runtime = self.get_runtime_llm()
@@ -342,6 +392,23 @@ class OrganizationService:
             out.append(candidate)
         return out
 
+    def _feedback_rows(self) -> List[Dict[str, Any]]:
+        """Historical feedback; read once per generate_proposals run."""
+        if self._run_cache is None:
+            return self.db.organization_list_feedback(limit=5000, offset=0)
+        if "feedback" not in self._run_cache:
+            self._run_cache["feedback"] = self.db.organization_list_feedback(
+                limit=5000, offset=0
+            )
+        return self._run_cache["feedback"]
+
+    def _run_cached(self, key: Any, build: Any) -> Any:
+        if self._run_cache is None:
+            return build()
+        if key not in self._run_cache:
+            self._run_cache[key] = build()
+        return self._run_cache[key]
+
     def _folder_preference_scores(self) -> Dict[str, int]:
         """Learn simple folder preferences from historical feedback.
 
@@ -352,7 +419,7 @@ class OrganizationService:
         - reject -> original/proposed folder
         """
         scores: Dict[str, int] = {}
-        feedback = self.db.organization_list_feedback(limit=5000, offset=0)
+        feedback = self._feedback_rows()
         for f in feedback:
             action = str(f.get("action") or "").lower()
             original = f.get("original") or {}
@@ -381,10 +448,10 @@ class OrganizationService:
         stem = Path(name).stem
         return re.sub(r"[^a-z0-9]+", "", stem)
 
-    def _historical_folder_corrections(self, min_votes: int = 1) -> Dict[str, str]:
-        """Build signature -> preferred folder mapping from user edit feedback."""
+    def _learned_corrections(self, field: str, min_votes: int) -> Dict[str, str]:
+        """Map signature -> most-voted ``final[field]`` from user edit feedback."""
         votes: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        feedback = self.db.organization_list_feedback(limit=5000, offset=0)
+        feedback = self._feedback_rows()
         for f in feedback:
             action = str(f.get("action") or "").strip().lower()
             if action != "edit":
@@ -392,52 +459,37 @@ class OrganizationService:
             original = f.get("original") or {}
             final = f.get("final") or {}
             sig = self._path_signature(original.get("current_path"))
-            folder = str(final.get("proposed_folder") or "").strip()
-            if not sig or not folder:
+            value = str(final.get(field) or "").strip()
+            if not sig or not value:
                 continue
-            votes[sig][folder] += 1
+            votes[sig][value] += 1
 
         out: Dict[str, str] = {}
         threshold = max(1, int(min_votes))
-        for sig, folder_counts in votes.items():
-            best_folder = ""
+        for sig, value_counts in votes.items():
+            best_value = ""
             best_votes = 0
-            for folder, count in folder_counts.items():
+            for value, count in value_counts.items():
                 if count > best_votes:
-                    best_folder = folder
+                    best_value = value
                     best_votes = count
-            if best_folder and best_votes >= threshold:
-                out[sig] = best_folder
+            if best_value and best_votes >= threshold:
+                out[sig] = best_value
         return out
 
+    def _historical_folder_corrections(self, min_votes: int = 1) -> Dict[str, str]:
+        """Build signature -> preferred folder mapping from user edit feedback."""
+        return self._run_cached(
+            ("folders", min_votes),
+            lambda: self._learned_corrections("proposed_folder", min_votes),
+        )
+
     def _historical_filename_corrections(self, min_votes: int = 1) -> Dict[str, str]:
         """Build signature -> preferred filename mapping from user edit feedback."""
-        votes: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        feedback = self.db.organization_list_feedback(limit=5000, offset=0)
-        for f in feedback:
-            action = str(f.get("action") or "").strip().lower()
-            if action != "edit":
-                continue
-            original = f.get("original") or {}
-            final = f.get("final") or {}
-            sig = self._path_signature(original.get("current_path"))
-            filename = str(final.get("proposed_filename") or "").strip()
-            if not sig or not filename:
-                continue
-            votes[sig][filename] += 1
-
-        out: Dict[str, str] = {}
-        threshold = max(1, int(min_votes))
-        for sig, name_counts in votes.items():
-            best_name = ""
-            best_votes = 0
-            for name, count in name_counts.items():
-                if count > best_votes:
-                    best_name = name
-                    best_votes = count
-            if best_name and best_votes >= threshold:
-                out[sig] = best_name
-        return out
+        return self._run_cached(
+            ("filenames", min_votes),
+            lambda: self._learned_corrections("proposed_filename", min_votes),
+        )
 
     def _auto_correct_existing_proposals(
         self,
@@ -505,6 +557,255 @@ class OrganizationService:
             corrected += 1
         return corrected
 
+    @staticmethod
+    def _suggest_inputs(rec: Dict[str, Any]) -> Dict[str, Any]:
+        meta = rec.get("metadata_json") or {}
+        return {
+            "file_name": str(rec.get("display_name") or ""),
+            "current_path": str(rec.get("normalized_path") or ""),
+            "preview": str(meta.get("preview") or ""),
+            "semantic_summary": meta.get("semantic_analysis_summary", None),
+        }
+
+    @staticmethod
+    def _group_similar(
+        records: List[Dict[str, Any]], batch_size: int
+    ) -> List[List[int]]:
+        """Positions of ``records`` grouped by parent folder and extension.
+
+        Groups hold at most ``batch_size`` positions.
+        """
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for pos, rec in enumerate(records):
+            path = (
+                str(rec.get("normalized_path") or "").replace("\\", "/").strip().lower()
+            )
+            parent = path.rsplit("/", 1)[0] if "/" in path else ""
+            ext = str(rec.get("ext") or Path(path).suffix or "").lower()
+            groups.setdefault((parent, ext), []).append(pos)
+        size = max(1, int(batch_size))
+        return [
+            positions[i : i + size]
+            for positions in groups.values()
+            for i in range(0, len(positions), size)
+        ]
+
+    def _suggest_for_group(
+        self,
+        *,
+        provider: str,
+        model: str,
+        records: List[Dict[str, Any]],
+        known_folders: List[str],
+    ) -> List[Dict[str, Any]]:
+        files = [self._suggest_inputs(rec) for rec in records]
+        if len(files) == 1:
+            return [
+                self._llm_suggest(
+                    provider=provider,
+                    model=model,
+                    known_folders=known_folders,
+                    **files[0],
+                )
+            ]
+
+        try:
+            answers = self._llm_suggest_batch(
+                provider=provider, model=model, files=files, known_folders=known_folders
+            )
+        except RuntimeError as exc:
+            if "llm_circuit_open" in str(exc):
+                raise
+            logger.warning(
+                f"Batched organization prompt failed for {len(files)} file(s), "
+                f"retrying singly: {exc}"
+            )
+            answers = [None] * len(files)
+
+        out: List[Dict[str, Any]] = []
+        for f, answer in zip(files, answers):
+            if (
+                not answer
+                or not answer.get("proposed_folder")
+                or not answer.get("proposed_filename")
+            ):
+                answer = self._llm_suggest(
+                    provider=provider, model=model, known_folders=known_folders, **f
+                )
+            out.append(answer)
+        return out
+
+    def _suggest_chunk(
+        self,
+        pool: ThreadPoolExecutor,
+        records: List[Dict[str, Any]],
+        *,
+        provider: str,
+        model: str,
+        known_folders: List[str],
+    ) -> List[Dict[str, Any]]:
+        """LLM suggestions for ``records`` (same order), computed on ``pool``."""
+        suggestions: List[Optional[Dict[str, Any]]] = [None] * len(records)
+        futures = {
+            pool.submit(
+                self._suggest_for_group,
+                provider=provider,
+                model=model,
+                records=[records[pos] for pos in positions],
+                known_folders=known_folders,
+            ): positions
+            for positions in self._group_similar(records, self.llm_batch_size)
+        }
+        try:
+            for fut in as_completed(futures):
+                for pos, llm in zip(futures[fut], fut.result()):
+                    suggestions[pos] = llm
+        except BaseException:
+            for fut in futures:
+                fut.cancel()
+            raise
+        return [s or {} for s in suggestions]
+
+    def _build_proposal(
+        self,
+        rec: Dict[str, Any],
+        llm: Dict[str, Any],
+        *,
+        run_id: Optional[int],
+        provider_name: str,
+        model_name: str,
+        known_folders: List[str],
+        folder_pref_scores: Dict[str, int],
+        learned_folders: Dict[str, str],
+        learned_filenames: Dict[str, str],
+    ) -> Dict[str, Any]:
+        row_status = str(rec.get("status") or "").strip().lower()
+        if not llm.get("proposed_folder") or not llm.get("proposed_filename"):
+            raise RuntimeError(
+                "organization_invalid_llm_output: missing_folder_or_filename "
+                f"file_id={rec.get('id')}"
+            )
+        folder, fname = self._sanitize_path_parts(
+            str(llm.get("proposed_folder")),
+            str(llm.get("proposed_filename")),
+        )
+        conf = float(llm.get("confidence", 0.75))
+        rationale = str(llm.get("rationale") or "LLM proposal")
+        alternatives = (
+            llm.get("alternatives")
+            if isinstance(llm.get("alternatives"), list)
+            else ["Inbox/Review"]
+        )
+        source = "llm"
+
+        sig = self._path_signature(rec.get("normalized_path"))
+        learned_folder = learned_folders.get(sig)
+        learned_filename = learned_filenames.get(sig)
+        if learned_folder or learned_filename:
+            folder, fname = self._sanitize_path_parts(
+                learned_folder or folder,
+                learned_filename or fname,
+            )
+            source = "historical_edit_feedback"
+            rationale = "Auto-adjusted from historical user edits"
+            conf = max(conf, 0.98)
+
+        # Apply learned confidence adjustment from past folder decisions.
+        folder_bias = int(folder_pref_scores.get(folder, 0))
+        if folder_bias != 0:
+            conf = max(0.05, min(0.99, conf + (0.03 * folder_bias)))
+        if known_folders:
+            ranked = self._rank_known_folder_suggestions(folder, known_folders, limit=5)
+            alternatives = self._normalize_alternatives([*alternatives, *ranked])
+
+        return {
+            "run_id": run_id,
+            "file_id": rec.get("id"),
+            "current_path": rec.get("normalized_path"),
+            "proposed_folder": folder,
+            "proposed_filename": fname,
+            "confidence": conf,
+            "rationale": rationale,
+            "alternatives": alternatives,
+            "provider": provider_name,
+            "model": model_name,
+            "status": "proposed",
+            "metadata": {
+                "source": "organize_indexed",
+                "decision_source": source,
+                "folder_preference_bias": folder_bias,
+                "known_folders_count": len(known_folders),
+                "file_status": row_status or "unknown",
+            },
+        }
+
+    def _record_proposal_provenance(
+        self,
+        rec: Dict[str, Any],
+        llm: Dict[str, Any],
+        proposal: Dict[str, Any],
+        *,
+        source_sha256: str,
+        provider_name: str,
+        model_name: str,
+    ) -> int:
+        name = str(rec.get("display_name") or "")
+        preview = str((rec.get("metadata_json") or {}).get("preview") or "")
+        # Capture spans from LLM response
+        raw_spans = llm.get("evidence_spans", [])
+        spans = []
+        for s in raw_spans:
+            try:
+                spans.append(
+                    EvidenceSpan(
+                        artifact_row_id=int(rec.get("id")),
+                        start_char=int(s.get("start_char")),
+                        end_char=int(s.get("end_char")),
+                        quote=s.get("quote"),
+                    )
+                )
+            except (ValueError, TypeError, AttributeError):
+                continue
+
+        # If no spans provided by LLM, require deterministic contextual evidence.
+        if not spans:
+            fallback_text = (
+                preview.strip()
+                or name.strip()
+                or str(rec.get("normalized_path") or "").strip()
+            )
+            if not fallback_text:
+                raise RuntimeError(
+                    f"organization_missing_evidence_context: file_id={rec.get('id')}"
+                )
+            spans.append(
+                EvidenceSpan(
+                    artifact_row_id=int(rec.get("id")),
+                    start_char=0,
+                    end_char=len(fallback_text),
+                    quote=(
+                        f"{fallback_text[:100]}..."
+                        if len(fallback_text) > 100
+                        else fallback_text
+                    ),
+                )
+            )
+
+        prov_record = ProvenanceRecord(
+            source_artifact_row_id=int(rec.get("id")),
+            source_sha256=source_sha256,
+            captured_at=datetime.now(timezone.utc),
+            extractor=f"organizer:{provider_name}:{model_name}",
+            spans=spans,
+            notes=f"Auto-generated proposal for {name}",
+        )
+
+        return get_provenance_service().record_provenance(
+            prov_record,
+            target_type="organization_proposal",
+            target_id=str(proposal["id"]),
+        )
+
     def generate_proposals(
         self,
         *,
@@ -513,6 +814,34 @@ class OrganizationService:
         provider: Optional[str] = None,
         model: Optional[str] = None,
         root_prefix: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Propose a destination for up to ``limit`` indexed files in scope.
+
+        Files are processed in chunks of ``proposal_write_chunk``:
+        the chunk's LLM calls run concurrently (similar files share a prompt),
+        then its proposals are inserted in one transaction. Chunks already
+        written survive a failure in a later chunk.
+        """
+        self._run_cache = {}
+        try:
+            return self._generate_proposals(
+                run_id=run_id,
+                limit=limit,
+                provider=provider,
+                model=model,
+                root_prefix=root_prefix,
+            )
+        finally:
+            self._run_cache = None
+
+    def _generate_proposals(
+        self,
+        *,
+        run_id: Optional[int],
+        limit: int,
+        provider: Optional[str],
+        model: Optional[str],
+        root_prefix: Optional[str],
     ) -> Dict[str, Any]:
         auto_corrected_existing = self._auto_correct_existing_proposals(
             root_prefix=root_prefix,
@@ -525,26 +854,13 @@ class OrganizationService:
                 max_items=max(int(limit) * 20, 4000),
             )
 
-        scoped_items = list(self.db.list_all_indexed_files())
-        prefixes = self._scope_prefixes(root_prefix)
-        if prefixes:
-            scoped_items = [
-                x
-                for x in scoped_items
-                if self._path_matches_prefixes(x.get("normalized_path"), prefixes)
-            ]
-        ready_items = [
-            x for x in scoped_items if str(x.get("status") or "").strip().lower() == "ready"
-        ]
-        candidate_items = [
-            x
-            for x in scoped_items
-            if str(x.get("status") or "").strip().lower() not in {"missing"}
-        ]
-        items = candidate_items[: int(limit)]
+        items, scope_counts = self.db.list_indexed_files_in_scope(
+            self._scope_prefixes(root_prefix),
+            limit=int(limit),
+            exclude_statuses=("missing",),
+        )
         active_generation_mode = True
 
-        created = 0
         rows: List[Dict[str, Any]] = []
         runtime = self.get_runtime_llm()
         resolved = OrganizationLLMPolicy.resolve(
@@ -567,159 +883,84 @@ class OrganizationService:
         learned_folders = self._historical_folder_corrections(min_votes=1)
         learned_filenames = self._historical_filename_corrections(min_votes=1)
 
-        for rec in items:
-            name = str(rec.get("display_name") or "")
-            meta = rec.get("metadata_json") or {}
-            preview = str(meta.get("preview") or "")
-            row_status = str(rec.get("status") or "").strip().lower()
-            source_sha256 = self._validate_source_sha256(rec)
-            llm = self._llm_suggest(
-                provider=provider_name,
-                model=model_name,
-                file_name=name,
-                current_path=str(rec.get("normalized_path") or ""),
-                preview=preview,
-                known_folders=known_folders,
-                semantic_summary=rec.get("metadata_json", {}).get("semantic_analysis_summary", None),
-            )
-            if not llm.get("proposed_folder") or not llm.get("proposed_filename"):
-                raise RuntimeError(
-                    f"organization_invalid_llm_output: missing_folder_or_filename file_id={rec.get('id')}"
+        chunk_size = max(1, int(self.proposal_write_chunk))
+        with ThreadPoolExecutor(
+            max_workers=max(1, int(self.llm_concurrency)),
+            thread_name_prefix="organizer-llm",
+        ) as pool:
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start : start + chunk_size]
+                # Fail closed before spending LLM calls on the chunk
+                hashes = [self._validate_source_sha256(rec) for rec in chunk]
+                suggestions = self._suggest_chunk(
+                    pool,
+                    chunk,
+                    provider=provider_name,
+                    model=model_name,
+                    known_folders=known_folders,
                 )
-            folder, fname = self._sanitize_path_parts(
-                str(llm.get("proposed_folder")),
-                str(llm.get("proposed_filename")),
-            )
-            conf = float(llm.get("confidence", 0.75))
-            rationale = str(llm.get("rationale") or "LLM proposal")
-            alternatives = (
-                llm.get("alternatives")
-                if isinstance(llm.get("alternatives"), list)
-                else ["Inbox/Review"]
-            )
-            source = "llm"
-            used_provider = provider_name
-            used_model = model_name
-
-            sig = self._path_signature(rec.get("normalized_path"))
-            learned_folder = learned_folders.get(sig)
-            learned_filename = learned_filenames.get(sig)
-            if learned_folder or learned_filename:
-                folder, fname = self._sanitize_path_parts(
-                    learned_folder or folder,
-                    learned_filename or fname,
-                )
-                source = "historical_edit_feedback"
-                rationale = "Auto-adjusted from historical user edits"
-                conf = max(conf, 0.98)
-
-            # Apply learned confidence adjustment from past folder decisions.
-            folder_bias = int(folder_pref_scores.get(folder, 0))
-            if folder_bias != 0:
-                conf = max(0.05, min(0.99, conf + (0.03 * folder_bias)))
-            if known_folders:
-                ranked = self._rank_known_folder_suggestions(folder, known_folders, limit=5)
-                alternatives = self._normalize_alternatives([*alternatives, *ranked])
-
-
-            proposal = {
-                "run_id": run_id,
-                "file_id": rec.get("id"),
-                "current_path": rec.get("normalized_path"),
-                "proposed_folder": folder,
-                "proposed_filename": fname,
-                "confidence": conf,
-                "rationale": rationale,
-                "alternatives": alternatives,
-                "provider": used_provider,
-                "model": used_model,
-                "status": "proposed",
-                "metadata": {
-                    "source": "organize_indexed",
-                    "decision_source": source,
-                    "folder_preference_bias": folder_bias,
-                    "known_folders_count": len(known_folders),
-                    "file_status": row_status or "unknown",
-                },
-            }
-            pid = self.db.organization_add_proposal(proposal)
-            proposal["id"] = pid
+                proposals = [
+                    self._build_proposal(
+                        rec,
+                        llm,
+                        run_id=run_id,
+                        provider_name=provider_name,
+                        model_name=model_name,
+                        known_folders=known_folders,
+                        folder_pref_scores=folder_pref_scores,
+                        learned_folders=learned_folders,
+                        learned_filenames=learned_filenames,
+                    )
+                    for rec, llm in zip(chunk, suggestions)
+                ]
+                ids = self.db.organization_add_proposals(proposals)
 
-            # Phase 3: Record Provenance
-            try:
-                # Capture spans from LLM response
-                raw_spans = llm.get("evidence_spans", [])
-                spans = []
-                for s in raw_spans:
+                # Phase 3: Record Provenance
+                for i, (rec, llm, proposal, pid, source_sha256) in enumerate(
+                    zip(chunk, suggestions, proposals, ids, hashes)
+                ):
+                    proposal["id"] = pid
                     try:
-                        spans.append(EvidenceSpan(
-                            artifact_row_id=int(rec.get("id")),
-                            start_char=int(s.get("start_char")),
-                            end_char=int(s.get("end_char")),
-                            quote=s.get("quote")
-                        ))
-                    except (ValueError, TypeError):
-                        continue
-                
-                # If no spans provided by LLM, require deterministic contextual evidence.
-                if not spans:
-                    fallback_text = preview.strip() or name.strip() or str(
-                        rec.get("normalized_path") or ""
-                    ).strip()
-                    if not fallback_text:
-                        raise RuntimeError(
-                            f"organization_missing_evidence_context: file_id={rec.get('id')}"
+                        proposal["metadata"][
+                            "provenance_id"
+                        ] = self._record_proposal_provenance(
+                            rec,
+                            llm,
+                            proposal,
+                            source_sha256=source_sha256,
+                            provider_name=provider_name,
+                            model_name=model_name,
                         )
-                    spans.append(EvidenceSpan(
-                        artifact_row_id=int(rec.get("id")),
-                        start_char=0,
-                        end_char=len(fallback_text),
-                        quote=(
-                            f"{fallback_text[:100]}..."
-                            if len(fallback_text) > 100
-                            else fallback_text
-                        ),
-                    ))
-
-                prov_record = ProvenanceRecord(
-                    source_artifact_row_id=int(rec.get("id")),
-                    source_sha256=source_sha256,
-                    captured_at=datetime.now(timezone.utc),
-                    extractor=f"organizer:{provider_name}:{model_name}",
-                    spans=spans,
-                    notes=f"Auto-generated proposal for {name}"
-                )
-                
-                prov_id = get_provenance_service().record_provenance(
-                    prov_record, 
-                    target_type="organization_proposal", 
-                    target_id=str(pid)
-                )
-                proposal["metadata"]["provenance_id"] = prov_id
-            except (ProvenanceGateError, RuntimeError) as prov_err:
-                logger.error(f"Provenance gate failed for proposal {pid}: {prov_err}. Deleting proposal.")
-                self.db.organization_delete_proposal(pid) # Delete the proposal if provenance fails
-                raise # Re-raise to fail the generation for this proposal
-            except Exception as prov_err:
-                logger.exception(f"An unexpected error occurred while recording provenance for proposal {pid}: {prov_err}. Deleting proposal.")
-                self.db.organization_delete_proposal(pid) # Delete the proposal if provenance fails
-                raise # Re-raise to fail the generation for this proposal
-
-            rows.append(proposal)
-            created += 1
+                    except Exception as prov_err:
+                        if isinstance(prov_err, (ProvenanceGateError, RuntimeError)):
+                            logger.error(
+                                f"Provenance gate failed for proposal {pid}: "
+                                f"{prov_err}. Deleting proposal."
+                            )
+                        else:
+                            logger.exception(
+                                "An unexpected error occurred while recording "
+                                f"provenance for proposal {pid}: {prov_err}. "
+                                "Deleting proposal."
+                            )
+                        # This proposal and the rest of its chunk have no provenance yet
+                        for orphan_id in ids[i:]:
+                            self.db.organization_delete_proposal(orphan_id)
+                        raise  # Re-raise to fail the generation for this proposal
+                    rows.append(proposal)
 
         return {
             "success": True,
-            "created": created,
+            "created": len(rows),
             "items": rows,
             "auto_corrected_existing": auto_corrected_existing,
             "requested_provider": resolved.provider,
             "active_provider": provider_name,
             "active_generation_mode": active_generation_mode,
             "seeded_indexed_count": seeded_count,
-            "scoped_indexed_count": len(scoped_items),
-            "scoped_candidate_count": len(candidate_items),
-            "scoped_ready_count": len(ready_items),
+            "scoped_indexed_count": scope_counts["scoped"],
+            "scoped_candidate_count": scope_counts["candidates"],
+            "scoped_ready_count": scope_counts["ready"],
         }
 
     def list_proposals(
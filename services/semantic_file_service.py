@@ -156,7 +156,18 @@ class SemanticFileService:
             }
         ]
 
-    def enrich_file(self, file_id: int, embedding_model: str = "local-hash-v1") -> Dict[str, Any]:
+    def enrich_file(
+        self,
+        file_id: int,
+        embedding_model: str = "local-hash-v1",
+        writer: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """Chunk, embed and table-extract one file.
+
+        All rows for the file are written in one transaction. Pass the
+        ``writer`` from ``db.file_index_bulk_writer()`` to batch several
+        files per commit (see ``enrich_files``).
+        """
         rec = self.db.get_indexed_file(file_id)
         if not rec:
             return {"success": False, "error": "file_not_found"}
@@ -191,8 +202,8 @@ class SemanticFileService:
                 }
             )
 
-        chunk_ids = self.db.replace_file_chunks(file_id, chunk_payload)
-
+        # Embed and extract before opening the write transaction so no
+        # model work happens while the database write lock is held.
         texts = [str(chunk.get("content") or "") for chunk in chunk_payload]
         try:
             embeddings = self._compute_embeddings(texts, embedding_model)
@@ -206,24 +217,62 @@ class SemanticFileService:
             embeddings = [self._deterministic_embedding(t) for t in texts]
             effective_model = "local-hash-v1"
 
-        embeddings_created = 0
-        for chunk_id, emb in zip(chunk_ids, embeddings):
-            self.db.upsert_chunk_embedding(
-                file_id=file_id,
-                chunk_id=chunk_id,
-                embedding_model=effective_model,
-                embedding=emb,
-            )
-            embeddings_created += 1
-
         tables = self._extract_tables(content, ext)
-        table_count = self.db.replace_file_tables(file_id, tables)
+
+        if writer is None:
+            with self.db.file_index_bulk_writer(files_per_commit=1) as own_writer:
+                return self._persist_enrichment(
+                    own_writer, file_id, chunk_payload, embeddings, effective_model, tables
+                )
+        return self._persist_enrichment(
+            writer, file_id, chunk_payload, embeddings, effective_model, tables
+        )
+
+    @staticmethod
+    def _persist_enrichment(
+        writer: Any,
+        file_id: int,
+        chunk_payload: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+        embedding_model: str,
+        tables: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        with writer.file():
+            chunk_count = writer.replace_file_chunks(
+                file_id,
+                chunk_payload,
+                embedding_model=embedding_model,
+                embeddings=embeddings,
+            )
+            table_count = writer.replace_file_tables(file_id, tables)
 
         return {
             "success": True,
             "file_id": file_id,
-            "chunks": len(chunk_ids),
-            "embeddings": embeddings_created,
+            "chunks": chunk_count,
+            "embeddings": min(chunk_count, len(embeddings)),
             "tables": table_count,
-            "embedding_model": effective_model,
+            "embedding_model": embedding_model,
         }
+
+    def enrich_files(
+        self,
+        file_ids: List[int],
+        embedding_model: str = "local-hash-v1",
+        files_per_commit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Enrich several files, committing every ``files_per_commit`` files.
+
+        A failing file is rolled back on its own and reported with
+        ``success: False``; the other files in the batch are kept.
+        """
+        results: List[Dict[str, Any]] = []
+        with self.db.file_index_bulk_writer(files_per_commit=files_per_commit) as writer:
+            for file_id in file_ids:
+                try:
+                    out = self.enrich_file(file_id, embedding_model=embedding_model, writer=writer)
+                except Exception as e:
+                    out = {"success": False, "error": str(e)}
+                out.setdefault("file_id", file_id)
+                results.append(out)
+        return results
@@ -3,14 +3,31 @@
 from __future__ import annotations
 
 import asyncio
+import os
 import re
 import threading
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
 
 from mem_db.database import DatabaseManager
 from services.file_index_service import FileIndexService
 from services.persona_skill_runtime import PersonaSkillRuntime
 
+# A claimed job is reclaimed if its worker stops heartbeating for this long.
+DEFAULT_LEASE_SECONDS = int(os.getenv("TASKMASTER_LEASE_SECONDS", "300"))
+
+_thread_loops = threading.local()
+
+
+def _get_thread_loop() -> asyncio.AbstractEventLoop:
+    """This thread's long-lived sync->async bridge loop, created on first use."""
+    loop = getattr(_thread_loops, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_loops.loop = loop
+    return loop
+
 
 class TaskMasterService:
     def __init__(self, db: DatabaseManager):
@@ -20,21 +37,21 @@ class TaskMasterService:
 
     @staticmethod
     def _run_coro_sync(coro):
-        """Run async coroutine from sync context, even if an event loop is already running."""
-        out = {"result": None, "error": None}
+        """Run a coroutine from sync code, even if an event loop is already running.
 
-        def _worker():
-            try:
-                out["result"] = asyncio.run(coro)
-            except Exception as e:
-                out["error"] = e
-
-        t = threading.Thread(target=_worker, daemon=True)
-        t.start()
-        t.join()
-        if out["error"] is not None:
-            raise out["error"]
-        return out["result"]
+        Each calling thread drives its own long-lived loop, so pool workers run
+        their agent calls in parallel while loop-bound clients (e.g. agent HTTP
+        sessions) are still reused across one worker's calls.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return _get_thread_loop().run_until_complete(coro)
+        # This thread's loop is busy running the caller; use a helper thread instead
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="taskmaster-async-bridge"
+        ) as pool:
+            return pool.submit(asyncio.run, coro).result()
 
     @staticmethod
     def _extract_text_from_processed(process_data: Dict[str, Any]) -> str:
@@ -488,28 +505,96 @@ class TaskMasterService:
         )
         return {"success": True, "queue_job_id": job_id, "queue_depth": depth + 1}
 
-    def run_worker_once(self, *, worker_name: str = "taskmaster-worker-1") -> Dict[str, Any]:
-        job = self.db.taskmaster_queue_claim_next(worker_name=worker_name)
+    @contextmanager
+    def _lease_heartbeat(
+        self, job_id: int, *, lease_token: str, worker_name: str, lease_seconds: int
+    ) -> Iterator[None]:
+        """Renew a job lease in the background while the job runs."""
+        stop = threading.Event()
+        interval = max(1.0, lease_seconds / 3.0)
+
+        def _beat() -> None:
+            while not stop.wait(interval):
+                try:
+                    if not self.db.taskmaster_queue_heartbeat(
+                        job_id, lease_token=lease_token, lease_seconds=lease_seconds
+                    ):
+                        # Lease lost; the reclaimed job belongs to someone else now
+                        return
+                except Exception:
+                    # Transient DB error; the next beat retries before the lease ends
+                    pass
+
+        beat = threading.Thread(
+            target=_beat, name=f"{worker_name}-heartbeat", daemon=True
+        )
+        beat.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            beat.join(timeout=interval)
+
+    def run_worker_once(
+        self,
+        *,
+        worker_name: str = "taskmaster-worker-1",
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+    ) -> Dict[str, Any]:
+        job = self.db.taskmaster_queue_claim_next(
+            worker_name=worker_name, lease_seconds=lease_seconds
+        )
         if not job:
             return {"success": True, "idle": True}
 
         job_id = int(job.get("id"))
+        lease_token = str(job.get("lease_token"))
         mode = str(job.get("mode"))
         payload = dict(job.get("payload_json") or {})
         try:
-            out = self.run_file_pipeline(mode=mode, payload=payload)
+            with self._lease_heartbeat(
+                job_id,
+                lease_token=lease_token,
+                worker_name=worker_name,
+                lease_seconds=lease_seconds,
+            ):
+                out = self.run_file_pipeline(mode=mode, payload=payload)
             if out.get("success"):
-                self.db.taskmaster_queue_mark_completed(job_id)
-                return {"success": True, "idle": False, "queue_job_id": job_id, "status": "completed", "run": out.get("run")}
+                if not self.db.taskmaster_queue_mark_completed(
+                    job_id, lease_token=lease_token
+                ):
+                    return {
+                        "success": True,
+                        "idle": False,
+                        "queue_job_id": job_id,
+                        "status": "lease_lost",
+                        "run": out.get("run"),
+                    }
+                return {
+                    "success": True,
+                    "idle": False,
+                    "queue_job_id": job_id,
+                    "status": "completed",
+                    "run": out.get("run"),
+                }
 
             action = self.db.taskmaster_queue_mark_retry_or_dead_letter(
                 job_id,
                 error_message=str(out.get("error") or "taskmaster run failed"),
+                lease_token=lease_token,
             )
             return {"success": False, "idle": False, "queue_job_id": job_id, "status": action, "error": out.get("error")}
         except Exception as e:
-            action = self.db.taskmaster_queue_mark_retry_or_dead_letter(job_id, error_message=str(e))
-            return {"success": False, "idle": False, "queue_job_id": job_id, "status": action, "error": str(e)}
+            action = self.db.taskmaster_queue_mark_retry_or_dead_letter(
+                job_id, error_message=str(e), lease_token=lease_token
+            )
+            return {
+                "success": False,
+                "idle": False,
+                "queue_job_id": job_id,
+                "status": action,
+                "error": str(e),
+            }
 
     def queue_status(self) -> Dict[str, Any]:
         return {
@@ -542,8 +627,12 @@ class TaskMasterService:
         return {"success": True, "total": len(items), "items": items}
 
     def run_due_schedules(self, *, max_due: int = 2) -> Dict[str, Any]:
-        # Keep scheduler ticks bounded to avoid long-running lock pressure from bulk schedule runs.
-        due = self.db.schedule_due()[: max(1, int(max_due))]
+        """Run due schedules inline (manual trigger).
+
+        The background scheduler enqueues them instead.
+        """
+        # Keep inline runs bounded to avoid long lock pressure from bulk schedule runs.
+        due = self.db.schedule_due(limit=max(1, int(max_due)))
         runs = []
         for s in due:
             mode = str(s.get("mode"))
@@ -553,6 +642,12 @@ class TaskMasterService:
             self.db.schedule_mark_ran(int(s.get("id")), int(s.get("every_minutes") or 60))
         return {"success": True, "due": len(due), "runs": runs, "max_due": max(1, int(max_due))}
 
+    def enqueue_due_schedules(self, *, max_due: int = 100) -> Dict[str, Any]:
+        """Queue due schedules (up to ``max_due``) as jobs without running them."""
+        limit = max(1, int(max_due))
+        jobs = self.db.schedule_enqueue_due(limit=limit)
+        return {"success": True, "due": len(jobs), "enqueued": jobs, "max_due": limit}
+
     def get_skill_results(self, run_id: int) -> Dict[str, Any]:
         items = self.db.skill_result_list(run_id)
         return {"success": True, "total": len(items), "items": items}
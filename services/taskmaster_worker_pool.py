@@ -0,0 +1,170 @@
+"""Long-lived pool of TaskMaster queue workers.
+
+Each worker thread loops claim -> run -> claim, so queue throughput scales
+with the number of workers instead of one job per API call or poll tick.
+Claims take a lease that the running worker renews by heartbeat; a reaper
+thread requeues (or dead-letters) jobs whose worker stopped heartbeating.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from mem_db.database import DatabaseManager
+from services.taskmaster_service import DEFAULT_LEASE_SECONDS, TaskMasterService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.getenv("TASKMASTER_WORKERS", "2"))
+# Idle workers re-check the queue this often (or sooner after notify())
+DEFAULT_POLL_SECONDS = float(os.getenv("TASKMASTER_WORKER_POLL_SECONDS", "2"))
+
+
+class TaskMasterWorkerPool:
+    """Run queued TaskMaster jobs on ``workers`` background threads."""
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        *,
+        workers: int = DEFAULT_WORKERS,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_SECONDS,
+        name_prefix: str = "taskmaster-worker",
+        service_factory: Optional[
+            Callable[[DatabaseManager], TaskMasterService]
+        ] = None,
+    ):
+        self.db = db
+        self.workers = max(1, int(workers))
+        self.lease_seconds = max(1, int(lease_seconds))
+        self.poll_interval = max(0.01, float(poll_interval))
+        self.name_prefix = name_prefix
+        self._service_factory = service_factory or TaskMasterService
+
+        self._stop = threading.Event()
+        # notify() adds pending wakeups; an idle worker consumes one before it
+        # re-claims, so a signal sent while every worker is busy is not lost.
+        self._wakeup = threading.Condition()
+        self._pending_wakeups = 0
+        self._threads: List[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "jobs_completed": 0,
+            "jobs_failed": 0,
+            "leases_lost": 0,
+            "leases_reclaimed": 0,
+            "leases_dead_lettered": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(
+                target=self._worker_loop,
+                args=(f"{self.name_prefix}-{i + 1}",),
+                name=f"{self.name_prefix}-{i + 1}",
+                daemon=True,
+            )
+            for i in range(self.workers)
+        ]
+        self._threads.append(
+            threading.Thread(
+                target=self._reaper_loop, name=f"{self.name_prefix}-reaper", daemon=True
+            )
+        )
+        for thread in self._threads:
+            thread.start()
+        logger.info("TaskMaster worker pool started with %d workers", self.workers)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop claiming new jobs and wait for in-flight jobs to finish."""
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def notify(self, jobs: int = 1) -> None:
+        """Wake one idle worker per enqueued job, e.g. right after enqueueing."""
+        jobs = max(1, int(jobs))
+        with self._wakeup:
+            # Busy workers re-claim without waiting, so more than one wakeup per
+            # worker would only buy empty claims.
+            self._pending_wakeups = min(self.workers, self._pending_wakeups + jobs)
+            self._wakeup.notify(jobs)
+
+    def _wait_for_work(self) -> None:
+        with self._wakeup:
+            if not self._pending_wakeups:
+                self._wakeup.wait_for(
+                    lambda: self._pending_wakeups > 0 or self._stop.is_set(),
+                    timeout=self.poll_interval,
+                )
+            if self._pending_wakeups:
+                self._pending_wakeups -= 1
+
+    def _bump(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _worker_loop(self, worker_name: str) -> None:
+        svc = self._service_factory(self.db)
+        while not self._stop.is_set():
+            try:
+                out = svc.run_worker_once(
+                    worker_name=worker_name, lease_seconds=self.lease_seconds
+                )
+            except Exception as e:
+                logger.warning(
+                    "TaskMaster worker %s failed to claim a job: %s", worker_name, e
+                )
+                out = {"idle": True}
+
+            if out.get("idle"):
+                self._wait_for_work()
+                continue
+            status = out.get("status")
+            if status == "completed":
+                self._bump("jobs_completed")
+            elif status == "lease_lost":
+                self._bump("leases_lost")
+            else:
+                self._bump("jobs_failed")
+
+    def _reaper_loop(self) -> None:
+        interval = max(1.0, self.lease_seconds / 2.0)
+        while not self._stop.is_set():
+            try:
+                out = self.db.taskmaster_queue_reclaim_expired(
+                    lease_seconds=self.lease_seconds
+                )
+                if out["requeued"] or out["dead_lettered"]:
+                    logger.warning("TaskMaster reclaimed expired leases: %s", out)
+                    self._bump("leases_reclaimed", out["requeued"])
+                    self._bump("leases_dead_lettered", out["dead_lettered"])
+                    if out["requeued"]:
+                        self.notify(out["requeued"])
+            except Exception as e:
+                logger.warning("TaskMaster lease reclaim failed: %s", e)
+            self._stop.wait(interval)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            out: Dict[str, Any] = dict(self._stats)
+        out["workers"] = self.workers
+        out["alive_workers"] = sum(
+            1 for t in self._threads if t.is_alive() and not t.name.endswith("-reaper")
+        )
+        out["lease_seconds"] = self.lease_seconds
+        return out
@@ -5,60 +5,120 @@ Orchestrates high-fidelity clustering and zero-shot entity extraction
 to discover strategic themes in legal documents.
 """
 
+import asyncio
 import logging
+import os
 import uuid
 import json
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 
-from agents.utils.evidence_clusterer import EvidenceClusterer
+from agents.utils.evidence_clusterer import EvidenceClusterer, get_shared_clusterer
 from services.agent_service import AgentService
 from mem_db.memory import proposals_db
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent Oracle extraction calls per discovery run
+DEFAULT_ORACLE_CONCURRENCY = int(os.getenv("THEMATIC_ORACLE_CONCURRENCY", "4"))
+
+ORACLE_LABELS = ["Prosecutor", "Witness", "Misconduct Action", "Violation", "Key Document"]
+
+
 class ThematicDiscoveryService:
-    def __init__(self, agent_manager):
+    def __init__(
+        self,
+        agent_manager,
+        clusterer: Optional[EvidenceClusterer] = None,
+        max_concurrency: int = DEFAULT_ORACLE_CONCURRENCY,
+    ):
         self.agent_manager = agent_manager
-        self.clusterer = EvidenceClusterer()
+        # Shared across service instances so transformer weights load once
+        self.clusterer = clusterer or get_shared_clusterer()
+        self.max_concurrency = max(1, max_concurrency)
 
     async def discover_strategic_themes(self, text: str, document_id: str, num_clusters: int = 5) -> Dict[str, Any]:
         """
         Perform an end-to-end thematic audit and persist the findings.
         """
         logger.info(f"Starting discovery for document: {document_id}")
-        
-        # 1. Generate Semantic Clusters (Local MiniLM)
-        clusters = self.clusterer.cluster_document(text, num_clusters=num_clusters)
-        
-        # 2. Deploy Oracle for each cluster (Agent Service)
-        discovery_results = []
+
+        # 1. Generate Semantic Clusters (Local MiniLM), off the event loop
+        clusters = await asyncio.to_thread(
+            self.clusterer.cluster_document, text, num_clusters
+        )
+
+        # 2. Deploy Oracle for every cluster concurrently (Agent Service)
+        themes = [(theme_idx, items, None) for theme_idx, items in clusters.items()]
+        discovery_results = await self._build_themes(document_id, themes)
+
+        # 3. Persist all themes as 'Analysis Proposals' in one write
+        await self._persist_themes(discovery_results)
+
+        return {
+            "document_id": document_id,
+            "themes_discovered": len(discovery_results),
+            "results": discovery_results
+        }
+
+    async def discover_corpus_themes(
+        self, documents: Dict[str, str], corpus_id: str, num_clusters: int = 7
+    ) -> Dict[str, Any]:
+        """
+        Discover themes across many documents with a single embedding pass.
+
+        ``documents`` maps document id (e.g. file path) to its text. Each theme
+        records which documents its evidence came from.
+        """
+        logger.info(f"Starting corpus discovery for {corpus_id}: {len(documents)} documents")
+
+        # Sentence splitting a whole corpus is CPU-bound; keep it off the event loop
+        sentences, sources = await asyncio.to_thread(self._split_corpus, documents)
+
+        themes = []
+        if sentences:
+            labels = await asyncio.to_thread(
+                self.clusterer.cluster_sentences, sentences, num_clusters
+            )
+            grouped: Dict[int, List[int]] = {}
+            for row, label in enumerate(labels):
+                grouped.setdefault(int(label), []).append(row)
+            for theme_idx, rows in sorted(grouped.items()):
+                counts: Dict[str, int] = {}
+                for row in rows:
+                    counts[sources[row]] = counts.get(sources[row], 0) + 1
+                themes.append((theme_idx, [sentences[row] for row in rows], counts))
+
+        discovery_results = await self._build_themes(corpus_id, themes)
+        await self._persist_themes(discovery_results)
+
+        return {
+            "document_id": corpus_id,
+            "documents_analyzed": len(documents),
+            "sentences_analyzed": len(sentences),
+            "themes_discovered": len(discovery_results),
+            "results": discovery_results
+        }
+
+    def _split_corpus(self, documents: Dict[str, str]) -> tuple:
+        """Split every document into sentences; returns ``(sentences, source_ids)``."""
+        sentences: List[str] = []
+        sources: List[str] = []
+        for document_id, text in documents.items():
+            doc_sentences = self.clusterer.split_sentences(text)
+            sentences.extend(doc_sentences)
+            sources.extend([document_id] * len(doc_sentences))
+        return sentences, sources
+
+    async def _build_themes(self, document_id: str, themes: List[tuple]) -> List[Dict[str, Any]]:
+        """Label each ``(theme_idx, items, source_counts)`` cluster concurrently."""
         agent_service = AgentService(self.agent_manager) if self.agent_manager else None
-        
-        for theme_idx, items in clusters.items():
-            # Use the COMPLETE content for labeling and summary
-            full_theme_content = "\n".join(items)
-            entities = []
-            
-            # Only attempt entity extraction if manager is available
-            if agent_service:
-                try:
-                    # Take a high-quality slice for the Oracle to identify the theme
-                    oracle_sample = "\n".join(items[:5]) 
-                    oracle_task = {
-                        "type": "entity_extraction",
-                        "text": oracle_sample,
-                        "extra_options": {
-                            "extraction_model": "gliner_zero_shot",
-                            "labels": ["Prosecutor", "Witness", "Misconduct Action", "Violation", "Key Document"]
-                        }
-                    }
-                    oracle_res = await agent_service.dispatch_task("extract_entities", oracle_task)
-                    if isinstance(oracle_res, dict):
-                        entities = oracle_res.get("data", {}).get("entities", [])
-                except Exception as e:
-                    logger.warning(f"Thematic Oracle extraction failed for cluster {theme_idx}: {e}")
-            
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def build(theme_idx: int, items: List[str], sources: Optional[Dict[str, int]]) -> Dict[str, Any]:
+            async with semaphore:
+                entities = await self._extract_theme_entities(agent_service, theme_idx, items)
+
             # Create a 'Theme Artifact' with FULL FIDELITY
             theme_record = {
                 "theme_id": str(uuid.uuid4()),
@@ -67,49 +127,76 @@ class ThematicDiscoveryService:
                 "evidence_count": len(items),
                 "key_identifiers": [e.get("text") for e in entities],
                 "full_evidence": items, # EVERY SINGLE SENTENCE
-                "summary": full_theme_content, # THE ENTIRE TEXT BLOCK
+                "summary": "\n".join(items), # THE ENTIRE TEXT BLOCK
                 "created_at": datetime.now(timezone.utc).isoformat()
             }
-            
-            discovery_results.append(theme_record)
-            
-            # Persist to database as an 'Analysis Proposal'
-            await self._persist_theme(theme_record, items)
+            if sources is not None:
+                theme_record["source_documents"] = sources
+            return theme_record
 
+        # gather keeps the cluster order of the input
+        return list(await asyncio.gather(*(build(*theme) for theme in themes)))
+
+    async def _extract_theme_entities(
+        self, agent_service: Optional[AgentService], theme_idx: int, items: List[str]
+    ) -> List[Dict[str, Any]]:
+        # Only attempt entity extraction if manager is available
+        if not agent_service:
+            return []
+        try:
+            # Take a high-quality slice for the Oracle to identify the theme
+            oracle_sample = "\n".join(items[:5])
+            oracle_task = {
+                "type": "entity_extraction",
+                "text": oracle_sample,
+                "extra_options": {
+                    "extraction_model": "gliner_zero_shot",
+                    "labels": ORACLE_LABELS
+                }
+            }
+            oracle_res = await agent_service.dispatch_task("extract_entities", oracle_task)
+            if isinstance(oracle_res, dict):
+                return oracle_res.get("data", {}).get("entities", [])
+        except Exception as e:
+            logger.warning(f"Thematic Oracle extraction failed for cluster {theme_idx}: {e}")
+        return []
+
+    @staticmethod
+    def _theme_proposal(theme_record: Dict) -> Dict[str, Any]:
+        # We treat each theme as a 'Strategic Proposal' for the Knowledge Graph
+        metadata = {
+            "theme_label": theme_record["theme_label"],
+            "evidence_count": theme_record["evidence_count"]
+        }
+        if "source_documents" in theme_record:
+            metadata["source_documents"] = theme_record["source_documents"]
         return {
-            "document_id": document_id,
-            "themes_discovered": len(discovery_results),
-            "results": discovery_results
+            "namespace": "thematic_discovery",
+            "key": f"theme_{theme_record['document_id']}_{theme_record['theme_id']}",
+            "content": json.dumps({
+                "label": theme_record["theme_label"],
+                "identifiers": theme_record["key_identifiers"],
+                "evidence_items": theme_record["full_evidence"],
+                "summary": theme_record["summary"]
+            }),
+            "memory_type": "analysis",
+            "agent_id": "thematic_discovery_service",
+            "document_id": theme_record["document_id"],
+            "metadata": metadata,
+            "confidence_score": 0.95,
+            "importance_score": 0.8,
+            "status": "pending",
+            "created_at": theme_record["created_at"]
         }
 
-    async def _persist_theme(self, theme_record: Dict, items: List[str]):
-        """Save findings to the proposals database for GUI review."""
+    async def _persist_themes(self, theme_records: List[Dict]):
+        """Save findings to the proposals database for GUI review in one transaction."""
+        if not theme_records:
+            return
         try:
-            # We treat each theme as a 'Strategic Proposal' for the Knowledge Graph
-            proposal_data = {
-                "namespace": "thematic_discovery",
-                "key": f"theme_{theme_record['document_id']}_{theme_record['theme_id']}",
-                "content": json.dumps({
-                    "label": theme_record["theme_label"],
-                    "identifiers": theme_record["key_identifiers"],
-                    "evidence_items": items,
-                    "summary": theme_record["summary"]
-                }),
-                "memory_type": "analysis",
-                "agent_id": "thematic_discovery_service",
-                "document_id": theme_record["document_id"],
-                "metadata": {
-                    "theme_label": theme_record["theme_label"],
-                    "evidence_count": theme_record["evidence_count"]
-                },
-                "confidence_score": 0.95,
-                "importance_score": 0.8,
-                "status": "pending",
-                "created_at": theme_record["created_at"]
-            }
-            
-            proposals_db.add_proposal(proposal_data)
-            logger.info(f"Persisted theme proposal: {theme_record['theme_label']}")
-            
+            proposals = [self._theme_proposal(record) for record in theme_records]
+            await asyncio.to_thread(proposals_db.add_proposals, proposals)
+            logger.info(f"Persisted {len(proposals)} theme proposals")
+
         except Exception as e:
-            logger.error(f"Failed to persist theme: {e}")
+            logger.error(f"Failed to persist themes: {e}")
@@ -5,29 +5,45 @@ from .execution import (
     execute_index_extract,
     execute_summarize,
     persist_step_result,
+    record_webhook_delivery,
     step_index,
     update_step_status,
 )
 from .repository import (
     default_stepper,
     load_job,
+    locked_job,
     read_idempotent_response,
     save_job,
     write_idempotent_response,
 )
+from .runner import (
+    recover_interrupted_steps,
+    run_workflow_step,
+    shutdown_step_executor,
+    submit_workflow_step,
+    workflow_progress_snapshot,
+)
 
 __all__ = [
     "STEP_ORDER",
     "default_stepper",
     "save_job",
     "load_job",
+    "locked_job",
     "read_idempotent_response",
     "write_idempotent_response",
     "update_step_status",
     "step_index",
     "persist_step_result",
     "deliver_workflow_callback",
+    "record_webhook_delivery",
     "execute_index_extract",
     "execute_summarize",
     "derive_draft_state_for_proposal",
+    "run_workflow_step",
+    "recover_interrupted_steps",
+    "submit_workflow_step",
+    "shutdown_step_executor",
+    "workflow_progress_snapshot",
 ]
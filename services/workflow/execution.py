@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 from uuid import uuid4
 
 from app.contracts.workflow import JobStatus, PaginationMeta, ResultItem, ResultSchema
@@ -10,7 +10,7 @@ from services.organization_service import OrganizationService
 from services.workflow_webhook_service import WorkflowWebhookService
 
 from .constants import STEP_ORDER
-from .repository import save_job
+from .repository import load_job, locked_job
 
 
 def update_step_status(job: JobStatus, step_name: str, status: str) -> None:
@@ -53,13 +53,17 @@ def deliver_workflow_callback(
     event_type: str,
     payload: Dict[str, Any],
 ) -> None:
+    """Queue a webhook event for the job; ``WorkflowWebhookDispatcher`` sends it."""
     if not (job.webhook and job.webhook.enabled and job.webhook.url):
         return
 
     try:
-        svc = WorkflowWebhookService()
         event_id = f"{job.job_id}:{event_type}:{uuid4().hex[:10]}"
-        result = svc.deliver(
+        # The outbox insert also marks the stored job queued; mirror it so a
+        # later save of this object does not put the old status back.
+        job.webhook.last_delivery_status = f"queued:{event_type}"
+        WorkflowWebhookService().enqueue(
+            db,
             url=str(job.webhook.url),
             payload={
                 "event_id": event_id,
@@ -72,41 +76,59 @@ def deliver_workflow_callback(
                 "emitted_at": datetime.utcnow().isoformat(),
             },
             event_id=event_id,
+            event_type=event_type,
+            job_id=job.job_id,
         )
+    except Exception as e:
+        # Log the error but don't fail the workflow
+        import logging
+
+        logging.getLogger(__name__).warning(f"Failed to queue workflow callback: {e}")
+        return
+
+
+def record_webhook_delivery(db: Any, outcome: Dict[str, Any]) -> None:
+    """Reflect one dispatcher delivery attempt on the job's webhook status."""
+    job_id = outcome.get("job_id")
+    if not job_id or load_job(db, str(job_id)) is None:
+        return
+
+    with locked_job(db, str(job_id)) as job:
         job.webhook.last_delivery_at = datetime.utcnow()
         job.webhook.last_delivery_status = (
-            f"delivered:{result.get('status')}@attempt={result.get('attempt')}"
-            if result.get("ok")
-            else f"failed:{result.get('status')}@attempt={result.get('attempt')}"
+            f"delivered:{outcome.get('status')}@attempt={outcome.get('attempt')}"
+            if outcome.get("ok")
+            else f"failed:{outcome.get('status')}@attempt={outcome.get('attempt')}"
         )
 
         webhook_meta = dict(job.metadata.get("webhook") or {})
         deliveries = list(webhook_meta.get("deliveries") or [])
         deliveries.append(
             {
-                "event_id": event_id,
-                "event_type": event_type,
-                "ok": bool(result.get("ok")),
-                "status": result.get("status"),
-                "attempt": int(result.get("attempt") or 0),
-                "retryable": bool(result.get("retryable", False)),
-                "signature_version": result.get("signature_version"),
-                "last_error": result.get("last_error"),
+                "event_id": outcome.get("event_id"),
+                "event_type": outcome.get("event_type"),
+                "ok": bool(outcome.get("ok")),
+                "status": outcome.get("status"),
+                "attempt": int(outcome.get("attempt") or 0),
+                "retryable": bool(outcome.get("retryable", False)),
+                "dead_lettered": bool(outcome.get("dead_lettered", False)),
+                "batch_size": int(outcome.get("batch_size") or 1),
+                "signature_version": outcome.get("signature_version"),
+                "last_error": outcome.get("last_error"),
                 "delivered_at": datetime.utcnow().isoformat(),
             }
         )
         webhook_meta["deliveries"] = deliveries[-50:]
         webhook_meta["last_delivery"] = deliveries[-1]
         job.metadata["webhook"] = webhook_meta
-        save_job(db, job)
-    except Exception as e:
-        # Log the error but don't fail the workflow
-        import logging
-        logging.getLogger(__name__).warning(f"Failed to deliver workflow callback: {e}")
-        return
 
 
-def execute_index_extract(db: Any, payload: Dict[str, Any]) -> ResultSchema:
+def execute_index_extract(
+    db: Any,
+    payload: Dict[str, Any],
+    *,
+    progress_cb: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> ResultSchema:
     indexer = FileIndexService(db)
 
     mode = str(payload.get("mode") or "auto").strip().lower()
@@ -116,9 +138,14 @@ def execute_index_extract(db: Any, payload: Dict[str, Any]) -> ResultSchema:
         max_files = 5000
 
     if mode == "watched":
-        out = indexer.run_watched_index(max_files_per_watch=max_files)
+        out = indexer.run_watched_index(
+            max_files_per_watch=max_files, progress_cb=progress_cb
+        )
     elif mode == "refresh":
-        out = indexer.refresh_index(stale_after_hours=int(payload.get("stale_after_hours", 24)))
+        out = indexer.refresh_index(
+            stale_after_hours=int(payload.get("stale_after_hours", 24)),
+            progress_cb=progress_cb,
+        )
     else:
         roots = payload.get("roots")
         if isinstance(roots, list) and roots:
@@ -127,9 +154,12 @@ def execute_index_extract(db: Any, payload: Dict[str, Any]) -> ResultSchema:
                 recursive=bool(payload.get("recursive", True)),
                 max_files=max_files,
                 max_runtime_seconds=(float(payload["max_runtime_seconds"]) if payload.get("max_runtime_seconds") else None),
+                progress_cb=progress_cb,
             )
         else:
-            out = indexer.run_watched_index(max_files_per_watch=max_files)
+            out = indexer.run_watched_index(
+                max_files_per_watch=max_files, progress_cb=progress_cb
+            )
 
     indexed = int(out.get("indexed", 0))
     scanned = int(out.get("scanned", 0))
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 from app.contracts.workflow import JobStatus, StepStatusItem
 
 from .constants import STEP_ORDER
 
+# Job rows are read-modify-written as a whole. Striped locks serialise those
+# updates per job without keeping a lock object for every job id ever seen.
+_JOB_LOCKS = [threading.Lock() for _ in range(64)]
+
 
 def default_stepper() -> list[StepStatusItem]:
     return [StepStatusItem(name=s, status="not_started") for s in STEP_ORDER]
@@ -133,6 +139,22 @@ def load_job(db: Any, job_id: str) -> Optional[JobStatus]:
     return _job_from_row(dict(row))
 
 
+@contextmanager
+def locked_job(db: Any, job_id: str) -> Iterator[JobStatus]:
+    """Load ``job_id`` under its lock and save it when the block exits cleanly."""
+    with _JOB_LOCKS[hash(job_id) % len(_JOB_LOCKS)]:
+        job = load_job(db, job_id)
+        if job is None:
+            job = JobStatus(
+                job_id=job_id,
+                stepper=default_stepper(),
+                metadata={"completed_steps": [], "last_result_by_step": {}},
+            )
+        yield job
+        job.updated_at = datetime.utcnow()
+        save_job(db, job)
+
+
 def read_idempotent_response(db: Any, scope: str, key: Optional[str]) -> Optional[Dict[str, Any]]:
     if not key:
         return None
@@ -0,0 +1,452 @@
+"""Background execution of workflow steps.
+
+Indexing, summarising, proposal generation and apply are synchronous and can
+run for minutes. ``submit_workflow_step`` marks the step queued on the job and
+hands it to a bounded thread pool, so the request that started it returns at
+once. The worker records progress under ``job.metadata["step_progress"]``,
+which the status and events endpoints read back.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import uuid4
+
+from app.contracts.workflow import (
+    JobStatus,
+    PaginationMeta,
+    ResultItem,
+    ResultResponse,
+    ResultSchema,
+)
+from services.organization_service import OrganizationService
+
+from .constants import STEP_ORDER
+from .execution import (
+    deliver_workflow_callback,
+    execute_index_extract,
+    execute_summarize,
+    persist_step_result,
+    step_index,
+    update_step_status,
+)
+from .repository import locked_job, write_idempotent_response
+
+logger = logging.getLogger(__name__)
+
+WORKFLOW_STEP_WORKERS = int(os.getenv("WORKFLOW_STEP_WORKERS", "2"))
+# Indexers report every ~100 files; persist progress at most this often
+PROGRESS_WRITE_INTERVAL_SECONDS = float(
+    os.getenv("WORKFLOW_PROGRESS_WRITE_INTERVAL_SECONDS", "0.5")
+)
+
+ACTIVE_STEP_STATES = ("queued", "running")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+JobUpdate = Callable[[JobStatus], None]
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, WORKFLOW_STEP_WORKERS),
+                thread_name_prefix="workflow-step",
+            )
+        return _executor
+
+
+def shutdown_step_executor(wait: bool = True) -> None:
+    """Stop the step pool; steps that have not started yet are cancelled.
+
+    Cancelled steps are marked interrupted on their jobs (see
+    ``submit_workflow_step``); steps still running when the process exits are
+    picked up by ``recover_interrupted_steps`` on the next start.
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _set_step_progress(job: JobStatus, step_name: str, **fields: Any) -> None:
+    progress = dict(job.metadata.get("step_progress") or {})
+    entry = dict(progress.get(step_name) or {})
+    entry.update(fields)
+    entry["updated_at"] = datetime.utcnow().isoformat()
+    progress[step_name] = entry
+    job.metadata["step_progress"] = progress
+
+
+class _ProgressReporter:
+    """``progress_cb`` for step runners that records throttled progress on the job."""
+
+    def __init__(
+        self,
+        db: Any,
+        job_id: str,
+        step_name: str,
+        interval: float = PROGRESS_WRITE_INTERVAL_SECONDS,
+    ):
+        self.db = db
+        self.job_id = job_id
+        self.step_name = step_name
+        self.interval = interval
+        self._last_write = 0.0
+
+    def __call__(self, detail: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        if now - self._last_write < self.interval:
+            return
+        self._last_write = now
+        try:
+            with locked_job(self.db, self.job_id) as job:
+                _set_step_progress(job, self.step_name, detail=dict(detail))
+        except Exception as e:
+            logger.debug(
+                "Failed to record workflow progress for "
+                f"{self.job_id}/{self.step_name}: {e}"
+            )
+
+
+def _mark_step_interrupted(db: Any, job_id: str, step_name: str, reason: str) -> None:
+    """Record that a queued or running step will never finish.
+
+    Otherwise the job would look active forever.
+    """
+    with locked_job(db, job_id) as job:
+        entry = (job.metadata.get("step_progress") or {}).get(step_name) or {}
+        if str(entry.get("state")) not in ACTIVE_STEP_STATES:
+            return
+        update_step_status(job, step_name, "failed")
+        job.status = "failed"
+        job.draft_state = "failed"
+        job.metadata["last_error"] = reason
+        _set_step_progress(
+            job,
+            step_name,
+            state="interrupted",
+            finished_at=datetime.utcnow().isoformat(),
+            error=reason,
+        )
+
+
+def recover_interrupted_steps(db: Any) -> int:
+    """Mark steps left queued or running by a previous process as interrupted.
+
+    The step pool lives in the process, so at startup nothing recorded as
+    queued or running can still be executing. Returns the number of steps
+    marked.
+    """
+    with db.get_connection() as conn:
+        rows = conn.execute(
+            "SELECT job_id, metadata_json FROM workflow_jobs "
+            "WHERE metadata_json LIKE '%step_progress%'"
+        ).fetchall()
+    recovered = 0
+    for row in rows:
+        try:
+            progress = (
+                json.loads(row["metadata_json"] or "{}").get("step_progress") or {}
+            )
+        except Exception:
+            continue
+        for step_name, entry in progress.items():
+            if str((entry or {}).get("state")) in ACTIVE_STEP_STATES:
+                _mark_step_interrupted(
+                    db, str(row["job_id"]), step_name, "interrupted: server restarted"
+                )
+                recovered += 1
+    return recovered
+
+
+def _default_result(step_name: str) -> ResultSchema:
+    return ResultSchema(
+        summary=f"Execution accepted for step '{step_name}'",
+        items=[],
+        bulk={"supported": True},
+        ontology_edits={"supported": True, "granular": True},
+        pagination=PaginationMeta(count=0, has_more=False, next_cursor=None),
+    )
+
+
+def _execute_step(
+    db: Any,
+    step_name: str,
+    payload: Dict[str, Any],
+    progress_cb: Callable[[Dict[str, Any]], None],
+) -> Tuple[ResultSchema, Optional[JobUpdate]]:
+    """Run one step; returns its result and an optional update to apply to the job."""
+    result = _default_result(step_name)
+
+    if step_name == "index_extract":
+        return execute_index_extract(db, payload, progress_cb=progress_cb), None
+
+    if step_name == "summarize":
+        result = execute_summarize(db, payload)
+        artifact = result.items[0].payload if result.items else {}
+
+        def _store_artifact(job: JobStatus) -> None:
+            job.metadata["summary_artifact"] = artifact
+
+        return result, _store_artifact
+
+    if step_name == "proposals":
+        svc = OrganizationService(db)
+        try:
+            limit_val = int(payload.get("limit", 50))
+        except (ValueError, TypeError):
+            limit_val = 50
+        progress_cb({"stage": "generate_proposals", "limit": limit_val})
+        generate_out = svc.generate_proposals(
+            run_id=payload.get("run_id"),
+            limit=limit_val,
+            provider=payload.get("provider"),
+            model=payload.get("model"),
+            root_prefix=payload.get("root_prefix"),
+        )
+        try:
+            created = int(generate_out.get("created", 0))
+        except (ValueError, TypeError):
+            created = 0
+        result.summary = f"Generated {created} proposal(s)"
+        result.pagination = PaginationMeta(
+            count=created, has_more=False, next_cursor=None
+        )
+        return result, None
+
+    if step_name == "apply":
+        svc = OrganizationService(db)
+        dry_run = bool(payload.get("dry_run", True))
+        try:
+            apply_limit = int(payload.get("limit", 200))
+        except (ValueError, TypeError):
+            apply_limit = 200
+        progress_cb({"stage": "apply", "limit": apply_limit, "dry_run": dry_run})
+        out = svc.apply_approved(limit=apply_limit, dry_run=dry_run)
+        undo_token = str(out.get("rollback_group") or uuid4().hex)
+        undo_entry = {
+            "undo_token": undo_token,
+            "step": "apply",
+            "created_at": datetime.utcnow().isoformat(),
+            "dry_run": dry_run,
+            "operation": "organization_move_batch",
+            "result": {
+                "applied": out.get("applied", 0),
+                "failed": out.get("failed", 0),
+            },
+        }
+        result.summary = (
+            f"Apply finished: applied={out.get('applied', 0)}, "
+            f"failed={out.get('failed', 0)}, dry_run={dry_run}"
+        )
+        result.items = [
+            ResultItem(
+                id=f"apply_{undo_token[:12]}",
+                type="apply_result",
+                status="complete" if out.get("success") else "failed",
+                payload=out,
+                undo_token=undo_token,
+                version=1,
+            )
+        ]
+        result.pagination = PaginationMeta(count=1, has_more=False, next_cursor=None)
+
+        def _push_undo(job: JobStatus) -> None:
+            stack = list(job.metadata.get("undo_stack") or [])
+            stack.append(undo_entry)
+            job.metadata["undo_stack"] = stack[-25:]
+            job.undo.depth = len(job.metadata.get("undo_stack") or [])
+            job.undo.last_undo_token = undo_token
+
+        return result, _push_undo
+
+    return result, None
+
+
+def run_workflow_step(
+    db: Any,
+    job_id: str,
+    step_name: str,
+    payload: Dict[str, Any],
+    *,
+    scope: str,
+    key: Optional[str] = None,
+) -> ResultResponse:
+    """Execute a step to completion, recording progress and the outcome on the job."""
+    started = time.monotonic()
+    with locked_job(db, job_id) as job:
+        _set_step_progress(
+            job, step_name, state="running", started_at=datetime.utcnow().isoformat()
+        )
+
+    reporter = _ProgressReporter(db, job_id, step_name)
+    try:
+        result, job_update = _execute_step(db, step_name, payload, reporter)
+    except Exception as e:
+        logger.warning(f"Workflow step {job_id}/{step_name} failed: {e}")
+        with locked_job(db, job_id) as job:
+            update_step_status(job, step_name, "failed")
+            job.status = "failed"
+            job.draft_state = "failed"
+            job.metadata["last_error"] = str(e)
+            _set_step_progress(
+                job,
+                step_name,
+                state="failed",
+                finished_at=datetime.utcnow().isoformat(),
+                elapsed_seconds=round(time.monotonic() - started, 3),
+                error=str(e),
+            )
+            response = ResultResponse(
+                success=False,
+                job_id=job_id,
+                step=step_name,
+                result=_default_result(step_name),
+                errors=[str(e)],
+            )
+            write_idempotent_response(db, scope, key, response.model_dump(mode="json"))
+            deliver_workflow_callback(
+                db,
+                job=job,
+                event_type="step.failed",
+                payload={"step": step_name, "errors": [str(e)]},
+            )
+        return response
+
+    with locked_job(db, job_id) as job:
+        if job_update is not None:
+            job_update(job)
+        update_step_status(job, step_name, "complete")
+        persist_step_result(job, step_name=step_name, result=result)
+        job.draft_state = "clean"
+        _set_step_progress(
+            job,
+            step_name,
+            state="complete",
+            finished_at=datetime.utcnow().isoformat(),
+            elapsed_seconds=round(time.monotonic() - started, 3),
+            summary=result.summary,
+        )
+        response = ResultResponse(
+            success=True, job_id=job_id, step=step_name, result=result, errors=[]
+        )
+        write_idempotent_response(db, scope, key, response.model_dump(mode="json"))
+        deliver_workflow_callback(
+            db,
+            job=job,
+            event_type="step.completed",
+            payload={
+                "step": step_name,
+                "summary": result.summary,
+                "count": result.pagination.count,
+            },
+        )
+    return response
+
+
+def submit_workflow_step(
+    db: Any,
+    job_id: str,
+    step_name: str,
+    payload: Dict[str, Any],
+    *,
+    scope: str,
+    key: Optional[str] = None,
+) -> Tuple[ResultResponse, "Future[ResultResponse]"]:
+    """Queue ``step_name`` on the step pool.
+
+    Returns the "accepted" response together with the future of the final
+    one. The accepted response is stored under the idempotency key first, so
+    a retried request does not start the step twice; the worker overwrites it
+    with the final response when the step finishes.
+    """
+    run_id = f"run_{uuid4().hex[:12]}"
+    with locked_job(db, job_id) as job:
+        job.status = "running"
+        job.current_step = step_name  # type: ignore[assignment]
+        job.draft_state = "saving"
+        job.progress = max(
+            job.progress,
+            min((step_index(step_name) + 1) / max(len(STEP_ORDER), 1), 1.0),
+        )
+        job.idempotency_key = key or job.idempotency_key
+        update_step_status(job, step_name, "in_progress")
+        _set_step_progress(
+            job,
+            step_name,
+            run_id=run_id,
+            state="queued",
+            queued_at=datetime.utcnow().isoformat(),
+            started_at=None,
+            finished_at=None,
+            detail={},
+        )
+
+    result = _default_result(step_name)
+    result.items = [
+        ResultItem(
+            id=run_id,
+            type="step_run",
+            status="queued",
+            payload={
+                "run_id": run_id,
+                "events_url": f"/api/workflow/jobs/{job_id}/events?step={step_name}",
+            },
+            version=1,
+        )
+    ]
+    accepted = ResultResponse(
+        success=True, job_id=job_id, step=step_name, result=result, errors=[]
+    )
+    write_idempotent_response(db, scope, key, accepted.model_dump(mode="json"))
+
+    future = _get_executor().submit(
+        run_workflow_step, db, job_id, step_name, payload, scope=scope, key=key
+    )
+
+    def _on_done(fut: "Future[ResultResponse]") -> None:
+        # Runs in the shutting-down thread when the pool drops a queued step
+        if fut.cancelled():
+            try:
+                _mark_step_interrupted(
+                    db, job_id, step_name, "interrupted: step pool shut down"
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Failed to mark workflow step {job_id}/{step_name} "
+                    f"interrupted: {e}"
+                )
+
+    future.add_done_callback(_on_done)
+    return accepted, future
+
+
+def workflow_progress_snapshot(
+    job: JobStatus, step_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """Progress view of a job for the events stream, optionally for one step."""
+    steps = dict(job.metadata.get("step_progress") or {})
+    if step_name:
+        steps = {step_name: steps[step_name]} if step_name in steps else {}
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "current_step": job.current_step,
+        "progress": job.progress,
+        "steps": steps,
+        "active": any(
+            str(s.get("state")) in ACTIVE_STEP_STATES for s in steps.values()
+        ),
+    }
@@ -0,0 +1,302 @@
+"""Deliver queued workflow webhooks from the SQLite outbox.
+
+Emitting a callback costs one ``workflow_webhook_outbox`` insert. The
+dispatcher claims due rows per endpoint, coalesces rows bound for the same URL
+into one POST, and sends them over a shared pooled HTTP client. A failed
+delivery is rescheduled to a later timestamp (jittered exponential backoff)
+instead of sleeping. Each endpoint has its own in-flight limit, so a slow or
+dead subscriber only delays its own events.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from services.workflow_webhook_service import SIGNATURE_VERSION, WorkflowWebhookService
+
+try:
+    import httpx
+
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = int(os.getenv("WORKFLOW_WEBHOOK_BATCH_SIZE", "20"))
+DEFAULT_PER_ENDPOINT_CONCURRENCY = int(
+    os.getenv("WORKFLOW_WEBHOOK_PER_ENDPOINT_CONCURRENCY", "2")
+)
+DEFAULT_POLL_SECONDS = float(os.getenv("WORKFLOW_WEBHOOK_POLL_SECONDS", "1"))
+DEFAULT_MAX_ENDPOINTS_PER_TICK = int(
+    os.getenv("WORKFLOW_WEBHOOK_MAX_ENDPOINTS_PER_TICK", "100")
+)
+# Delivered rows are kept this long for inspection, then purged
+DELIVERED_RETENTION_SECONDS = int(
+    os.getenv("WORKFLOW_WEBHOOK_OUTBOX_RETENTION_SECONDS", str(7 * 86400))
+)
+PURGE_INTERVAL_SECONDS = 600.0
+
+
+class WorkflowWebhookDispatcher:
+    """Drain ``workflow_webhook_outbox`` on the running event loop."""
+
+    def __init__(
+        self,
+        db: Any,
+        *,
+        service: Optional[WorkflowWebhookService] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        per_endpoint_concurrency: int = DEFAULT_PER_ENDPOINT_CONCURRENCY,
+        poll_interval: float = DEFAULT_POLL_SECONDS,
+        max_endpoints_per_tick: int = DEFAULT_MAX_ENDPOINTS_PER_TICK,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+        client: Any = None,
+    ):
+        self.db = db
+        self.service = service or WorkflowWebhookService()
+        self.batch_size = max(1, int(batch_size))
+        self.per_endpoint_concurrency = max(1, int(per_endpoint_concurrency))
+        self.poll_interval = max(0.01, float(poll_interval))
+        self.max_endpoints_per_tick = max(1, int(max_endpoints_per_tick))
+        # Rows left "delivering" by a crashed process become due again after this
+        self.lease_seconds = self.service.timeout_seconds * 2 + 30
+        self.on_result = on_result
+
+        self._client = client
+        self._owns_client = client is None
+        self._in_flight: Dict[str, int] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._last_purge = 0.0
+        self._stats: Dict[str, int] = {
+            "batches_sent": 0,
+            "events_delivered": 0,
+            "events_retried": 0,
+            "events_dead_lettered": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._runner is not None and not self._runner.done()
+
+    def _get_client(self) -> Any:
+        if self._client is None and HTTPX_AVAILABLE:
+            connections = self.per_endpoint_concurrency * self.max_endpoints_per_tick
+            self._client = httpx.AsyncClient(
+                timeout=self.service.timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=connections,
+                    max_keepalive_connections=min(connections, 50),
+                ),
+            )
+        return self._client
+
+    async def dispatch_once(self) -> int:
+        """Claim due deliveries for endpoints with free capacity and start sending.
+
+        Returns the number of batches started; sends continue in the background.
+        """
+        now = time.time()
+        urls = await asyncio.to_thread(
+            self.db.webhook_outbox_due_endpoints,
+            now=now,
+            limit=self.max_endpoints_per_tick,
+        )
+        started = 0
+        for url in urls:
+            free = self.per_endpoint_concurrency - self._in_flight.get(url, 0)
+            if free <= 0:
+                continue
+            rows = await asyncio.to_thread(
+                self.db.webhook_outbox_claim,
+                url=url,
+                limit=free * self.batch_size,
+                now=now,
+                lease_seconds=self.lease_seconds,
+            )
+            for i in range(0, len(rows), self.batch_size):
+                self._in_flight[url] = self._in_flight.get(url, 0) + 1
+                task = asyncio.create_task(
+                    self._deliver_batch(url, rows[i : i + self.batch_size])
+                )
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                started += 1
+        return started
+
+    async def drain_once(self) -> int:
+        """``dispatch_once`` and wait for the batches it started."""
+        started = await self.dispatch_once()
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        return started
+
+    async def _post(
+        self, url: str, body: bytes, headers: Dict[str, str]
+    ) -> Tuple[Optional[int], Optional[str]]:
+        client = self._get_client()
+        if client is None:
+            return await asyncio.to_thread(
+                self.service.send_once, url, body, headers=headers
+            )
+        try:
+            resp = await client.post(url, content=body, headers=headers)
+        except Exception as e:
+            return None, str(e) or e.__class__.__name__
+        status = int(resp.status_code)
+        return status, None if status < 400 else f"HTTP {status}"
+
+    async def _deliver_batch(self, url: str, rows: List[Dict[str, Any]]) -> None:
+        try:
+            payloads = [r["payload_json"] for r in rows]
+            if len(payloads) == 1:
+                body_obj: Dict[str, Any] = payloads[0]
+                event = "job_callback"
+            else:
+                body_obj = {"batch": True, "count": len(payloads), "events": payloads}
+                event = "job_callback_batch"
+            body = json.dumps(body_obj, default=str, separators=(",", ":")).encode(
+                "utf-8"
+            )
+            status, err = await self._post(
+                url, body, self.service.build_headers(body, event=event)
+            )
+            self._stats["batches_sent"] += 1
+
+            ids = [int(r["id"]) for r in rows]
+            ok = status is not None and 200 <= status < 300
+            retryable = False
+            dead_ids: Set[int] = set()
+            if ok:
+                await asyncio.to_thread(
+                    self.db.webhook_outbox_mark_delivered, ids, status_code=status
+                )
+                self._stats["events_delivered"] += len(ids)
+            else:
+                retryable = self.service.is_retryable(status, err)
+                attempt = max(int(r["attempts"]) for r in rows)
+                dead = await asyncio.to_thread(
+                    self.db.webhook_outbox_mark_failed,
+                    ids,
+                    retryable=retryable,
+                    next_attempt_at=time.time() + self.service.backoff_seconds(attempt),
+                    status_code=status,
+                    error=err,
+                )
+                for row in dead:
+                    dead_ids.add(int(row["id"]))
+                    await asyncio.to_thread(
+                        self.service.dead_letter,
+                        event_id=str(row["event_id"]),
+                        url=url,
+                        payload=row["payload_json"],
+                        attempts=int(row["attempts"]),
+                        attempts_detail=[
+                            {
+                                "attempt": int(row["attempts"]),
+                                "status": status,
+                                "error": err,
+                                "retryable": retryable,
+                                "at": datetime.utcnow().isoformat(),
+                            }
+                        ],
+                    )
+                self._stats["events_dead_lettered"] += len(dead_ids)
+                self._stats["events_retried"] += len(ids) - len(dead_ids)
+
+            if self.on_result is not None:
+                for row in rows:
+                    outcome = {
+                        "job_id": row.get("job_id"),
+                        "event_id": row.get("event_id"),
+                        "event_type": row.get("event_type"),
+                        "ok": ok,
+                        "status": status,
+                        "attempt": int(row["attempts"]),
+                        "retryable": retryable,
+                        "last_error": err,
+                        "dead_lettered": int(row["id"]) in dead_ids,
+                        "batch_size": len(rows),
+                        "signature_version": SIGNATURE_VERSION,
+                    }
+                    try:
+                        await asyncio.to_thread(self.on_result, outcome)
+                    except Exception as e:
+                        logger.debug(
+                            "Webhook result callback failed for "
+                            f"{row.get('event_id')}: {e}"
+                        )
+        except Exception as e:
+            logger.warning(f"Webhook batch delivery to {url} failed: {e}")
+        finally:
+            remaining = self._in_flight.get(url, 1) - 1
+            if remaining > 0:
+                self._in_flight[url] = remaining
+            else:
+                self._in_flight.pop(url, None)
+            # Freed capacity: look for more work without waiting a full poll interval
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    async def _maybe_purge(self) -> None:
+        if time.monotonic() - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = time.monotonic()
+        purged = await asyncio.to_thread(
+            self.db.webhook_outbox_purge_delivered,
+            older_than_seconds=DELIVERED_RETENTION_SECONDS,
+        )
+        if purged:
+            logger.info(
+                "Purged %d delivered workflow webhook(s) from the outbox", purged
+            )
+
+    async def run(self) -> None:
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                await self.dispatch_once()
+                await self._maybe_purge()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Workflow webhook dispatch tick failed: %s", e)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        if not self.running:
+            self._runner = asyncio.create_task(self.run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop claiming; in-flight sends get ``timeout`` seconds to finish."""
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        if self._tasks:
+            # Unfinished rows stay "delivering" and are retried once their lease expires
+            await asyncio.wait(list(self._tasks), timeout=timeout)
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = dict(self._stats)
+        out["in_flight_batches"] = sum(self._in_flight.values())
+        out["endpoints_in_flight"] = len(self._in_flight)
+        return out
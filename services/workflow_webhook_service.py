@@ -5,6 +5,7 @@ import hashlib
 import hmac
 import json
 import os
+import random
 import threading
 import time
 import urllib.error
@@ -39,7 +40,12 @@ def _env_float(name: str, default: float, *, minimum: float = 0.0) -> float:
 
 
 class WorkflowWebhookService:
-    """Best-effort workflow callback delivery with signing, retries, and DLQ."""
+    """Best-effort workflow callback delivery with signing, retries, and DLQ.
+
+    ``deliver`` sends inline and sleeps between retries. Workflow callbacks use
+    ``enqueue`` instead: one outbox insert, delivered later by
+    ``WorkflowWebhookDispatcher``.
+    """
 
     _lock = threading.Lock()
     _retry_state: Dict[str, Dict[str, Any]] = {}
@@ -50,7 +56,56 @@ class WorkflowWebhookService:
         self.max_retries = _env_int("WORKFLOW_WEBHOOK_MAX_RETRIES", 2, minimum=0)
         self.retry_backoff_seconds = _env_float("WORKFLOW_WEBHOOK_RETRY_BACKOFF_SECONDS", 0.5, minimum=0.0)
         self.enable_retries = _env_bool("WORKFLOW_WEBHOOK_ENABLE_RETRIES", True)
-        self.dlq_path = Path(os.getenv("WORKFLOW_WEBHOOK_DLQ_PATH", "logs/workflow_webhook_dlq.jsonl"))
+        self.dlq_path = Path(
+            os.getenv("WORKFLOW_WEBHOOK_DLQ_PATH", "logs/workflow_webhook_dlq.jsonl")
+        )
+        self.max_backoff_seconds = _env_float(
+            "WORKFLOW_WEBHOOK_MAX_BACKOFF_SECONDS", 300.0, minimum=0.0
+        )
+
+    def enqueue(
+        self,
+        db: Any,
+        *,
+        url: str,
+        payload: Dict[str, Any],
+        event_id: str,
+        event_type: str,
+        job_id: str | None = None,
+    ) -> int | None:
+        """Record a delivery in the outbox; the dispatcher sends it."""
+        retries = self.max_retries if self.enable_retries else 0
+        return db.webhook_outbox_enqueue(
+            event_id=event_id,
+            event_type=event_type,
+            url=url,
+            payload=payload,
+            job_id=job_id,
+            max_attempts=retries + 1,
+            available_at=time.time(),
+        )
+
+    def build_headers(
+        self, body: bytes, *, event: str = "job_callback"
+    ) -> Dict[str, str]:
+        timestamp = str(int(time.time()))
+        headers = {
+            "Content-Type": "application/json",
+            "X-Workflow-Event": event,
+            "X-Workflow-Timestamp": timestamp,
+            "X-Workflow-Signature-Version": SIGNATURE_VERSION,
+        }
+        if self.secret:
+            headers["X-Workflow-Signature"] = self._sign(body=body, timestamp=timestamp)
+        return headers
+
+    def backoff_seconds(self, attempt: int) -> float:
+        """Exponential backoff for ``attempt`` (1-based) with +/-50% jitter."""
+        delay = min(
+            self.max_backoff_seconds,
+            self.retry_backoff_seconds * (2 ** max(0, attempt - 1)),
+        )
+        return delay * random.uniform(0.5, 1.5)
 
     def deliver(self, *, url: str, payload: Dict[str, Any], event_id: str) -> Dict[str, Any]:
         body = json.dumps(payload, default=str, separators=(",", ":")).encode("utf-8")
@@ -62,20 +117,12 @@ class WorkflowWebhookService:
         attempt_records: List[Dict[str, Any]] = []
 
         for attempt in range(1, total_attempts + 1):
-            timestamp = str(int(time.time()))
-            headers = {
-                "Content-Type": "application/json",
-                "X-Workflow-Event": "job_callback",
-                "X-Workflow-Timestamp": timestamp,
-                "X-Workflow-Signature-Version": SIGNATURE_VERSION,
-            }
-            if self.secret:
-                headers["X-Workflow-Signature"] = self._sign(body=body, timestamp=timestamp)
+            headers = self.build_headers(body)
 
             self._record_retry(event_id, url=url, attempt=attempt)
-            status, err = self._send_once(url, body, headers=headers)
+            status, err = self.send_once(url, body, headers=headers)
 
-            retryable = self._is_retryable(status, err)
+            retryable = self.is_retryable(status, err)
             final_status = status
             final_error = err
             attempt_records.append(
@@ -108,27 +155,13 @@ class WorkflowWebhookService:
             if not should_retry:
                 break
 
-        dlq_entry = {
-            "event_id": event_id,
-            "url": url,
-            "failed_at": datetime.utcnow().isoformat(),
-            "payload": payload,
-            "attempts": len(attempt_records),
-            "attempts_detail": attempt_records,
-            "last_state": self._retry_state.get(event_id, {}),
-            "replay": {
-                "method": "POST",
-                "url": url,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "X-Workflow-Event": "job_callback",
-                    "X-Workflow-Signature-Version": SIGNATURE_VERSION,
-                },
-                "body_base64": base64.b64encode(body).decode("ascii"),
-                "encoding": "utf-8",
-            },
-        }
-        self._append_dlq(dlq_entry)
+        self.dead_letter(
+            event_id=event_id,
+            url=url,
+            payload=payload,
+            attempts=len(attempt_records),
+            attempts_detail=attempt_records,
+        )
         return {
             "ok": False,
             "status": final_status,
@@ -136,13 +169,48 @@ class WorkflowWebhookService:
             "event_id": event_id,
             "signature_version": SIGNATURE_VERSION,
             "last_error": final_error,
-            "retryable": self._is_retryable(final_status, final_error),
+            "retryable": self.is_retryable(final_status, final_error),
             "attempts_detail": attempt_records,
             "dlq_path": str(self.dlq_path),
         }
 
+    def dead_letter(
+        self,
+        *,
+        event_id: str,
+        url: str,
+        payload: Dict[str, Any],
+        attempts: int,
+        attempts_detail: List[Dict[str, Any]] | None = None,
+    ) -> None:
+        """Append an undeliverable event, with a replayable request, to the DLQ file."""
+        body = json.dumps(payload, default=str, separators=(",", ":")).encode("utf-8")
+        self._append_dlq(
+            {
+                "event_id": event_id,
+                "url": url,
+                "failed_at": datetime.utcnow().isoformat(),
+                "payload": payload,
+                "attempts": attempts,
+                "attempts_detail": attempts_detail or [],
+                "last_state": self._retry_state.get(event_id, {}),
+                "replay": {
+                    "method": "POST",
+                    "url": url,
+                    "headers": {
+                        "Content-Type": "application/json",
+                        "X-Workflow-Event": "job_callback",
+                        "X-Workflow-Signature-Version": SIGNATURE_VERSION,
+                    },
+                    "body_base64": base64.b64encode(body).decode("ascii"),
+                    "encoding": "utf-8",
+                },
+            }
+        )
+
     @staticmethod
-    def _is_retryable(status: int | None, err: str | None) -> bool:
+    def is_retryable(status: int | None, err: str | None) -> bool:
+        """Transport errors, 429 and 5xx are retried; other statuses are final."""
         if status is None:
             return True
         if status == 429:
@@ -156,7 +224,10 @@ class WorkflowWebhookService:
         digest = hmac.new(self.secret.encode("utf-8"), signed, hashlib.sha256).hexdigest()
         return f"sha256={digest}"
 
-    def _send_once(self, url: str, body: bytes, *, headers: Dict[str, str]) -> tuple[int | None, str | None]:
+    def send_once(
+        self, url: str, body: bytes, *, headers: Dict[str, str]
+    ) -> tuple[int | None, str | None]:
+        """POST ``body`` once with urllib; returns ``(status, error)``."""
         request = urllib.request.Request(url, data=body, method="POST")
         for k, v in headers.items():
             request.add_header(k, v)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from mem_db.access_stats import AccessStatsBuffer
+from mem_db.memory.memory_interfaces import MemoryRecord, MemoryType
+from mem_db.memory.unified_memory_manager import UnifiedMemoryManager
+from mem_db.vector_store.unified_vector_store import UnifiedVectorStore
+
+
+@pytest.mark.asyncio
+async def test_buffer_aggregates_and_flushes_on_size_and_timer():
+    batches = []
+
+    async def flush(rows):
+        batches.append(sorted(rows))
+
+    buffer = AccessStatsBuffer(flush, flush_interval=0.05, max_pending=3)
+    early = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    buffer.record("a", early)
+    buffer.record("a", early + timedelta(seconds=5))
+    buffer.record("b", early)
+    assert buffer.pending_delta("a") == (2, early + timedelta(seconds=5))
+    assert batches == []
+
+    buffer.record("c", early)  # third distinct id: size-triggered flush
+    await asyncio.sleep(0)
+    assert [row[:2] for row in batches[0]] == [("a", 2), ("b", 1), ("c", 1)]
+    assert len(buffer) == 0
+
+    buffer.record("d")
+    await asyncio.sleep(0.15)  # timer-triggered flush
+    assert [row[:2] for row in batches[1]] == [("d", 1)]
+    assert buffer.flushes == 2
+
+    buffer.record("e")
+    buffer.discard(["e"])
+    buffer.record("f")
+    await buffer.close()
+    assert [row[:2] for row in batches[2]] == [("f", 1)]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_hits_buffered():
+    calls = []
+
+    async def flush(rows):
+        calls.append(rows)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+
+    buffer = AccessStatsBuffer(flush, flush_interval=60)
+    buffer.record("a")
+    assert await buffer.flush() == 0
+    buffer.record("a")
+    assert await buffer.flush() == 1
+    assert calls[1][0][:2] == ("a", 2)
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_vector_search_hits_are_written_behind(tmp_path):
+    store = UnifiedVectorStore(store_path=tmp_path / "vs", dimension=4)
+    assert await store.initialize()
+    doc_id = await store.add_document("doc", np.array([1.0, 0.0, 0.0, 0.0]))
+    for _ in range(3):
+        await store.search(np.array([1.0, 0.0, 0.0, 0.0]), k=1)
+
+    def stored_count():
+        with sqlite3.connect(store.db_path) as conn:
+            return conn.execute(
+                "SELECT access_count FROM documents WHERE id = ?", (doc_id,)
+            ).fetchone()[0]
+
+    assert stored_count() == 0
+    assert (await store.get_statistics())["pending_access_updates"] == 1
+    await store.close()
+    assert stored_count() == 3
+
+
+@pytest.mark.asyncio
+async def test_memory_manager_access_counts_merge_buffered_deltas(tmp_path: Path):
+    manager = UnifiedMemoryManager(db_path=tmp_path / "mem.db", vector_backend="faiss")
+    assert await manager.initialize()
+    record_id = await manager.store(
+        MemoryRecord(
+            record_id=str(uuid.uuid4()),
+            namespace="tests",
+            key="k",
+            content="statute of limitations",
+            memory_type=MemoryType.ANALYSIS,
+        )
+    )
+    await manager.retrieve(record_id)
+    hits = await manager.search("statute", namespace="tests")
+    assert hits[0].record.access_count == 2
+
+    # Reads straight from SQLite merge the unflushed delta.
+    records = await manager.get_all_records(namespace="tests")
+    assert records[0].access_count == 2
+    await manager.close()
+    with sqlite3.connect(tmp_path / "mem.db") as conn:
+        stored = conn.execute(
+            "SELECT access_count FROM memory_records WHERE record_id = ?", (record_id,)
+        ).fetchone()[0]
+    assert stored == 2
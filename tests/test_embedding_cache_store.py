@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import multiprocessing
+import pickle
+
+import numpy as np
+import pytest
+
+from mem_db import embedding_cache
+from mem_db.embedding_cache import EmbeddingCacheStore
+
+
+def _writer(directory: str, worker: int) -> None:
+    store = EmbeddingCacheStore(directory)
+    for i in range(50):
+        store.put(f"w{worker}-{i}", np.full(16, worker * 1000 + i, dtype=np.float32))
+    store.close()
+
+
+def test_round_trip_and_reopen(tmp_path):
+    store = EmbeddingCacheStore(tmp_path)
+    vectors = np.random.default_rng(0).standard_normal((20, 12)).astype(np.float32)
+    store.put_many((f"k{i}", vectors[i]) for i in range(20))
+    store.put("k3", vectors[4])  # overwrite appends; old bytes become dead
+    assert np.array_equal(store.get("k3"), vectors[4])
+    assert store.get("missing") is None
+    found = store.get_many(["k0", "missing", "k19"])
+    assert np.array_equal(found[0], vectors[0]) and found[1] is None
+    stats = store.stats()
+    assert stats["entries"] == 20 and stats["live_bytes"] == 20 * 12 * 4
+    assert stats["file_bytes"] == 21 * 12 * 4
+    store.close()
+
+    reopened = EmbeddingCacheStore(tmp_path)
+    assert len(reopened) == 20 and "k7" in reopened
+    assert np.array_equal(reopened.get("k7"), vectors[7])
+
+
+def test_lru_eviction_and_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "COMPACT_MIN_BYTES", 0)
+    store = EmbeddingCacheStore(tmp_path, max_entries=10, compact_ratio=0.5)
+    for i in range(10):
+        store.put(f"k{i}", np.full(4, i, dtype=np.float32))
+    store.get("k0")  # recently used: survives eviction
+    store.put("k10", np.full(4, 10, dtype=np.float32))
+
+    stats = store.stats()
+    assert stats["entries"] == 9 and stats["evictions"] == 2
+    assert store.get("k1") is None and store.get("k2") is None
+    assert store.get("k0") is not None
+
+    store.delete([f"k{i}" for i in range(3, 8)])
+    stats = store.stats()
+    assert stats["compactions"] >= 1 and stats["file_bytes"] == stats["live_bytes"]
+    assert [float(store.get(k)[0]) for k in ("k0", "k8", "k9", "k10")] == [0, 8, 9, 10]
+    assert len(list(tmp_path.glob("vectors.*.f32"))) == 1
+
+    store.clear()
+    assert len(store) == 0 and store.get("k0") is None
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_concurrent_writers_share_one_directory(tmp_path):
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_writer, args=(str(tmp_path), w)) for w in range(4)]
+    for proc in workers:
+        proc.start()
+    for proc in workers:
+        proc.join(30)
+        assert proc.exitcode == 0
+
+    store = EmbeddingCacheStore(tmp_path)
+    assert len(store) == 200
+    for worker in range(4):
+        assert float(store.get(f"w{worker}-49")[0]) == worker * 1000 + 49
+
+
+def test_embedding_cache_migrates_legacy_pickle(tmp_path):
+    from core.ml_optimization import EmbeddingCache
+
+    legacy = EmbeddingCache(tmp_path)
+    key = legacy._get_hash("old text")
+    legacy.close()
+    with open(tmp_path / "embedding_cache.pkl", "wb") as f:
+        pickle.dump({key: np.ones(8, dtype=np.float32)}, f)
+
+    cache = EmbeddingCache(tmp_path)
+    assert np.array_equal(cache.get("old text"), np.ones(8, dtype=np.float32))
+    assert not (tmp_path / "embedding_cache.pkl").exists()
+    cache.put_many(["a", "b"], np.zeros((2, 8), dtype=np.float32))
+    assert cache.get_stats()["total_entries"] == 3
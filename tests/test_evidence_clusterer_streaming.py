@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from sklearn.metrics import adjusted_rand_score
+
+from agents.utils.evidence_clusterer import cluster_embedding_batches
+
+
+def _blobs(per_cluster: int = 400, dim: int = 16, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((3, dim)) * 5
+    truth = np.repeat(np.arange(3), per_cluster)
+    points = centers[truth] + rng.standard_normal((len(truth), dim)) * 0.3
+    return points.astype(np.float32), truth
+
+
+def _stream(points: np.ndarray, batch_size: int, seed: int = 1):
+    # Out-of-order batches, as produced by length bucketing
+    order = np.random.default_rng(seed).permutation(len(points))
+    for start in range(0, len(order), batch_size):
+        indices = order[start : start + batch_size]
+        yield indices, points[indices]
+
+
+@pytest.mark.parametrize(
+    "method,sample_size", [("reservoir", 200), ("reservoir", 10_000), ("minibatch", 0)]
+)
+def test_streamed_clusters_recover_blobs(method, sample_size):
+    points, truth = _blobs()
+    labels = cluster_embedding_batches(
+        _stream(points, batch_size=32),
+        total=len(points),
+        num_clusters=3,
+        method=method,
+        sample_size=sample_size,
+        assign_chunk=100,
+    )
+    assert labels.shape == truth.shape
+    assert adjusted_rand_score(truth, labels) == pytest.approx(1.0)
+
+
+def test_small_batches_and_validation():
+    points, _ = _blobs(per_cluster=2)
+    labels = cluster_embedding_batches(_stream(points, 1), len(points), 3, method="minibatch")
+    assert len(set(labels.tolist())) == 3
+    assert cluster_embedding_batches(iter(()), 0, 3).size == 0
+    with pytest.raises(ValueError):
+        cluster_embedding_batches(_stream(points, 2), len(points), 3, method="spectral")
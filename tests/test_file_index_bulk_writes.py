@@ -0,0 +1,230 @@
+import importlib.util
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from mem_db.database import DatabaseManager
+from services.semantic_file_service import SemanticFileService
+
+
+def _file(db: DatabaseManager, path: Path) -> int:
+    return db.upsert_indexed_file(
+        display_name=path.name,
+        original_path=str(path),
+        normalized_path=str(path),
+        file_size=path.stat().st_size if path.exists() else None,
+        mtime=path.stat().st_mtime if path.exists() else None,
+        mime_type="text/markdown",
+        mime_source="test",
+        sha256=None,
+        ext=".md",
+        status="ready",
+    )
+
+
+def test_bulk_writer_batches_commits_and_rolls_back_failed_file(tmp_path):
+    db = DatabaseManager(str(tmp_path / "bulk.db"))
+    ids = [_file(db, tmp_path / f"f{i}.md") for i in range(3)]
+
+    with db.file_index_bulk_writer(files_per_commit=2) as writer:
+        with writer.file() as first:
+            assert (
+                writer.replace_file_chunks(
+                    ids[0],
+                    [{"content": "alpha"}, {"content": "beta"}, {"content": "gamma"}],
+                    embedding_model="m",
+                    embeddings=[[1.0, 0.0], [0.0, 1.0], [0.5, 0.5]],
+                )
+                == 3
+            )
+            assert (
+                writer.replace_file_entities(ids[0], [{"text": "Acme"}, {"text": " "}])
+                == 1
+            )
+        with pytest.raises(RuntimeError):
+            with writer.file():
+                writer.replace_file_chunks(ids[1], [{"content": "lost"}])
+                raise RuntimeError("parser blew up")
+        assert writer.commits == 0
+        with writer.file():
+            writer.replace_file_tables(ids[2], [{"headers": ["a"], "rows": [[1]]}])
+        assert writer.commits == 1
+
+    chunk_ids = first.chunk_ids
+    chunks = db.list_file_chunks(ids[0])
+    assert [c["id"] for c in chunks] == chunk_ids
+    assert [c["content"] for c in chunks] == ["alpha", "beta", "gamma"]
+    assert db.list_file_chunks(ids[1]) == []
+    assert len(db.list_file_entities(ids[0])) == 1
+    assert db.list_file_tables(ids[2])[0]["rows_json"] == [[1]]
+    hits = db.semantic_similarity_search(query_embedding=[0.0, 1.0], embedding_model="m", limit=1)
+    assert hits[0]["chunk_id"] == chunk_ids[1]
+
+
+def test_bulk_writer_window_survives_errors_on_the_shared_connection(tmp_path):
+    db = DatabaseManager(str(tmp_path / "nested.db"))
+    ids = [_file(db, tmp_path / f"n{i}.md") for i in range(2)]
+
+    with db.file_index_bulk_writer(files_per_commit=10) as writer:
+        with writer.file():
+            writer.replace_file_chunks(ids[0], [{"content": "kept"}])
+        with writer.file():
+            # A caught failure elsewhere rolls back the thread connection, not the batch
+            with pytest.raises(RuntimeError):
+                with db.get_connection():
+                    raise RuntimeError("unrelated query failed")
+            assert db.scan_manifest_get("0" * 40) is None
+            writer.replace_file_chunks(ids[1], [{"content": "also kept"}])
+        assert writer.commits == 0
+
+    assert [c["content"] for c in db.list_file_chunks(ids[0])] == ["kept"]
+    assert [c["content"] for c in db.list_file_chunks(ids[1])] == ["also kept"]
+
+
+def test_enrich_files_shares_transactions(tmp_path):
+    db = DatabaseManager(str(tmp_path / "enrich.db"))
+    ids = []
+    for i in range(3):
+        doc = tmp_path / f"doc{i}.md"
+        doc.write_text(f"# Title {i}\nbody {i}\n\n# Next\nmore {i}\n", encoding="utf-8")
+        ids.append(_file(db, doc))
+
+    results = SemanticFileService(db).enrich_files(ids + [999999], files_per_commit=2)
+    assert [r["success"] for r in results] == [True, True, True, False]
+    assert results[-1] == {"success": False, "error": "file_not_found", "file_id": 999999}
+    for file_id, result in zip(ids, results):
+        assert len(db.list_file_chunks(file_id)) == result["chunks"] == result["embeddings"]
+
+
+def test_file_index_write_benchmark_smoke():
+    spec = importlib.util.spec_from_file_location(
+        "benchmark_file_index_writes",
+        Path(__file__).resolve().parents[1] / "scripts" / "benchmark_file_index_writes.py",
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    report = module.run_benchmark(files=10, chunks=10, entities=5, dim=8, files_per_commit=4)
+    for mode in report["modes"].values():
+        assert mode["chunks_written"] == 100
+        assert mode["rows_per_sec"] > 0
+
+
+def test_bulk_writer_commits_when_the_latency_bound_passes(tmp_path):
+    db = DatabaseManager(str(tmp_path / "latency.db"))
+    ids = [_file(db, tmp_path / f"f{i}.md") for i in range(2)]
+
+    with db.file_index_bulk_writer(
+        files_per_commit=100, max_latency_seconds=0.05
+    ) as writer:
+        with writer.file():
+            writer.replace_file_entities(ids[0], [{"text": "Acme"}])
+        assert writer.commits == 0
+        time.sleep(0.06)
+        assert writer.commit_if_due() is True
+        with writer.file():
+            writer.replace_file_entities(ids[1], [{"text": "Beta"}])
+        assert writer.commits == 1
+    assert writer.commits == 2
+
+
+def test_index_roots_group_commits_and_rolls_back_a_failed_file_as_a_unit(
+    tmp_path, monkeypatch
+):
+    from mem_db.repositories.file_index_repository import FileIndexBulkWriter
+    from services.file_index_service import FileIndexService
+
+    root = tmp_path / "docs"
+    root.mkdir()
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (root / name).write_text(f"contents of {name}", encoding="utf-8")
+    original = FileIndexBulkWriter.scan_manifest_upsert
+
+    def _flaky_manifest(self, **row):
+        if (
+            row["normalized_path"].endswith("b.txt")
+            and row.get("last_status") != "unreadable"
+        ):
+            raise RuntimeError("disk hiccup")
+        return original(self, **row)
+
+    monkeypatch.setattr(FileIndexBulkWriter, "scan_manifest_upsert", _flaky_manifest)
+    commits = []
+    real_commit = FileIndexBulkWriter.commit
+
+    def _counting_commit(self):
+        if self.pending_files:
+            commits.append(self.pending_files)
+        real_commit(self)
+
+    monkeypatch.setattr(FileIndexBulkWriter, "commit", _counting_commit)
+    db = DatabaseManager(str(tmp_path / "scan.db"))
+
+    out = FileIndexService(db).index_roots(
+        [str(root)],
+        allowed_exts={".txt"},
+        files_per_commit=10,
+        commit_latency_seconds=60.0,
+        defer_ocr=False,
+    )
+
+    assert out["indexed"] == 2
+    assert out["errors"] == 1
+    # Three files (the failed one as its failure row) went out in one commit
+    assert commits == [3]
+    rows = {r["display_name"]: r for r in db.list_all_indexed_files()}
+    assert rows["a.txt"]["status"] == "ready"
+    assert rows["b.txt"]["status"] == "unreadable"
+    assert "disk hiccup" in rows["b.txt"]["last_error"]
+    assert (
+        rows["b.txt"]["metadata_json"]["ingest_result"]["failed_stage"] == "persistence"
+    )
+
+
+def test_bulk_writer_leaves_the_database_writable_between_flushes(tmp_path):
+    db_path = tmp_path / "shared.db"
+    db = DatabaseManager(str(db_path))
+    ids = [_file(db, tmp_path / f"s{i}.md") for i in range(2)]
+
+    with db.file_index_bulk_writer(
+        files_per_commit=10, max_latency_seconds=60.0
+    ) as writer:
+        with writer.file():
+            writer.replace_file_entities(ids[0], [{"text": "Acme"}])
+        # Mid-window, as while the next file parses or waits on OCR: another
+        # writer gets through
+        other = sqlite3.connect(str(db_path), timeout=0.2)
+        try:
+            other.execute(
+                "UPDATE files_index SET status = 'damaged' WHERE id = ?", (ids[1],)
+            )
+            other.commit()
+        finally:
+            other.close()
+        with writer.file():
+            writer.replace_file_entities(ids[1], [{"text": "Beta"}])
+        assert writer.commits == 0
+
+    assert writer.commits == 1
+    assert db.get_indexed_file(ids[1])["status"] == "damaged"
+    assert [e["entity_text"] for e in db.list_file_entities(ids[1])] == ["Beta"]
+
+
+def test_bulk_writer_rolls_back_a_file_that_fails_at_flush(tmp_path):
+    db = DatabaseManager(str(tmp_path / "flush.db"))
+
+    with db.file_index_bulk_writer(files_per_commit=10) as writer:
+        with writer.file() as bad:
+            writer.scan_manifest_upsert(path_hash="a" * 40, normalized_path=None)
+        with writer.file() as good:
+            writer.scan_manifest_upsert(
+                path_hash="b" * 40, normalized_path="/docs/b.txt"
+            )
+
+    assert "NOT NULL" in bad.error
+    assert good.error is None
+    assert writer.failed_files == 1
+    assert db.scan_manifest_get("a" * 40) is None
+    assert db.scan_manifest_get("b" * 40)["normalized_path"] == "/docs/b.txt"
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+import time
+
+import pytest
+
+import utils.ocr_pages as ocr_pages
+from mem_db.database import DatabaseManager
+from mem_db.page_text_cache import PageTextCache
+from services.file_index_service import FileIndexService
+
+
+def _fake_ocr_page(texts: dict[int, str], calls: list[int], delay: float = 0.0):
+    def _ocr_page(path, kind, page_no, settings, deadline):
+        calls.append(page_no)
+        time.sleep(delay)
+        text = texts.get(page_no, "")
+        return {
+            "page_no": page_no,
+            "text": text,
+            "quality": ocr_pages.ocr_quality_score(text),
+            "attempts": [
+                {
+                    "attempt": f"pdf_page_{page_no}_raw",
+                    "chars": len(text),
+                    "quality": 0.0,
+                }
+            ],
+            "timed_out": False,
+            "page_count": 3,
+        }
+
+    return _ocr_page
+
+
+GOOD_TEXT = " ".join(
+    ["Invoice number 4471 issued to Acme Corporation for consulting services"] * 6
+)
+
+
+def test_ocr_document_stops_at_quality_target_and_reuses_cached_pages(
+    tmp_path, monkeypatch
+):
+    calls: list[int] = []
+    monkeypatch.setattr(
+        ocr_pages,
+        "ocr_page",
+        _fake_ocr_page({1: "~~", 2: GOOD_TEXT, 3: GOOD_TEXT}, calls),
+    )
+    cache = PageTextCache(tmp_path / "pages.db")
+
+    first = ocr_pages.ocr_document(
+        "scan.pdf", "pdf", sha256="a" * 64, cache=cache, max_pages=3, workers=1
+    )
+
+    assert calls == [1, 2]
+    assert first["pages_cancelled"] == 1
+    assert first["text"] == GOOD_TEXT
+
+    again = ocr_pages.ocr_document(
+        "scan.pdf", "pdf", sha256="a" * 64, cache=cache, max_pages=3, workers=1
+    )
+
+    assert calls == [1, 2]
+    assert again["cache_hits"] == 2
+    assert again["text"] == GOOD_TEXT
+    # Different OCR settings never see each other's text
+    other = ocr_pages.ocr_settings(lang="deu")
+    assert ocr_pages.ocr_extractor_key(other) != ocr_pages.ocr_extractor_key(
+        ocr_pages.ocr_settings()
+    )
+    ocr_pages.ocr_document(
+        "scan.pdf",
+        "pdf",
+        sha256="a" * 64,
+        cache=cache,
+        settings=other,
+        max_pages=3,
+        workers=1,
+    )
+    assert calls == [1, 2, 1, 2]
+    cache.close()
+
+
+def test_ocr_document_stops_when_file_budget_is_spent(monkeypatch):
+    calls: list[int] = []
+    monkeypatch.setattr(ocr_pages, "ocr_page", _fake_ocr_page({}, calls, delay=0.05))
+
+    out = ocr_pages.ocr_document(
+        "scan.pdf", "pdf", max_pages=5, budget_seconds=0.08, workers=1
+    )
+
+    assert out["timed_out"] is True
+    assert 1 <= len(calls) < 5
+    assert out["pages_cancelled"] == 5 - len(calls)
+
+
+@pytest.fixture
+def indexer(tmp_path):
+    db = DatabaseManager(str(tmp_path / "index.db"))
+    svc = FileIndexService(db)
+    svc.ocr_cache_path = tmp_path / "ocr_cache" / "pages.db"
+    svc.ocr_workers = 1
+    svc.ocr_file_concurrency = 2
+    yield svc
+    db.close()
+
+
+def test_index_roots_defers_ocr_until_text_files_are_stored(
+    indexer, tmp_path, monkeypatch
+):
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "notes.txt").write_text(
+        "plain text notes about the Acme matter", encoding="utf-8"
+    )
+    (root / "scan_a.png").write_bytes(b"fake image a")
+    (root / "scan_b.png").write_bytes(b"fake image b")
+    visible_during_ocr: list[list[str]] = []
+
+    def _ocr_page(path, kind, page_no, settings, deadline):
+        visible_during_ocr.append(
+            sorted(r["display_name"] for r in indexer.db.list_all_indexed_files())
+        )
+        return {
+            "page_no": 1,
+            "text": GOOD_TEXT,
+            "quality": 0.9,
+            "attempts": [],
+            "timed_out": False,
+        }
+
+    monkeypatch.setattr(ocr_pages, "ocr_page", _ocr_page)
+
+    out = indexer.index_roots(
+        [str(root)], allowed_exts={".txt", ".png"}, defer_ocr=True
+    )
+
+    assert out["indexed"] == 3
+    assert out["ocr"]["queued"] == 2
+    assert out["ocr"]["used"] == 2
+    # Every phase-one row was committed before the first image was OCR'd
+    assert visible_during_ocr and all(
+        "notes.txt" in names for names in visible_during_ocr
+    )
+    rows = {r["display_name"]: r for r in indexer.db.list_all_indexed_files()}
+    scan = rows["scan_a.png"]["metadata_json"]
+    assert scan["ocr"]["used"] is True
+    assert "pending" not in scan["ocr"]
+    assert scan["preview"].startswith("Invoice number")
+    path_hash = hashlib.sha1(str(root / "scan_a.png").encode("utf-8")).hexdigest()
+    assert indexer.db.scan_manifest_get(path_hash) is not None
+
+
+def test_index_roots_leaves_unfinished_ocr_for_the_next_scan(
+    indexer, tmp_path, monkeypatch
+):
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "scan.png").write_bytes(b"fake image")
+    monkeypatch.setattr(
+        ocr_pages,
+        "ocr_page",
+        lambda *a, **k: {
+            "page_no": 1,
+            "text": GOOD_TEXT,
+            "quality": 0.9,
+            "attempts": [],
+            "timed_out": False,
+        },
+    )
+    calls = {"n": 0}
+
+    def _should_stop():
+        # The walk checks once for its single file; the OCR phase sees the stop
+        calls["n"] += 1
+        return calls["n"] > 1
+
+    out = indexer.index_roots(
+        [str(root)], allowed_exts={".png"}, defer_ocr=True, should_stop=_should_stop
+    )
+
+    assert out["ocr"]["cancelled"] is True
+    row = indexer.db.list_all_indexed_files()[0]
+    assert row["metadata_json"]["ocr"]["pending"] is True
+    path_hash = hashlib.sha1(str(root / "scan.png").encode("utf-8")).hexdigest()
+    assert indexer.db.scan_manifest_get(path_hash) is None
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+import pytest_asyncio
+
+from mem_db.knowledge import graph_analytics
+from mem_db.knowledge.unified_knowledge_graph_manager import UnifiedKnowledgeGraphManager
+
+
+def _random_edges(nodes: int, edges: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [(f"n{rng.randrange(nodes)}", f"n{rng.randrange(nodes)}", 1.0) for _ in range(edges)]
+
+
+@pytest_asyncio.fixture
+async def make_manager(tmp_path):
+    """Initialized managers under ``tmp_path``; their pools close at teardown."""
+    managers = []
+
+    async def _make(**options) -> UnifiedKnowledgeGraphManager:
+        manager = UnifiedKnowledgeGraphManager(graph_path=tmp_path / "kg", **options)
+        managers.append(manager)
+        await manager.initialize()
+        return manager
+
+    yield _make
+    for manager in managers:
+        await manager.close()
+
+
+def _to_networkx(node_ids, edges):
+    graph = nx.MultiDiGraph()
+    graph.add_nodes_from(node_ids)
+    graph.add_weighted_edges_from(edges)
+    return graph
+
+
+def test_csr_centrality_matches_networkx():
+    node_ids = [f"n{i}" for i in range(60)]
+    edges = _random_edges(60, 240)
+    csr = graph_analytics.build_csr(node_ids, edges)
+    reference = _to_networkx(node_ids, edges)
+
+    assert graph_analytics.pagerank(csr).sum() == pytest.approx(1.0)
+
+    # networkx pagerank/betweenness want simple digraphs, so compare on one.
+    expected_pr = nx.pagerank(nx.DiGraph(reference), tol=1e-10, max_iter=500)
+    simple_edges = [(u, v, 1.0) for u, v in nx.DiGraph(reference).edges()]
+    simple_csr = graph_analytics.build_csr(node_ids, simple_edges)
+    simple_pr = graph_analytics.pagerank(simple_csr, tol=1e-10, max_iter=500)
+    assert np.allclose(simple_pr, [expected_pr[n] for n in simple_csr.node_ids], atol=1e-6)
+
+    exact = graph_analytics.approximate_betweenness(simple_csr, samples=len(node_ids))
+    expected_bc = nx.betweenness_centrality(nx.DiGraph(reference))
+    assert np.allclose(exact, [expected_bc[n] for n in simple_csr.node_ids], atol=1e-9)
+
+    degree = graph_analytics.degree_centrality(csr)
+    expected_degree = nx.degree_centrality(reference)
+    assert np.allclose(degree, [expected_degree[n] for n in csr.node_ids])
+
+
+def test_csr_shortest_paths_match_networkx():
+    node_ids = [f"n{i}" for i in range(80)]
+    edges = _random_edges(80, 200, seed=3)
+    csr = graph_analytics.build_csr(node_ids, edges)
+    reference = _to_networkx(node_ids, edges)
+    rng = random.Random(11)
+    for _ in range(50):
+        s, t = rng.choice(node_ids), rng.choice(node_ids)
+        path, length = graph_analytics.shortest_path(csr, csr.index[s], csr.index[t])
+        if nx.has_path(reference, s, t):
+            assert length == nx.shortest_path_length(reference, s, t)
+            assert path[0] == csr.index[s] and path[-1] == csr.index[t]
+        else:
+            assert path is None
+
+    weighted = [(u, v, float(rng.randint(1, 9))) for u, v, _ in edges]
+    wcsr = graph_analytics.build_csr(node_ids, weighted)
+    wref = nx.DiGraph()
+    wref.add_nodes_from(node_ids)
+    for u, v, w in weighted:
+        if not wref.has_edge(u, v) or wref[u][v]["weight"] > w:
+            wref.add_edge(u, v, weight=w)
+    for _ in range(50):
+        s, t = rng.choice(node_ids), rng.choice(node_ids)
+        _path, length = graph_analytics.shortest_path(wcsr, wcsr.index[s], wcsr.index[t])
+        if nx.has_path(wref, s, t):
+            assert length == nx.dijkstra_path_length(wref, s, t)
+
+
+def test_communities_recover_planted_clusters():
+    edges = []
+    for block in range(4):
+        members = [f"b{block}_{i}" for i in range(10)]
+        edges += [(u, v, 1.0) for u in members for v in members if u < v]
+    edges += [("b0_0", "b1_0", 1.0), ("b1_0", "b2_0", 1.0), ("b2_0", "b3_0", 1.0)]
+    csr = graph_analytics.build_csr([], edges)
+    for algorithm in graph_analytics.COMMUNITY_ALGORITHMS:
+        partition, score = graph_analytics.compute_communities(csr, algorithm)
+        assert len(set(partition)) == 4
+        assert score > 0.6
+
+
+@pytest.mark.asyncio
+async def test_manager_analytics_are_cached_per_graph_version(make_manager):
+    manager = await make_manager()
+    for name in "abcd":
+        await manager.add_entity(name=name.upper(), entity_type="generic", entity_id=name)
+    await manager.add_relationship(source_id="a", target_id="b", relation_type="cites")
+    await manager.add_relationship(source_id="b", target_id="c", relation_type="cites")
+
+    first = await manager.analyze_centrality(["pagerank", "degree"], top_k=2)
+    assert first.results["pagerank"][0]["id"] == "c"
+    assert first.results["pagerank"][0]["name"] == "C"
+    assert await manager.analyze_centrality(["pagerank", "degree"], top_k=2) is first
+
+    path = await manager.find_shortest_path("a", "c")
+    assert path.results["path"] == ["a", "b", "c"]
+    assert not (await manager.find_shortest_path("a", "d")).results["found"]
+
+    await manager.add_relationship(
+        source_id="a", target_id="d", relation_type="cites", metadata={"weight": 0.5}
+    )
+    assert await manager.analyze_centrality(["pagerank", "degree"], top_k=2) is not first
+    weighted = await manager.find_shortest_path("a", "d")
+    assert weighted.metadata["algorithm"] == "dijkstra"
+    assert weighted.results["length"] == pytest.approx(0.5)
+
+    communities = await manager.detect_communities(min_community_size=1)
+    assert sum(c["size"] for c in communities.results["communities"]) == 4
+    viz = await manager.create_interactive_visualization(max_nodes=3)
+    assert len(viz["nodes"]) == 3
+    assert all(0.0 <= node["x"] <= 1.0 for node in viz["nodes"])
+
+
+def test_force_directed_layout_blocks_do_not_change_the_result(monkeypatch):
+    edges = [(i, (i * 7 + 3) % 60) for i in range(60)]
+    whole = graph_analytics.force_directed_layout(60, edges, iterations=20, seed=3)
+    monkeypatch.setattr(graph_analytics, "LAYOUT_BLOCK_PAIRS", 60 * 7)
+    blocked = graph_analytics.force_directed_layout(60, edges, iterations=20, seed=3)
+    np.testing.assert_allclose(blocked, whole, rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.asyncio
+async def test_manager_path_cache_is_a_bounded_lru(make_manager, monkeypatch):
+    monkeypatch.setattr(UnifiedKnowledgeGraphManager, "ANALYSIS_CACHE_SIZE", 3)
+    manager = await make_manager()
+    for name in "abcde":
+        await manager.add_entity(
+            name=name.upper(), entity_type="generic", entity_id=name
+        )
+
+    first = await manager.find_shortest_path("a", "b")
+    for target in "cd":
+        await manager.find_shortest_path("a", target)
+    assert await manager.find_shortest_path("a", "b") is first
+    await manager.find_shortest_path("a", "e")
+
+    assert len(manager._analysis_cache) == 3
+    assert await manager.find_shortest_path("a", "b") is first
+    # "a"->"c" was the least recently used entry when "a"->"e" was added
+    assert [k[:3] for k in manager._analysis_cache] == [
+        ("path", "a", "d"),
+        ("path", "a", "e"),
+        ("path", "a", "b"),
+    ]
+
+
+def test_graph_analytics_benchmark_smoke():
+    import importlib.util
+    from pathlib import Path
+
+    spec = importlib.util.spec_from_file_location(
+        "benchmark_knowledge_graph",
+        Path(__file__).resolve().parents[1] / "scripts" / "benchmark_knowledge_graph.py",
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    report = module.run_benchmark(nodes=2000, edges=8000, communities=10, betweenness_samples=8)
+    assert report["edges"] == 8000
+    assert report["modularity"] > 0.3
+    # relaxed threshold; this is a regression guard, not a strict perf gate.
+    assert sum(report["timings"].values()) < 30.0
+
+
+def test_hierarchical_layout_lod_and_incremental_extension():
+    edges = []
+    for block in range(6):
+        members = [f"b{block}_{i}" for i in range(30)]
+        edges += [(members[i], members[(i + 1) % 30], 1.0) for i in range(30)]
+        edges += [(members[0], members[15], 1.0)]
+    edges += [(f"b{b}_0", f"b{b + 1}_0", 1.0) for b in range(5)]
+    csr = graph_analytics.build_csr([], edges)
+    layout = graph_analytics.build_layout(csr, version=1)
+    assert layout.positions.min() >= 0.0 and layout.positions.max() <= 1.0
+    assert int(layout.sizes.sum()) == csr.node_count
+
+    whole = graph_analytics.viewport_selection(layout, (0.0, 0.0, 1.0, 1.0), max_nodes=50)
+    assert whole["level"] == "clusters"
+    assert whole["visible_nodes"] == csr.node_count
+    everything = graph_analytics.viewport_selection(layout, (0.0, 0.0, 1.0, 1.0), max_nodes=500)
+    assert everything["level"] == "nodes" and len(everything["nodes"]) == csr.node_count
+
+    grown = graph_analytics.build_csr([], edges + [("new", "b2_3", 1.0)])
+    extended = graph_analytics.build_layout(grown, version=2, previous=layout)
+    for node_id, old in layout.index.items():
+        assert np.allclose(extended.positions[extended.index[node_id]], layout.positions[old])
+    new = extended.index["new"]
+    assert extended.communities[new] == layout.communities[layout.index["b2_3"]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("lazy", [False, True])
+async def test_manager_layout_viewport_deltas(make_manager, lazy):
+    manager = await make_manager(lazy_loading=lazy)
+    for name in "abcdef":
+        await manager.add_entity(name=name.upper(), entity_type="Party", entity_id=name)
+    for src, dst in [("a", "b"), ("b", "c"), ("d", "e"), ("e", "f")]:
+        await manager.add_relationship(source_id=src, target_id=dst, relation_type="cites")
+
+    full = await manager.get_layout_viewport()
+    assert not full["delta"] and full["level"] == "nodes"
+    assert {n["id"] for n in full["nodes"]} == set("abcdef")
+    assert {n["label"] for n in full["nodes"]} == set("ABCDEF")
+    assert len(full["edges"]) == 4
+
+    unchanged = await manager.get_layout_viewport(since_version=full["version"])
+    assert unchanged["delta"] and unchanged["nodes"] == [] and unchanged["edges"] == []
+
+    await manager.add_entity(name="G", entity_type="Party", entity_id="g")
+    await manager.add_relationship(source_id="f", target_id="g", relation_type="cites")
+    await manager.delete_relationship("rel_a_b_cites")
+    delta = await manager.get_layout_viewport(since_version=full["version"])
+    assert delta["delta"] and delta["version"] > full["version"]
+    assert "g" in {n["id"] for n in delta["nodes"]}
+    assert "a->b" in delta["removed_edges"]
+    assert {e["key"] for e in delta["edges"]} == {"f->g"}
+
+    clustered = await manager.get_layout_viewport(max_nodes=3)
+    assert clustered["level"] in ("clusters", "sampled")
+    assert len(clustered["nodes"]) <= 3
+    with pytest.raises(ValueError):
+        await manager.get_layout_viewport(x0=1.0, x1=0.0)
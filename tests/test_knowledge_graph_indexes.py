@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import pytest
+import pytest_asyncio
+
+from mem_db.knowledge.unified_knowledge_graph_manager import UnifiedKnowledgeGraphManager
+
+
+@pytest_asyncio.fixture
+async def make_manager(tmp_path):
+    """Open managers on one graph directory; their pools close at teardown."""
+    managers = []
+
+    async def _make(lazy: bool = False) -> UnifiedKnowledgeGraphManager:
+        manager = UnifiedKnowledgeGraphManager(
+            graph_path=tmp_path / "kg", lazy_loading=lazy, hot_node_cache_size=2
+        )
+        managers.append(manager)
+        assert await manager.initialize()
+        return manager
+
+    yield _make
+    for manager in managers:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("lazy", [False, True])
+async def test_name_index_tracks_add_and_delete(make_manager, lazy):
+    manager = await make_manager(lazy)
+    ent_id = await manager.add_entity(name="  Acme Corp ", entity_type="Party")
+    assert await manager.find_entity_id_by_name("acme corp") == ent_id
+
+    await manager.add_entity(name="Acme Holdings", entity_type="Party", entity_id=ent_id)
+    assert await manager.find_entity_id_by_name("acme corp") is None
+    assert await manager.find_entity_id_by_name("ACME HOLDINGS") == ent_id
+
+    assert await manager.delete_entity(ent_id)
+    assert await manager.find_entity_id_by_name("acme holdings") is None
+    assert await manager.list_entity_ids_by_type("Party") == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("lazy", [False, True])
+async def test_cursor_pagination_is_stable(make_manager, lazy):
+    manager = await make_manager(lazy)
+    for idx in range(7):
+        await manager.add_entity(name=f"e{idx}", entity_type="generic", entity_id=f"id_{idx:02d}")
+
+    seen = []
+    cursor = None
+    while True:
+        page = await manager.list_entities(limit=3, cursor=cursor)
+        if not page:
+            break
+        seen.extend(item["id"] for item in page)
+        cursor = page[-1]["id"]
+    assert seen == [f"id_{idx:02d}" for idx in range(7)]
+    offset_page = await manager.list_entities(limit=2, offset=5)
+    assert [item["id"] for item in offset_page] == ["id_05", "id_06"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("lazy", [False, True])
+async def test_bulk_upsert_resolves_names_and_persists(make_manager, lazy):
+    manager = await make_manager(lazy)
+    existing = await manager.add_entity(name="Contract", entity_type="generic")
+    result = await manager.bulk_upsert(
+        entities=[{"name": "Party", "entity_type": "generic"}],
+        relationships=[
+            {"source_name": "contract", "target_name": "party", "relation_type": "obligates"},
+            {"source_name": "missing", "target_name": "party", "relation_type": "cites"},
+        ],
+    )
+    assert len(result["entity_ids"]) == 1
+    assert len(result["relationship_ids"]) == 1
+
+    party_id = result["entity_ids"][0]
+    rels = await manager.get_entity_relationships(existing, direction="out")
+    assert [r["target_id"] for r in rels] == [party_id]
+    assert await manager.get_entity_relationships(existing, direction="in") == []
+
+    reloaded = await make_manager(lazy)
+    assert await reloaded.find_entity_id_by_name("party") == party_id
+    assert len(await reloaded.list_relationships(limit=10)) == 1
+
+
+@pytest.mark.asyncio
+async def test_lazy_subgraph_matches_in_memory_neighborhood(make_manager):
+    eager = await make_manager()
+    for name in "abcde":
+        await eager.add_entity(name=name, entity_type="generic", entity_id=name)
+    for src, dst in [("a", "b"), ("c", "b"), ("c", "d"), ("d", "e")]:
+        await eager.add_relationship(source_id=src, target_id=dst, relation_type="cites")
+
+    lazy = await make_manager(lazy=True)
+    for depth in (1, 2, 3):
+        expected = await eager.get_subgraph("a", depth)
+        actual = await lazy.get_subgraph("a", depth)
+        assert sorted(n["id"] for n in actual["nodes"]) == sorted(n["id"] for n in expected["nodes"])
+        assert sorted(e["key"] for e in actual["edges"]) == sorted(e["key"] for e in expected["edges"])
+    assert await lazy.get_subgraph("missing", 2) == {"nodes": [], "edges": []}
+    assert (await lazy.get_status())["hot_entities_cached"] <= 2
+
+    graph = await lazy.materialize_graph()
+    assert graph.number_of_nodes() == 5
+    assert graph.number_of_edges() == 4
+    await lazy.delete_relationship("rel_d_e_cites")
+    assert (await lazy.materialize_graph()).number_of_edges() == 3
+    status = await lazy.get_status()
+    assert status["storage_mode"] == "lazy"
+    assert status["stats"]["total_relationships"] == 3
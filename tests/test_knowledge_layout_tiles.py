@@ -0,0 +1,24 @@
+import pytest
+
+from routes.knowledge import get_knowledge_service
+from services.knowledge_service import KnowledgeService
+
+
+@pytest.fixture
+def tile_client(client):
+    service = KnowledgeService(knowledge_manager=object(), provenance_service=object())
+    client.app.dependency_overrides[get_knowledge_service] = lambda: service
+    yield client
+    client.app.dependency_overrides.pop(get_knowledge_service, None)
+
+
+def test_layout_tile_path_params_are_validated(tile_client):
+    assert tile_client.get("/api/knowledge/layout/tiles/-1/0/0").status_code == 422
+    assert tile_client.get("/api/knowledge/layout/tiles/100000/0/0").status_code == 422
+    assert tile_client.get("/api/knowledge/layout/tiles/2/0/-1").status_code == 422
+
+
+def test_layout_tile_outside_the_zoom_grid_is_a_bad_request(tile_client):
+    resp = tile_client.get("/api/knowledge/layout/tiles/2/4/0")
+    assert resp.status_code == 400
+    assert "out of range" in resp.json()["detail"]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from mem_db.memory.memory_interfaces import MemoryRecord, MemoryType
+from mem_db.memory.unified_memory_manager import UnifiedMemoryManager
+
+
+class _FakeCollection:
+    def __init__(self, ids):
+        self.ids = ids
+
+    def query(self, query_texts, n_results, where=None):
+        ids = self.ids[:n_results]
+        return {"ids": [ids], "distances": [[0.1 * i for i in range(len(ids))]]}
+
+
+def _query(limit: int = 10):
+    # Same shape search() builds for plain-string queries
+    return SimpleNamespace(
+        query_text="zzz", memory_type=None, namespace=None, agent_id=None, limit=limit
+    )
+
+
+async def _manager_with_records(tmp_path: Path, count: int):
+    manager = UnifiedMemoryManager(db_path=tmp_path / "mem.db", vector_backend="faiss")
+    assert await manager.initialize()
+    ids = []
+    for i in range(count):
+        ids.append(
+            await manager.store(
+                MemoryRecord(
+                    record_id=f"rec-{i:03d}",
+                    namespace="tests",
+                    key=f"k{i}",
+                    content=f"record {i}",
+                    memory_type=MemoryType.ANALYSIS,
+                )
+            )
+        )
+    manager.vector_backend = "chromadb"
+    return manager, ids
+
+
+@pytest.mark.asyncio
+async def test_semantic_hits_hydrate_in_one_query_and_keep_rank_order(tmp_path):
+    manager, ids = await _manager_with_records(tmp_path, 12)
+    ranked = list(reversed(ids))[:8] + ["missing-id"]
+    manager._vector_collection = _FakeCollection(ranked)
+    manager._record_cache.clear()
+
+    reads_before = manager._db_pool.stats()["reads"]
+    hits = await manager._search_vector(_query())
+    assert [h.record.record_id for h in hits] == ranked[:8]
+    assert manager._db_pool.stats()["reads"] == reads_before + 1
+
+    # A second search is served from the LRU cache without touching SQLite.
+    await manager._search_vector(_query())
+    assert manager._db_pool.stats()["reads"] == reads_before + 2  # only "missing-id"
+
+    stats = await manager.get_statistics()
+    assert stats["search_latency_ms"]["hydrate"]["count"] == 2
+    assert stats["search_latency_ms"]["vector_query"]["count"] == 2
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_record_cache_evicts_least_recently_used(tmp_path):
+    manager, ids = await _manager_with_records(tmp_path, 3)
+    manager._cache_max_size = 3
+    await manager.retrieve(ids[0])  # ids[1] is now the least recently used
+    await manager.store(
+        MemoryRecord(
+            record_id="rec-new",
+            namespace="tests",
+            key="new",
+            content="new record",
+            memory_type=MemoryType.ANALYSIS,
+        )
+    )
+    assert list(manager._record_cache) == [ids[2], ids[0], "rec-new"]
+    await manager.close()
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import time
+
+import pytest
+
+from mem_db.database import DatabaseManager
+from services.organization_service import OrganizationService
+from services.provenance_service import ProvenanceService
+
+_BATCH_ENTRY = re.compile(r"^\[(\d+)\]$", re.MULTILINE)
+
+
+class _StubLLM:
+    def __init__(self, latency: float = 0.0, fail_after: int | None = None):
+        self.latency = latency
+        self.fail_after = fail_after
+        self.prompts: list[str] = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def complete_sync(self, prompt: str, **_):
+        with self._lock:
+            self.prompts.append(prompt)
+            calls = len(self.prompts)
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            time.sleep(self.latency)
+            if self.fail_after is not None and calls > self.fail_after:
+                raise RuntimeError("stub provider down")
+            answer = {
+                "proposed_folder": "Clients/Acme",
+                "proposed_filename": "doc.pdf",
+                "confidence": 0.8,
+                "rationale": "stub",
+                "alternatives": [],
+                "evidence_spans": [{"start_char": 0, "end_char": 4, "quote": "memo"}],
+            }
+            indexes = [int(m) for m in _BATCH_ENTRY.findall(prompt)]
+            if indexes:
+                return json.dumps([{**answer, "index": i} for i in indexes])
+            return json.dumps(answer)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+def _add_file(db: DatabaseManager, path: str, status: str = "ready") -> int:
+    return db.upsert_indexed_file(
+        display_name=path.rsplit("/", 1)[-1].rsplit("\\", 1)[-1],
+        original_path=path,
+        normalized_path=path,
+        file_size=1,
+        mtime=1.0,
+        mime_type="application/pdf",
+        mime_source="test",
+        sha256=hashlib.sha256(path.encode("utf-8")).hexdigest(),
+        ext=".pdf",
+        status=status,
+        metadata={"preview": "memo about the Acme contract"},
+    )
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    manager = DatabaseManager(str(tmp_path / "org.db"))
+    provenance = ProvenanceService(manager)
+    monkeypatch.setattr(
+        "services.organization_service.get_provenance_service", lambda: provenance
+    )
+    monkeypatch.setattr(
+        "services.organization_service.OrganizationLLMPolicy.configured_status",
+        lambda: {"xai": True, "deepseek": True},
+    )
+    OrganizationService._llm_circuit_record_success()
+    yield manager
+    OrganizationService._llm_circuit_record_success()
+    manager.close()
+
+
+def _service(db: DatabaseManager, llm: _StubLLM, **settings) -> OrganizationService:
+    svc = OrganizationService(db)
+    svc.llm_manager = llm
+    svc._known_folders_from_root = lambda *_args, **_kwargs: []
+    svc._seed_index_from_root = lambda *_args, **_kwargs: 0
+    for key, value in settings.items():
+        setattr(svc, key, value)
+    return svc
+
+
+def test_scope_query_matches_windows_and_wsl_variants_case_insensitively(db):
+    _add_file(db, "C:\\Users\\Ann\\Docs\\a.pdf")
+    _add_file(db, "/mnt/c/users/ann/docs/b.pdf")
+    _add_file(db, "C:/Users/Ann/Docs/gone.pdf", status="missing")
+    _add_file(db, "C:/Users/Ann/Docsets/c.pdf")
+    _add_file(db, "D:/Other/d.pdf")
+
+    prefixes = OrganizationService._scope_prefixes("c:/users/ann/docs/")
+    items, counts = db.list_indexed_files_in_scope(prefixes, limit=10)
+
+    assert [x["display_name"] for x in items] == ["a.pdf", "b.pdf"]
+    assert counts == {"scoped": 3, "ready": 2, "candidates": 2}
+    assert isinstance(items[0]["metadata_json"], dict)
+
+    with db.get_connection() as conn:
+        plan = " ".join(
+            str(tuple(r))
+            for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM files_index "
+                "WHERE lower(replace(trim(normalized_path), char(92), '/')) >= ? "
+                "AND lower(replace(trim(normalized_path), char(92), '/')) < ?",
+                ("c:/", "c:0"),
+            ).fetchall()
+        )
+    assert "idx_files_index_scope_path" in plan
+
+
+def test_generate_proposals_batches_similar_files_and_runs_calls_concurrently(db):
+    for folder in ("alpha", "beta", "gamma", "delta"):
+        for n in range(4):
+            _add_file(db, f"/data/inbox/{folder}/memo_{n}.pdf")
+    _add_file(db, "/data/elsewhere/memo.pdf")
+    llm = _StubLLM(latency=0.05)
+    svc = _service(
+        db, llm, llm_concurrency=4, llm_batch_size=4, proposal_write_chunk=50
+    )
+
+    out = svc.generate_proposals(
+        limit=100, provider="xai", model="stub", root_prefix="/data/inbox"
+    )
+
+    assert out["created"] == 16
+    assert out["scoped_indexed_count"] == 16
+    # One prompt per folder, all four in flight together
+    assert len(llm.prompts) == 4
+    assert llm.max_in_flight == 4
+    assert all("Classify each numbered file" in p for p in llm.prompts)
+    stored = db.organization_list_proposals(status="proposed", limit=100)
+    assert len(stored) == 16
+    assert all(p["metadata"].get("provenance_id") for p in out["items"])
+
+
+def test_generate_proposals_falls_back_to_single_prompts_for_skipped_batch_entries(db):
+    _add_file(db, "/data/inbox/a/one.pdf")
+    _add_file(db, "/data/inbox/a/two.pdf")
+    svc = _service(db, _StubLLM(), llm_batch_size=2)
+    svc._llm_suggest_batch = lambda **_: [None, None]
+    singles: list[str] = []
+    original = svc._llm_suggest
+
+    def _single(**kwargs):
+        singles.append(kwargs["file_name"])
+        return original(**kwargs)
+
+    svc._llm_suggest = _single
+
+    out = svc.generate_proposals(
+        limit=10, provider="xai", model="stub", root_prefix="/data/inbox"
+    )
+
+    assert out["created"] == 2
+    assert sorted(singles) == ["one.pdf", "two.pdf"]
+
+
+def test_generate_proposals_keeps_committed_chunks_when_a_later_chunk_fails(db):
+    for n in range(5):
+        _add_file(db, f"/data/inbox/dir{n}/memo.pdf")
+    svc = _service(
+        db,
+        _StubLLM(fail_after=2),
+        llm_concurrency=1,
+        llm_batch_size=1,
+        proposal_write_chunk=2,
+    )
+
+    with pytest.raises(RuntimeError, match="llm_suggest_failed"):
+        svc.generate_proposals(
+            limit=10, provider="xai", model="stub", root_prefix="/data/inbox"
+        )
+
+    stored = db.organization_list_proposals(status="proposed", limit=100)
+    assert len(stored) == 2
+
+
+def test_feedback_is_read_once_per_run(db, monkeypatch):
+    _add_file(db, "/data/inbox/a/memo.pdf")
+    calls = []
+    original = db.organization_list_feedback
+
+    def _counting(**kwargs):
+        calls.append(kwargs)
+        return original(**kwargs)
+
+    monkeypatch.setattr(db, "organization_list_feedback", _counting)
+    svc = _service(db, _StubLLM())
+
+    svc.generate_proposals(
+        limit=10, provider="xai", model="stub", root_prefix="/data/inbox"
+    )
+
+    assert len(calls) == 1
@@ -12,12 +12,22 @@ class _FakeDB:
         self.deleted_ids: list[int] = []
         self._next_id = add_return_id
 
-    def list_all_indexed_files(self) -> list[dict]:
-        return self._rows
-
-    def organization_add_proposal(self, proposal: dict) -> int:
-        self.add_calls += 1
-        return self._next_id
+    def list_indexed_files_in_scope(
+        self, prefixes, *, limit: int, exclude_statuses=("missing",)
+    ):
+        items = [
+            r for r in self._rows if str(r.get("status") or "") not in exclude_statuses
+        ]
+        counts = {
+            "scoped": len(self._rows),
+            "ready": len(items),
+            "candidates": len(items),
+        }
+        return items[:limit], counts
+
+    def organization_add_proposals(self, proposals: list[dict]) -> list[int]:
+        self.add_calls += len(proposals)
+        return [self._next_id for _ in proposals]
 
     def organization_delete_proposal(self, proposal_id: int) -> bool:
         self.deleted_ids.append(proposal_id)
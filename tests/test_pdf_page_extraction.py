@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from agents.processors.document_processor import (
+    DocumentProcessingConfig,
+    DocumentProcessor,
+)
+from core.container.service_container_impl import ProductionServiceContainer
+from mem_db.page_text_cache import PageTextCache
+from utils.pdf_pages import page_shards, shutdown_pdf_page_pool
+
+pytest.importorskip("pypdf")
+
+
+def _write_pdf(path: Path, texts: list[str]) -> None:
+    """Minimal PDF with one line of Helvetica text per page."""
+    n = len(texts)
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(n))
+    objs = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {n} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objs.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        )
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, body in enumerate(objs):
+        offsets.append(len(out))
+        out += f"{i + 1} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{off:010d} 00000 n \n".encode() for off in offsets)
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\n".encode()
+    out += f"startxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(out)
+
+
+@pytest.fixture
+def processor(tmp_path: Path):
+    config = DocumentProcessingConfig(
+        pdf_page_workers=2,
+        pdf_pages_per_shard=2,
+        pdf_parallel_min_pages=1,
+        pdf_page_cache_path=tmp_path / "cache" / "pages.db",
+    )
+    yield DocumentProcessor(services=ProductionServiceContainer(), config=config)
+    shutdown_pdf_page_pool()
+
+
+def test_page_shards_split_sorted_pages():
+    assert page_shards([5, 1, 2, 3, 9], 2) == [[1, 2], [3, 5], [9]]
+
+
+def test_pdf_pages_extract_in_shards_and_reuse_the_page_cache(processor, tmp_path):
+    pdf = tmp_path / "filing.pdf"
+    _write_pdf(pdf, [f"Page text {i}" for i in range(1, 6)] + [""])
+
+    content, metadata, _, _, method = asyncio.run(processor._process_pdf(pdf))
+
+    assert method == "pypdf"
+    assert metadata["page_count"] == 6
+    assert metadata["pages_extracted"] == 6
+    assert metadata["extraction_shards"] == 3
+    assert content.index("--- Page 1 ---") < content.index("--- Page 5 ---")
+    assert "Page text 5" in content
+    assert "--- Page 6 ---" not in content
+
+    again, metadata2, _, _, _ = asyncio.run(processor._process_pdf(pdf))
+
+    assert again == content
+    assert metadata2["page_cache_hits"] == 6
+    assert metadata2["pages_extracted"] == 0
+
+
+def test_page_text_cache_separates_extractors_and_evicts_oldest(tmp_path):
+    cache = PageTextCache(tmp_path / "pages.db", max_entries=4)
+    cache.put_pages("a" * 64, [(1, "one"), (2, "two")], extractor="pypdf")
+    cache.put_pages("a" * 64, [(1, "ocr one")], extractor="ocr")
+
+    assert cache.get_pages("a" * 64, [1, 2, 3], extractor="pypdf") == {
+        1: "one",
+        2: "two",
+    }
+    assert cache.get_pages("a" * 64, [1], extractor="ocr") == {1: "ocr one"}
+
+    cache.put_pages("b" * 64, [(1, "x"), (2, "y")], extractor="pypdf")
+    assert cache.get_pages("b" * 64, [1, 2], extractor="pypdf") == {1: "x", 2: "y"}
+    cache.close()
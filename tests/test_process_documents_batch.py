@@ -0,0 +1,105 @@
+import asyncio
+import json
+from typing import Any, Dict
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+class _SlowAgentService:
+    """Processes a file after a delay read from its content; tracks concurrency."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.seen_paths: list[str] = []
+
+    async def dispatch_task(self, task_type: str, payload: Dict[str, Any]) -> Any:
+        path = payload["file_path"]
+        self.seen_paths.append(path)
+        with open(path, "rb") as fh:
+            body = fh.read()
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if body.startswith(b"boom"):
+                raise RuntimeError("parser crashed")
+            await asyncio.sleep(float(body.split(b":", 1)[0] or 0))
+            return {
+                "success": True,
+                "data": {"size": len(body)},
+                "agent_type": "document_processor",
+                "metadata": {},
+            }
+        finally:
+            self.in_flight -= 1
+
+
+def _client(service: _SlowAgentService) -> TestClient:
+    from routes.agent_routes import common
+    from routes.agents import router
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+
+    async def _service():
+        return service
+
+    app.dependency_overrides[common.get_agent_service] = _service
+    return TestClient(app)
+
+
+def _files(*bodies: bytes):
+    return [
+        ("files", (f"doc{i}.txt", body, "text/plain")) for i, body in enumerate(bodies)
+    ]
+
+
+def test_process_documents_runs_files_concurrently_and_keeps_upload_order(monkeypatch):
+    from routes.agent_routes import analysis
+
+    monkeypatch.setattr(analysis, "PROCESS_DOCUMENTS_CONCURRENCY", 2)
+    service = _SlowAgentService()
+    client = _client(service)
+
+    r = client.post(
+        "/api/agents/process-documents",
+        files=_files(b"0.2:a", b"0.05:b", b"0.05:c", b"boom"),
+    )
+
+    assert r.status_code == 200
+    body = r.json()
+    assert [item["filename"] for item in body["items"]] == [
+        "doc0.txt",
+        "doc1.txt",
+        "doc2.txt",
+        "doc3.txt",
+    ]
+    assert body["processed_count"] == 3
+    assert body["failed_count"] == 1
+    assert "parser crashed" in body["items"][3]["error"]
+    assert service.max_in_flight == 2
+    assert all(item["timing"]["total_seconds"] >= 0 for item in body["items"])
+    # Temp copies are removed once each file is done
+    assert not any(__import__("os").path.exists(p) for p in service.seen_paths)
+
+
+def test_process_documents_streams_ndjson_in_completion_order(monkeypatch):
+    from routes.agent_routes import analysis
+
+    monkeypatch.setattr(analysis, "PROCESS_DOCUMENTS_CONCURRENCY", 3)
+    client = _client(_SlowAgentService())
+
+    r = client.post(
+        "/api/agents/process-documents?stream=true",
+        files=_files(b"0.3:slow", b"0:fast", b"0.1:mid"),
+    )
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines() if line.strip()]
+    files = [line for line in lines if line["event"] == "file"]
+    assert [f["filename"] for f in files] == ["doc1.txt", "doc2.txt", "doc0.txt"]
+    assert lines[-1]["event"] == "summary"
+    assert lines[-1]["total"] == 3
+    assert lines[-1]["processed_count"] == 3
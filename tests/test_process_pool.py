@@ -0,0 +1,28 @@
+import os
+
+from utils import ocr_pages, pdf_pages
+from utils.process_pool import LazyProcessPool
+
+
+def test_lazy_process_pool_reuses_resizes_and_shuts_down():
+    lazy = LazyProcessPool()
+    try:
+        first = lazy.get(1)
+        assert lazy.get(1) is first
+        assert first.submit(os.getpid).result(timeout=60) != os.getpid()
+
+        resized = lazy.get(2)
+        assert resized is not first
+        assert resized.submit(abs, -3).result(timeout=60) == 3
+    finally:
+        lazy.shutdown()
+    assert lazy.get(1) is not resized
+    lazy.shutdown()
+
+
+def test_pdf_and_ocr_modules_keep_separate_pools():
+    try:
+        assert pdf_pages.get_pdf_page_pool(1) is not ocr_pages.get_ocr_pool(1)
+    finally:
+        pdf_pages.shutdown_pdf_page_pool()
+        ocr_pages.shutdown_ocr_pool()
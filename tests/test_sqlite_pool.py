@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from mem_db.sqlite_pool import AsyncSQLitePool
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_connections_and_queues_writes(tmp_path):
+    pool = AsyncSQLitePool(tmp_path / "pool.db", size=2)
+    async with pool.write() as db:
+        await db.execute("CREATE TABLE t (n INTEGER)")
+        await db.commit()
+
+    async with pool.read() as first:
+        pass
+    async with pool.read() as second:
+        pass
+    assert first is second
+
+    async def insert(n: int) -> None:
+        async with pool.write() as db:
+            await db.execute("INSERT INTO t VALUES (?)", (n,))
+            await asyncio.sleep(0)
+            await db.commit()
+
+    await asyncio.gather(*(insert(n) for n in range(20)))
+
+    async with pool.read() as db:
+        async with db.execute("PRAGMA journal_mode") as cursor:
+            assert (await cursor.fetchone())[0] == "wal"
+        async with db.execute("SELECT COUNT(*) FROM t") as cursor:
+            assert (await cursor.fetchone())[0] == 20
+
+    stats = pool.stats()
+    assert stats["writes"] == 21 and stats["reads"] == 3
+    assert stats["idle_readers"] == 2 and stats["overflow_connections"] == 0
+    await pool.close()
+    assert not pool.is_open
+
+
+@pytest.mark.asyncio
+async def test_uncommitted_writes_are_rolled_back_on_release(tmp_path):
+    pool = AsyncSQLitePool(tmp_path / "pool.db", size=1)
+    async with pool.write() as db:
+        await db.execute("CREATE TABLE t (n INTEGER)")
+        await db.commit()
+    with pytest.raises(RuntimeError):
+        async with pool.write() as db:
+            await db.execute("INSERT INTO t VALUES (1)")
+            raise RuntimeError("boom")
+
+    async with pool.read() as db:
+        async with db.execute("SELECT COUNT(*) FROM t") as cursor:
+            assert (await cursor.fetchone())[0] == 0
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_vector_store_reports_pool_stats(tmp_path):
+    import numpy as np
+
+    from mem_db.vector_store.unified_vector_store import UnifiedVectorStore
+
+    store = UnifiedVectorStore(store_path=tmp_path / "vs", dimension=4)
+    assert await store.initialize()
+    await store.add_document("doc", np.ones(4, dtype=np.float32))
+    stats = await store.get_statistics()
+    assert stats["db_pool"]["writes"] >= 2
+    await store.close()
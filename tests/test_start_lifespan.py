@@ -39,3 +39,19 @@ async def test_lifespan_propagates_startup_errors(monkeypatch) -> None:
     with pytest.raises(RuntimeError, match="startup failure"):
         async with Start.app.router.lifespan_context(Start.app):
             pass
+
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_the_knowledge_manager(monkeypatch) -> None:
+    import mem_db.knowledge as knowledge
+
+    closed = []
+
+    async def fake_close() -> None:
+        closed.append(True)
+
+    monkeypatch.setattr(knowledge, "close_knowledge_manager", fake_close)
+
+    await Start._shutdown_services()
+
+    assert closed == [True]
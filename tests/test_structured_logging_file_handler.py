@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+
+from tools.db.interfaces.logging import LogCategory, LogFormatter, LogLevel, LogRecord
+from tools.db.structured_logging.handlers import FileLogHandler
+from tools.db.structured_logging.logger import StructuredLoggerImpl
+
+
+class _LineFormatter(LogFormatter):
+    def __init__(self, gate: threading.Event | None = None):
+        self.gate = gate
+
+    def format(self, record: LogRecord) -> str:
+        if self.gate is not None:
+            self.gate.wait(5)
+        return f"{record.level.name} {record.message}"
+
+
+def _record(message: str, level: LogLevel = LogLevel.INFO) -> LogRecord:
+    return LogRecord(
+        level=level,
+        message=message,
+        category=LogCategory.SYSTEM,
+        timestamp=datetime.now(),
+        logger_name="test",
+    )
+
+
+def test_sync_logger_writes_through_the_background_writer_and_rotates(tmp_path):
+    path = tmp_path / "app.log"
+    handler = FileLogHandler(
+        str(path), max_size=200, backup_count=2, batch_size=4, flush_interval=0.05
+    )
+    handler.set_formatter(_LineFormatter())
+    logger = StructuredLoggerImpl("test", LogLevel.DEBUG)
+    logger.add_handler(handler)
+
+    for i in range(40):
+        logger.info(f"message number {i:02d}")
+    handler.close()
+
+    assert handler.written == 40 and handler.dropped == 0
+    assert path.with_suffix(".log.1").exists()
+    assert path.with_suffix(".log.2").exists()
+    assert not path.with_suffix(".log.3").exists()
+    tail = path.read_text(encoding="utf-8").splitlines()
+    assert tail[-1] == "INFO message number 39"
+    # Handles are closed; later records are ignored rather than reopening the file
+    assert handler.enqueue(_record("late")) is False
+
+
+def test_full_queue_drops_without_blocking_and_reports_the_drop(tmp_path):
+    path = tmp_path / "burst.log"
+    gate = threading.Event()
+    handler = FileLogHandler(str(path), queue_size=5, flush_interval=0.05)
+    handler.set_formatter(_LineFormatter(gate))
+
+    started = time.perf_counter()
+    accepted = [handler.enqueue(_record(f"burst {i}")) for i in range(50)]
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5
+    # The writer holds at most one batch while blocked; the queue keeps five more
+    assert 5 <= sum(accepted) <= 5 + handler.batch_size
+    assert handler.dropped == 50 - sum(accepted)
+    gate.set()
+    handler.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == sum(accepted) + 1
+    assert f"WARNING {handler.dropped} log records dropped: log queue full" in lines
+
+
+def test_sample_policy_thins_low_severity_records_but_keeps_errors(tmp_path):
+    gate = threading.Event()
+    handler = FileLogHandler(
+        str(tmp_path / "sampled.log"),
+        queue_size=100,
+        batch_size=1,
+        overflow="sample",
+        sample_every=4,
+    )
+    handler.set_formatter(_LineFormatter(gate))
+    handler.enqueue(_record("occupies the writer"))
+    time.sleep(0.05)
+    for i in range(80):
+        handler.enqueue(_record(f"fill {i}"))
+
+    info_kept = [handler.enqueue(_record(f"info {i}")) for i in range(20)]
+    error_kept = handler.enqueue(_record("disk failing", LogLevel.ERROR))
+
+    assert sum(info_kept) == 5
+    assert error_kept is True
+    gate.set()
+    handler.close()
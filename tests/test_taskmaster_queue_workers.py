@@ -39,3 +39,212 @@ def test_taskmaster_queue_retry_then_dead_letter(monkeypatch, tmp_path):
     dead = db.taskmaster_dead_letters(limit=10)
     assert len(dead) == 1
     assert dead[0]["error_message"] == "boom"
+
+
+def test_taskmaster_concurrent_claims_never_share_a_job(tmp_path):
+    import threading
+
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    for i in range(40):
+        db.taskmaster_queue_enqueue(mode="index", payload={"i": i})
+
+    claimed = []
+    lock = threading.Lock()
+
+    def worker(name):
+        while True:
+            job = db.taskmaster_queue_claim_next(worker_name=name, lease_seconds=60)
+            if not job:
+                return
+            with lock:
+                claimed.append(int(job["id"]))
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(claimed) == sorted(set(claimed))
+    assert len(claimed) == 40
+
+
+def test_taskmaster_expired_lease_is_reclaimed_and_fenced(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    job_id = db.taskmaster_queue_enqueue(mode="index", payload={}, max_retries=1)
+    job = db.taskmaster_queue_claim_next(worker_name="crashed", lease_seconds=60)
+    assert job["lease_expires_at"] is not None
+    assert db.taskmaster_queue_heartbeat(
+        job_id, lease_token=job["lease_token"], lease_seconds=60
+    )
+
+    with db.get_connection() as conn:
+        conn.execute(
+            "UPDATE taskmaster_job_queue "
+            "SET lease_expires_at = datetime('now', '-1 second')"
+        )
+        conn.commit()
+    assert db.taskmaster_queue_reclaim_expired() == {"requeued": 1, "dead_lettered": 0}
+
+    # The crashed worker no longer owns the job.
+    assert not db.taskmaster_queue_heartbeat(job_id, lease_token=job["lease_token"])
+    assert not db.taskmaster_queue_mark_completed(
+        job_id, lease_token=job["lease_token"]
+    )
+
+    again = db.taskmaster_queue_claim_next(worker_name="w2", lease_seconds=60)
+    assert int(again["id"]) == job_id and again["retry_count"] == 1
+    with db.get_connection() as conn:
+        conn.execute(
+            "UPDATE taskmaster_job_queue "
+            "SET lease_expires_at = datetime('now', '-1 second')"
+        )
+        conn.commit()
+    assert db.taskmaster_queue_reclaim_expired() == {"requeued": 0, "dead_lettered": 1}
+    assert db.taskmaster_dead_letters()[0]["error_message"] == "lease expired"
+
+
+def test_taskmaster_lease_is_fenced_by_claim_token_not_worker_name(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    job_id = db.taskmaster_queue_enqueue(mode="index", payload={}, max_retries=3)
+    stale = db.taskmaster_queue_claim_next(
+        worker_name="taskmaster-worker-1", lease_seconds=60
+    )
+    with db.get_connection() as conn:
+        conn.execute(
+            "UPDATE taskmaster_job_queue "
+            "SET lease_expires_at = datetime('now', '-1 second')"
+        )
+        conn.commit()
+    db.taskmaster_queue_reclaim_expired()
+    with db.get_connection() as conn:
+        conn.execute(
+            "UPDATE taskmaster_job_queue "
+            "SET available_at = datetime('now', '-1 second')"
+        )
+        conn.commit()
+    # Another process's worker with the same name now holds the job.
+    current = db.taskmaster_queue_claim_next(
+        worker_name="taskmaster-worker-1", lease_seconds=60
+    )
+    assert int(current["id"]) == job_id
+    assert current["lease_token"] != stale["lease_token"]
+
+    assert not db.taskmaster_queue_heartbeat(job_id, lease_token=stale["lease_token"])
+    assert (
+        db.taskmaster_queue_mark_retry_or_dead_letter(
+            job_id, error_message="late failure", lease_token=stale["lease_token"]
+        )
+        == "lease_lost"
+    )
+    assert not db.taskmaster_queue_mark_completed(
+        job_id, lease_token=stale["lease_token"]
+    )
+    with db.get_connection() as conn:
+        row = conn.execute(
+            "SELECT status, retry_count FROM taskmaster_job_queue WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+    assert (row["status"], row["retry_count"]) == ("running", 1)
+
+    assert db.taskmaster_queue_heartbeat(job_id, lease_token=current["lease_token"])
+    assert db.taskmaster_queue_mark_completed(
+        job_id, lease_token=current["lease_token"]
+    )
+    assert (
+        db.taskmaster_queue_mark_retry_or_dead_letter(
+            job_id, error_message="x", lease_token=current["lease_token"]
+        )
+        == "lease_lost"
+    )
+    assert (
+        db.taskmaster_queue_mark_retry_or_dead_letter(404, error_message="x")
+        == "missing"
+    )
+
+
+def test_taskmaster_worker_pool_drains_queue(monkeypatch, tmp_path):
+    import time
+
+    from services.taskmaster_worker_pool import TaskMasterWorkerPool
+
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    for i in range(12):
+        db.taskmaster_queue_enqueue(mode="index", payload={"i": i})
+
+    def fake_run(self, *, mode, payload):
+        time.sleep(0.01)
+        return {"success": True, "run": {"payload": payload}}
+
+    monkeypatch.setattr(TaskMasterService, "run_file_pipeline", fake_run)
+    pool = TaskMasterWorkerPool(db, workers=3, poll_interval=0.05, lease_seconds=60)
+    pool.start()
+    deadline = time.monotonic() + 10
+    while (
+        db.taskmaster_queue_depth(include_running=True) and time.monotonic() < deadline
+    ):
+        time.sleep(0.02)
+    pool.stop(timeout=5)
+
+    assert db.taskmaster_queue_depth(include_running=True) == 0
+    assert pool.stats()["jobs_completed"] == 12
+
+
+def test_taskmaster_worker_pool_picks_up_every_notified_job_without_polling():
+    import threading
+    import time
+
+    from services.taskmaster_worker_pool import TaskMasterWorkerPool
+
+    lock = threading.Lock()
+    queued: list[int] = []
+    done: list[int] = []
+
+    class _FakeService:
+        def __init__(self, db):
+            pass
+
+        def run_worker_once(self, *, worker_name, lease_seconds):
+            with lock:
+                if not queued:
+                    return {"idle": True}
+                done.append(queued.pop())
+            return {"status": "completed"}
+
+    # Polling alone would take 30s; every job must be picked up through notify()
+    pool = TaskMasterWorkerPool(
+        None, workers=2, poll_interval=30, service_factory=_FakeService
+    )
+    pool.start()
+    try:
+        time.sleep(0.05)
+        for i in range(50):
+            with lock:
+                queued.append(i)
+            pool.notify()
+            time.sleep(0.001 * (i % 3))
+        deadline = time.monotonic() + 5
+        while len(done) < 50 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        pool.stop(timeout=5)
+
+    assert sorted(done) == list(range(50))
+    assert pool.stats()["jobs_completed"] == 50
+
+
+def test_taskmaster_worker_pool_keeps_wakeups_sent_while_workers_are_busy():
+    import time
+
+    from services.taskmaster_worker_pool import TaskMasterWorkerPool
+
+    pool = TaskMasterWorkerPool(
+        None, workers=2, poll_interval=30, service_factory=lambda db: None
+    )
+    # Jobs enqueued while nobody waits: the next idle workers must not sleep
+    pool.notify(5)
+    started = time.monotonic()
+    pool._wait_for_work()
+    pool._wait_for_work()
+    assert time.monotonic() - started < 1
+    assert pool._pending_wakeups == 0
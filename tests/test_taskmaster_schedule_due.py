@@ -37,3 +37,126 @@ def test_run_due_schedules_executes_due_and_marks_ran(monkeypatch, tmp_path):
     ran = next(s for s in schedules if s["id"] == sid)
     assert ran["last_run_at"] is not None
     assert ran["next_run_at"] is not None
+
+
+def _make_due(db, count):
+    ids = [
+        db.schedule_upsert(
+            name=f"s{i}", mode="index", payload={"i": i}, every_minutes=30, active=True
+        )
+        for i in range(count)
+    ]
+    with db.get_connection() as conn:
+        conn.execute(
+            "UPDATE taskmaster_schedules SET next_run_at = datetime('now', '-1 minute')"
+        )
+        conn.commit()
+    return ids
+
+
+def test_enqueue_due_schedules_hands_off_to_queue_once(monkeypatch, tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    svc = TaskMasterService(db)
+    _make_due(db, 3)
+
+    def must_not_run(**kwargs):
+        raise AssertionError("scheduler must not run pipelines inline")
+
+    monkeypatch.setattr(svc, "run_file_pipeline", must_not_run)
+
+    out = svc.enqueue_due_schedules(max_due=2)
+    assert out["due"] == 2 and len({j["queue_job_id"] for j in out["enqueued"]}) == 2
+    assert svc.enqueue_due_schedules()["due"] == 1
+    assert svc.enqueue_due_schedules()["due"] == 0
+    assert db.taskmaster_queue_depth() == 3
+    job = db.taskmaster_queue_claim_next(worker_name="w1")
+    assert job["mode"] == "index" and "i" in job["payload_json"]
+
+
+def test_scheduler_loop_keeps_event_loop_responsive(monkeypatch, tmp_path):
+    import asyncio
+    import logging
+    import time
+
+    import mem_db.database as database
+    from app.bootstrap.lifecycle import taskmaster_scheduler_loop
+
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    _make_due(db, 300)
+    monkeypatch.setattr(database, "get_database_manager", lambda: db)
+    monkeypatch.setenv("TASKMASTER_SCHEDULER_MAX_DUE_PER_TICK", "50")
+
+    async def scenario():
+        notified = []
+        task = asyncio.create_task(
+            taskmaster_scheduler_loop(
+                logger=logging.getLogger("test"), on_enqueued=notified.append
+            )
+        )
+        worst_gap = 0.0
+        deadline = time.monotonic() + 10
+        while db.taskmaster_queue_depth() < 300 and time.monotonic() < deadline:
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst_gap = max(worst_gap, time.perf_counter() - started)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return worst_gap, notified
+
+    worst_gap, notified = asyncio.run(scenario())
+    assert db.taskmaster_queue_depth() == 300
+    assert notified == [50] * 6
+    assert worst_gap < 0.25
+
+
+def test_run_coro_sync_reuses_one_loop_per_thread():
+    import asyncio
+    import threading
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    first = TaskMasterService._run_coro_sync(current_loop())
+    second = TaskMasterService._run_coro_sync(current_loop())
+    assert first is second and not first.is_closed()
+
+    other = []
+    worker = threading.Thread(
+        target=lambda: other.append(TaskMasterService._run_coro_sync(current_loop()))
+    )
+    worker.start()
+    worker.join()
+    assert other[0] is not first
+
+
+def test_run_coro_sync_runs_workers_coroutines_in_parallel():
+    import threading
+    import time
+
+    # Each coroutine blocks its loop until the other worker's coroutine is running too
+    barrier = threading.Barrier(2, timeout=5)
+
+    async def blocking_agent_call():
+        barrier.wait()
+        time.sleep(0.2)
+        return threading.current_thread().name
+
+    results = []
+
+    def worker():
+        results.append(TaskMasterService._run_coro_sync(blocking_agent_call()))
+
+    threads = [
+        threading.Thread(target=worker, name=f"taskmaster-worker-{i}") for i in range(2)
+    ]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(results) == ["taskmaster-worker-0", "taskmaster-worker-1"]
+    assert time.monotonic() - started < 0.4
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from mem_db.memory import proposals_db
+from services.thematic_discovery_service import ThematicDiscoveryService
+
+
+class _KeywordClusterer:
+    """Groups sentences by their first word; stands in for the transformer clusterer."""
+
+    @staticmethod
+    def split_sentences(text):
+        return [line.strip() for line in text.splitlines() if line.strip()]
+
+    def cluster_sentences(self, sentences, num_clusters=3):
+        keys = sorted({s.split()[0] for s in sentences})
+        return np.array([keys.index(s.split()[0]) for s in sentences])
+
+    def cluster_document(self, text, num_clusters=3):
+        sentences = self.split_sentences(text)
+        clusters = {}
+        for sentence, label in zip(sentences, self.cluster_sentences(sentences)):
+            clusters.setdefault(int(label), []).append(sentence)
+        return clusters
+
+
+class _SlowManager:
+    agents = {"ready": True}
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def extract_entities(self, text, **options):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.02)
+        self.active -= 1
+        return {"data": {"entities": [{"text": text.split()[0]}]}}
+
+
+@pytest.fixture
+def proposals_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(proposals_db, "DB_PATH", tmp_path / "proposals.db")
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_themes_label_concurrently_and_persist_in_one_batch(proposals_path, monkeypatch):
+    writes = []
+    original = proposals_db.add_proposals
+    monkeypatch.setattr(
+        proposals_db, "add_proposals", lambda items: writes.append(len(items)) or original(items)
+    )
+    manager = _SlowManager()
+    service = ThematicDiscoveryService(manager, clusterer=_KeywordClusterer(), max_concurrency=3)
+    text = "\n".join(f"{word} sentence {i}" for word in "abcdef" for i in range(3))
+
+    result = await service.discover_strategic_themes(text, "doc-1", num_clusters=6)
+
+    assert result["themes_discovered"] == 6
+    assert [r["key_identifiers"] for r in result["results"]] == [[w] for w in "abcdef"]
+    assert manager.peak == 3
+    assert writes == [6]
+    assert proposals_db.stats()["total"] == 6
+
+
+@pytest.mark.asyncio
+async def test_corpus_mode_tracks_source_documents(proposals_path):
+    service = ThematicDiscoveryService(None, clusterer=_KeywordClusterer())
+    documents = {"one.txt": "alpha x\nbeta y", "two.txt": "alpha z\nalpha w"}
+
+    result = await service.discover_corpus_themes(documents, "folder")
+
+    assert result["documents_analyzed"] == 2 and result["sentences_analyzed"] == 4
+    alpha, beta = result["results"]
+    assert alpha["source_documents"] == {"one.txt": 1, "two.txt": 2}
+    assert beta["source_documents"] == {"one.txt": 1}
+    assert [p["document_id"] for p in proposals_db.list_proposals()] == ["folder", "folder"]
+
+
+@pytest.mark.asyncio
+async def test_corpus_sentence_splitting_runs_off_the_event_loop(proposals_path):
+    split_threads = []
+
+    class _RecordingClusterer(_KeywordClusterer):
+        @staticmethod
+        def split_sentences(text):
+            split_threads.append(threading.get_ident())
+            return _KeywordClusterer.split_sentences(text)
+
+    service = ThematicDiscoveryService(None, clusterer=_RecordingClusterer())
+
+    result = await service.discover_corpus_themes({"a.txt": "alpha x", "b.txt": "beta y"}, "folder")
+
+    assert result["sentences_analyzed"] == 2
+    assert len(split_threads) == 2
+    assert threading.get_ident() not in split_threads
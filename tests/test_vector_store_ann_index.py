@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from mem_db.vector_store.unified_vector_store import UnifiedVectorStore
+
+DIM = 16
+
+
+def _vectors(count: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+async def _store(tmp_path, index_type: str, **options) -> UnifiedVectorStore:
+    store = UnifiedVectorStore(
+        store_path=tmp_path / "vs",
+        dimension=DIM,
+        index_type=index_type,
+        train_min_vectors=300,
+        pq_m=4,
+        nprobe=64,
+        ef_search=64,
+        **options,
+    )
+    assert await store.initialize()
+    return store
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "ivf_pq", "hnsw"])
+async def test_index_types_train_persist_and_reload(tmp_path, index_type):
+    store = await _store(tmp_path, index_type)
+    vectors = _vectors(320)
+    ids = [await store.add_document(f"doc {i}", vectors[i]) for i in range(len(vectors))]
+    stats = await store.get_statistics()
+    assert stats["active_index_type"] == index_type
+    assert stats["index_size"] == len(ids)
+    if index_type != "flat" and index_type != "hnsw":
+        # crossed train_min_vectors while adding: interim flat index was replaced.
+        assert stats["index_rebuilds"] == 1
+
+    hits = await store.search(vectors[5], k=3, boost_recent=False)
+    if index_type != "ivf_pq":
+        assert hits[0].document.id == ids[5]
+    await store.close()
+
+    reloaded = await _store(tmp_path, index_type)
+    stats = await reloaded.get_statistics()
+    assert stats["index_loaded_from_disk"] and stats["index_rebuilds"] == 0
+    assert stats["active_index_type"] == index_type
+    again = await reloaded.search(vectors[5], k=3, boost_recent=False)
+    assert [r.document.id for r in again] == [r.document.id for r in hits]
+
+    # Writes after a memory-mapped load still land in the index.
+    new_id = await reloaded.add_document("fresh", vectors[7] * -1.0)
+    assert (await reloaded.get_statistics())["index_size"] == len(ids) + 1
+    assert new_id in reloaded._id_to_index
+
+
+@pytest.mark.asyncio
+async def test_stale_or_lagging_index_is_rebuilt_or_caught_up(tmp_path):
+    store = await _store(tmp_path, "hnsw")
+    vectors = _vectors(20)
+    for i in range(10):
+        await store.add_document(f"doc {i}", vectors[i])
+    await store.close()
+
+    # Documents persisted after the last index save are appended on startup.
+    lagging = await _store(tmp_path, "hnsw")
+    for i in range(10, 20):
+        await lagging.add_document(f"doc {i}", vectors[i])
+    manifest = json.loads(lagging.index_manifest_path.read_text())
+    assert manifest["ntotal"] == 10
+
+    caught_up = await _store(tmp_path, "hnsw")
+    stats = await caught_up.get_statistics()
+    assert stats["index_loaded_from_disk"] and stats["index_size"] == 20
+    hit = await caught_up.search(vectors[15], k=1, boost_recent=False)
+    assert hit[0].document.content == "doc 15"
+
+    # A different build configuration makes the saved index stale.
+    rebuilt = await _store(tmp_path, "hnsw", hnsw_m=8)
+    stats = await rebuilt.get_statistics()
+    assert not stats["index_loaded_from_disk"] and stats["index_size"] == 20
+    assert json.loads(rebuilt.index_manifest_path.read_text())["params"]["hnsw_m"] == 8
+
+
+def test_search_params_and_validation(tmp_path):
+    with pytest.raises(ValueError):
+        UnifiedVectorStore(store_path=tmp_path / "bad", index_type="lsh")
+
+    store = UnifiedVectorStore(store_path=tmp_path / "vs", dimension=DIM, index_type="hnsw")
+    index, kind = store._build_index(_vectors(50))
+    store._index = index
+    store.set_search_params(ef_search=200)
+    assert kind == "hnsw" and store._base_index(index).hnsw.efSearch == 200
+
+
+def test_vector_index_benchmark_smoke():
+    import importlib.util
+    from pathlib import Path
+
+    spec = importlib.util.spec_from_file_location(
+        "benchmark_vector_index",
+        Path(__file__).resolve().parents[1] / "scripts" / "benchmark_vector_index.py",
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    report = module.run_benchmark(vectors=3000, dimension=32, queries=20, clusters=10)
+    results = report["results"]
+    assert results["flat"]["recall_at_10"] == 1.0
+    assert results["ivf_flat"]["recall_at_10"] > 0.8
+    assert results["hnsw"]["recall_at_10"] > 0.8
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from mem_db.vector_store.unified_vector_store import UnifiedVectorStore
+
+DIM = 8
+
+
+async def _store(tmp_path, **options) -> UnifiedVectorStore:
+    store = UnifiedVectorStore(store_path=tmp_path / "vs", dimension=DIM, **options)
+    assert await store.initialize()
+    return store
+
+
+@pytest.mark.asyncio
+async def test_add_documents_matches_single_inserts(tmp_path):
+    rng = np.random.default_rng(5)
+    vectors = rng.standard_normal((50, DIM)).astype(np.float32) * 3
+    store = await _store(tmp_path)
+    ids = await store.add_documents(
+        [f"doc {i}" for i in range(50)],
+        vectors,
+        metadatas=[{"row": i} for i in range(50)],
+        legal_domain=["contract" if i % 2 else "tort" for i in range(50)],
+        importance_score=0.5,
+    )
+    assert len(ids) == len(set(ids)) == 50
+
+    stats = await store.get_statistics()
+    assert stats["index_size"] == 50 and stats["total_documents"] == 50
+    assert stats["batch_inserts"] == 1 and stats["batch_documents"] == 50
+
+    # Rows are normalized like add_document and searchable by filter.
+    doc = store._documents[ids[3]]
+    assert np.isclose(np.linalg.norm(doc.embedding), 1.0)
+    assert doc.metadata == {"row": 3} and doc.legal_domain == "contract"
+    hits = await store.search(vectors[3], k=1, legal_domain="contract", boost_recent=False)
+    assert hits[0].document.id == ids[3]
+
+    with sqlite3.connect(store.db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0] == 50
+
+    reloaded = await _store(tmp_path)
+    assert set(reloaded._documents) == set(ids)
+
+
+@pytest.mark.asyncio
+async def test_add_documents_validates_shapes(tmp_path):
+    store = await _store(tmp_path, enable_persistence=False)
+    assert await store.add_documents([], np.zeros((0, DIM))) == []
+    with pytest.raises(ValueError):
+        await store.add_documents(["a", "b"], np.zeros((2, DIM + 1)))
+    with pytest.raises(ValueError):
+        await store.add_documents(["a", "b"], np.ones((2, DIM)), tags=[["x"]])
+    assert (await store.get_statistics())["index_size"] == 0
+
+
+def test_batch_index_route(tmp_path):
+    import asyncio
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from routes.vector_store import router
+    from services.dependencies import get_vector_store_strict_dep
+
+    store = UnifiedVectorStore(store_path=tmp_path / "vs", dimension=DIM)
+    app = FastAPI()
+    app.include_router(router, prefix="/api/vector_store")
+    app.dependency_overrides[get_vector_store_strict_dep] = lambda: store
+    client = TestClient(app)
+
+    docs = [{"content": f"doc {i}", "embedding": [float(i + 1)] * DIM} for i in range(3)]
+    response = client.post("/api/vector_store/vector/index/batch", json={"documents": docs})
+    assert response.status_code == 200
+    assert response.json()["count"] == 3
+    assert asyncio.run(store.get_statistics())["batch_documents"] == 3
+
+    bad = client.post(
+        "/api/vector_store/vector/index/batch",
+        json={"documents": [{"content": "x", "embedding": [1.0, 2.0]}]},
+    )
+    assert bad.status_code == 400
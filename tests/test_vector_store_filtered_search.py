@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from mem_db.vector_store.unified_vector_store import UnifiedVectorStore
+
+DIM = 8
+
+
+async def _populated_store(tmp_path, index_type: str = "flat", count: int = 400):
+    store = UnifiedVectorStore(
+        store_path=tmp_path / "vs",
+        dimension=DIM,
+        index_type=index_type,
+        enable_persistence=False,
+        train_min_vectors=200,
+    )
+    assert await store.initialize()
+    rng = np.random.default_rng(3)
+    for i in range(count):
+        await store.add_document(
+            f"doc {i}",
+            rng.standard_normal(DIM).astype(np.float32),
+            legal_domain="rare" if i % 100 == 0 else ("half" if i % 2 else "other"),
+            document_type="brief" if i % 10 == 0 else "memo",
+            case_id=f"case-{i % 4}",
+            jurisdiction="CA" if i % 3 == 0 else "NY",
+            tags=["privileged"] if i % 5 == 0 else [],
+        )
+    return store
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+async def test_selective_and_broad_filters_return_k_results(tmp_path, index_type):
+    store = await _populated_store(tmp_path, index_type)
+    query = np.ones(DIM, dtype=np.float32)
+
+    rare = await store.search(query, k=10, legal_domain="rare", boost_recent=False)
+    assert len(rare) == 4  # only four documents match; all of them come back
+    assert {r.document.legal_domain for r in rare} == {"rare"}
+
+    half = await store.search(query, k=10, legal_domain="half", boost_recent=False)
+    assert len(half) == 10 and {r.document.legal_domain for r in half} == {"half"}
+
+    combined = await store.search(
+        query, k=10, jurisdiction="CA", tags=["privileged"], boost_recent=False
+    )
+    assert len(combined) == 10
+    assert all(
+        r.document.jurisdiction == "CA" and "privileged" in r.document.tags for r in combined
+    )
+
+    # Unindexed predicates still reach k through over-fetch retries.
+    important = await store.search(query, k=10, min_importance=1.0, case_id="case-1")
+    assert len(important) == 10 and {r.document.case_id for r in important} == {"case-1"}
+
+    stats = await store.get_statistics()
+    assert stats["prefiltered_searches"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_prefiltered_results_match_exact_ranking(tmp_path):
+    store = await _populated_store(tmp_path)
+    query = np.linspace(-1, 1, DIM).astype(np.float32)
+    hits = await store.search(
+        query, k=5, document_type="brief", boost_recent=False, boost_domain=False
+    )
+
+    briefs = [d for d in store._documents.values() if d.document_type == "brief"]
+    normalized = query / np.linalg.norm(query)
+    expected = sorted(briefs, key=lambda d: -float(d.embedding[0] @ normalized))[:5]
+    assert {h.document.id for h in hits} == {d.id for d in expected}
+
+
+@pytest.mark.asyncio
+async def test_postings_follow_deletes(tmp_path):
+    store = await _populated_store(tmp_path, count=200)
+    rare_ids = [d.id for d in store._documents.values() if d.legal_domain == "rare"]
+    await store.delete_documents(rare_ids[:1])
+    hits = await store.search(np.ones(DIM), k=10, legal_domain="rare")
+    assert [h.document.id for h in hits] == rare_ids[1:]
+    assert await store.search(np.ones(DIM), k=10, case_id="missing") == []
+
+
+def test_vector_filter_benchmark_smoke():
+    import importlib.util
+    from pathlib import Path
+
+    spec = importlib.util.spec_from_file_location(
+        "benchmark_vector_filters",
+        Path(__file__).resolve().parents[1] / "scripts" / "benchmark_vector_filters.py",
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    report = module.run_benchmark(vectors=2000, dimension=16, queries=5)
+    for row in report["selectivity"].values():
+        assert row["filtered_avg_results"] == 10.0
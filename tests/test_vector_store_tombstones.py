@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from mem_db.vector_store.unified_vector_store import UnifiedVectorStore
+
+DIM = 8
+
+
+def _vectors(count: int, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+async def _store(tmp_path, index_type: str = "flat", **options) -> UnifiedVectorStore:
+    store = UnifiedVectorStore(
+        store_path=tmp_path / "vs", dimension=DIM, index_type=index_type, **options
+    )
+    assert await store.initialize()
+    return store
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+async def test_deletes_tombstone_without_rebuild(tmp_path, index_type):
+    store = await _store(tmp_path, index_type, compact_ratio=0.9)
+    vectors = _vectors(30)
+    ids = [await store.add_document(f"doc {i}", vectors[i]) for i in range(30)]
+    labels = dict(store._id_to_index)
+
+    assert await store.delete_documents(ids[:5] + ["missing"]) == 5
+    stats = await store.get_statistics()
+    assert stats["index_rebuilds"] == 0 and stats["tombstones"] == 5
+    assert stats["index_size"] == 30 and stats["total_documents"] == 25
+
+    # Deleted neighbours are skipped by the selector, so k results still come back.
+    hits = await store.search(vectors[0], k=10, boost_recent=False)
+    assert len(hits) == 10
+    assert not {h.document.id for h in hits} & set(ids[:5])
+
+    await store.compact_index()
+    stats = await store.get_statistics()
+    assert stats["index_size"] == 25 and stats["tombstones"] == 0
+    # Labels are stable across compaction.
+    assert all(store._id_to_index[d] == labels[d] for d in ids[5:])
+    assert (await store.search(vectors[7], k=1, boost_recent=False))[0].document.id == ids[7]
+
+
+@pytest.mark.asyncio
+async def test_compaction_triggers_past_ratio_and_survives_restart(tmp_path):
+    store = await _store(tmp_path, compact_ratio=0.25)
+    vectors = _vectors(20)
+    ids = [await store.add_document(f"doc {i}", vectors[i]) for i in range(20)]
+    await store.close()
+
+    await store.delete_documents(ids[:2])
+    assert store._compaction_task is None
+    await store.delete_documents(ids[2:6])
+    await asyncio.wait_for(store._compaction_task, timeout=10)
+    stats = await store.get_statistics()
+    assert stats["index_compactions"] == 1 and stats["index_size"] == 14
+
+    await store.delete_documents([ids[6]])
+    # Not saved: the reload re-derives the tombstone from the missing row.
+    reloaded = await _store(tmp_path, compact_ratio=0.9)
+    stats = await reloaded.get_statistics()
+    assert stats["index_loaded_from_disk"]
+    assert stats["index_size"] == 20 and stats["tombstones"] == 7
+    hits = await reloaded.search(vectors[3], k=5, boost_recent=False)
+    assert len(hits) == 5 and not {h.document.id for h in hits} & set(ids[:7])
+
+
+@pytest.mark.asyncio
+async def test_cleanup_expired_tombstones_expired_documents(tmp_path):
+    store = await _store(tmp_path, compact_ratio=0.9)
+    vectors = _vectors(4)
+    keep = await store.add_document("keep", vectors[0])
+    gone = await store.add_document("gone", vectors[1], ttl_seconds=1)
+    store._documents[gone].date_created = store._documents[gone].date_created.replace(year=2000)
+
+    assert await store.cleanup_expired() == 1
+    stats = await store.get_statistics()
+    assert stats["tombstones"] == 1 and stats["index_rebuilds"] == 0
+    hits = await store.search(vectors[1], k=2, boost_recent=False)
+    assert [h.document.id for h in hits] == [keep]
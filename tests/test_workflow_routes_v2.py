@@ -1,3 +1,6 @@
+import json
+import threading
+
 from mem_db.database import DatabaseManager
 from services.dependencies import get_database_manager_strict_dep
 
@@ -130,14 +133,14 @@ def test_workflow_index_extract_and_summarize_persist_resume_state(client, tmp_p
     job_id = client.post("/api/workflow/jobs", json={"workflow": "memory_first_v2"}).json()["job"]["job_id"]
 
     ex1 = client.post(
-        f"/api/workflow/jobs/{job_id}/steps/index_extract/execute",
+        f"/api/workflow/jobs/{job_id}/steps/index_extract/execute?wait=true",
         json={"payload": {"mode": "watched", "max_files": 50}},
     )
     assert ex1.status_code == 200
     assert ex1.json()["success"] is True
 
     ex2 = client.post(
-        f"/api/workflow/jobs/{job_id}/steps/summarize/execute",
+        f"/api/workflow/jobs/{job_id}/steps/summarize/execute?wait=true",
         json={"payload": {"limit": 100}},
     )
     assert ex2.status_code == 200
@@ -209,7 +212,7 @@ def test_workflow_frontend_route_smoke_contract(client, tmp_path):
     assert len(job["stepper"]) == 7
 
     exec_step = client.post(
-        f"/api/workflow/jobs/{job_id}/steps/proposals/execute",
+        f"/api/workflow/jobs/{job_id}/steps/proposals/execute?wait=true",
         json={"payload": {"limit": 10}},
         headers={"Idempotency-Key": "frontend-smoke-proposals"},
     )
@@ -407,3 +410,135 @@ def test_workflow_draft_state_uses_feedback_history(client, tmp_path):
     assert r.status_code == 200
     payload = r.json()["result"]["items"][0]["payload"]
     assert payload["draft_state"] == "human_edited"
+
+
+def test_workflow_step_runs_in_background_and_streams_progress(
+    client, tmp_path, monkeypatch
+):
+    db = _with_test_db(client, tmp_path)
+    release = threading.Event()
+
+    def _slow_summarize(db, payload):
+        assert release.wait(10)
+        from services.workflow.execution import execute_summarize
+
+        return execute_summarize(db, payload)
+
+    monkeypatch.setattr("services.workflow.runner.execute_summarize", _slow_summarize)
+    monkeypatch.setattr("routes.workflow.EVENTS_POLL_SECONDS", 0.01)
+
+    job_id = client.post(
+        "/api/workflow/jobs", json={"workflow": "memory_first_v2"}
+    ).json()["job"]["job_id"]
+    r = client.post(
+        f"/api/workflow/jobs/{job_id}/steps/summarize/execute",
+        json={"payload": {"limit": 10}},
+        headers={"Idempotency-Key": "bg-summarize"},
+    )
+    assert r.status_code == 200
+    accepted = r.json()
+    assert accepted["success"] is True
+    assert accepted["result"]["items"][0]["type"] == "step_run"
+
+    job = client.get(f"/api/workflow/jobs/{job_id}/status").json()["job"]
+    assert job["metadata"]["step_progress"]["summarize"]["state"] in {
+        "queued",
+        "running",
+    }
+    assert "summarize" not in job["metadata"].get("completed_steps", [])
+
+    # A retried request with the same key does not start the step again.
+    replay = client.post(
+        f"/api/workflow/jobs/{job_id}/steps/summarize/execute",
+        json={"payload": {"limit": 10}},
+        headers={"Idempotency-Key": "bg-summarize"},
+    )
+    assert (
+        replay.json()["result"]["items"][0]["id"]
+        == accepted["result"]["items"][0]["id"]
+    )
+
+    release.set()
+    stream = client.get(f"/api/workflow/jobs/{job_id}/events?step=summarize&timeout=10")
+    assert stream.status_code == 200
+    assert stream.headers["content-type"].startswith("text/event-stream")
+    events = [
+        (
+            block.split("\n")[0][len("event: ") :],
+            json.loads(block.split("\n")[1][len("data: ") :]),
+        )
+        for block in stream.text.strip().split("\n\n")
+    ]
+    name, last = events[-1]
+    assert name == "done"
+    assert last["steps"]["summarize"]["state"] == "complete"
+    assert last["steps"]["summarize"]["elapsed_seconds"] >= 0
+
+    job = client.get(f"/api/workflow/jobs/{job_id}/status").json()["job"]
+    assert "summarize" in job["metadata"]["completed_steps"]
+    assert job["metadata"]["summary_artifact"]
+
+
+def test_workflow_unknown_step_is_rejected(client, tmp_path):
+    _with_test_db(client, tmp_path)
+    r = client.post(
+        "/api/workflow/jobs/wf_missing/steps/not_a_step/execute", json={"payload": {}}
+    )
+    assert r.status_code == 404
+
+
+def test_interrupted_workflow_steps_do_not_stay_active(tmp_path, monkeypatch):
+    import time
+
+    from services.workflow import (
+        load_job,
+        locked_job,
+        runner,
+        workflow_progress_snapshot,
+    )
+
+    db = DatabaseManager(str(tmp_path / "workflow-interrupted.db"))
+    started, release = threading.Event(), threading.Event()
+
+    def _blocking_summarize(db, payload):
+        started.set()
+        assert release.wait(10)
+        from services.workflow.execution import execute_summarize
+
+        return execute_summarize(db, payload)
+
+    runner.shutdown_step_executor()
+    monkeypatch.setattr(runner, "WORKFLOW_STEP_WORKERS", 1)
+    monkeypatch.setattr(runner, "execute_summarize", _blocking_summarize)
+
+    _, running = runner.submit_workflow_step(
+        db, "job-running", "summarize", {}, scope="test"
+    )
+    assert started.wait(10)
+    _, queued = runner.submit_workflow_step(
+        db, "job-queued", "summarize", {}, scope="test"
+    )
+    runner.shutdown_step_executor(wait=False)
+    release.set()
+    running.result(timeout=10)
+
+    assert queued.cancelled()
+    dropped = load_job(db, "job-queued")
+    assert dropped.metadata["step_progress"]["summarize"]["state"] == "interrupted"
+    assert dropped.status == "failed"
+    assert not workflow_progress_snapshot(dropped)["active"]
+    assert (
+        load_job(db, "job-running").metadata["step_progress"]["summarize"]["state"]
+        == "complete"
+    )
+
+    # A step the previous process was still running when it exited
+    with locked_job(db, "job-orphaned") as job:
+        job.metadata["step_progress"] = {
+            "index_extract": {"state": "running", "started_at": time.time()}
+        }
+    assert runner.recover_interrupted_steps(db) == 1
+    orphaned = load_job(db, "job-orphaned")
+    assert orphaned.metadata["step_progress"]["index_extract"]["state"] == "interrupted"
+    assert not workflow_progress_snapshot(orphaned)["active"]
+    assert runner.recover_interrupted_steps(db) == 0
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mem_db.database import DatabaseManager
+from services.workflow_webhook_dispatcher import WorkflowWebhookDispatcher
+from services.workflow_webhook_service import WorkflowWebhookService
+
+
+class _StubServer:
+    """Local HTTP endpoint that records POST bodies and answers ``status``."""
+
+    def __init__(self, status: int = 204):
+        self.status = status
+        self.requests: list[dict] = []
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self):  # noqa: N802
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                stub.requests.append(
+                    {"headers": dict(self.headers), "body": json.loads(body)}
+                )
+                self.send_response(stub.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/hook"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _closed_port_url() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/hook"
+
+
+@pytest.fixture
+def stub():
+    server = _StubServer()
+    yield server
+    server.close()
+
+
+def _enqueue(db, url: str, n: int, prefix: str) -> None:
+    svc = WorkflowWebhookService()
+    for i in range(n):
+        svc.enqueue(
+            db,
+            url=url,
+            payload={"n": i},
+            event_id=f"{prefix}-{i}",
+            event_type="step.completed",
+            job_id="wf_x",
+        )
+
+
+def _rows(db, prefix: str):
+    with db.get_connection() as conn:
+        return [
+            dict(r)
+            for r in conn.execute(
+                "SELECT * FROM workflow_webhook_outbox "
+                "WHERE event_id LIKE ? ORDER BY id",
+                (f"{prefix}-%",),
+            ).fetchall()
+        ]
+
+
+@pytest.mark.asyncio
+async def test_outbox_coalesces_per_endpoint_and_isolates_dead_endpoint(
+    stub, tmp_path, monkeypatch
+):
+    monkeypatch.setenv("WORKFLOW_WEBHOOK_MAX_RETRIES", "3")
+    monkeypatch.setenv("WORKFLOW_WEBHOOK_RETRY_BACKOFF_SECONDS", "30")
+    db = DatabaseManager(str(tmp_path / "outbox.db"))
+    dead_url = _closed_port_url()
+    _enqueue(db, stub.url, 3, "good")
+    _enqueue(db, dead_url, 2, "dead")
+    # Same event id again is a no-op: emitting is idempotent per event.
+    _enqueue(db, stub.url, 1, "good")
+
+    outcomes = []
+    dispatcher = WorkflowWebhookDispatcher(db, on_result=outcomes.append)
+    started = time.time()
+    assert await dispatcher.drain_once() == 2
+    await dispatcher.stop()
+
+    assert len(stub.requests) == 1
+    request = stub.requests[0]
+    assert request["headers"]["X-Workflow-Event"] == "job_callback_batch"
+    assert [e["n"] for e in request["body"]["events"]] == [0, 1, 2]
+    assert {r["status"] for r in _rows(db, "good")} == {"delivered"}
+
+    dead = _rows(db, "dead")
+    assert {r["status"] for r in dead} == {"pending"}
+    assert all(r["attempts"] == 1 for r in dead)
+    # Retry is scheduled by timestamp (30s base, +/-50% jitter), not slept on.
+    assert all(started + 14 <= r["next_attempt_at"] <= time.time() + 46 for r in dead)
+    assert time.time() - started < 10
+
+    assert sum(1 for o in outcomes if o["ok"]) == 3
+    assert dispatcher.stats()["events_retried"] == 2
+    assert db.webhook_outbox_stats()["pending"] == 2
+
+
+@pytest.mark.asyncio
+async def test_outbox_dead_letters_after_max_attempts(tmp_path, monkeypatch):
+    dlq = tmp_path / "dlq.jsonl"
+    monkeypatch.setenv("WORKFLOW_WEBHOOK_MAX_RETRIES", "1")
+    monkeypatch.setenv("WORKFLOW_WEBHOOK_RETRY_BACKOFF_SECONDS", "0")
+    monkeypatch.setenv("WORKFLOW_WEBHOOK_DLQ_PATH", str(dlq))
+    db = DatabaseManager(str(tmp_path / "outbox.db"))
+    server = _StubServer(status=503)
+    try:
+        _enqueue(db, server.url, 1, "evt")
+        dispatcher = WorkflowWebhookDispatcher(db)
+        assert await dispatcher.drain_once() == 1
+        assert _rows(db, "evt")[0]["status"] == "pending"
+        assert await dispatcher.drain_once() == 1
+        await dispatcher.stop()
+    finally:
+        server.close()
+
+    row = _rows(db, "evt")[0]
+    assert (
+        row["status"] == "dead_letter"
+        and row["attempts"] == 2
+        and row["last_status"] == 503
+    )
+    assert len(server.requests) == 2
+    entries = [
+        json.loads(line) for line in dlq.read_text(encoding="utf-8").splitlines()
+    ]
+    assert [e["event_id"] for e in entries] == ["evt-0"]
+    assert entries[0]["replay"]["body_base64"]
+
+
+def test_emitting_a_callback_is_one_outbox_write(tmp_path):
+    from app.contracts.workflow import JobStatus
+    from services.workflow.execution import deliver_workflow_callback
+    from services.workflow.repository import load_job, save_job
+
+    db = DatabaseManager(str(tmp_path / "emit.db"))
+    job = JobStatus(job_id="job-1", metadata={"completed_steps": []})
+    job.webhook.enabled = True
+    job.webhook.url = "http://127.0.0.1:9/hook"
+    save_job(db, job)
+
+    job.progress = 0.5  # unsaved; emitting must not write the rest of the job
+    statements = []
+    with db.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            deliver_workflow_callback(
+                db, job=job, event_type="step.completed", payload={}
+            )
+        finally:
+            conn.set_trace_callback(None)
+
+    writes = [
+        s
+        for s in statements
+        if s.lstrip().split()[0].upper() in {"INSERT", "UPDATE", "DELETE"}
+    ]
+    assert len(writes) == 2 and "workflow_webhook_outbox" in writes[0]
+    assert sum(1 for s in statements if s.strip().upper() == "COMMIT") == 1
+    stored = load_job(db, "job-1")
+    assert stored.webhook.last_delivery_status == "queued:step.completed"
+    assert stored.progress == 0.0
+    assert db.webhook_outbox_stats()["pending"] == 1
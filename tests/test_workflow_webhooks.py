@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import threading
 import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from mem_db.database import DatabaseManager
 from services.dependencies import get_database_manager_strict_dep
+from services.workflow import record_webhook_delivery
+from services.workflow_webhook_dispatcher import WorkflowWebhookDispatcher
 from services.workflow_webhook_dlq import as_replay_requests, read_webhook_dlq
 from services.workflow_webhook_service import WorkflowWebhookService
 
@@ -87,31 +92,55 @@ def test_webhook_signature_header_present_when_secret_set(monkeypatch):
     assert str(req.headers.get("X-workflow-signature", "")).startswith("sha256=")
 
 
-def test_workflow_route_triggers_webhook_and_updates_status(client, tmp_path, monkeypatch):
+def test_workflow_route_queues_webhook_and_dispatcher_updates_status(
+    client, tmp_path, monkeypatch
+):
     db = DatabaseManager(str(tmp_path / "workflow-webhook.db"))
     client.app.dependency_overrides[get_database_manager_strict_dep] = lambda: db
 
     monkeypatch.setenv("WORKFLOW_WEBHOOK_MAX_RETRIES", "0")
     monkeypatch.setenv("WORKFLOW_WEBHOOK_RETRY_BACKOFF_SECONDS", "0")
 
-    class _Resp:
-        status = 204
-
-        def __enter__(self):
-            return self
-
-        def __exit__(self, exc_type, exc, tb):
-            return False
-
-    monkeypatch.setattr("urllib.request.urlopen", lambda *args, **kwargs: _Resp())
-
-    create = client.post(
-        "/api/workflow/jobs",
-        json={"workflow": "memory_first_v2", "webhook_url": "http://example.com/hook"},
-    )
-    assert create.status_code == 200
-    job_id = create.json()["job"]["job_id"]
-
+    received = []
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802
+            received.append(
+                json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            )
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+
+    try:
+        create = client.post(
+            "/api/workflow/jobs",
+            json={"workflow": "memory_first_v2", "webhook_url": url},
+        )
+        assert create.status_code == 200
+        job_id = create.json()["job"]["job_id"]
+
+        # Emitting only queues the event.
+        queued = client.get(f"/api/workflow/jobs/{job_id}/status").json()["job"]
+        assert queued["webhook"]["last_delivery_status"] == "queued:job.created"
+        assert not received
+
+        dispatcher = WorkflowWebhookDispatcher(
+            db, on_result=lambda outcome: record_webhook_delivery(db, outcome)
+        )
+        assert asyncio.run(dispatcher.drain_once()) == 1
+        asyncio.run(dispatcher.stop())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert received[0]["event_type"] == "job.created"
     status = client.get(f"/api/workflow/jobs/{job_id}/status")
     assert status.status_code == 200
     webhook = status.json()["job"]["webhook"]
@@ -3,10 +3,14 @@ Log handlers for different output destinations.
 """
 
 import asyncio
+import atexit
 import json
+import queue
 import sys
+import threading
+import weakref
 from pathlib import Path
-from typing import Optional, TextIO, List
+from typing import Any, BinaryIO, List, Optional, TextIO
 from datetime import datetime
 
 from ..interfaces.logging import (
@@ -19,53 +23,217 @@ from ..interfaces.logging import (
 )
 
 
+# Closes the writer of every live FileLogHandler at interpreter exit.
+_open_file_handlers: "weakref.WeakSet[FileLogHandler]" = weakref.WeakSet()
+
+
+def _close_open_file_handlers() -> None:
+    for handler in list(_open_file_handlers):
+        try:
+            handler.close()
+        except Exception:
+            pass
+
+
+atexit.register(_close_open_file_handlers)
+
+_STOP = object()
+
+
 class FileLogHandler(LogHandler):
-    """Log handler for file output with rotation support."""
-    
+    """Log handler for file output with rotation support.
+
+    Records are put on a bounded queue and return immediately; a background
+    thread formats them, writes them in batches through a persistent file
+    handle, rotates the file and flushes once per batch. When the queue is
+    full new records are dropped (``overflow="drop"``), or, with
+    ``overflow="sample"``, records below WARNING are thinned to one in
+    ``sample_every`` once the queue passes its high-water mark. Dropped
+    records are counted and reported in the log itself.
+    """
+
+    # Fraction of ``queue_size`` at which sampling starts.
+    HIGH_WATER = 0.8
+
     def __init__(
         self, 
         file_path: str, 
         max_size: int = 10 * 1024 * 1024, 
         backup_count: int = 5,
-        encoding: str = 'utf-8'
+        encoding: str = "utf-8",
+        queue_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        overflow: str = "drop",
+        sample_every: int = 10,
     ):
+        if overflow not in ("drop", "sample"):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
         self.file_path = Path(file_path)
         self.max_size = max_size
         self.backup_count = backup_count
         self.encoding = encoding
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.sample_every = max(1, sample_every)
         self.formatter: Optional[LogFormatter] = None
-        self._lock = asyncio.Lock()
-        
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+        self._high_water = int(max(1, queue_size) * self.HIGH_WATER)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self._handle: Optional[BinaryIO] = None
+        self._size = 0
+        # Updated without a lock; counts can be off by a few under contention
+        self._sampled = 0
+        self.dropped = 0
+        self._reported_dropped = 0
+        self.written = 0
+
         # Ensure directory exists
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
     
     async def emit(self, record: LogRecord) -> None:
-        """Emit log record to file."""
+        """Queue log record for the background writer."""
+        self.enqueue(record)
+
+    def enqueue(self, record: LogRecord) -> bool:
+        """Queue ``record`` without blocking; returns False if it was dropped."""
         if not self.formatter:
             raise LogHandlerError("No formatter set for file handler")
-        
+        if self._closed:
+            return False
+        if self._thread is None:
+            self._start()
+
+        if (
+            self.overflow == "sample"
+            and record.level < LogLevel.WARNING
+            and self._queue.qsize() >= self._high_water
+        ):
+            self._sampled += 1
+            if self._sampled % self.sample_every:
+                self.dropped += 1
+                return False
         try:
-            formatted_message = self.formatter.format(record)
-            
-            async with self._lock:
-                # Check if rotation is needed
-                if self.file_path.exists() and self.file_path.stat().st_size >= self.max_size:
-                    await self._rotate_files()
-                
-                # Write to file
-                with open(self.file_path, 'a', encoding=self.encoding) as f:
-                    f.write(formatted_message + '\n')
-                    f.flush()
-                    
-        except Exception as e:
-            raise LogHandlerError(f"Failed to write to log file: {e}")
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
     
     def set_formatter(self, formatter: LogFormatter) -> None:
         """Set log formatter."""
         self.formatter = formatter
-    
-    async def _rotate_files(self) -> None:
-        """Rotate log files when max size is reached."""
+
+    @property
+    def pending(self) -> int:
+        """Records queued but not yet written."""
+        return self._queue.qsize()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write out queued records and stop the writer thread."""
+        with self._start_lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            # The writer is draining, so this only waits for a free slot
+            self._queue.put(_STOP)
+            thread.join(timeout)
+            if thread.is_alive():
+                return
+        self._close_handle()
+        _open_file_handlers.discard(self)
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name=f"log-writer:{self.file_path.name}", daemon=True
+            )
+            self._thread.start()
+            _open_file_handlers.add(self)
+
+    def _run(self) -> None:
+        """Writer thread: drain the queue in batches until ``close``."""
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                if self.dropped != self._reported_dropped:
+                    self._write_batch([])
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            self._write_batch([item for item in batch if item is not _STOP])
+            if stop:
+                return
+
+    def _write_batch(self, records: List[LogRecord]) -> None:
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception as e:
+                print(f"Failed to format log record: {e}", file=sys.stderr)
+        dropped = self.dropped - self._reported_dropped
+        if dropped:
+            self._reported_dropped += dropped
+            notice = LogRecord(
+                level=LogLevel.WARNING,
+                message=f"{dropped} log records dropped: log queue full",
+                category=LogCategory.SYSTEM,
+                timestamp=datetime.now(),
+                logger_name=__name__,
+                context={"dropped": dropped, "overflow": self.overflow},
+            )
+            try:
+                lines.append(self.formatter.format(notice))
+            except Exception as e:
+                print(f"Failed to format log record: {e}", file=sys.stderr)
+        if not lines:
+            return
+
+        payload = ("\n".join(lines) + "\n").encode(self.encoding, errors="replace")
+        try:
+            if self._handle is None:
+                self._open_handle()
+            elif self._size >= self.max_size:
+                self._rotate_files()
+            self._handle.write(payload)
+            self._handle.flush()
+            self._size += len(payload)
+            self.written += len(records)
+        except Exception as e:
+            # Never raise on the writer thread; drop the handle and retry next batch
+            print(f"Failed to write to log file: {e}", file=sys.stderr)
+            self._close_handle()
+
+    def _open_handle(self) -> None:
+        self._handle = open(self.file_path, "ab")
+        self._size = self._handle.tell()
+        if self._size >= self.max_size:
+            self._rotate_files()
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            finally:
+                self._handle = None
+
+    def _rotate_files(self) -> None:
+        """Rotate log files when max size is reached and reopen the live file."""
+        self._close_handle()
         try:
             # Remove oldest backup if it exists
             oldest_backup = self.file_path.with_suffix(f'{self.file_path.suffix}.{self.backup_count}')
@@ -88,6 +256,9 @@ class FileLogHandler(LogHandler):
         except Exception as e:
             raise LogHandlerError(f"Failed to rotate log files: {e}")
 
+        self._handle = open(self.file_path, "ab")
+        self._size = 0
+
 
 class ConsoleLogHandler(LogHandler):
     """Log handler for console output with color support."""
@@ -285,4 +456,4 @@ class MemoryLogHandler(LogHandler):
     
     def get_records_by_category(self, category: LogCategory) -> List[LogRecord]:
         """Get records filtered by category."""
-        return [record for record in self._records if record.category == category]
\ No newline at end of file
+        return [record for record in self._records if record.category == category]
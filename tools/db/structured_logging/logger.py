@@ -291,8 +291,11 @@ class StructuredLoggerImpl(StructuredLogger):
         for handler in self._handlers:
             try:
                 if asyncio.iscoroutinefunction(handler.emit):
-                    # For async handlers, we'd need to handle this differently
-                    # For now, skip async handlers in sync logging
+                    # Queue-backed handlers take records without awaiting;
+                    # other async handlers are skipped in sync logging
+                    enqueue = getattr(handler, "enqueue", None)
+                    if enqueue is not None:
+                        enqueue(record)
                     continue
                 else:
                     handler.emit(record)
@@ -0,0 +1,297 @@
+"""Budgeted, page-parallel tesseract OCR on a process pool.
+
+Each page (an image file counts as one page) is rendered and recognized in
+its own task; within a page the preprocessing passes stop as soon as one
+scores well enough. Across pages, ``ocr_document`` cancels outstanding pages
+once any page reaches the file's quality target and stops waiting when the
+per-file time budget runs out. Like ``utils.pdf_pages`` this module only
+imports the standard library at top level so spawned workers start cheaply;
+PIL, pytesseract and PyMuPDF are imported inside the worker.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    BrokenExecutor,
+    ProcessPoolExecutor,
+    wait,
+)
+from typing import Any, Dict, Optional
+
+from utils.process_pool import LazyProcessPool
+
+logger = logging.getLogger(__name__)
+
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+OCR_FILE_BUDGET_SECONDS = float(os.getenv("OCR_FILE_BUDGET_SECONDS", "60"))
+OCR_QUALITY_TARGET = float(os.getenv("OCR_QUALITY_TARGET", "0.6"))
+OCR_PDF_MAX_PAGES = int(os.getenv("OCR_PDF_MAX_PAGES", "3"))
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+
+# Bump when passes or rendering change so cached OCR text is not reused.
+OCR_PIPELINE_VERSION = 1
+# A page pass scoring below this is retried with heavier preprocessing.
+RETRY_BELOW = 0.45
+PDF_RENDER_SCALE = 2.0
+
+_pool = LazyProcessPool()
+
+
+def ocr_settings(lang: str = OCR_LANG) -> Dict[str, Any]:
+    return {
+        "version": OCR_PIPELINE_VERSION,
+        "lang": lang,
+        "retry_below": RETRY_BELOW,
+        "pdf_render_scale": PDF_RENDER_SCALE,
+    }
+
+
+def ocr_extractor_key(settings: Dict[str, Any]) -> str:
+    """PageTextCache extractor name; differs whenever the OCR settings do."""
+    digest = hashlib.sha1(
+        json.dumps(settings, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:12]
+    return f"tesseract-ocr:{digest}"
+
+
+def ocr_quality_score(text: str) -> float:
+    sample = str(text or "")
+    if not sample.strip():
+        return 0.0
+    useful = sum(1 for ch in sample if ch.isalnum() or ch in " .,;:-_/\n")
+    density = useful / max(1, len(sample))
+    words = len([w for w in re.split(r"\s+", sample) if w.strip()])
+    long_words = len([w for w in re.split(r"\s+", sample) if len(w) >= 3])
+    vocab = len(set(re.findall(r"[A-Za-z]{3,}", sample)))
+    score = (
+        0.45 * density
+        + 0.25 * min(1.0, words / 40.0)
+        + 0.2 * min(1.0, long_words / 30.0)
+        + 0.1 * min(1.0, vocab / 25.0)
+    )
+    return round(max(0.0, min(1.0, score)), 3)
+
+
+def _tesseract(image_obj: Any, *, psm: int, lang: str, deadline: float) -> str:
+    import pytesseract  # type: ignore
+
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise TimeoutError("ocr_budget_exhausted")
+    try:
+        return str(
+            pytesseract.image_to_string(
+                image_obj,
+                lang=lang,
+                config=f"--psm {int(psm)}",
+                timeout=max(1, int(remaining)),
+            )
+            or ""
+        )
+    except RuntimeError as e:
+        # pytesseract signals its subprocess timeout as RuntimeError
+        if "timeout" in str(e).lower():
+            raise TimeoutError("ocr_budget_exhausted") from e
+        raise
+
+
+def ocr_page(
+    path: str, kind: str, page_no: int, settings: Dict[str, Any], deadline: float
+) -> Dict[str, Any]:
+    """Recognize one page; ``kind`` is ``"image"`` or ``"pdf"`` (1-based ``page_no``).
+
+    Returns ``{"page_no", "text", "quality", "attempts", "timed_out"}`` plus
+    ``page_count`` for PDFs; pages past the end come back with
+    ``beyond_end`` set.
+    """
+    from PIL import Image, ImageOps  # type: ignore
+
+    lang = str(settings.get("lang") or "eng")
+    retry_below = float(settings.get("retry_below", RETRY_BELOW))
+    out: Dict[str, Any] = {
+        "page_no": int(page_no),
+        "text": "",
+        "quality": 0.0,
+        "attempts": [],
+        "timed_out": False,
+    }
+
+    def _consider(text: str, label: str) -> None:
+        t = str(text or "").strip()
+        score = ocr_quality_score(t)
+        out["attempts"].append({"attempt": label, "chars": len(t), "quality": score})
+        if score > out["quality"]:
+            out["quality"] = score
+            out["text"] = t
+
+    try:
+        if kind == "image":
+            with Image.open(path) as img:
+                _consider(
+                    _tesseract(img, psm=6, lang=lang, deadline=deadline), "raw_psm6"
+                )
+                if out["quality"] < retry_below:
+                    gray = ImageOps.grayscale(img)
+                    _consider(
+                        _tesseract(gray, psm=6, lang=lang, deadline=deadline),
+                        "grayscale_psm6",
+                    )
+                if out["quality"] < retry_below:
+                    high_contrast = ImageOps.autocontrast(ImageOps.grayscale(img))
+                    _consider(
+                        _tesseract(high_contrast, psm=11, lang=lang, deadline=deadline),
+                        "autocontrast_psm11",
+                    )
+            return out
+
+        import fitz  # type: ignore
+
+        scale = float(settings.get("pdf_render_scale", PDF_RENDER_SCALE))
+        doc = fitz.open(path)
+        try:
+            out["page_count"] = int(doc.page_count)
+            if int(page_no) > out["page_count"]:
+                out["beyond_end"] = True
+                return out
+            pix = doc.load_page(int(page_no) - 1).get_pixmap(
+                matrix=fitz.Matrix(scale, scale)
+            )
+            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        finally:
+            doc.close()
+        _consider(
+            _tesseract(img, psm=6, lang=lang, deadline=deadline),
+            f"pdf_page_{page_no}_raw",
+        )
+        if out["quality"] < retry_below:
+            retry = ImageOps.autocontrast(ImageOps.grayscale(img))
+            _consider(
+                _tesseract(retry, psm=11, lang=lang, deadline=deadline),
+                f"pdf_page_{page_no}_retry",
+            )
+    except TimeoutError:
+        out["timed_out"] = True
+    return out
+
+
+def ocr_document(
+    path: str,
+    kind: str,
+    *,
+    sha256: Optional[str] = None,
+    cache: Any = None,
+    settings: Optional[Dict[str, Any]] = None,
+    max_pages: int = OCR_PDF_MAX_PAGES,
+    budget_seconds: float = OCR_FILE_BUDGET_SECONDS,
+    quality_target: float = OCR_QUALITY_TARGET,
+    workers: int = OCR_WORKERS,
+) -> Dict[str, Any]:
+    """OCR an image (one page) or the first ``max_pages`` pages of a PDF.
+
+    Pages already in ``cache`` (a ``PageTextCache``, keyed by ``sha256`` and
+    the settings digest) are not recognized again. With ``workers`` <= 1
+    pages run one after another in the calling thread.
+    """
+    settings = settings or ocr_settings()
+    extractor = ocr_extractor_key(settings)
+    pages = [1] if kind == "image" else list(range(1, max(1, int(max_pages)) + 1))
+    results: Dict[int, Dict[str, Any]] = {}
+    stats: Dict[str, Any] = {
+        "cache_hits": 0,
+        "pages_ocred": 0,
+        "pages_cancelled": 0,
+        "timed_out": False,
+    }
+
+    use_cache = cache is not None and bool(sha256)
+    if use_cache:
+        for page_no, text in cache.get_pages(
+            sha256, pages, extractor=extractor
+        ).items():
+            results[page_no] = {
+                "page_no": page_no,
+                "text": text,
+                "quality": ocr_quality_score(text),
+                "attempts": [],
+                "cached": True,
+            }
+        stats["cache_hits"] = len(results)
+
+    def _best() -> float:
+        return max((r["quality"] for r in results.values()), default=0.0)
+
+    def _record(r: Dict[str, Any]) -> None:
+        if r.get("beyond_end"):
+            return
+        results[r["page_no"]] = r
+        stats["pages_ocred"] += 1
+        if "page_count" in r:
+            stats["page_count"] = r["page_count"]
+        if r.get("timed_out"):
+            stats["timed_out"] = True
+        elif use_cache:
+            cache.put_pages(sha256, [(r["page_no"], r["text"])], extractor=extractor)
+
+    todo = [p for p in pages if p not in results] if _best() < quality_target else []
+    deadline = time.time() + max(0.0, float(budget_seconds))
+    if todo and int(workers) <= 1:
+        for i, page_no in enumerate(todo):
+            if _best() >= quality_target:
+                stats["pages_cancelled"] += len(todo) - i
+                break
+            if time.time() >= deadline:
+                stats["timed_out"] = True
+                stats["pages_cancelled"] += len(todo) - i
+                break
+            _record(ocr_page(path, kind, page_no, settings, deadline))
+    elif todo:
+        pool = get_ocr_pool(workers)
+        pending = {
+            pool.submit(ocr_page, path, kind, page_no, settings, deadline)
+            for page_no in todo
+        }
+        try:
+            while pending and _best() < quality_target:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    stats["timed_out"] = True
+                    break
+                done, pending = wait(
+                    pending, timeout=remaining, return_when=FIRST_COMPLETED
+                )
+                for fut in done:
+                    _record(fut.result())
+        except BrokenExecutor:
+            # A renderer crash kills the worker, not the caller; start afresh next time
+            shutdown_ocr_pool(wait=False)
+            raise
+        finally:
+            for fut in pending:
+                # Running pages cannot be interrupted; they stop at the deadline
+                fut.cancel()
+            stats["pages_cancelled"] += len(pending)
+
+    ordered = [results[p] for p in sorted(results)]
+    best = max(ordered, key=lambda r: r["quality"], default=None)
+    return {
+        "text": best["text"] if best else "",
+        "quality": best["quality"] if best else 0.0,
+        "pages": ordered,
+        **stats,
+    }
+
+
+def get_ocr_pool(workers: int = OCR_WORKERS) -> ProcessPoolExecutor:
+    """Shared OCR pool, created on first use (and re-created if resized)."""
+    return _pool.get(workers)
+
+
+def shutdown_ocr_pool(wait: bool = True) -> None:
+    _pool.shutdown(wait=wait)
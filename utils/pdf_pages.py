@@ -0,0 +1,54 @@
+"""Page-range sharded PDF text extraction on a process pool.
+
+pypdf is pure Python, so text extraction of a long PDF is CPU-bound and holds
+the GIL. Splitting the page list into shards and extracting each shard in a
+separate process uses every core. This module is deliberately free of heavy
+imports: spawned workers import it to run ``extract_page_range``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Sequence, Tuple
+
+from utils.process_pool import LazyProcessPool
+
+logger = logging.getLogger(__name__)
+
+PDF_PAGE_WORKERS = int(os.getenv("PDF_PAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_pool = LazyProcessPool()
+
+
+def extract_page_range(path: str, page_numbers: Sequence[int]) -> List[Tuple[int, str]]:
+    """Return ``(page_no, text)`` for the given 1-based pages of ``path``."""
+    from pypdf import PdfReader  # type: ignore
+
+    reader = PdfReader(path)
+    out: List[Tuple[int, str]] = []
+    for page_no in page_numbers:
+        out.append(
+            (
+                int(page_no),
+                (reader.pages[int(page_no) - 1].extract_text() or "").strip(),
+            )
+        )
+    return out
+
+
+def page_shards(page_numbers: Sequence[int], pages_per_shard: int) -> List[List[int]]:
+    """Split sorted page numbers into shards of at most ``pages_per_shard`` pages."""
+    pages = sorted(int(p) for p in page_numbers)
+    size = max(1, int(pages_per_shard))
+    return [pages[i : i + size] for i in range(0, len(pages), size)]
+
+
+def get_pdf_page_pool(workers: int = PDF_PAGE_WORKERS) -> ProcessPoolExecutor:
+    """Shared extraction pool, created on first use (and re-created if resized)."""
+    return _pool.get(workers)
+
+
+def shutdown_pdf_page_pool(wait: bool = True) -> None:
+    _pool.shutdown(wait=wait)
@@ -0,0 +1,42 @@
+"""Lazily created, resizable process pools shared across a module's callers.
+
+Only imports the standard library: modules whose functions run inside the
+spawned workers build their pool from this, so it must stay cheap to import.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+
+class LazyProcessPool:
+    """A spawn-context ProcessPoolExecutor, created on first use."""
+
+    def __init__(self) -> None:
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._workers = 0
+        self._lock = threading.Lock()
+
+    def get(self, workers: int) -> ProcessPoolExecutor:
+        """Return the pool, creating it (or re-creating it if resized) as needed."""
+        workers = max(1, int(workers))
+        with self._lock:
+            if self._pool is not None and self._workers != workers:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            if self._pool is None:
+                # spawn: forking a process that already runs threads is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                self._workers = workers
+            return self._pool
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)